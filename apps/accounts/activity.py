@@ -0,0 +1,116 @@
+"""
+Throttling and buffering of the users' last activity date updates.
+
+Updating the last activity date of the current user at each request turns every page view into a write on the user's
+profile row. Instead:
+
+- the last activity date of each user is updated at most once per ``LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS``, using
+  an atomic ``add`` of a per-user throttling key in the cache;
+- in buffered mode (see ``LAST_ACTIVITY_BUFFERED_UPDATES``), the throttled updates are appended to a buffer in the
+  cache and written to the database in bulk by the ``flushlastactivitydates`` management command.
+
+The buffer is made of numbered slots: each buffered update get a new slot number using an atomic ``incr`` of a
+sequence key, and the flush command read all slots between the last flushed slot and the current sequence number.
+A writer takes its slot number before writing the slot, so slots found empty by the flush command are read again by
+the next run before being skipped.
+"""
+
+from django.core.cache import caches
+
+from .settings import (LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS,
+                       LAST_ACTIVITY_CACHE_ALIAS,
+                       LAST_ACTIVITY_BUFFER_TIMEOUT)
+
+
+# Cache key of the buffer sequence number (last used slot number)
+BUFFER_SEQUENCE_KEY = 'accounts:last-activity:seq'
+
+# Cache key of the last flushed buffer slot number
+BUFFER_FLUSHED_KEY = 'accounts:last-activity:flushed'
+
+# Cache key of the buffer slot numbers found empty by the last flush, read again by the next flush
+BUFFER_MISSING_KEY = 'accounts:last-activity:missing'
+
+# Number of buffer slots read at once by ``pop_buffered_activity_dates()``
+BUFFER_READ_CHUNK_SIZE = 1000
+
+
+def _get_throttle_key(user_id):
+    """
+    Return the cache key used to throttle the last activity date updates of the given user.
+    :param user_id: The user's ID.
+    """
+    return 'accounts:last-activity:throttle:%d' % user_id
+
+
+def _get_buffer_slot_key(slot):
+    """
+    Return the cache key of the given buffer slot.
+    :param slot: The slot number.
+    """
+    return 'accounts:last-activity:slot:%d' % slot
+
+
+def should_update_activity_date(user_id):
+    """
+    Return True if the last activity date of the given user need to be updated, False if it has already been updated
+    less than ``LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS`` ago.
+    :param user_id: The user's ID.
+    """
+    if LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS <= 0:
+        return True
+    return caches[LAST_ACTIVITY_CACHE_ALIAS].add(_get_throttle_key(user_id), True,
+                                                 LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS)
+
+
+def buffer_activity_date(user_id, activity_date):
+    """
+    Append the given last activity date of the given user to the buffer.
+    :param user_id: The user's ID.
+    :param activity_date: The last activity date.
+    :return: None
+    """
+    cache = caches[LAST_ACTIVITY_CACHE_ALIAS]
+    cache.add(BUFFER_SEQUENCE_KEY, 0, None)
+    try:
+        slot = cache.incr(BUFFER_SEQUENCE_KEY)
+    except ValueError:
+        # Sequence key evicted between the "add" and the "incr", the update is lost
+        return
+    cache.set(_get_buffer_slot_key(slot), (user_id, activity_date), LAST_ACTIVITY_BUFFER_TIMEOUT)
+
+
+def pop_buffered_activity_dates():
+    """
+    Read and remove all buffered last activity dates. Must not be called concurrently.
+    :return: A dictionary ``{user_id: last_activity_date}``, with the latest date of each user.
+    """
+    cache = caches[LAST_ACTIVITY_CACHE_ALIAS]
+    last_slot = cache.get(BUFFER_SEQUENCE_KEY)
+    if last_slot is None:
+        return {}
+    flushed_slot = cache.get(BUFFER_FLUSHED_KEY, 0)
+    missing_slots = cache.get(BUFFER_MISSING_KEY, [])
+    if flushed_slot > last_slot:
+        # Sequence key evicted and restarted from zero
+        flushed_slot = 0
+        missing_slots = []
+
+    # Slots found empty by the last run may have been written since, slots found empty twice are skipped
+    new_slots = range(flushed_slot + 1, last_slot + 1)
+    slots = list(missing_slots) + list(new_slots)
+    activity_dates = {}
+    still_missing_slots = []
+    for chunk_start in range(0, len(slots), BUFFER_READ_CHUNK_SIZE):
+        chunk_slots = slots[chunk_start:chunk_start + BUFFER_READ_CHUNK_SIZE]
+        slot_keys = {_get_buffer_slot_key(slot): slot for slot in chunk_slots}
+        buffered_dates = cache.get_many(slot_keys.keys())
+        for user_id, activity_date in buffered_dates.values():
+            if user_id not in activity_dates or activity_dates[user_id] < activity_date:
+                activity_dates[user_id] = activity_date
+        cache.delete_many(buffered_dates.keys())
+        still_missing_slots.extend(slot for slot_key, slot in slot_keys.items()
+                                   if slot_key not in buffered_dates and slot in new_slots)
+    cache.set(BUFFER_MISSING_KEY, still_missing_slots, None)
+    cache.set(BUFFER_FLUSHED_KEY, last_slot, None)
+    return activity_dates
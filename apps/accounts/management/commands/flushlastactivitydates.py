@@ -0,0 +1,55 @@
+"""
+Management command to write the buffered last activity dates to the database.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.dbmutex import (MutexLock,
+                          AlreadyLockedError,
+                          LockTimeoutError)
+
+from ...models import UserProfile
+from ...settings import LAST_ACTIVITY_FLUSH_MUTEX_NAME
+
+
+class Command(BaseCommand):
+    """
+    A management command which write all the last activity dates buffered in the cache to the database, when
+    ``LAST_ACTIVITY_BUFFERED_UPDATES`` is enabled.
+    Only one instance of this command can run at the same time (using a database mutex lock), so it can be safely
+    started by a CRON job every minute.
+    """
+
+    help = "Write the buffered last activity dates to the database"
+
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--batch-size',
+                            type=int,
+                            dest='batch_size',
+                            default=500,
+                            help='Number of users updated per query.')
+
+    def handle(self, *args, **options):
+        """
+        Command handler.
+        :param args: Not used.
+        :param options: Command options.
+        :return: None.
+        """
+        try:
+            with MutexLock(LAST_ACTIVITY_FLUSH_MUTEX_NAME):
+                nb_users = UserProfile.objects.flush_buffered_last_activity_dates(options['batch_size'])
+        except AlreadyLockedError:
+            if options['verbosity']:
+                self.stdout.write('Another instance is already flushing the last activity dates')
+            return
+        except LockTimeoutError:
+            # Lock expired while flushing, the dates have been written anyway
+            pass
+
+        if options['verbosity']:
+            self.stdout.write('%d user(s) last activity date updated' % nb_users)
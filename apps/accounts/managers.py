@@ -4,10 +4,19 @@ Objects managers for the user accounts app.
 
 import datetime
 
+from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import (Case,
+                              When,
+                              Value,
+                              F)
 from django.utils import timezone
 
-from .settings import ONLINE_USER_TIME_WINDOW_SECONDS
+from .activity import (should_update_activity_date,
+                       buffer_activity_date,
+                       pop_buffered_activity_dates)
+from .settings import (ONLINE_USER_TIME_WINDOW_SECONDS,
+                       LAST_ACTIVITY_BUFFERED_UPDATES)
 
 
 class UserProfileManager(models.Manager):
@@ -35,3 +44,55 @@ class UserProfileManager(models.Manager):
         Return a queryset of all active users.
         """
         return self.filter(user__is_active=True)
+
+    def update_last_activity_date(self, user):
+        """
+        Update the last activity date of the given user, at most once per ``LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS``.
+        In buffered mode (see ``LAST_ACTIVITY_BUFFERED_UPDATES``), the update is only buffered in the cache and will
+        be written by ``flush_buffered_last_activity_dates()``.
+        :param user: The user instance.
+        :return: True if the last activity date has been updated (or buffered), False if throttled.
+        """
+        if not should_update_activity_date(user.pk):
+            return False
+        now = timezone.now()
+        if LAST_ACTIVITY_BUFFERED_UPDATES:
+            buffer_activity_date(user.pk, now)
+            return True
+        updated = self.filter(user=user).update(last_activity_date=now)
+        if not updated:
+            # The user profile does not exist yet. Fallback to a simple "get then save" logic.
+            self._set_last_activity_date(user, now)
+        return True
+
+    def _set_last_activity_date(self, user, activity_date):
+        """
+        Set the last activity date of the given user, creating the user profile if necessary.
+        :param user: The user instance.
+        :param activity_date: The last activity date.
+        """
+        user_profile = user.user_profile
+        user_profile.last_activity_date = activity_date
+        user_profile.save_no_rendering(update_fields=('last_activity_date',))
+
+    def flush_buffered_last_activity_dates(self, batch_size=500):
+        """
+        Write all buffered last activity dates to the database, using one bulk update per batch of users.
+        Must not be called concurrently.
+        :param batch_size: The number of users updated per query.
+        :return: The number of users updated.
+        """
+        activity_dates = pop_buffered_activity_dates()
+        user_ids = sorted(activity_dates.keys())
+        for batch_start in range(0, len(user_ids), batch_size):
+            batch_user_ids = user_ids[batch_start:batch_start + batch_size]
+            whens = [When(user_id=user_id, then=Value(activity_dates[user_id])) for user_id in batch_user_ids]
+            self.filter(user_id__in=batch_user_ids).update(
+                last_activity_date=Case(*whens, default=F('last_activity_date'),
+                                        output_field=models.DateTimeField()))
+
+        # Create the missing user profiles, if any
+        existing_user_ids = set(self.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+        for user in get_user_model().objects.filter(pk__in=set(user_ids) - existing_user_ids):
+            self._set_last_activity_date(user, activity_dates[user.pk])
+        return len(user_ids)
@@ -2,14 +2,13 @@
 Middleware for the user accounts app.
 """
 
-from django.utils import timezone
-
 from .models import UserProfile
 
 
 class LastActivityDateUpdateMiddleware(object):
     """
     Middleware for updating the "last activity date" of authenticated users.
+    Updates are throttled (and can be buffered), see ``UserProfileManager.update_last_activity_date()``.
     """
 
     def process_request(self, request):
@@ -22,11 +21,5 @@ class LastActivityDateUpdateMiddleware(object):
         current_user = request.user
         if current_user.is_authenticated():
 
-            # Update last login IP address
-            now = timezone.now()
-            updated = UserProfile.objects.filter(user=current_user).update(last_activity_date=now)
-            if not updated:
-                # The user profile does not exist yet. Fallback to a simple "get then save" logic.
-                user_profile = current_user.user_profile
-                user_profile.last_activity_date = now
-                user_profile.save_no_rendering(update_fields=('last_activity_date',))
+            # Update last activity date
+            UserProfile.objects.update_last_activity_date(current_user)
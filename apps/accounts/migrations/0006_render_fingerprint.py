@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_auto_20160101_1840'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+    ]
@@ -23,8 +23,9 @@ from apps.countries.fields import CountryField
 from apps.gender.fields import GenderField
 from apps.timezones import TIMEZONE_SESSION_KEY
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .settings import (AVATAR_HEIGHT_SIZE_PX,
                        AVATAR_WIDTH_SIZE_PX,
@@ -147,6 +148,15 @@ class UserProfile(models.Model):
                                       editable=False,
                                       blank=True)
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     website_name = models.CharField(_('Website name'),
                                     help_text=_('The website URL will be used if empty.'),
                                     max_length=255,
@@ -360,32 +370,32 @@ class UserProfile(models.Model):
         allow_text_colors_in_biography = self.user.has_perm('accounts.allow_text_colors_in_biography')
         allow_cdm_extra_in_biography = self.user.has_perm('accounts.allow_cdm_extra_in_biography')
         force_nofollow_in_biography = not self.user.has_perm('accounts.allow_raw_link_in_biography')
-        content_html, content_text, _ = render_document(self.biography,
-                                                        allow_titles=allow_titles_in_biography,
-                                                        allow_code_blocks=True,
-                                                        allow_alerts_box=allow_alerts_box_in_biography,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=allow_text_colors_in_biography,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=allow_cdm_extra_in_biography,
-                                                        force_nofollow=force_nofollow_in_biography,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, biography_extra = render_document(self.biography,
+                                                                      allow_titles=allow_titles_in_biography,
+                                                                      allow_code_blocks=True,
+                                                                      allow_alerts_box=allow_alerts_box_in_biography,
+                                                                      allow_text_formating=True,
+                                                                      allow_text_extra=True,
+                                                                      allow_text_alignments=True,
+                                                                      allow_text_directions=True,
+                                                                      allow_text_modifiers=True,
+                                                                      allow_text_colors=allow_text_colors_in_biography,
+                                                                      allow_spoilers=True,
+                                                                      allow_figures=True,
+                                                                      allow_lists=True,
+                                                                      allow_todo_lists=True,
+                                                                      allow_definition_lists=True,
+                                                                      allow_tables=True,
+                                                                      allow_quotes=True,
+                                                                      allow_footnotes=True,
+                                                                      allow_acronyms=True,
+                                                                      allow_links=True,
+                                                                      allow_medias=True,
+                                                                      allow_cdm_extra=allow_cdm_extra_in_biography,
+                                                                      force_nofollow=force_nofollow_in_biography,
+                                                                      render_text_version=True,
+                                                                      merge_footnotes_html=True,
+                                                                      merge_footnotes_text=True)
         self.biography_html = content_html
         self.biography_text = content_text
 
@@ -397,33 +407,37 @@ class UserProfile(models.Model):
         allow_medias_in_signature = self.user.has_perm('accounts.allow_medias_in_signature')
         allow_cdm_extra_in_signature = self.user.has_perm('accounts.allow_cdm_extra_in_signature')
         force_nofollow_in_signature = not self.user.has_perm('accounts.allow_raw_link_in_signature')
-        content_html, content_text, _ = render_document(self.signature,
-                                                        allow_code_blocks=allow_code_blocks_in_signature,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=allow_text_colors_in_signature,
-                                                        allow_lists=allow_lists_in_signature,
-                                                        allow_todo_lists=allow_lists_in_signature,
-                                                        allow_definition_lists=allow_lists_in_signature,
-                                                        allow_tables=allow_tables_in_signature,
-                                                        allow_quotes=allow_quotes_in_signature,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=allow_medias_in_signature,
-                                                        allow_cdm_extra=allow_cdm_extra_in_signature,
-                                                        force_nofollow=force_nofollow_in_signature,
-                                                        render_text_version=True,
-                                                        make_auto_paragraphs=False)
+        content_html, content_text, signature_extra = render_document(self.signature,
+                                                                      allow_code_blocks=allow_code_blocks_in_signature,
+                                                                      allow_text_formating=True,
+                                                                      allow_text_extra=True,
+                                                                      allow_text_alignments=True,
+                                                                      allow_text_directions=True,
+                                                                      allow_text_modifiers=True,
+                                                                      allow_text_colors=allow_text_colors_in_signature,
+                                                                      allow_lists=allow_lists_in_signature,
+                                                                      allow_todo_lists=allow_lists_in_signature,
+                                                                      allow_definition_lists=allow_lists_in_signature,
+                                                                      allow_tables=allow_tables_in_signature,
+                                                                      allow_quotes=allow_quotes_in_signature,
+                                                                      allow_acronyms=True,
+                                                                      allow_links=True,
+                                                                      allow_medias=allow_medias_in_signature,
+                                                                      allow_cdm_extra=allow_cdm_extra_in_signature,
+                                                                      force_nofollow=force_nofollow_in_signature,
+                                                                      render_text_version=True,
+                                                                      make_auto_paragraphs=False)
         self.signature_html = content_html
         self.signature_text = content_text
 
+        self.render_fingerprint = signature_extra['fingerprint']
+        self.render_tags = format_used_tags(biography_extra, signature_extra)
+
         # Save if required
         if save:
             self.save_no_rendering(update_fields=('biography_html', 'biography_text',
-                                                  'signature_html', 'signature_text'))
+                                                  'signature_html', 'signature_text',
+                                                  'render_fingerprint', 'render_tags'))
 
     def is_online(self):
         """
@@ -456,16 +470,11 @@ class UserProfile(models.Model):
         return 'https://twitter.com/%s' % urlquote_plus(self.twitter_name)
 
 
-def _redo_profile_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all user profiles.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for profile in UserProfile.objects.all():
-        profile.render_text(save=True)
-
-render_engine_changed.connect(_redo_profile_text_rendering)
+register_rendered_model(UserProfile,
+                        'render_text',
+                        ('biography_html', 'biography_text', 'signature_html', 'signature_text'),
+                        select_related=('user',),
+                        date_field='last_modification_date')
 
 
 def set_preferred_language_and_timezone(user, request):
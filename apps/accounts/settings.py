@@ -51,3 +51,22 @@ DEFAULT_MAX_NB_USER_IN_LATEST_MODIFIED_ACCOUNTS_LIST = getattr(settings,
 DEFAULT_MAX_NB_USER_IN_LATEST_ONLINE_ACCOUNTS_LIST = getattr(settings,
                                                              'DEFAULT_MAX_NB_USER_IN_LATEST_ONLINE_ACCOUNTS_LIST',
                                                              10)
+
+# Minimum number of seconds between two updates of the last activity date of an user (default 1 minute).
+# Set to 0 to update the last activity date at each request. Must be (much) lower than
+# ``ONLINE_USER_TIME_WINDOW_SECONDS`` to keep the online users list accurate.
+LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS = getattr(settings, 'LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS', 60)
+
+# Set to True to buffer the last activity dates in the cache instead of updating the database on request.
+# Buffered dates are written to the database by the ``flushlastactivitydates`` management command, which must be
+# run frequently (every minute by a CRON job for instance) to keep the online users list accurate.
+LAST_ACTIVITY_BUFFERED_UPDATES = getattr(settings, 'LAST_ACTIVITY_BUFFERED_UPDATES', False)
+
+# Django cache alias used for throttling and buffering the last activity dates updates
+LAST_ACTIVITY_CACHE_ALIAS = getattr(settings, 'LAST_ACTIVITY_CACHE_ALIAS', 'default')
+
+# Lifetime of a buffered last activity date in seconds (default 1 hour)
+LAST_ACTIVITY_BUFFER_TIMEOUT = getattr(settings, 'LAST_ACTIVITY_BUFFER_TIMEOUT', 60 * 60)
+
+# Name of the database mutex used by the ``flushlastactivitydates`` management command
+LAST_ACTIVITY_FLUSH_MUTEX_NAME = getattr(settings, 'LAST_ACTIVITY_FLUSH_MUTEX_NAME', 'accounts_flushlastactivitydates')
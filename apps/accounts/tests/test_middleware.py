@@ -6,9 +6,17 @@ from unittest.mock import MagicMock, patch
 
 from django.test import TestCase
 from django.utils import timezone
+from django.core.cache import caches
+from django.core.management import call_command
 from django.contrib.auth import get_user_model
 
+from ..activity import (BUFFER_SEQUENCE_KEY,
+                        buffer_activity_date,
+                        pop_buffered_activity_dates,
+                        _get_buffer_slot_key)
 from ..middleware import LastActivityDateUpdateMiddleware
+from ..models import UserProfile
+from ..settings import LAST_ACTIVITY_CACHE_ALIAS
 
 
 class LastActivityDateUpdateMiddlewareTestCase(TestCase):
@@ -16,6 +24,12 @@ class LastActivityDateUpdateMiddlewareTestCase(TestCase):
     Tests case for the ``LastActivityDateUpdateMiddleware`` middleware.
     """
 
+    def setUp(self):
+        """
+        Start each test with a fresh cache.
+        """
+        caches[LAST_ACTIVITY_CACHE_ALIAS].clear()
+
     def test_last_activity_middleware_no_user_profile_yet(self):
         """
         Test if the LastActivityDateUpdateMiddleware is working when the user profile does not exist.
@@ -66,3 +80,96 @@ class LastActivityDateUpdateMiddlewareTestCase(TestCase):
         request.user.user_profile = MagicMock(return_value=None)
         result = mw.process_request(request)
         self.assertIsNone(result)
+
+    def test_last_activity_middleware_throttled(self):
+        """
+        Test if the ``LastActivityDateUpdateMiddleware`` middleware update the last activity date only once per
+        ``LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS``.
+        """
+        user = get_user_model().objects.create_user(username='johndoe',
+                                                    password='illpassword',
+                                                    email='johndoe@example.com')
+        self.assertIsNotNone(user.user_profile)
+        now = timezone.now()
+        mw = LastActivityDateUpdateMiddleware()
+        request = MagicMock(user=user)
+
+        with patch('django.utils.timezone.now') as mock_now:
+            mock_now.return_value = now
+            mw.process_request(request)
+        with self.assertNumQueries(0):
+            mw.process_request(request)
+
+        user.user_profile.refresh_from_db()
+        self.assertEqual(user.user_profile.last_activity_date, now)
+
+    def test_last_activity_middleware_not_throttled(self):
+        """
+        Test if the ``LastActivityDateUpdateMiddleware`` middleware update the last activity date at each request when
+        ``LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS`` is zero.
+        """
+        user = get_user_model().objects.create_user(username='johndoe',
+                                                    password='illpassword',
+                                                    email='johndoe@example.com')
+        self.assertIsNotNone(user.user_profile)
+        mw = LastActivityDateUpdateMiddleware()
+        request = MagicMock(user=user)
+
+        with patch('apps.accounts.activity.LAST_ACTIVITY_UPDATE_INTERVAL_SECONDS', 0):
+            mw.process_request(request)
+            with self.assertNumQueries(1):
+                mw.process_request(request)
+
+    def test_last_activity_middleware_buffered(self):
+        """
+        Test if the ``LastActivityDateUpdateMiddleware`` middleware only buffer the last activity date in buffered
+        mode, and if the ``flushlastactivitydates`` command write the buffered dates to the database.
+        """
+        user = get_user_model().objects.create_user(username='johndoe',
+                                                    password='illpassword',
+                                                    email='johndoe@example.com')
+        user2 = get_user_model().objects.create_user(username='janedoe',
+                                                     password='illpassword',
+                                                     email='janedoe@example.com')
+        self.assertIsNotNone(user.user_profile)
+        now = timezone.now()
+        mw = LastActivityDateUpdateMiddleware()
+
+        with patch('apps.accounts.managers.LAST_ACTIVITY_BUFFERED_UPDATES', True):
+            with patch('django.utils.timezone.now') as mock_now:
+                mock_now.return_value = now
+                with self.assertNumQueries(0):
+                    mw.process_request(MagicMock(user=user))
+                    mw.process_request(MagicMock(user=user2))
+
+        user.user_profile.refresh_from_db()
+        self.assertIsNone(user.user_profile.last_activity_date)
+
+        call_command('flushlastactivitydates', verbosity=0)
+        self.assertEqual(UserProfile.objects.get(user=user).last_activity_date, now)
+        self.assertEqual(UserProfile.objects.get(user=user2).last_activity_date, now)
+
+        # Nothing more to flush
+        self.assertEqual(UserProfile.objects.flush_buffered_last_activity_dates(), 0)
+
+    def test_pop_buffered_activity_dates_slot_written_late(self):
+        """
+        Test that a buffer slot taken but not written yet during a flush is read by the next flush.
+        """
+        now = timezone.now()
+        cache = caches[LAST_ACTIVITY_CACHE_ALIAS]
+        buffer_activity_date(1, now)
+
+        # Slot taken by a writer, but not written yet
+        cache.incr(BUFFER_SEQUENCE_KEY)
+        self.assertEqual(pop_buffered_activity_dates(), {1: now})
+        cache.set(_get_buffer_slot_key(2), (2, now))
+        buffer_activity_date(3, now)
+        self.assertEqual(pop_buffered_activity_dates(), {2: now, 3: now})
+
+        # Slots found empty twice are skipped
+        cache.incr(BUFFER_SEQUENCE_KEY)
+        self.assertEqual(pop_buffered_activity_dates(), {})
+        self.assertEqual(pop_buffered_activity_dates(), {})
+        cache.set(_get_buffer_slot_key(4), (4, now))
+        self.assertEqual(pop_buffered_activity_dates(), {})
@@ -14,7 +14,7 @@ from django.utils.translation import ugettext_lazy as _
 from django.template.response import TemplateResponse
 
 from apps.paginator.shortcut import (update_context_for_pagination,
-                                     paginate)
+                                     paginate_by_keyset)
 
 from .models import (UserProfile, set_preferred_language_and_timezone)
 from .settings import NB_ACCOUNTS_PER_PAGE
@@ -36,7 +36,7 @@ def accounts_list(request,
     user_account_list = UserProfile.objects.get_active_users_accounts().select_related('user')
 
     # Accounts list pagination
-    paginator, page = paginate(user_account_list, request, NB_ACCOUNTS_PER_PAGE)
+    paginator, page = paginate_by_keyset(user_account_list, request, NB_ACCOUNTS_PER_PAGE)
 
     # Render the template
     context = {
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0002_auto_20151209_1321'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+    ]
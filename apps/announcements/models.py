@@ -11,8 +11,9 @@ from django.utils.translation import ugettext_lazy as _
 from apps.tools.utils import unique_slug
 from apps.tools.models import ModelDiffMixin
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .managers import (AnnouncementManager,
                        AnnouncementTwitterCrossPublicationManager)
@@ -78,6 +79,15 @@ class Announcement(ModelDiffMixin, models.Model):
 
     content_text = models.TextField(_('Content (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     tags = models.ManyToManyField('AnnouncementTag',
                                   related_name='announcements',
                                   verbose_name=_('Announcement\'s tags'),
@@ -180,49 +190,47 @@ class Announcement(ModelDiffMixin, models.Model):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.content,
-                                                        allow_titles=True,
-                                                        allow_code_blocks=True,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, extra_dict = render_document(self.content,
+                                                                 allow_titles=True,
+                                                                 allow_code_blocks=True,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_todo_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True,
+                                                                 merge_footnotes_html=True,
+                                                                 merge_footnotes_text=True)
         self.content_html = content_html
         self.content_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
-            self.save_no_rendering(update_fields=('content_html', 'content_text'))
+            self.save_no_rendering(update_fields=('content_html', 'content_text',
+                                                  'render_fingerprint', 'render_tags'))
 
 
-def _redo_announcements_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all announcements.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for announcement in Announcement.objects.all():
-        announcement.render_text(save=True)
-
-render_engine_changed.connect(_redo_announcements_text_rendering)
+register_rendered_model(Announcement,
+                        'render_text',
+                        ('content_html', 'content_text'),
+                        date_field='last_modification_date')
 
 
 class AnnouncementTag(models.Model):
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_articletwittercrosspublication'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+        migrations.AddField(
+            model_name='articlecategory',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='articlecategory',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+        migrations.AddField(
+            model_name='articlenote',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='articlenote',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+    ]
@@ -19,8 +19,9 @@ from apps.tools.utils import unique_slug
 from apps.tools.models import ModelDiffMixin
 from apps.tools.fields import AutoResizingImageField
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 from apps.forum.models import (Forum,
                                ForumThread)
 from apps.licenses.models import License
@@ -219,6 +220,15 @@ class Article(ModelDiffMixin, models.Model):
 
     footnotes_html = models.TextField(_('Footnotes (raw HTML)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     last_modification_date = models.DateTimeField(_('Last modification date'),
                                                   auto_now=True)
 
@@ -416,19 +426,19 @@ class Article(ModelDiffMixin, models.Model):
         """
 
         # Render HTML for description
-        description_html, description_text, _ = render_document(self.description,
-                                                                allow_text_formating=True,
-                                                                allow_text_extra=True,
-                                                                allow_text_alignments=True,
-                                                                allow_text_directions=True,
-                                                                allow_text_modifiers=True,
-                                                                allow_text_colors=True,
-                                                                allow_acronyms=True,
-                                                                allow_links=True,
-                                                                allow_cdm_extra=True,
-                                                                force_nofollow=False,
-                                                                render_text_version=True,
-                                                                make_auto_paragraphs=False)
+        description_html, description_text, description_extra_dict = render_document(self.description,
+                                                                                     allow_text_formating=True,
+                                                                                     allow_text_extra=True,
+                                                                                     allow_text_alignments=True,
+                                                                                     allow_text_directions=True,
+                                                                                     allow_text_modifiers=True,
+                                                                                     allow_text_colors=True,
+                                                                                     allow_acronyms=True,
+                                                                                     allow_links=True,
+                                                                                     allow_cdm_extra=True,
+                                                                                     force_nofollow=False,
+                                                                                     render_text_version=True,
+                                                                                     make_auto_paragraphs=False)
         self.description_html = description_html
         self.description_text = description_text
 
@@ -463,24 +473,24 @@ class Article(ModelDiffMixin, models.Model):
         self.summary_html = extra_dict['summary_html']
         self.footnotes_html = extra_dict['footnotes_html']
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(description_extra_dict, extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
             super(Article, self).save(update_fields=('description_html', 'description_text',
                                                      'content_html', 'content_text',
-                                                     'summary_html', 'footnotes_html'))
+                                                     'summary_html', 'footnotes_html',
+                                                     'render_fingerprint', 'render_tags'))
 
 
-def _redo_articles_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all articles.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for article in Article.objects.all():
-        article.render_text(save=True)
-
-render_engine_changed.connect(_redo_articles_text_rendering)
+register_rendered_model(Article,
+                        'render_text',
+                        ('description_html', 'description_text',
+                         'content_html', 'content_text',
+                         'summary_html', 'footnotes_html'),
+                        date_field='last_modification_date')
 
 
 class ArticleRevision(models.Model):
@@ -573,6 +583,15 @@ class ArticleNote(models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     type = models.CharField(_('Note type'),
                             max_length=10,
                             default=NOTE_TYPE_DEFAULT,
@@ -604,47 +623,44 @@ class ArticleNote(models.Model):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_code_blocks=True,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_code_blocks=True,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_todo_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(ArticleNote, self).save(update_fields=('description_html', ))
+            super(ArticleNote, self).save(update_fields=('description_html', 'description_text',
+                                                         'render_fingerprint', 'render_tags'))
 
 
-def _redo_article_notes_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all article's notes.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for note in ArticleNote.objects.all():
-        note.render_description(save=True)
-
-render_engine_changed.connect(_redo_article_notes_text_rendering)
+register_rendered_model(ArticleNote,
+                        'render_description',
+                        ('description_html', 'description_text'))
 
 
 class ArticleTag(models.Model):
@@ -753,6 +769,15 @@ class ArticleCategory(MPTTModel):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     last_modification_date = models.DateTimeField(_('Last modification date'),
                                                   auto_now=True)
 
@@ -827,37 +852,35 @@ class ArticleCategory(MPTTModel):
         """
 
         # Render HTML for description
-        description_html, description_text, _ = render_document(self.description,
-                                                                allow_text_formating=True,
-                                                                allow_text_extra=True,
-                                                                allow_text_alignments=True,
-                                                                allow_text_directions=True,
-                                                                allow_text_modifiers=True,
-                                                                allow_text_colors=True,
-                                                                allow_acronyms=True,
-                                                                allow_links=True,
-                                                                allow_cdm_extra=True,
-                                                                force_nofollow=False,
-                                                                render_text_version=True)
+        description_html, description_text, extra_dict = render_document(self.description,
+                                                                         allow_text_formating=True,
+                                                                         allow_text_extra=True,
+                                                                         allow_text_alignments=True,
+                                                                         allow_text_directions=True,
+                                                                         allow_text_modifiers=True,
+                                                                         allow_text_colors=True,
+                                                                         allow_acronyms=True,
+                                                                         allow_links=True,
+                                                                         allow_cdm_extra=True,
+                                                                         force_nofollow=False,
+                                                                         render_text_version=True)
         self.description_html = description_html
         self.description_text = description_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(ArticleCategory, self).save(update_fields=('description_html', 'description_text'))
-
+            super(ArticleCategory, self).save(update_fields=('description_html', 'description_text',
+                                                             'render_fingerprint', 'render_tags'))
 
-def _redo_article_categories_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all article categories.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for category in ArticleCategory.objects.all():
-        category.render_text(save=True)
 
-render_engine_changed.connect(_redo_article_categories_text_rendering)
+register_rendered_model(ArticleCategory,
+                        'render_text',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
 
 
 def update_child_category_slug_hierarchy_on_parent_save(sender, instance, created, raw, using, update_fields, **kwargs):
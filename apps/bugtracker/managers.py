@@ -4,6 +4,33 @@ Data models managers for the bug tracker app.
 
 from django.db import models
 
+from apps.tools.expressions import related_exists
+
+
+class IssueTicketManager(models.Manager):
+    """
+    Manager class for the ``IssueTicket`` data model.
+    """
+
+    def with_user_flags(self, user, queryset=None):
+        """
+        Annotate the given tickets with the following flags of the given user, computed in the same query:
+        - ``user_has_commented``: True if the user has commented the ticket,
+        - ``user_is_subscribed``: True if the user has subscribed to the ticket.
+        :param user: The target user.
+        :param queryset: The tickets queryset, default to all tickets.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import (IssueComment,
+                             IssueTicketSubscription)
+
+        if queryset is None:
+            queryset = self.all()
+        return queryset.annotate(user_has_commented=related_exists(IssueComment, 'issue', author=user),
+                                 user_is_subscribed=related_exists(IssueTicketSubscription, 'issue',
+                                                                   user=user, active=True))
+
 
 class IssueTicketSubscriptionManager(models.Manager):
     """
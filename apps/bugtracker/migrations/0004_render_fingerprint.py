@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bugtracker', '0003_auto_20151228_1424'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issuecomment',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='issuecomment',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+        migrations.AddField(
+            model_name='issueticket',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='issueticket',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+    ]
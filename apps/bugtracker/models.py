@@ -12,8 +12,9 @@ from django.utils.translation import ugettext_lazy as _
 from apps.tools.models import ModelDiffMixin
 from apps.tools.fields import AutoOneToOneField
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .constants import (STATUS_CODES,
                         STATUS_OPEN,
@@ -21,7 +22,8 @@ from .constants import (STATUS_CODES,
                         PRIORITY_NEED_REVIEW,
                         DIFFICULTY_CODES,
                         DIFFICULTY_NORMAL)
-from .managers import (IssueTicketSubscriptionManager,
+from .managers import (IssueTicketManager,
+                       IssueTicketSubscriptionManager,
                        BugTrackerUserProfileManager)
 from .settings import (NB_ISSUE_COMMENTS_PER_PAGE,
                        NB_SECONDS_BETWEEN_COMMENTS)
@@ -88,6 +90,15 @@ class IssueTicket(ModelDiffMixin, models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     submitter = models.ForeignKey(settings.AUTH_USER_MODEL,
                                   db_index=True,  # Database optimization
                                   verbose_name=_('Submitter'),
@@ -133,6 +144,8 @@ class IssueTicket(ModelDiffMixin, models.Model):
                                                         blank=True,
                                                         null=True)
 
+    objects = IssueTicketManager()
+
     class Meta:
         verbose_name = _('Issue ticket')
         verbose_name_plural = _('Issue tickets')
@@ -282,51 +295,50 @@ class IssueTicket(ModelDiffMixin, models.Model):
         allow_text_colors_in_ticket = self.submitter.has_perm('bugtracker.allow_text_colors_in_ticket')
         allow_cdm_extra_in_ticket = self.submitter.has_perm('bugtracker.allow_cdm_extra_in_ticket')
         force_nofollow_in_ticket = not self.submitter.has_perm('bugtracker.allow_raw_link_in_ticket')
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_titles=allow_titles_in_ticket,
-                                                        allow_code_blocks=True,
-                                                        allow_alerts_box=allow_alerts_box_in_ticket,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=allow_text_colors_in_ticket,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=allow_cdm_extra_in_ticket,
-                                                        force_nofollow=force_nofollow_in_ticket,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_titles=allow_titles_in_ticket,
+                                                                 allow_code_blocks=True,
+                                                                 allow_alerts_box=allow_alerts_box_in_ticket,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=allow_text_colors_in_ticket,
+                                                                 allow_spoilers=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_todo_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=allow_cdm_extra_in_ticket,
+                                                                 force_nofollow=force_nofollow_in_ticket,
+                                                                 render_text_version=True,
+                                                                 merge_footnotes_html=True,
+                                                                 merge_footnotes_text=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(IssueTicket, self).save(update_fields=('description_html', 'description_text'))
-
+            super(IssueTicket, self).save(update_fields=('description_html', 'description_text',
+                                                         'render_fingerprint', 'render_tags'))
 
-def _redo_tickets_description_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all issue tickets.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for ticket in IssueTicket.objects.all():
-        ticket.render_description(save=True)
 
-render_engine_changed.connect(_redo_tickets_description_rendering)
+register_rendered_model(IssueTicket,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        select_related=('submitter',),
+                        date_field='last_modification_date')
 
 
 class IssueComment(models.Model):
@@ -362,6 +374,15 @@ class IssueComment(models.Model):
 
     body_text = models.TextField(_('Comment text (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     author_ip_address = models.GenericIPAddressField(_('Author IP address'),
                                                      default=None,
                                                      blank=True,
@@ -433,51 +454,50 @@ class IssueComment(models.Model):
         allow_text_colors_in_comment = self.author.has_perm('bugtracker.allow_text_colors_in_comment')
         allow_cdm_extra_in_comment = self.author.has_perm('bugtracker.allow_cdm_extra_in_comment')
         force_nofollow_in_comment = not self.author.has_perm('bugtracker.allow_raw_link_in_comment')
-        content_html, content_text, _ = render_document(self.body,
-                                                        allow_titles=allow_titles_in_comment,
-                                                        allow_code_blocks=True,
-                                                        allow_alerts_box=allow_alerts_box_in_comment,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=allow_text_colors_in_comment,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=allow_cdm_extra_in_comment,
-                                                        force_nofollow=force_nofollow_in_comment,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, extra_dict = render_document(self.body,
+                                                                 allow_titles=allow_titles_in_comment,
+                                                                 allow_code_blocks=True,
+                                                                 allow_alerts_box=allow_alerts_box_in_comment,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=allow_text_colors_in_comment,
+                                                                 allow_spoilers=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_todo_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=allow_cdm_extra_in_comment,
+                                                                 force_nofollow=force_nofollow_in_comment,
+                                                                 render_text_version=True,
+                                                                 merge_footnotes_html=True,
+                                                                 merge_footnotes_text=True)
         self.body_html = content_html
         self.body_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(IssueComment, self).save(update_fields=('body_html', 'body_text'))
+            super(IssueComment, self).save(update_fields=('body_html', 'body_text',
+                                                          'render_fingerprint', 'render_tags'))
 
 
-def _redo_ticket_comments_body_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all issue ticket comments.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for comment in IssueComment.objects.all():
-        comment.render_body(save=True)
-
-render_engine_changed.connect(_redo_ticket_comments_body_rendering)
+register_rendered_model(IssueComment,
+                        'render_body',
+                        ('body_html', 'body_text'),
+                        select_related=('author',),
+                        date_field='last_modification_date')
 
 
 class IssueChange(models.Model):
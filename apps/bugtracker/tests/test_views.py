@@ -71,8 +71,8 @@ class BugTrackerViewsTestCase(TestCase):
         self.assertTemplateUsed(response, 'bugtracker/issueticket_list.html')
         self.assertIn('issues', response.context)
         self.assertQuerysetEqual(response.context['issues'], ['<IssueTicket: Test ticket 1>'])
-        self.assertEqual(response.context['issues'][0].user_comments, [self.comment])
-        self.assertEqual(response.context['issues'][0].user_subscriptions, [self.subscription])
+        self.assertTrue(response.context['issues'][0].user_has_commented)
+        self.assertTrue(response.context['issues'][0].user_is_subscribed)
 
     def test_my_tickets_list_view_available(self):
         """
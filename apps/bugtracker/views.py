@@ -2,7 +2,6 @@
 Views for the bug tracker app.
 """
 
-from django.db.models import Prefetch
 from django.core.urlresolvers import reverse
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404, resolve_url
@@ -15,7 +14,8 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
 from apps.paginator.shortcut import (update_context_for_pagination,
-                                     paginate)
+                                     paginate,
+                                     paginate_by_keyset)
 
 from .models import (IssueTicket,
                      IssueComment,
@@ -61,16 +61,10 @@ def tickets_list(request,
     """
     queryset = IssueTicket.objects.all()
 
-    # Prefetch comments and subscribers
+    # Annotate commented and subscribed flags
     current_user = request.user
     if current_user.is_authenticated():
-        prefetch_comments = Prefetch('comments',
-                                     queryset=IssueComment.objects.filter(author=current_user),
-                                     to_attr='user_comments')
-        prefetch_subscriptions = Prefetch('subscribers',
-                                          queryset=IssueTicketSubscription.objects.filter(user=current_user),
-                                          to_attr='user_subscriptions')
-        queryset = queryset.prefetch_related(prefetch_comments, prefetch_subscriptions)
+        queryset = IssueTicket.objects.with_user_flags(current_user, queryset)
 
     context = {
         'title': _('Tickets list'),
@@ -142,7 +136,8 @@ def _generic_tickets_list(queryset, request, template_name, context):
         issues_list = issues_list.filter(status=filter_difficulty)
 
     # Issues list pagination
-    paginator, page = paginate(issues_list.select_related('submitter'), request, NB_ISSUES_PER_PAGE)
+    paginator, page = paginate_by_keyset(issues_list.select_related('submitter'), request, NB_ISSUES_PER_PAGE,
+                                         ordering=(order_by, 'pk'))
 
     # Template rendering
     sort_context = {
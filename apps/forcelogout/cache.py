@@ -0,0 +1,66 @@
+"""
+Versioned cache for the logout orders.
+
+The logout order date of each user (or the absence of logout order) is cached using the key ``(user ID, version)``, so
+the common case (no logout order) cost no database query. The version is bumped each time a logout order is created,
+updated or deleted, so cached entries never need to be deleted explicitly.
+"""
+
+from django.core.cache import caches
+
+from apps.tools.cache import (get_cache_version,
+                              bump_cache_version)
+
+from .settings import (FORCE_LOGOUT_CACHE_ALIAS,
+                       FORCE_LOGOUT_CACHE_TIMEOUT)
+
+
+# Cached value meaning "no logout order for this user"
+NO_LOGOUT_ORDER = 0
+
+# Cache key of the version number of the logout orders
+VERSION_KEY = 'forcelogout:version'
+
+
+def get_logout_orders_cache_version():
+    """
+    Return the current cache version number of the logout orders.
+    """
+    return get_cache_version(FORCE_LOGOUT_CACHE_ALIAS, VERSION_KEY)
+
+
+def invalidate_logout_orders_cache():
+    """
+    Invalidate all cached logout orders by bumping the version number.
+    :return: None
+    """
+    bump_cache_version(FORCE_LOGOUT_CACHE_ALIAS, VERSION_KEY)
+
+
+def get_logout_order_cache_key(user_id):
+    """
+    Return the cache key of the logout order of the given user.
+    :param user_id: The user's ID.
+    """
+    return 'forcelogout:order:%d:%d' % (get_logout_orders_cache_version(), user_id)
+
+
+def get_cached_logout_order_timestamp(cache_key):
+    """
+    Return the cached logout order timestamp of a user.
+    :param cache_key: The cache key, see ``get_logout_order_cache_key()``.
+    :return: The order timestamp, ``NO_LOGOUT_ORDER`` if the user has no logout order, or None if not cached.
+    """
+    return caches[FORCE_LOGOUT_CACHE_ALIAS].get(cache_key)
+
+
+def set_cached_logout_order_timestamp(cache_key, timestamp):
+    """
+    Cache the logout order timestamp of a user.
+    The cache key must be computed before fetching the order, so an order fetched while being modified is cached
+    under the outdated version.
+    :param cache_key: The cache key, see ``get_logout_order_cache_key()``.
+    :param timestamp: The order timestamp, or ``NO_LOGOUT_ORDER`` if the user has no logout order.
+    :return: None
+    """
+    caches[FORCE_LOGOUT_CACHE_ALIAS].set(cache_key, timestamp, FORCE_LOGOUT_CACHE_TIMEOUT)
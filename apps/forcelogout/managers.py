@@ -5,6 +5,11 @@ Objects manager for the force-logout app.
 from django.db.models import Manager
 from django.utils import timezone
 
+from .cache import (NO_LOGOUT_ORDER,
+                    get_logout_order_cache_key,
+                    get_cached_logout_order_timestamp,
+                    set_cached_logout_order_timestamp)
+
 
 class ForceLogoutOrderManager(Manager):
     """
@@ -20,3 +25,17 @@ class ForceLogoutOrderManager(Manager):
         now = timezone.now()
         order, created = self.update_or_create(user=user, defaults={'order_date': now})
         return order
+
+    def get_logout_order_timestamp(self, user):
+        """
+        Return the timestamp of the logout order of the given user, from the cache if available.
+        :param user: The user to get the logout order for.
+        :return: The order timestamp, or None if the user has no logout order.
+        """
+        cache_key = get_logout_order_cache_key(user.pk)
+        timestamp = get_cached_logout_order_timestamp(cache_key)
+        if timestamp is None:
+            order_date = self.filter(user=user).values_list('order_date', flat=True).first()
+            timestamp = order_date.timestamp() if order_date is not None else NO_LOGOUT_ORDER
+            set_cached_logout_order_timestamp(cache_key, timestamp)
+        return timestamp if timestamp != NO_LOGOUT_ORDER else None
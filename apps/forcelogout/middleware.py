@@ -38,12 +38,11 @@ class ForceLogoutMiddleware(object):
             return
 
         # Get the logout order if any
-        try:
-            logout_order = ForceLogoutOrder.objects.get(user=request.user)
-        except ForceLogoutOrder.DoesNotExist:
+        order_timestamp = ForceLogoutOrder.objects.get_logout_order_timestamp(request.user)
+        if order_timestamp is None:
             return
 
         # If the order is valid, BOOM
-        if logout_order.order_date.timestamp() > login_time:
+        if order_timestamp > login_time:
             auth.logout(request)
             messages.add_message(request, messages.INFO, _('Your session has expired.'), extra_tags='session_expired')
@@ -7,8 +7,11 @@ from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import (post_save,
+                                      post_delete)
 
 from .managers import ForceLogoutOrderManager
+from .cache import invalidate_logout_orders_cache
 
 
 FORCE_LOGOUT_SESSION_KEY = 'django_force_logout'
@@ -53,3 +56,15 @@ def store_current_session_login_timestamp(sender, user, request, **kwargs):
     request.session[FORCE_LOGOUT_SESSION_KEY] = timezone.now().timestamp()
 
 user_logged_in.connect(store_current_session_login_timestamp)
+
+
+def invalidate_logout_orders_cache_on_change(sender, **kwargs):
+    """
+    Invalidate the cached logout orders when a logout order is created, updated or deleted.
+    :param sender: Not used.
+    :param kwargs: Not used.
+    """
+    invalidate_logout_orders_cache()
+
+post_save.connect(invalidate_logout_orders_cache_on_change, sender=ForceLogoutOrder)
+post_delete.connect(invalidate_logout_orders_cache_on_change, sender=ForceLogoutOrder)
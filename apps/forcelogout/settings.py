@@ -0,0 +1,13 @@
+"""
+Custom settings for the force-logout app.
+"""
+
+from django.conf import settings
+
+
+# Django cache alias used for caching the logout orders
+FORCE_LOGOUT_CACHE_ALIAS = getattr(settings, 'FORCE_LOGOUT_CACHE_ALIAS', 'default')
+
+# Lifetime of a cached logout order (or absence of logout order) in seconds (default 1 hour).
+# Cached orders are invalidated on change, this delay only bound the memory usage of the cache.
+FORCE_LOGOUT_CACHE_TIMEOUT = getattr(settings, 'FORCE_LOGOUT_CACHE_TIMEOUT', 60 * 60)
@@ -3,10 +3,12 @@ Test suite for the force-logout app.
 """
 
 from django.test import TestCase, Client
+from django.core.cache import caches
 from django.contrib.auth import get_user_model
 
 from ..models import (ForceLogoutOrder,
                       FORCE_LOGOUT_SESSION_KEY)
+from ..settings import FORCE_LOGOUT_CACHE_ALIAS
 
 
 class ForceLogoutMiddlewareTestCase(TestCase):
@@ -14,6 +16,12 @@ class ForceLogoutMiddlewareTestCase(TestCase):
     Test suite for the ``ForceLogoutMiddleware``.
     """
 
+    def setUp(self):
+        """
+        Start each test with a fresh cache.
+        """
+        caches[FORCE_LOGOUT_CACHE_ALIAS].clear()
+
     def test_middleware_installed(self):
         """
         Test if the ``ForceLogoutMiddleware`` is installed.
@@ -7,10 +7,12 @@ from datetime import timedelta
 
 from django.utils import timezone
 from django.test import TestCase, Client
+from django.core.cache import caches
 from django.contrib.auth import get_user_model
 
 from ..models import (ForceLogoutOrder,
                       FORCE_LOGOUT_SESSION_KEY)
+from ..settings import FORCE_LOGOUT_CACHE_ALIAS
 
 
 class ForceLogoutOrderTestCase(TestCase):
@@ -71,6 +73,27 @@ class ForceLogoutOrderTestCase(TestCase):
             self.assertEqual(order.order_date, future_now)
         self.assertEqual(ForceLogoutOrder.objects.count(), 1)
 
+    def test_get_logout_order_timestamp(self):
+        """
+        Test the ``get_logout_order_timestamp`` manager method, and the invalidation of the cached orders.
+        """
+        caches[FORCE_LOGOUT_CACHE_ALIAS].clear()
+        user = get_user_model().objects.create_user(username='johndoe',
+                                                    password='illpassword',
+                                                    email='john.doe@example.com')
+        self.assertIsNone(ForceLogoutOrder.objects.get_logout_order_timestamp(user))
+        with self.assertNumQueries(0):
+            self.assertIsNone(ForceLogoutOrder.objects.get_logout_order_timestamp(user))
+
+        order = ForceLogoutOrder.objects.force_logout(user)
+        self.assertEqual(ForceLogoutOrder.objects.get_logout_order_timestamp(user), order.order_date.timestamp())
+        with self.assertNumQueries(0):
+            self.assertEqual(ForceLogoutOrder.objects.get_logout_order_timestamp(user),
+                             order.order_date.timestamp())
+
+        order.delete()
+        self.assertIsNone(ForceLogoutOrder.objects.get_logout_order_timestamp(user))
+
     def test_store_current_session_login_timestamp(self):
         """
         Test the current session login timestamp persistence.
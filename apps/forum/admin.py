@@ -4,7 +4,10 @@ Admin views for the forum app.
 
 from django import forms
 from django.contrib import admin
+from django.contrib import messages
+from django.contrib.admin import helpers
 from django.core.urlresolvers import reverse
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
 from django.utils.translation import ugettext_lazy as _
 
@@ -105,6 +108,29 @@ class ForumThreadPostAdmin(admin.ModelAdmin):
         }),
     )
 
+    actions = ('soft_delete_posts',
+               'restore_posts')
+
+    def soft_delete_posts(self, request, queryset):
+        """
+        Logically delete the selected posts (first posts of threads excluded).
+        :param request: The current request.
+        :param queryset: The selected posts.
+        """
+        nb_posts = ForumThreadPost.objects.soft_delete_posts(queryset)
+        self.message_user(request, _('%d post(s) deleted.') % nb_posts)
+    soft_delete_posts.short_description = _('Delete selected posts (can be restored)')
+
+    def restore_posts(self, request, queryset):
+        """
+        Restore the selected logically deleted posts.
+        :param request: The current request.
+        :param queryset: The selected posts.
+        """
+        nb_posts = ForumThreadPost.objects.restore_posts(queryset)
+        self.message_user(request, _('%d post(s) restored.') % nb_posts)
+    restore_posts.short_description = _('Restore selected deleted posts')
+
     def post_id(self, obj):
         """
         Return the post ID in #ID format.
@@ -222,6 +248,36 @@ view_on_site_link.short_description = ''
 view_on_site_link.allow_tags = True
 
 
+class ForumThreadMoveForm(forms.Form):
+    """
+    Forum's threads move form, used by the "move threads" admin action.
+    """
+
+    parent_forum = forms.ModelChoiceField(queryset=Forum.objects.all(),
+                                          label=_('New parent forum'))
+
+
+class ForumThreadMergeForm(forms.Form):
+    """
+    Forum's threads merge form, used by the "merge threads" admin action.
+    """
+
+    target_thread = forms.ModelChoiceField(queryset=ForumThread.objects.none(),
+                                           label=_('Target thread'),
+                                           empty_label=None)
+
+    def __init__(self, threads, *args, **kwargs):
+        """
+        Create a new merge form.
+        :param threads: The threads to be merged, the target thread is one of them.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        super(ForumThreadMergeForm, self).__init__(*args, **kwargs)
+        self.fields['target_thread'].queryset = threads
+        self.fields['target_thread'].initial = threads.order_by('pk').first()
+
+
 class ForumThreadAdmin(admin.ModelAdmin):
     """
     ``ForumThread`` admin form.
@@ -353,6 +409,105 @@ class ForumThreadAdmin(admin.ModelAdmin):
 
     inlines = (ForumThreadPostInline, )
 
+    actions = ('close_threads',
+               'open_threads',
+               'move_threads',
+               'merge_threads',
+               'soft_delete_threads',
+               'restore_threads')
+
+    def close_threads(self, request, queryset):
+        """
+        Close the selected threads.
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        nb_threads = ForumThread.objects.set_closed(queryset, True)
+        self.message_user(request, _('%d thread(s) closed.') % nb_threads)
+    close_threads.short_description = _('Close selected threads')
+
+    def open_threads(self, request, queryset):
+        """
+        Re-open the selected threads.
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        nb_threads = ForumThread.objects.set_closed(queryset, False)
+        self.message_user(request, _('%d thread(s) opened.') % nb_threads)
+    open_threads.short_description = _('Open selected threads')
+
+    def move_threads(self, request, queryset):
+        """
+        Move the selected threads to another forum, using an intermediate page to select the new parent forum.
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        if request.POST.get('apply'):
+            form = ForumThreadMoveForm(request.POST)
+            if form.is_valid():
+                nb_threads = ForumThread.objects.move_threads(queryset, form.cleaned_data['parent_forum'])
+                self.message_user(request, _('%d thread(s) moved.') % nb_threads)
+                return None
+        else:
+            form = ForumThreadMoveForm()
+        context = {
+            'title': _('Move threads'),
+            'opts': self.model._meta,
+            'form': form,
+            'threads': queryset.select_related('parent_forum'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/forum/forumthread/move_threads.html', context)
+    move_threads.short_description = _('Move selected threads to another forum')
+
+    def merge_threads(self, request, queryset):
+        """
+        Merge the selected threads into one of them, using an intermediate page to select the target thread and
+        confirm the merge (which cannot be undone).
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        if queryset.count() < 2:
+            self.message_user(request, _('Select at least two threads to merge.'), messages.WARNING)
+            return None
+        if request.POST.get('apply'):
+            form = ForumThreadMergeForm(queryset, request.POST)
+            if form.is_valid():
+                target_thread = ForumThread.objects.merge_threads(queryset, form.cleaned_data['target_thread'])
+                self.message_user(request, _('Threads merged into "%s".') % target_thread.title)
+                return None
+        else:
+            form = ForumThreadMergeForm(queryset)
+        context = {
+            'title': _('Merge threads'),
+            'opts': self.model._meta,
+            'form': form,
+            'threads': queryset.select_related('parent_forum'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/forum/forumthread/merge_threads.html', context)
+    merge_threads.short_description = _('Merge selected threads')
+
+    def soft_delete_threads(self, request, queryset):
+        """
+        Logically delete the selected threads.
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        nb_threads = ForumThread.objects.soft_delete_threads(queryset)
+        self.message_user(request, _('%d thread(s) deleted.') % nb_threads)
+    soft_delete_threads.short_description = _('Delete selected threads (can be restored)')
+
+    def restore_threads(self, request, queryset):
+        """
+        Restore the selected logically deleted threads.
+        :param request: The current request.
+        :param queryset: The selected threads.
+        """
+        nb_threads = ForumThread.objects.restore_threads(queryset)
+        self.message_user(request, _('%d thread(s) restored.') % nb_threads)
+    restore_threads.short_description = _('Restore selected deleted threads')
+
     def thread_id(self, obj):
         """
         Return the thread ID in #ID format.
@@ -541,6 +696,29 @@ class ForumAdmin(admin.ModelAdmin):
 
     inlines = (ChildForumLinkInline, ForumThreadLinkInline)
 
+    actions = ('close_forums',
+               'open_forums')
+
+    def close_forums(self, request, queryset):
+        """
+        Close the selected forums, all their sub-forums and all their threads.
+        :param request: The current request.
+        :param queryset: The selected forums.
+        """
+        nb_forums = Forum.objects.set_closed(queryset, True, close_threads=True, recursive=True)
+        self.message_user(request, _('%d forum(s) closed.') % nb_forums)
+    close_forums.short_description = _('Close selected forums, sub-forums and threads')
+
+    def open_forums(self, request, queryset):
+        """
+        Re-open the selected forums, all their sub-forums and all their threads.
+        :param request: The current request.
+        :param queryset: The selected forums.
+        """
+        nb_forums = Forum.objects.set_closed(queryset, False, close_threads=True, recursive=True)
+        self.message_user(request, _('%d forum(s) opened.') % nb_forums)
+    open_forums.short_description = _('Open selected forums, sub-forums and threads')
+
     def logo_img(self, obj):
         """
         Return the forum's logo image as html ``<img>`` tag for the admin edit view.
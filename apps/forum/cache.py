@@ -0,0 +1,101 @@
+"""
+Versioned fragment cache for the forum's threads pages.
+
+The rendered HTML of each post (author information, content and attachments, without the per-user controls and the
+author online status, which change with activity) is cached by page, using the key ``(thread ID, page number, thread
+version)``. The thread version is bumped each time a post of the thread is created, edited or deleted, and each time
+the profile of one of the authors of the thread is updated, so cached pages never need to be deleted explicitly.
+
+Anonymous users get the cached page without any posts query. Authenticated users get the cached posts with their
+own controls (edit, delete and reply links) layered on top, using a lightweight posts query.
+"""
+
+from django.core.cache import caches
+from django.utils import (timezone,
+                          translation)
+
+from apps.perfstats.collector import record_count
+from apps.tools.cache import (get_cache_version,
+                              bump_cache_version)
+
+from .settings import (FORUM_THREAD_PAGES_CACHE_ALIAS,
+                       FORUM_THREAD_PAGES_CACHE_TIMEOUT)
+
+
+class CachedThreadPost(object):
+    """
+    Stand-in for a ``ForumThreadPost`` instance, holding the cached HTML of the post.
+    Only suitable for anonymous users, which do not see the posts controls.
+    """
+
+    def __init__(self, pk, author_id, cached_html):
+        """
+        Create a new cached post.
+        :param pk: The post's PK.
+        :param author_id: The post's author ID.
+        :param cached_html: The cached HTML of the post.
+        """
+        self.pk = self.id = pk
+        self.author_id = author_id
+        self.cached_html = cached_html
+
+
+def _get_version_key(thread_id):
+    """
+    Return the cache key of the version number of the given thread.
+    :param thread_id: The thread's ID.
+    """
+    return 'forum:thread-version:%d' % thread_id
+
+
+def get_thread_cache_version(thread_id):
+    """
+    Return the current cache version number of the given thread.
+    :param thread_id: The thread's ID.
+    """
+    return get_cache_version(FORUM_THREAD_PAGES_CACHE_ALIAS, _get_version_key(thread_id))
+
+
+def invalidate_thread_cache(*thread_ids):
+    """
+    Invalidate all cached pages of the given threads by bumping their version number.
+    :param thread_ids: The threads' IDs.
+    :return: None
+    """
+    for thread_id in set(thread_ids):
+        if thread_id is not None:
+            bump_cache_version(FORUM_THREAD_PAGES_CACHE_ALIAS, _get_version_key(thread_id))
+
+
+def get_thread_page_cache_key(thread_id, page_number):
+    """
+    Return the cache key of the given page of the given thread.
+    The current language and timezone are part of the key, because posts' dates are localized.
+    :param thread_id: The thread's ID.
+    :param page_number: The page number.
+    """
+    return 'forum:thread-posts:%d:%d:%d:%s:%s' % (thread_id, page_number, get_thread_cache_version(thread_id),
+                                                  translation.get_language(), timezone.get_current_timezone_name())
+
+
+def get_cached_thread_page(cache_key):
+    """
+    Return the cached posts of a thread page.
+    :param cache_key: The cache key of the page, see ``get_thread_page_cache_key()``.
+    :return: A list of ``(post_pk, author_id, cached_html)`` tuples, or None if not cached.
+    """
+    posts = caches[FORUM_THREAD_PAGES_CACHE_ALIAS].get(cache_key)
+    record_count('forum_page_cache_hits' if posts is not None else 'forum_page_cache_misses')
+    return posts
+
+
+def set_cached_thread_page(cache_key, posts):
+    """
+    Cache the given posts of a thread page.
+    The cache key must be computed before fetching the posts, so a page rendered while the thread is being modified
+    is cached under the outdated version.
+    :param cache_key: The cache key of the page, see ``get_thread_page_cache_key()``.
+    :param posts: A list of ``(post_pk, author_id, cached_html)`` tuples.
+    :return: None
+    """
+    caches[FORUM_THREAD_PAGES_CACHE_ALIAS].set(cache_key, posts, FORUM_THREAD_PAGES_CACHE_TIMEOUT)
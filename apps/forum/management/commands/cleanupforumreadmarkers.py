@@ -1,19 +1,18 @@
 """
-Custom ``manage.py`` command to cleanup inactive forum and thread "read" markers.
+Custom ``manage.py`` command to cleanup redundant thread "read" markers.
 """
 
 from django.core.management.base import NoArgsCommand
 
-from ...models import (ReadForumTracker,
-                       ReadForumThreadTracker)
+from ...models import ReadForumThreadTracker
 
 
 class Command(NoArgsCommand):
     """
-    A management command which deletes inactive forum and thread "read" markers from the database.
+    A management command which deletes thread "read" markers covered by the "read" marker of the parent forum.
     """
 
-    help = "Delete inactive forum and thread \"read\" markers from the database."
+    help = "Delete thread \"read\" markers covered by the \"read\" marker of the parent forum from the database."
 
     def handle_noargs(self, **options):
         """
@@ -21,5 +20,4 @@ class Command(NoArgsCommand):
         :param options: Not used.
         :return: None.
         """
-        ReadForumTracker.objects.filter(active=False).delete()
-        ReadForumThreadTracker.objects.filter(active=False).delete()
+        ReadForumThreadTracker.objects.delete_redundant_markers()
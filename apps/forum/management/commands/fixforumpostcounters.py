@@ -0,0 +1,32 @@
+"""
+Custom ``manage.py`` command to fix the posts counters and last posts of forum's threads and the statistics of forums.
+"""
+
+from django.core.management.base import NoArgsCommand
+
+from ...models import (Forum,
+                       ForumThread)
+
+
+class Command(NoArgsCommand):
+    """
+    A management command which recompute the number of posts and the last post of all forum's threads, the position
+    of each post and the statistics (number of threads and posts, last post) of all forums.
+    """
+
+    help = "Recompute the number of posts and the last post of forum threads, the position of each post " \
+           "and the forums statistics."
+
+    def handle_noargs(self, **options):
+        """
+        Command handler.
+        :param options: Not used.
+        :return: None.
+        """
+        nb_fixed_threads = ForumThread.objects.reset_post_counters()
+        nb_fixed_last_posts = ForumThread.objects.reset_last_posts()
+        nb_fixed_forums = Forum.objects.reset_forum_stats()
+        if options.get('verbosity', 1):
+            self.stdout.write('%d thread(s) fixed' % nb_fixed_threads)
+            self.stdout.write('%d thread(s) last post fixed' % nb_fixed_last_posts)
+            self.stdout.write('%d forum(s) fixed' % nb_fixed_forums)
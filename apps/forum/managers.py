@@ -3,14 +3,25 @@ Data models managers for the forum app.
 """
 
 import datetime
+import operator
+from functools import reduce
 
-from django.db import models
-from django.db.models import Q
+from django.db import (models,
+                       transaction,
+                       IntegrityError)
+from django.db.models import Q, F, Count, Sum
 from django.utils import timezone
+from django.core.cache import caches
 from django.core.exceptions import ObjectDoesNotExist
 
+from apps.tools.expressions import (related_exists,
+                                    related_max)
+
+from .cache import invalidate_thread_cache
 from .settings import (DELETED_THREAD_PHYSICAL_DELETION_TIMEOUT_DAYS,
-                       DELETED_THREAD_POST_PHYSICAL_DELETION_TIMEOUT_DAYS)
+                       DELETED_THREAD_POST_PHYSICAL_DELETION_TIMEOUT_DAYS,
+                       FORUM_READ_MARKERS_CACHE_ALIAS,
+                       FORUM_READ_MARKERS_CACHE_TIMEOUT)
 
 
 class ForumManager(models.Manager):
@@ -32,6 +43,175 @@ class ForumManager(models.Manager):
         """
         return self.filter(private=False)
 
+    @staticmethod
+    def _get_stats_filter(forum_lookup, forum_id, tree_id, lft, rght):
+        """
+        Return the filter selecting the threads (or posts) counted in the statistics of the given forum: the threads
+        of the forum itself and of its public descendants. Private child forums are not rolled up into their
+        parents, so the statistics never disclose private threads and posts.
+        :param forum_lookup: The lookup from the filtered model to the parent forum, like "parent_forum".
+        :param forum_id: The forum's ID.
+        :param tree_id: The MPTT tree ID of the forum.
+        :param lft: The MPTT left value of the forum.
+        :param rght: The MPTT right value of the forum.
+        """
+        return Q(**{'%s_id' % forum_lookup: forum_id}) | Q(**{'%s__tree_id' % forum_lookup: tree_id,
+                                                              '%s__lft__gt' % forum_lookup: lft,
+                                                              '%s__rght__lt' % forum_lookup: rght,
+                                                              '%s__private' % forum_lookup: False})
+
+    def _get_last_post_id(self, forum_id, tree_id, lft, rght):
+        """
+        Return the ID of the last published post of all published threads counted in the statistics of the given
+        forum (see ``_get_stats_filter()``).
+        :param forum_id: The forum's ID.
+        :param tree_id: The MPTT tree ID of the forum.
+        :param lft: The MPTT left value of the forum.
+        :param rght: The MPTT right value of the forum.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ForumThreadPost
+
+        stats_filter = self._get_stats_filter('parent_thread__parent_forum', forum_id, tree_id, lft, rght)
+        return ForumThreadPost.objects.published().filter(stats_filter, parent_thread__deleted_at__isnull=True) \
+            .order_by('-id').values_list('id', flat=True).first()
+
+    def update_forum_stats(self, forum_id, nb_threads=0, nb_posts=0, new_post_id=None,
+                           removed_post_id=None, removed_thread_id=None):
+        """
+        Update the statistics of the given forum and of all its ancestors (only the given forum if private, see
+        ``_get_stats_filter()``).
+        :param forum_id: The forum's ID.
+        :param nb_threads: The number of published threads to be added (or removed if negative).
+        :param nb_posts: The number of published posts to be added (or removed if negative).
+        :param new_post_id: The ID of a newly published post, the new last post if more recent.
+        :param removed_post_id: The ID of an unpublished post, the last post is recomputed if it was this one.
+        :param removed_thread_id: The ID of an unpublished thread, the last post is recomputed if it was in this thread.
+        :return: None
+        """
+        forum = self.filter(pk=forum_id).values_list('tree_id', 'lft', 'rght', 'private').first()
+        if forum is None:
+            return
+        tree_id, lft, rght, private = forum
+        if private:
+            ancestors = self.filter(pk=forum_id)
+        else:
+            ancestors = self.filter(tree_id=tree_id, lft__lte=lft, rght__gte=rght)
+
+        # Update the counters (skip counters which would become negative, see ``reset_forum_stats()``)
+        if nb_threads:
+            ancestors.filter(nb_threads__gte=-nb_threads).update(nb_threads=F('nb_threads') + nb_threads)
+        if nb_posts:
+            ancestors.filter(nb_posts__gte=-nb_posts).update(nb_posts=F('nb_posts') + nb_posts)
+
+        # Update the last post
+        if new_post_id is not None:
+            ancestors.filter(Q(last_post__isnull=True) | Q(last_post_id__lt=new_post_id)).update(last_post=new_post_id)
+        stale_last_post = Q(last_post__isnull=True)
+        if removed_post_id is not None:
+            stale_last_post |= Q(last_post=removed_post_id)
+        if removed_thread_id is not None:
+            stale_last_post |= Q(last_post__parent_thread=removed_thread_id)
+        if removed_post_id is not None or removed_thread_id is not None:
+            for ancestor in ancestors.filter(stale_last_post).values_list('pk', 'tree_id', 'lft', 'rght'):
+                self.filter(pk=ancestor[0]).update(last_post=self._get_last_post_id(*ancestor))
+
+    def reset_forum_stats(self, queryset=None):
+        """
+        Recompute the statistics of the given forums. Only out-of-date values are written to the database.
+        :param queryset: The forums to be fixed, default to all forums.
+        :return: The number of fixed forums.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ForumThread
+
+        if queryset is None:
+            queryset = self.all()
+        nb_fixed_forums = 0
+        for forum_pk, tree_id, lft, rght, nb_threads, nb_posts, last_post_id in queryset \
+                .values_list('pk', 'tree_id', 'lft', 'rght', 'nb_threads', 'nb_posts', 'last_post'):
+            stats_filter = self._get_stats_filter('parent_forum', forum_pk, tree_id, lft, rght)
+            stats = ForumThread.objects.published().filter(stats_filter) \
+                .aggregate(nb_threads=Count('id'), nb_posts=Sum('nb_posts'))
+            stats['nb_posts'] = stats['nb_posts'] or 0
+            stats['last_post'] = self._get_last_post_id(forum_pk, tree_id, lft, rght)
+            if (nb_threads, nb_posts, last_post_id) != (stats['nb_threads'], stats['nb_posts'], stats['last_post']):
+                self.filter(pk=forum_pk).update(**stats)
+                nb_fixed_forums += 1
+        return nb_fixed_forums
+
+    def _get_trees_filter(self, forum_ids, ancestors):
+        """
+        Return a filter selecting the given forums and all their ancestors (or descendants), or None if no forum.
+        :param forum_ids: The forums' IDs.
+        :param ancestors: True to select the ancestors, False to select the descendants.
+        """
+        trees = []
+        for tree_id, lft, rght in self.filter(pk__in=forum_ids).values_list('tree_id', 'lft', 'rght'):
+            if ancestors:
+                trees.append(Q(tree_id=tree_id, lft__lte=lft, rght__gte=rght))
+            else:
+                trees.append(Q(tree_id=tree_id, lft__gte=lft, rght__lte=rght))
+        return reduce(operator.or_, trees) if trees else None
+
+    def with_descendants(self, forum_ids):
+        """
+        Return a queryset of the given forums and all their descendants, using a single query over the MPTT trees.
+        :param forum_ids: The forums' IDs.
+        """
+        trees_filter = self._get_trees_filter(forum_ids, ancestors=False)
+        return self.filter(trees_filter) if trees_filter is not None else self.none()
+
+    def reset_forum_stats_with_ancestors(self, forum_ids):
+        """
+        Recompute the statistics of the given forums and of all their ancestors.
+        :param forum_ids: The forums' IDs.
+        :return: The number of fixed forums.
+        """
+        forum_ids = set(forum_id for forum_id in forum_ids if forum_id is not None)
+        trees_filter = self._get_trees_filter(forum_ids, ancestors=True)
+        return self.reset_forum_stats(self.filter(trees_filter)) if trees_filter is not None else 0
+
+    def set_closed(self, queryset, closed, close_threads=False, recursive=False):
+        """
+        Set the "closed" flag of the given forums, using set-based updates.
+        :param queryset: The forums to be closed (or opened).
+        :param closed: "closed" flag state (bool).
+        :param close_threads: Set to ``True`` to also close all threads in these forums.
+        :param recursive: Set to ``True`` to also close all descendants of these forums.
+        :return: The number of updated forums.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ForumThread
+
+        with transaction.atomic():
+            forum_ids = list(queryset.values_list('pk', flat=True))
+            if recursive:
+                forum_ids = list(self.with_descendants(forum_ids).values_list('pk', flat=True))
+            if close_threads:
+                ForumThread.objects.filter(parent_forum__in=forum_ids).update(closed=closed)
+            return self.filter(pk__in=forum_ids).update(closed=closed)
+
+    def set_private(self, queryset, private, recursive=False):
+        """
+        Set the "private" flag of the given forums, using set-based updates.
+        The statistics of the ancestors of these forums are recomputed, see ``_get_stats_filter()``.
+        :param queryset: The forums to be updated.
+        :param private: "private" flag state (bool).
+        :param recursive: Set to ``True`` to also update all descendants of these forums.
+        :return: The number of updated forums.
+        """
+        with transaction.atomic():
+            forum_ids = list(queryset.values_list('pk', flat=True))
+            if recursive:
+                forum_ids = list(self.with_descendants(forum_ids).values_list('pk', flat=True))
+            nb_updated_forums = self.filter(pk__in=forum_ids).update(private=private)
+            self.reset_forum_stats_with_ancestors(forum_ids)
+            return nb_updated_forums
+
 
 class ForumThreadManager(models.Manager):
     """
@@ -59,6 +239,203 @@ class ForumThreadManager(models.Manager):
         return self.published().filter(Q(global_sticky=True) | Q(parent_forum=forum)) \
             .order_by('-sticky', '-last_post__last_modification_date')
 
+    def with_user_flags(self, user, queryset=None):
+        """
+        Annotate the given threads with the following flags of the given user, computed in the same query:
+        - ``user_has_posted``: True if the user has posted in the thread,
+        - ``user_is_subscribed``: True if the user has subscribed to the thread,
+        - ``user_last_read_date``: the date of the "read" marker of the thread, None if no marker exist.
+        :param user: The target user.
+        :param queryset: The threads queryset, default to all threads.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import (ForumThreadPost,
+                             ForumThreadSubscription,
+                             ReadForumThreadTracker)
+
+        if queryset is None:
+            queryset = self.all()
+        return queryset.annotate(user_has_posted=related_exists(ForumThreadPost, 'parent_thread', author=user),
+                                 user_is_subscribed=related_exists(ForumThreadSubscription, 'thread',
+                                                                   user=user, active=True),
+                                 user_last_read_date=related_max(ReadForumThreadTracker, 'thread', 'last_read_date',
+                                                                 user=user))
+
+    def reset_post_counters(self, queryset=None):
+        """
+        Recompute the number of published posts of each thread and the position of each post in its thread.
+        Only out-of-date values are written to the database.
+        :param queryset: The threads to be fixed, default to all threads.
+        :return: The number of fixed threads.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ForumThreadPost
+
+        if queryset is None:
+            queryset = self.all()
+        nb_fixed_threads = 0
+        for thread_pk, nb_posts in queryset.order_by().values_list('pk', 'nb_posts').iterator():
+            fixed = False
+            posts = ForumThreadPost.objects.filter(parent_thread_id=thread_pk)
+
+            # Deleted posts have no position
+            if posts.filter(deleted_at__isnull=False).exclude(ordinal=0).update(ordinal=0):
+                fixed = True
+
+            # Published posts are numbered by ID, from 1
+            published_posts = posts.filter(deleted_at__isnull=True).order_by('id').values_list('id', 'ordinal')
+            ordinal = 0
+            for ordinal, (post_pk, post_ordinal) in enumerate(published_posts, start=1):
+                if post_ordinal != ordinal:
+                    ForumThreadPost.objects.filter(pk=post_pk).update(ordinal=ordinal)
+                    fixed = True
+            if nb_posts != ordinal:
+                self.filter(pk=thread_pk).update(nb_posts=ordinal)
+                fixed = True
+
+            if fixed:
+                nb_fixed_threads += 1
+        return nb_fixed_threads
+
+    @staticmethod
+    def get_last_post_id(thread_id, excluded_post_id=None):
+        """
+        Return the ID of the last (most recently published) published post of the given thread.
+        :param thread_id: The thread's ID.
+        :param excluded_post_id: The ID of a post to be ignored (like a post being deleted).
+        :return: The post's ID, or None if the thread has no published post.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ForumThreadPost
+
+        posts = ForumThreadPost.objects.published().filter(parent_thread_id=thread_id)
+        if excluded_post_id is not None:
+            posts = posts.exclude(pk=excluded_post_id)
+        return posts.order_by('-pub_date', '-id').values_list('id', flat=True).first()
+
+    def reset_last_posts(self, queryset=None):
+        """
+        Recompute the last post of each thread. Only out-of-date values are written to the database.
+        Threads without any published post keep their last post.
+        :param queryset: The threads to be fixed, default to all threads.
+        :return: The number of fixed threads.
+        """
+        if queryset is None:
+            queryset = self.all()
+        nb_fixed_threads = 0
+        for thread_pk, last_post_id in queryset.order_by().values_list('pk', 'last_post').iterator():
+            new_last_post_id = self.get_last_post_id(thread_pk)
+            if new_last_post_id is not None and new_last_post_id != last_post_id:
+                self.filter(pk=thread_pk).update(last_post=new_last_post_id)
+                nb_fixed_threads += 1
+        return nb_fixed_threads
+
+    def set_closed(self, queryset, closed):
+        """
+        Set the "closed" flag of the given threads, using a single update.
+        :param queryset: The threads to be closed (or opened).
+        :param closed: "closed" flag state (bool).
+        :return: The number of updated threads.
+        """
+        return queryset.update(closed=closed)
+
+    def move_threads(self, queryset, forum):
+        """
+        Move the given threads to the given forum. The statistics of the old and new parent forums (and ancestors) are
+        recomputed once, after the move.
+        :param queryset: The threads to be moved.
+        :param forum: The new parent forum.
+        :return: The number of moved threads.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import Forum
+
+        with transaction.atomic():
+            threads = self.filter(pk__in=list(queryset.exclude(parent_forum=forum).values_list('pk', flat=True)))
+            forum_ids = set(threads.values_list('parent_forum_id', flat=True))
+            forum_ids.add(forum.pk)
+            nb_moved_threads = threads.update(parent_forum=forum)
+            Forum.objects.reset_forum_stats_with_ancestors(forum_ids)
+        return nb_moved_threads
+
+    def _set_deleted_at(self, queryset, deleted_at):
+        """
+        Set the deletion date of the given threads, and recompute the statistics of their parent forums once.
+        :param queryset: The threads to be updated.
+        :param deleted_at: The deletion date, None for restoring.
+        :return: The number of updated threads.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import Forum
+
+        with transaction.atomic():
+            threads = self.filter(pk__in=list(queryset.filter(deleted_at__isnull=deleted_at is not None)
+                                              .values_list('pk', flat=True)))
+            forum_ids = set(threads.values_list('parent_forum_id', flat=True))
+            nb_updated_threads = threads.update(deleted_at=deleted_at)
+            Forum.objects.reset_forum_stats_with_ancestors(forum_ids)
+        return nb_updated_threads
+
+    def soft_delete_threads(self, queryset):
+        """
+        Logically delete the given threads (published threads only).
+        :param queryset: The threads to be deleted.
+        :return: The number of deleted threads.
+        """
+        return self._set_deleted_at(queryset, timezone.now())
+
+    def restore_threads(self, queryset):
+        """
+        Restore the given logically deleted threads. Threads without their first post (merged into another thread
+        when merged threads were only logically deleted) are not restored.
+        :param queryset: The threads to be restored.
+        :return: The number of restored threads.
+        """
+        return self._set_deleted_at(queryset.filter(first_post__parent_thread=F('pk')), None)
+
+    def merge_threads(self, queryset, target_thread=None):
+        """
+        Merge the given threads into the target thread: all posts are moved to the target thread (ordered by
+        creation) and the other threads are physically deleted, so they cannot be restored without their posts.
+        Subscriptions and "read" markers of the merged threads are deleted with them.
+        :param queryset: The threads to be merged.
+        :param target_thread: The target thread, default to the oldest thread of the given threads.
+        :return: The target thread, or None if nothing to merge.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import (Forum,
+                             ForumThreadPost)
+
+        with transaction.atomic():
+            thread_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+            if target_thread is None:
+                if not thread_ids:
+                    return None
+                target_thread = self.get(pk=thread_ids[0])
+            source_ids = [thread_id for thread_id in thread_ids if thread_id != target_thread.pk]
+            if not source_ids:
+                return target_thread
+
+            # Move the posts and delete the merged threads (now without any post)
+            forum_ids = set(self.filter(pk__in=source_ids + [target_thread.pk])
+                            .values_list('parent_forum_id', flat=True))
+            ForumThreadPost.objects.filter(parent_thread__in=source_ids).update(parent_thread=target_thread)
+            self.filter(pk__in=source_ids).delete()
+
+            # Update the denormalized counters once
+            threads = self.filter(pk=target_thread.pk)
+            self.reset_post_counters(threads)
+            self.reset_last_posts(threads)
+            Forum.objects.reset_forum_stats_with_ancestors(forum_ids)
+        invalidate_thread_cache(target_thread.pk, *source_ids)
+        return target_thread
+
     @staticmethod
     def create_thread(parent_forum, title, author, pub_date, content, author_ip_address,
                       sticky=False, closed=False, resolved=False, locked=False):
@@ -143,6 +520,48 @@ class ForumThreadPostManager(models.Manager):
         """
         return self.published().filter(parent_thread__parent_forum__private=False)
 
+    def _set_deleted_at(self, queryset, deleted_at):
+        """
+        Set the deletion date of the given posts (first posts of threads excluded), and recompute the counters of
+        their parent threads and forums once.
+        :param queryset: The posts to be updated.
+        :param deleted_at: The deletion date, None for restoring.
+        :return: The number of updated posts.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import (Forum,
+                             ForumThread)
+
+        with transaction.atomic():
+            posts = queryset.filter(deleted_at__isnull=deleted_at is not None) \
+                .exclude(pk__in=ForumThread.objects.values('first_post'))
+            post_ids = list(posts.values_list('pk', flat=True))
+            thread_ids = set(self.filter(pk__in=post_ids).values_list('parent_thread_id', flat=True))
+            nb_updated_posts = self.filter(pk__in=post_ids).update(deleted_at=deleted_at)
+            threads = ForumThread.objects.filter(pk__in=thread_ids)
+            ForumThread.objects.reset_post_counters(threads)
+            ForumThread.objects.reset_last_posts(threads)
+            Forum.objects.reset_forum_stats_with_ancestors(threads.values_list('parent_forum_id', flat=True))
+        invalidate_thread_cache(*thread_ids)
+        return nb_updated_posts
+
+    def soft_delete_posts(self, queryset):
+        """
+        Logically delete the given posts (published posts only, first posts of threads excluded).
+        :param queryset: The posts to be deleted.
+        :return: The number of deleted posts.
+        """
+        return self._set_deleted_at(queryset, timezone.now())
+
+    def restore_posts(self, queryset):
+        """
+        Restore the given logically deleted posts.
+        :param queryset: The posts to be restored.
+        :return: The number of restored posts.
+        """
+        return self._set_deleted_at(queryset, None)
+
     def delete_deleted_posts(self, queryset=None):
         """
         Delete all deleted thread posts.
@@ -260,25 +679,37 @@ class ReadForumTrackerManager(models.Manager):
 
     def mark_forum_as_read(self, user, forum):
         """
-        Mark the given forum as read for the specified user.
+        Mark the given forum as read for the specified user. All thread "read" markers of the forum are deleted,
+        because they are covered by the new forum "read" marker.
         :param user: The target user.
         :param forum: The forum to be marked as read.
         :return: None
         """
-        marker, created = self.get_or_create(user=user, forum=forum)
-        if not created:
-            marker.active = True
-            marker.last_read_date = timezone.now()
-            marker.save()
+
+        # Import here to avoid circular dependency
+        from .models import ReadForumThreadTracker
+
+        now = timezone.now()
+        with transaction.atomic():
+            if not self.filter(user=user, forum=forum).update(last_read_date=now):
+                try:
+                    with transaction.atomic():
+                        self.create(user=user, forum=forum, last_read_date=now)
+                except IntegrityError:
+                    # Concurrent creation
+                    self.filter(user=user, forum=forum).update(last_read_date=now)
+            ReadForumThreadTracker.objects.delete_markers(ReadForumThreadTracker.objects
+                                                          .filter(user=user, thread__parent_forum=forum,
+                                                                  last_read_date__lte=now))
 
     def mark_forum_as_unread(self, user, forum):
         """
-        Mark the given thread as unread for the given user.
+        Mark the given forum as unread for the given user.
         :param user: The target user.
         :param forum: The forum to be marked as unread.
         :return: None
         """
-        self.filter(user=user, thread=forum).update(active=False)
+        self.filter(user=user, forum=forum).delete()
 
     def get_marker_for_forum(self, user, forum_id):
         """
@@ -288,7 +719,7 @@ class ReadForumTrackerManager(models.Manager):
         :return: The last read date or None.
         """
         try:
-            return self.get(user=user, active=True, forum=forum_id).last_read_date
+            return self.get(user=user, forum=forum_id).last_read_date
         except ObjectDoesNotExist:
             return None
 
@@ -301,8 +732,38 @@ class ReadForumTrackerManager(models.Manager):
         """
         if not forum_ids:
             return {}
-        return dict(self.filter(user=user, active=True, forum__in=forum_ids).values_list('forum__id',
-                                                                                         'last_read_date'))
+        return dict(self.filter(user=user, forum__in=forum_ids).values_list('forum__id', 'last_read_date'))
+
+    def get_unread_forums(self, user, forums):
+        """
+        Return the IDs of all unread forums in the given list, using two queries.
+        A forum is unread if the last post of the forum (see ``Forum.last_post``) has not been read by the given user,
+        either by the "read" marker of the forum, the "read" marker of the parent forum of the thread, or the "read"
+        marker of the thread itself.
+        :param user: The target user.
+        :param forums: A list of forums, with the last post and its parent thread pre-fetched.
+        :return: A set of forum IDs.
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ReadForumThreadTracker
+
+        forums = [forum for forum in forums if forum.last_post_id is not None]
+        if not forums:
+            return set()
+        forum_markers = dict(self.filter(user=user).values_list('forum_id', 'last_read_date'))
+        thread_markers = ReadForumThreadTracker.objects.get_marker_for_threads(user, [forum.last_post.parent_thread_id
+                                                                                      for forum in forums])
+        unread_forum_ids = set()
+        for forum in forums:
+            last_post = forum.last_post
+            last_modification_date = last_post.last_content_modification_date
+            read_dates = (forum_markers.get(forum.id),
+                          forum_markers.get(last_post.parent_thread.parent_forum_id),
+                          thread_markers.get(last_post.parent_thread_id))
+            if not any(read_date is not None and read_date >= last_modification_date for read_date in read_dates):
+                unread_forum_ids.add(forum.id)
+        return unread_forum_ids
 
 
 class ReadForumThreadTrackerManager(models.Manager):
@@ -310,18 +771,55 @@ class ReadForumThreadTrackerManager(models.Manager):
     Manager class for the ``ReadForumThreadTracker`` data model.
     """
 
+    @staticmethod
+    def _get_read_cache_key(user_id, thread_id):
+        """
+        Return the cache key of the last read date of the given thread for the given user.
+        :param user_id: The target user's ID.
+        :param thread_id: The target thread's ID.
+        """
+        return 'forum:thread-read:%d:%d' % (user_id, thread_id)
+
     def mark_thread_as_read(self, user, thread):
         """
         Mark the given thread as read for the specified user.
+        The last read date is cached once the thread marker exists, so nothing is done (no query at all) if the user
+        already read the thread since the last post modification. Otherwise, the marker is only written if out-of-date
+        or missing, and if the thread is not already covered by the "read" marker of the parent forum.
         :param user: The target user.
         :param thread: The thread to be marked as read.
         :return: None
         """
-        marker, created = self.get_or_create(user=user, thread=thread)
-        if not created:
-            marker.active = True
-            marker.last_read_date = timezone.now()
-            marker.save()
+
+        # Import here to avoid circular dependency
+        from .models import ReadForumTracker
+
+        last_modification_date = thread.last_post.last_content_modification_date
+        cache = caches[FORUM_READ_MARKERS_CACHE_ALIAS]
+        cache_key = self._get_read_cache_key(user.pk, thread.pk)
+        last_read_date = cache.get(cache_key)
+        if last_read_date is not None and last_read_date >= last_modification_date:
+            return
+
+        # Update the marker if out-of-date, create it if missing and not covered by the parent forum marker
+        # The marker is written right away, not buffered like the users last activity dates: the unread flags of the
+        # threads lists are computed from the markers table (see ``ForumThreadManager.with_user_flags()``)
+        now = timezone.now()
+        if not self.filter(user=user, thread=thread, last_read_date__lt=last_modification_date) \
+                .update(last_read_date=now):
+            forum_last_read_date = ReadForumTracker.objects.get_marker_for_forum(user, thread.parent_forum_id)
+            if forum_last_read_date is not None and forum_last_read_date >= last_modification_date:
+                # Covered by the parent forum marker, which may go away (thread moved, forum marked as unread), so
+                # the read date is only cached once a thread marker exists
+                return
+            if not self.filter(user=user, thread=thread).exists():
+                try:
+                    with transaction.atomic():
+                        self.create(user=user, thread=thread, last_read_date=now)
+                except IntegrityError:
+                    # Concurrent creation, the marker is fresh anyway
+                    pass
+        cache.set(cache_key, now, FORUM_READ_MARKERS_CACHE_TIMEOUT)
 
     def mark_thread_as_unread(self, user, thread):
         """
@@ -330,7 +828,22 @@ class ReadForumThreadTrackerManager(models.Manager):
         :param thread: The thread to be marked as unread.
         :return: None
         """
-        self.filter(user=user, thread=thread).update(active=False)
+        self.filter(user=user, thread=thread).delete()
+        caches[FORUM_READ_MARKERS_CACHE_ALIAS].delete(self._get_read_cache_key(user.pk, thread.pk))
+
+    def delete_markers(self, queryset):
+        """
+        Delete the given thread "read" markers, and their cached last read dates (only valid while the markers exist,
+        see ``mark_thread_as_read()``).
+        :param queryset: The markers to be deleted.
+        :return: None
+        """
+        markers = list(queryset.values_list('pk', 'user_id', 'thread_id'))
+        if not markers:
+            return
+        self.filter(pk__in=[marker[0] for marker in markers]).delete()
+        caches[FORUM_READ_MARKERS_CACHE_ALIAS].delete_many([self._get_read_cache_key(user_id, thread_id)
+                                                            for _, user_id, thread_id in markers])
 
     def get_marker_for_thread(self, user, thread_id):
         """
@@ -340,7 +853,7 @@ class ReadForumThreadTrackerManager(models.Manager):
         :return: The last read date or None.
         """
         try:
-            return self.get(user=user, active=True, thread=thread_id).last_read_date
+            return self.get(user=user, thread=thread_id).last_read_date
         except ObjectDoesNotExist:
             return None
 
@@ -353,5 +866,21 @@ class ReadForumThreadTrackerManager(models.Manager):
         """
         if not thread_ids:
             return {}
-        return dict(self.filter(user=user, active=True, thread__in=thread_ids).values_list('thread__id',
-                                                                                           'last_read_date'))
+        return dict(self.filter(user=user, thread__in=thread_ids).values_list('thread__id', 'last_read_date'))
+
+    def delete_redundant_markers(self):
+        """
+        Delete all thread "read" markers covered by the "read" marker of the parent forum (thread read before the
+        forum was marked as read, or thread not modified since the forum was marked as read).
+        :return: None
+        """
+
+        # Import here to avoid circular dependency
+        from .models import ReadForumTracker
+
+        for user_id, forum_id, forum_last_read_date in ReadForumTracker.objects \
+                .values_list('user_id', 'forum_id', 'last_read_date').iterator():
+            self.delete_markers(self.filter(Q(last_read_date__lte=forum_last_read_date) |
+                                            Q(thread__last_post__last_content_modification_date__lte=
+                                              forum_last_read_date),
+                                            user_id=user_id, thread__parent_forum_id=forum_id))
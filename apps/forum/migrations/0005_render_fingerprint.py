@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0004_auto_20160126_1514'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forum',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='forum',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+        migrations.AddField(
+            model_name='forumthreadpost',
+            name='render_fingerprint',
+            field=models.CharField(default='', editable=False, max_length=40, verbose_name='Rendering engine fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='forumthreadpost',
+            name='render_tags',
+            field=models.TextField(default='', editable=False, verbose_name='Rendering used tags'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def init_post_counters(apps, schema_editor):
+    """
+    Compute the number of published posts of all threads and the position of all published posts.
+    """
+    ForumThread = apps.get_model('forum', 'ForumThread')
+    ForumThreadPost = apps.get_model('forum', 'ForumThreadPost')
+    for thread_pk in ForumThread.objects.values_list('pk', flat=True).iterator():
+        published_posts = ForumThreadPost.objects.filter(parent_thread_id=thread_pk, deleted_at__isnull=True)
+        ordinal = 0
+        for ordinal, post_pk in enumerate(published_posts.order_by('id').values_list('id', flat=True), start=1):
+            ForumThreadPost.objects.filter(pk=post_pk).update(ordinal=ordinal)
+        ForumThread.objects.filter(pk=thread_pk).update(nb_posts=ordinal)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0005_render_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumthread',
+            name='nb_posts',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of posts'),
+        ),
+        migrations.AddField(
+            model_name='forumthreadpost',
+            name='ordinal',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Position in thread'),
+        ),
+        migrations.RunPython(init_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0006_post_counters'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='forumthreadpost',
+            index_together=set([('parent_thread', 'ordinal')]),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import Q
+
+
+def compact_read_markers(apps, schema_editor):
+    """
+    Delete inactive "read" markers and thread "read" markers covered by the "read" marker of the parent forum.
+    """
+    ReadForumTracker = apps.get_model('forum', 'ReadForumTracker')
+    ReadForumThreadTracker = apps.get_model('forum', 'ReadForumThreadTracker')
+    ReadForumTracker.objects.filter(active=False).delete()
+    ReadForumThreadTracker.objects.filter(active=False).delete()
+    for user_id, forum_id, forum_last_read_date in ReadForumTracker.objects \
+            .values_list('user_id', 'forum_id', 'last_read_date').iterator():
+        ReadForumThreadTracker.objects.filter(Q(last_read_date__lte=forum_last_read_date) |
+                                              Q(thread__last_post__last_content_modification_date__lte=
+                                                forum_last_read_date),
+                                              user_id=user_id, thread__parent_forum_id=forum_id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0007_forumthreadpost_ordinal_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(compact_read_markers, migrations.RunPython.noop),
+    ]
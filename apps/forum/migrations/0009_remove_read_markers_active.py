@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0008_compact_read_markers'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='readforumthreadtracker',
+            name='active',
+        ),
+        migrations.RemoveField(
+            model_name='readforumtracker',
+            name='active',
+        ),
+    ]
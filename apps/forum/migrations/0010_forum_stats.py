@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def init_forum_stats(apps, schema_editor):
+    """
+    Compute the statistics of all forums, including the threads and posts of child forums.
+    """
+    Forum = apps.get_model('forum', 'Forum')
+    ForumThread = apps.get_model('forum', 'ForumThread')
+    ForumThreadPost = apps.get_model('forum', 'ForumThreadPost')
+    for forum_pk, tree_id, lft, rght in Forum.objects.values_list('pk', 'tree_id', 'lft', 'rght').iterator():
+        subtree_filter = {
+            'parent_forum__tree_id': tree_id,
+            'parent_forum__lft__gte': lft,
+            'parent_forum__rght__lte': rght,
+        }
+        stats = ForumThread.objects.filter(deleted_at__isnull=True, **subtree_filter) \
+            .aggregate(nb_threads=models.Count('id'), nb_posts=models.Sum('nb_posts'))
+        stats['nb_posts'] = stats['nb_posts'] or 0
+        stats['last_post'] = ForumThreadPost.objects.filter(deleted_at__isnull=True,
+                                                            parent_thread__deleted_at__isnull=True,
+                                                            parent_thread__parent_forum__tree_id=tree_id,
+                                                            parent_thread__parent_forum__lft__gte=lft,
+                                                            parent_thread__parent_forum__rght__lte=rght) \
+            .order_by('-id').values_list('id', flat=True).first()
+        Forum.objects.filter(pk=forum_pk).update(**stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0009_remove_read_markers_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forum',
+            name='nb_threads',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of threads'),
+        ),
+        migrations.AddField(
+            model_name='forum',
+            name='nb_posts',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of posts'),
+        ),
+        migrations.AddField(
+            model_name='forum',
+            name='last_post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.SET_NULL, related_name='last_post_of_forum+', default=None, editable=False, to='forum.ForumThreadPost', blank=True, null=True, verbose_name='Last post'),
+        ),
+        migrations.RunPython(init_forum_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def reset_forum_stats(apps, schema_editor):
+    """
+    Recompute the statistics of all forums, without the threads and posts of private child forums.
+    """
+    Forum = apps.get_model('forum', 'Forum')
+    ForumThread = apps.get_model('forum', 'ForumThread')
+    ForumThreadPost = apps.get_model('forum', 'ForumThreadPost')
+    for forum_pk, tree_id, lft, rght in Forum.objects.values_list('pk', 'tree_id', 'lft', 'rght').iterator():
+        stats_filter = models.Q(parent_forum_id=forum_pk) | models.Q(parent_forum__tree_id=tree_id,
+                                                                     parent_forum__lft__gt=lft,
+                                                                     parent_forum__rght__lt=rght,
+                                                                     parent_forum__private=False)
+        stats = ForumThread.objects.filter(stats_filter, deleted_at__isnull=True) \
+            .aggregate(nb_threads=models.Count('id'), nb_posts=models.Sum('nb_posts'))
+        stats['nb_posts'] = stats['nb_posts'] or 0
+        stats['last_post'] = ForumThreadPost.objects.filter(deleted_at__isnull=True,
+                                                            parent_thread__deleted_at__isnull=True,
+                                                            parent_thread__in=ForumThread.objects.filter(stats_filter)) \
+            .order_by('-id').values_list('id', flat=True).first()
+        Forum.objects.filter(pk=forum_pk).update(**stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0010_forum_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_forum_stats, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,10 @@ Data models for the forum app.
 
 from datetime import timedelta
 
-from django.db import models
-from django.db.models.signals import post_save, pre_delete
+from django.db import (models,
+                       transaction)
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.fields import GenericRelation
@@ -15,15 +17,18 @@ from django.utils.translation import ugettext_lazy as _
 
 from mptt.models import MPTTModel
 
+from apps.accounts.signals import user_profile_updated
 from apps.fileattachments.models import FileAttachment
 from apps.tools.fields import (AutoOneToOneField,
                                AutoResizingImageField)
 from apps.tools.utils import unique_slug
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 
+from .cache import invalidate_thread_cache
 from .settings import (NB_FORUM_POST_PER_PAGE,
                        NB_SECONDS_BETWEEN_POSTS,
                        FORUM_LOGO_HEIGHT_SIZE_PX,
@@ -63,6 +68,10 @@ class ForumCategory(models.Model):
         return self.title
 
 
+# Names of the forum statistics fields
+FORUM_STATS_FIELDS = ('nb_threads', 'nb_posts', 'last_post')
+
+
 class Forum(MPTTModel):
     """
     Forum main data model.
@@ -72,7 +81,8 @@ class Forum(MPTTModel):
     - a description (can be blank),
     - a "private" flag, if set the forum is only visible by staff.
     - a "closed" flag, for read-only forum,
-    - a parent forum, or null if root forum.
+    - a parent forum, or null if root forum,
+    - some statistics (number of threads and posts, last post), including all public child forums.
     """
 
     title = models.CharField(_('Title'),
@@ -108,6 +118,15 @@ class Forum(MPTTModel):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     private = models.BooleanField(_('Private'),
                                   default=False)
 
@@ -129,6 +148,23 @@ class Forum(MPTTModel):
     last_modification_date = models.DateTimeField(_('Last modification date'),
                                                   auto_now=True)
 
+    nb_threads = models.PositiveIntegerField(_('Number of threads'),
+                                             default=0,
+                                             editable=False)
+
+    nb_posts = models.PositiveIntegerField(_('Number of posts'),
+                                           default=0,
+                                           editable=False)
+
+    last_post = models.ForeignKey('ForumThreadPost',
+                                  related_name='last_post_of_forum+',
+                                  verbose_name=_('Last post'),
+                                  on_delete=models.SET_NULL,
+                                  default=None,
+                                  blank=True,
+                                  null=True,
+                                  editable=False)
+
     objects = ForumManager()
 
     class MPTTMeta:
@@ -141,6 +177,17 @@ class Forum(MPTTModel):
         ordering = ('ordering', 'title')
         permissions = (('can_see_private_forum', 'Can see private forum'), )
 
+    def __init__(self, *args, **kwargs):
+        """
+        Backup the parent forum and the "private" flag for updating the statistics when the forum is moved or when
+        the "private" flag is changed.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        super(Forum, self).__init__(*args, **kwargs)
+        self._old_parent_id = self.parent_id
+        self._old_private = self.private
+
     def save(self, *args, **kwargs):
         """
         Save the model
@@ -158,9 +205,30 @@ class Forum(MPTTModel):
         # Build complete slug hierarchy
         self.build_slug_hierarchy()
 
+        # The statistics are only updated using atomic queries, never overwrite them with (maybe stale) values
+        # MPTT fields are excluded too, to avoid messing up the tree
+        adding = self._state.adding
+        if not adding and not args and 'update_fields' not in kwargs:
+            excluded_fields = FORUM_STATS_FIELDS + (self._mptt_meta.left_attr,
+                                                    self._mptt_meta.right_attr,
+                                                    self._mptt_meta.tree_id_attr,
+                                                    self._mptt_meta.level_attr)
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in excluded_fields]
+
         # Save the forum
         super(Forum, self).save(*args, **kwargs)
 
+        # Recompute the statistics of the old and new parent forums when the forum is moved
+        if not adding and self.parent_id != self._old_parent_id:
+            Forum.objects.reset_forum_stats_with_ancestors({self._old_parent_id, self.parent_id, self.pk})
+
+        # Private forums are not counted in the statistics of their parent forums
+        elif not adding and self.private != self._old_private:
+            Forum.objects.reset_forum_stats(self.get_ancestors())
+        self._old_parent_id = self.parent_id
+        self._old_private = self.private
+
     def __str__(self):
         return self.slug_hierarchy
 
@@ -247,11 +315,11 @@ class Forum(MPTTModel):
         :param save: Set to True to save the model instance after setting up the closed flag.
         """
         self.closed = closed
-        if close_threads:
-            self.threads.all().update(closed=closed)
-        if recursive:
-            for forum in self.children.all():
-                forum.set_closed(closed, close_threads, recursive, save=True)
+        if self.pk is not None:
+            if close_threads:
+                self.threads.all().update(closed=closed)
+            if recursive:
+                Forum.objects.set_closed(self.get_descendants(), closed, close_threads)
         if save:
             self.save(update_fields=('closed', ))
 
@@ -263,9 +331,8 @@ class Forum(MPTTModel):
         :param save: Set to True to save the model instance after setting up the private flag.
         """
         self.private = private
-        if recursive:
-            for forum in self.children.all():
-                forum.set_private(private, recursive, save=True)
+        if recursive and self.pk is not None:
+            Forum.objects.set_private(self.get_descendants(), private)
         if save:
             self.save(update_fields=('private', ))
 
@@ -281,40 +348,38 @@ class Forum(MPTTModel):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(Forum, self).save(update_fields=('description_html', 'description_text'))
-
+            super(Forum, self).save(update_fields=('description_html', 'description_text',
+                                                   'render_fingerprint', 'render_tags'))
 
-def _redo_forum_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all forums.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for forum in Forum.objects.all():
-        forum.render_description(save=True)
 
-render_engine_changed.connect(_redo_forum_text_rendering)
+register_rendered_model(Forum,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
 
 
 def update_child_forum_slug_hierarchy_on_parent_save(sender, instance, created, raw, using, update_fields, **kwargs):
@@ -390,6 +455,10 @@ class ForumThread(models.Model):
                                   related_name='last_post_of+',
                                   verbose_name=_('Last post'))
 
+    nb_posts = models.PositiveIntegerField(_('Number of posts'),
+                                           default=0,
+                                           editable=False)
+
     deleted_at = models.DateTimeField(_('Deletion date'),
                                       db_index=True,  # Database optimization
                                       default=None,
@@ -407,6 +476,16 @@ class ForumThread(models.Model):
         get_latest_by = 'last_post__last_modification_date'
         ordering = ('-last_post__last_modification_date', 'title')
 
+    def __init__(self, *args, **kwargs):
+        """
+        Backup the parent forum and the published state for updating the forum statistics.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        super(ForumThread, self).__init__(*args, **kwargs)
+        self._old_parent_forum_id = self.parent_forum_id
+        self._old_counted = self.is_counted()
+
     def save(self, *args, **kwargs):
         """
         Save the model.
@@ -422,8 +501,47 @@ class ForumThread(models.Model):
         if self.global_sticky:
             self.sticky = True
 
+        # The posts counter and last post are only updated using atomic queries (see ``ForumThreadPost``),
+        # never overwrite them with (maybe stale) values
+        adding = self._state.adding
+        if not adding and not args and 'update_fields' not in kwargs:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in ('nb_posts', 'last_post')]
+
         # Save the model
-        super(ForumThread, self).save(*args, **kwargs)
+        with transaction.atomic():
+            super(ForumThread, self).save(*args, **kwargs)
+
+            # Update the forum statistics
+            if adding:
+                self._old_counted = False
+            self.update_forum_stats()
+
+    def is_counted(self):
+        """
+        Return True if the thread is counted in the statistics of its parent forum (attached to a forum and published).
+        """
+        return self.parent_forum_id is not None and self.deleted_at is None
+
+    def update_forum_stats(self):
+        """
+        Update the statistics of the parent forum (and ancestors) if the thread has been created, deleted, un-deleted
+        or moved since the last call.
+        """
+        counted = self.is_counted()
+        if self.parent_forum_id == self._old_parent_forum_id and counted == self._old_counted:
+            return
+
+        # Use the current number of posts, not the (maybe stale) in-memory one
+        nb_posts = ForumThread.objects.filter(pk=self.pk).values_list('nb_posts', flat=True).first() or 0
+        if self._old_counted:
+            Forum.objects.update_forum_stats(self._old_parent_forum_id, nb_threads=-1, nb_posts=-nb_posts,
+                                             removed_thread_id=self.pk)
+        if counted:
+            Forum.objects.update_forum_stats(self.parent_forum_id, nb_threads=1, nb_posts=nb_posts,
+                                             new_post_id=self.last_post_id)
+        self._old_parent_forum_id = self.parent_forum_id
+        self._old_counted = counted
 
     def __str__(self):
         return self.title
@@ -494,10 +612,17 @@ class ForumThread(models.Model):
         """
         Return True if the given user can delete this thread.
         """
-        reply_count = self.posts.published().count()
         is_author = user == self.first_post.author
         has_del_perm = user.has_perm('forum.delete_forumthreadpost')
-        return (is_author and reply_count <= 1) or has_del_perm
+        return (is_author and self.nb_posts <= 1) or has_del_perm
+
+    def get_nb_replies(self):
+        """
+        Return the number of replies (published posts, first post excluded) of this thread.
+        """
+        return max(self.nb_posts - 1, 0)
+    get_nb_replies.short_description = _('Replies')
+    get_nb_replies.admin_order_field = 'nb_posts'
 
     def is_deleted(self):
         """
@@ -528,7 +653,8 @@ class ForumThreadPost(models.Model):
     - a published date,
     - a last modification date,
     - some text (source and HTML version),
-    - the author's IP address (for legal purpose).
+    - the author's IP address (for legal purpose),
+    - the position of the post in the parent thread (published posts only, 0 for deleted posts).
     """
 
     parent_thread = models.ForeignKey(ForumThread,
@@ -571,6 +697,15 @@ class ForumThreadPost(models.Model):
 
     footnotes_html = models.TextField(_('Content footnotes (raw HTML)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     author_ip_address = models.GenericIPAddressField(_('Author IP address'),
                                                      default=None,
                                                      blank=True,
@@ -582,6 +717,10 @@ class ForumThreadPost(models.Model):
                                       blank=True,
                                       null=True)
 
+    ordinal = models.PositiveIntegerField(_('Position in thread'),
+                                          default=0,
+                                          editable=False)
+
     attachments = GenericRelation(FileAttachment,
                                   related_query_name='forum_posts')
 
@@ -604,10 +743,23 @@ class ForumThreadPost(models.Model):
             ('allow_raw_link_in_post', 'Allow raw link (without forcing nofollow) in forum post'),
         )
         ordering = ('-pub_date', )
+        index_together = (
+            ('parent_thread', 'ordinal'),  # Database optimization for the thread's posts pagination
+        )
 
     def __str__(self):
         return "Post from %s" % self.author.username
 
+    def __init__(self, *args, **kwargs):
+        """
+        Backup the parent thread and the published state for updating the post counters.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        super(ForumThreadPost, self).__init__(*args, **kwargs)
+        self._old_parent_thread_id = self.parent_thread_id
+        self._old_counted = self.is_counted()
+
     def save(self, *args, **kwargs):
         """
         Save the model.
@@ -634,21 +786,115 @@ class ForumThreadPost(models.Model):
         # Render the HTML version
         self.render_text()
 
+        # The position is only updated using atomic queries, never overwrite it with a (maybe stale) value
+        adding = self._state.adding
+        if not adding and not args and 'update_fields' not in kwargs:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name != 'ordinal']
+
         # Save the model
-        super(ForumThreadPost, self).save(*args, **kwargs)
+        old_parent_thread_id = self._old_parent_thread_id
+        with transaction.atomic():
+            super(ForumThreadPost, self).save(*args, **kwargs)
+
+            # Update the post counters and the last post of the parent thread(s)
+            if adding:
+                self._old_counted = False
+            self.update_post_counters()
+
+        # Invalidate the cached pages of the parent thread(s)
+        invalidate_thread_cache(old_parent_thread_id, self.parent_thread_id)
+
+    def is_counted(self):
+        """
+        Return True if the post is counted in the posts of its parent thread (attached to a thread and published).
+        """
+        return self.parent_thread_id is not None and self.deleted_at is None
+
+    def update_post_counters(self):
+        """
+        Update the number of posts of the parent thread and the position of this post and of the following posts
+        of the parent thread if the post has been created, deleted, un-deleted or moved since the last call.
+        The last post of the parent thread is also updated, only if this post is or become the last post. Use
+        ``ForumThread.objects.reset_last_posts()`` after changing the publication date of an existing post.
+        """
+        counted = self.is_counted()
+        if self.parent_thread_id == self._old_parent_thread_id and counted == self._old_counted:
+            return
+
+        # Leave the old thread (and the statistics of the parent forum if the thread is published)
+        if self._old_counted:
+            ForumThread.objects.filter(pk=self._old_parent_thread_id, nb_posts__gt=0) \
+                .update(nb_posts=F('nb_posts') - 1)
+            ForumThreadPost.objects.published() \
+                .filter(parent_thread_id=self._old_parent_thread_id, id__gt=self.id, ordinal__gt=0) \
+                .update(ordinal=F('ordinal') - 1)
+            self.ordinal = 0
+            old_thread = ForumThread.objects.filter(pk=self._old_parent_thread_id) \
+                .values_list('parent_forum_id', 'deleted_at', 'last_post_id').first()
+            if old_thread is not None and old_thread[0] is not None and old_thread[1] is None:
+                Forum.objects.update_forum_stats(old_thread[0], nb_posts=-1, removed_post_id=self.pk)
+            if old_thread is not None and old_thread[2] == self.pk:
+                last_post_id = ForumThread.objects.get_last_post_id(self._old_parent_thread_id)
+                if last_post_id is not None:
+                    ForumThread.objects.filter(pk=self._old_parent_thread_id).update(last_post=last_post_id)
+
+        # Join the new thread (lock the thread row to serialize concurrent replies)
+        if counted:
+            nb_posts, parent_forum_id, thread_deleted_at, last_post_id = ForumThread.objects.select_for_update() \
+                .filter(pk=self.parent_thread_id) \
+                .values_list('nb_posts', 'parent_forum_id', 'deleted_at', 'last_post_id').get()
+            nb_posts += 1
+            thread_updates = {'nb_posts': nb_posts}
+            if last_post_id != self.pk:
+                last_post_pub_date = ForumThreadPost.objects.filter(pk=last_post_id, deleted_at__isnull=True) \
+                    .values_list('pub_date', flat=True).first()
+                if last_post_pub_date is None or (last_post_pub_date, last_post_id) < (self.pub_date, self.pk):
+                    thread_updates['last_post'] = self.pk
+            ForumThread.objects.filter(pk=self.parent_thread_id).update(**thread_updates)
+            nb_posts_after = ForumThreadPost.objects.published() \
+                .filter(parent_thread_id=self.parent_thread_id, id__gt=self.id) \
+                .update(ordinal=F('ordinal') + 1)
+            self.ordinal = nb_posts - nb_posts_after
+            if parent_forum_id is not None and thread_deleted_at is None:
+                Forum.objects.update_forum_stats(parent_forum_id, nb_posts=1, new_post_id=self.pk)
+
+        # Save the new position and keep the cached parent thread instance (if any) up-to-date
+        ForumThreadPost.objects.filter(pk=self.pk).update(ordinal=self.ordinal)
+        parent_thread = getattr(self, '_parent_thread_cache', None)
+        if counted and parent_thread is not None:
+            parent_thread.nb_posts = nb_posts
+            if 'last_post' in thread_updates:
+                parent_thread.last_post = self
+        self._old_parent_thread_id = self.parent_thread_id
+        self._old_counted = counted
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the model. If this post is the last post of the parent thread (and not the first post), the last post
+        of the parent thread is updated first, otherwise the parent thread would be deleted in cascade.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        first_post_id = ForumThread.objects.filter(pk=self.parent_thread_id, last_post=self.pk) \
+            .exclude(first_post=self.pk).values_list('first_post_id', flat=True).first()
+        if first_post_id is not None:
+            last_post_id = ForumThread.objects.get_last_post_id(self.parent_thread_id, excluded_post_id=self.pk)
+            ForumThread.objects.filter(pk=self.parent_thread_id).update(last_post=last_post_id or first_post_id)
+        return super(ForumThreadPost, self).delete(*args, **kwargs)
 
-        # Reset parent last post
-        self.reset_parent_last_post()
+    def get_page_number(self):
+        """
+        Return the number of the thread page where this post is displayed, without any query.
+        """
+        return max(self.ordinal - 1, 0) // NB_FORUM_POST_PER_PAGE + 1
 
     def get_absolute_url(self):
         """
         Return the permalink to this post.
         """
-        nb_posts_before_this_post = ForumThreadPost.objects.published() \
-            .filter(parent_thread=self.parent_thread, id__lt=self.id) \
-            .count()
-        page_nb_for_this_post = (nb_posts_before_this_post + 1) // NB_FORUM_POST_PER_PAGE
-        page_str = '?page=%d' % page_nb_for_this_post if page_nb_for_this_post > 0 else ''
+        page_nb_for_this_post = self.get_page_number()
+        page_str = '?page=%d' % page_nb_for_this_post if page_nb_for_this_post > 1 else ''
         return '%s%s#post-%d' % (reverse('forum:thread_detail', kwargs={'pk': self.parent_thread.pk,
                                                                         'slug': self.parent_thread.slug}),
                                  page_str, self.id)
@@ -729,17 +975,6 @@ class ForumThreadPost(models.Model):
         return self.last_content_modification_date is not None and \
                self.last_content_modification_date != self.pub_date
 
-    def reset_parent_last_post(self):
-        """
-        Reset the parent thread last post instance.
-        """
-        parent_thread = self.parent_thread
-        if parent_thread is not None:
-            parent_thread.last_post = parent_thread.posts.published().order_by('pub_date').last()
-            print(parent_thread)
-            print(parent_thread.last_post)
-            parent_thread.save(update_fields=('last_post',))
-
     def render_text(self, save=False):
         """
         Render the content. Save the model only if ``save`` is True.
@@ -782,41 +1017,88 @@ class ForumThreadPost(models.Model):
         self.summary_html = extra_dict['summary_html'] if allow_titles_in_post else ''
         self.footnotes_html = extra_dict['footnotes_html']
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
             super(ForumThreadPost, self).save(update_fields=('content_html', 'content_text',
-                                                             'summary_html', 'footnotes_html'))
+                                                             'summary_html', 'footnotes_html',
+                                                             'render_fingerprint', 'render_tags'))
+
 
+register_rendered_model(ForumThreadPost,
+                        'render_text',
+                        ('content_html', 'content_text', 'summary_html', 'footnotes_html'),
+                        select_related=('author',),
+                        date_field='last_modification_date')
 
-def _redo_forum_thread_posts_text_rendering(sender, **kwargs):
+
+def update_post_counters_after_deleting_post(sender, instance, using, **kwargs):
     """
-    Redo text rendering of all forum posts.
-    :param sender: Not used.
+    Update the number of posts of the parent thread and the position of the following posts on post delete.
+    :param sender: The ForumThreadPost class.
+    :param instance: The deleted post instance.
+    :param using: The database used.
+    :return: None
+    """
+    invalidate_thread_cache(instance.parent_thread_id)
+    instance.parent_thread_id = None
+    instance.update_post_counters()
+
+
+post_delete.connect(update_post_counters_after_deleting_post, sender=ForumThreadPost)
+
+
+def invalidate_thread_cache_on_attachment_change(sender, instance, **kwargs):
+    """
+    Invalidate the cached pages of the parent thread on post's attachment save and delete.
+    :param sender: The FileAttachment class.
+    :param instance: The attachment instance.
     :param kwargs: Not used.
+    :return: None
     """
-    for post in ForumThreadPost.objects.all():
-        post.render_text(save=True)
+    if instance.content_type.model_class() is ForumThreadPost:
+        invalidate_thread_cache(ForumThreadPost.objects.filter(pk=instance.object_id)
+                                .values_list('parent_thread_id', flat=True).first())
+
 
-render_engine_changed.connect(_redo_forum_thread_posts_text_rendering)
+post_save.connect(invalidate_thread_cache_on_attachment_change, sender=FileAttachment)
+post_delete.connect(invalidate_thread_cache_on_attachment_change, sender=FileAttachment)
 
 
-def update_last_post_of_parent_thread_before_deleting_post(sender, instance, using, **kwargs):
+def invalidate_thread_cache_on_profile_update(sender, user_profile, **kwargs):
     """
-    Update the ``last_post`` instance of the parent thread on post delete if the given post instance is the last post
-    of the parent thread (and not the first post).
-    :param sender: The ForumThreadPost class.
-    :param instance: The post instance to be deleted.
+    Invalidate the cached pages of all threads where the user has posted on user's profile update.
+    :param sender: The UserProfile class.
+    :param user_profile: The updated user's profile.
+    :param kwargs: Not used.
+    :return: None
+    """
+    invalidate_thread_cache(*ForumThreadPost.objects.filter(author_id=user_profile.user_id)
+                            .order_by().values_list('parent_thread_id', flat=True).distinct())
+
+
+user_profile_updated.connect(invalidate_thread_cache_on_profile_update)
+
+
+def reset_forum_stats_after_deleting_thread(sender, instance, using, **kwargs):
+    """
+    Recompute the statistics of the parent forum (and ancestors) on thread delete. Posts of the thread may have been
+    deleted before or after the thread itself, so the statistics are recomputed instead of being updated.
+    :param sender: The ForumThread class.
+    :param instance: The deleted thread instance.
     :param using: The database used.
     :return: None
     """
-    parent_thread = instance.parent_thread
-    if instance.is_last_post() and not instance.is_first_post():
-        parent_thread.last_post = parent_thread.posts.exclude(pk=instance.pk).last()
-        parent_thread.save()
+    if instance.is_counted():
+        forum = Forum.objects.filter(pk=instance.parent_forum_id).first()
+        if forum is not None:
+            Forum.objects.reset_forum_stats(forum.get_ancestors(include_self=True))
 
 
-pre_delete.connect(update_last_post_of_parent_thread_before_deleting_post, sender=ForumThreadPost)
+post_delete.connect(reset_forum_stats_after_deleting_thread, sender=ForumThread)
 
 
 class ForumSubscription(models.Model):
@@ -892,6 +1174,8 @@ class ForumThreadSubscription(models.Model):
 class ReadForumTracker(models.Model):
     """
     Model for tracking read/unread forum.
+    This is the "read" high-water mark of a forum for a user: all threads of the forum modified before the last read
+    date are read. Threads read after this date are tracked using ``ReadForumThreadTracker``.
     """
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
@@ -908,9 +1192,6 @@ class ReadForumTracker(models.Model):
 
     last_read_date = models.DateTimeField(_('Last read date'))
 
-    active = models.BooleanField(_('Active'),
-                                 default=True)
-
     objects = ReadForumTrackerManager()
 
     class Meta:
@@ -934,6 +1215,8 @@ class ReadForumTracker(models.Model):
 class ReadForumThreadTracker(models.Model):
     """
     Model for tracking read/unread forum's thread.
+    Only threads read after the "read" high-water mark of the parent forum (see ``ReadForumTracker``) are tracked,
+    markers covered by the high-water mark are deleted when the forum is marked as read.
     """
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
@@ -950,9 +1233,6 @@ class ReadForumThreadTracker(models.Model):
 
     last_read_date = models.DateTimeField(_('Last read date'))
 
-    active = models.BooleanField(_('Active'),
-                                 default=True)
-
     objects = ReadForumThreadTrackerManager()
 
     class Meta:
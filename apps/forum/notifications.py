@@ -2,21 +2,54 @@
 Utility class for notifications of the forum app.
 """
 
-from apps.notifications.models import Notification
+from django.contrib.auth import get_user_model
+
+from apps.notifications.models import (Notification,
+                                       NotificationEvent)
+from apps.notifications.events import register_event_handler
 
 from .models import (ForumSubscription,
                      ForumThreadSubscription)
 
 
-def notify_of_new_forum_thread(forum_thread, request, excluded_user,
-                               title_template_name="forum/notif_new_thread_title.txt",
-                               message_template_name="forum/notif_new_thread_msg.txt",
-                               message_template_name_html="forum/notif_new_thread_msg.html",
-                               extra_context=None,
-                               kwargs_send_mail=None):
+# Notification event types
+NEW_FORUM_THREAD_EVENT = 'forum.new_thread'
+NEW_THREAD_POST_EVENT = 'forum.new_post'
+
+
+def notify_of_new_forum_thread(forum_thread, request, excluded_user):
     """
-    Notify subscribers of a new forum's thread.
+    Record a notification event for a new forum's thread, see ``send_new_forum_thread_notifications()``.
+    :param forum_thread: The new thread.
     :param request: The current request.
+    :param excluded_user: The user to be excluded from the notification list (the thread's author).
+    :return: None
+    """
+    NotificationEvent.objects.record_event(NEW_FORUM_THREAD_EVENT, forum_thread, request, excluded_user)
+
+
+def notify_of_new_thread_post(new_post, request, excluded_user):
+    """
+    Record a notification event for a new forum thread's post, see ``send_new_thread_post_notifications()``.
+    :param new_post: The new post.
+    :param request: The current request.
+    :param excluded_user: The user to be excluded from the notification list (the post's author).
+    :return: None
+    """
+    NotificationEvent.objects.record_event(NEW_THREAD_POST_EVENT, new_post, request, excluded_user)
+
+
+def send_new_forum_thread_notifications(forum_thread, request, excluded_user,
+                                        title_template_name="forum/notif_new_thread_title.txt",
+                                        message_template_name="forum/notif_new_thread_msg.txt",
+                                        message_template_name_html="forum/notif_new_thread_msg.html",
+                                        extra_context=None,
+                                        kwargs_send_mail=None):
+    """
+    Notify subscribers of a new forum's thread.
+    :param forum_thread: The new thread.
+    :param request: The current request (None when called by the ``processnotificationevents`` command).
+    :param excluded_user: The user to be excluded from the notification list (the thread's author).
     :param title_template_name: The template name to be used for the notification's title.
     :param message_template_name: The template name to be used for the notification's message.
     :param message_template_name_html: The template name to be used for the notification's message in HTML format.
@@ -25,33 +58,34 @@ def notify_of_new_forum_thread(forum_thread, request, excluded_user,
     :return: None
     """
 
-    # Notify all subscribers of a new issue
-    for subscriber in ForumSubscription.objects.get_subscribers_for_forum(forum_thread.parent_forum) \
-            .exclude(user=excluded_user).select_related('user'):
-        user = subscriber.user
-        context = {
-            'forum': forum_thread.parent_forum,
-            'thread': forum_thread,
-            'user': user
-        }
-        if extra_context is not None:
-            context.update(extra_context)
-        Notification.objects.send_notification_to_user(request=request, user=user,
-                                                       title_template_name=title_template_name,
-                                                       message_template_name=message_template_name,
-                                                       message_template_name_html=message_template_name_html,
-                                                       extra_context=context, kwargs_send_mail=kwargs_send_mail)
-
-
-def notify_of_new_thread_post(new_post, request, excluded_user,
-                              title_template_name="forum/notif_new_post_title.txt",
-                              message_template_name="forum/notif_new_post_msg.txt",
-                              message_template_name_html="forum/notif_new_post_msg.html",
-                              extra_context=None,
-                              kwargs_send_mail=None):
+    # Notify all subscribers of a new thread
+    subscribers = get_user_model().objects.filter(
+        pk__in=ForumSubscription.objects.get_subscribers_for_forum(forum_thread.parent_forum)
+            .exclude(user=excluded_user).values('user_id'))
+    context = {
+        'forum': forum_thread.parent_forum,
+        'thread': forum_thread,
+    }
+    if extra_context is not None:
+        context.update(extra_context)
+    Notification.objects.send_notification_to_users(request=request, users=subscribers,
+                                                    title_template_name=title_template_name,
+                                                    message_template_name=message_template_name,
+                                                    message_template_name_html=message_template_name_html,
+                                                    extra_context=context, kwargs_send_mail=kwargs_send_mail)
+
+
+def send_new_thread_post_notifications(new_post, request, excluded_user,
+                                       title_template_name="forum/notif_new_post_title.txt",
+                                       message_template_name="forum/notif_new_post_msg.txt",
+                                       message_template_name_html="forum/notif_new_post_msg.html",
+                                       extra_context=None,
+                                       kwargs_send_mail=None):
     """
     Notify subscribers of a new forum thread's post.
-    :param request: The current request.
+    :param new_post: The new post.
+    :param request: The current request (None when called by the ``processnotificationevents`` command).
+    :param excluded_user: The user to be excluded from the notification list (the post's author).
     :param title_template_name: The template name to be used for the notification's title.
     :param message_template_name: The template name to be used for the notification's message.
     :param message_template_name_html: The template name to be used for the notification's message in HTML format.
@@ -60,19 +94,22 @@ def notify_of_new_thread_post(new_post, request, excluded_user,
     :return: None
     """
 
-    # Notify all subscribers of a new issue
-    for subscriber in ForumThreadSubscription.objects.get_subscribers_for_thread(new_post.parent_thread) \
-            .exclude(user=excluded_user).select_related('user'):
-        user = subscriber.user
-        context = {
-            'thread': new_post.parent_thread,
-            'post': new_post,
-            'user': user
-        }
-        if extra_context is not None:
-            context.update(extra_context)
-        Notification.objects.send_notification_to_user(request=request, user=user,
-                                                       title_template_name=title_template_name,
-                                                       message_template_name=message_template_name,
-                                                       message_template_name_html=message_template_name_html,
-                                                       extra_context=context, kwargs_send_mail=kwargs_send_mail)
+    # Notify all subscribers of a new post
+    subscribers = get_user_model().objects.filter(
+        pk__in=ForumThreadSubscription.objects.get_subscribers_for_thread(new_post.parent_thread)
+            .exclude(user=excluded_user).values('user_id'))
+    context = {
+        'thread': new_post.parent_thread,
+        'post': new_post,
+    }
+    if extra_context is not None:
+        context.update(extra_context)
+    Notification.objects.send_notification_to_users(request=request, users=subscribers,
+                                                    title_template_name=title_template_name,
+                                                    message_template_name=message_template_name,
+                                                    message_template_name_html=message_template_name_html,
+                                                    extra_context=context, kwargs_send_mail=kwargs_send_mail)
+
+
+register_event_handler(NEW_FORUM_THREAD_EVENT, send_new_forum_thread_notifications)
+register_event_handler(NEW_THREAD_POST_EVENT, send_new_thread_post_notifications)
@@ -47,3 +47,16 @@ DELETED_THREAD_POST_PHYSICAL_DELETION_TIMEOUT_DAYS = getattr(settings,
 
 # Number of days before a post become "old"
 NB_DAYS_BEFORE_FORUM_POST_GET_OLD = getattr(settings, 'NB_DAYS_BEFORE_FORUM_POST_GET_OLD', 31 * 6)
+
+# Django cache alias used for caching the last read date of forum's threads
+FORUM_READ_MARKERS_CACHE_ALIAS = getattr(settings, 'FORUM_READ_MARKERS_CACHE_ALIAS', 'default')
+
+# Lifetime of a cached last read date of a forum's thread in seconds (default 1 day)
+FORUM_READ_MARKERS_CACHE_TIMEOUT = getattr(settings, 'FORUM_READ_MARKERS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+# Django cache alias used for caching the rendered posts of forum's threads pages
+FORUM_THREAD_PAGES_CACHE_ALIAS = getattr(settings, 'FORUM_THREAD_PAGES_CACHE_ALIAS', 'default')
+
+# Lifetime of a cached forum's thread page in seconds (default 5 minutes).
+# Cached pages are invalidated on change, this delay only bound the memory used by the outdated versions.
+FORUM_THREAD_PAGES_CACHE_TIMEOUT = getattr(settings, 'FORUM_THREAD_PAGES_CACHE_TIMEOUT', 60 * 5)
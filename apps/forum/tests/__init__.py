@@ -0,0 +1,3 @@
+"""
+Tests suites for the forum app.
+"""
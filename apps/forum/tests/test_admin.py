@@ -0,0 +1,182 @@
+"""
+Tests suite for the admin views of the forum app.
+"""
+
+from django.test import TestCase, Client
+from django.core.urlresolvers import reverse
+from django.utils import timezone
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+
+from ..models import (Forum,
+                      ForumThread,
+                      ForumThreadPost)
+
+
+class ForumThreadAdminTestCase(TestCase):
+    """
+    Tests suite for the ``ForumThread`` admin views and actions.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.user = get_user_model().objects.create_superuser(username='johndoe',
+                                                              password='illpassword',
+                                                              email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.other_forum = Forum.objects.create(title='Other forum', slug='other-forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.user, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.other_thread = ForumThread.objects.create_thread(self.forum, 'Other thread', self.user, timezone.now(),
+                                                              'Hello again!', '127.0.0.1')
+        self.client = Client()
+        self.client.login(username='johndoe', password='illpassword')
+
+    def _post_action(self, action, thread_ids, **extra_data):
+        """
+        Post the given action on the given threads to the "thread list" admin view.
+        :param action: The action name.
+        :param thread_ids: The selected threads' IDs.
+        :param extra_data: Extra POST data (intermediate page form).
+        """
+        data = {'action': action, helpers.ACTION_CHECKBOX_NAME: thread_ids}
+        data.update(extra_data)
+        return self.client.post(reverse('admin:forum_forumthread_changelist'), data)
+
+    def test_thread_list_view_available(self):
+        """
+        Test the availability of the "thread list" view.
+        """
+        response = self.client.get(reverse('admin:forum_forumthread_changelist'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_thread_edit_view_available(self):
+        """
+        Test the availability of the "edit thread" view.
+        """
+        response = self.client.get(reverse('admin:forum_forumthread_change', args=[self.thread.pk]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_move_threads_intermediate_page(self):
+        """
+        Test that the "move threads" action display the intermediate page without moving anything.
+        """
+        response = self._post_action('move_threads', [self.thread.pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/forum/forumthread/move_threads.html')
+        self.assertContains(response, 'Test thread')
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).parent_forum_id, self.forum.pk)
+
+    def test_move_threads_apply(self):
+        """
+        Test that the "move threads" action move the threads once the intermediate page is submitted.
+        """
+        response = self._post_action('move_threads', [self.thread.pk], apply='yes', parent_forum=self.other_forum.pk)
+        self.assertRedirects(response, reverse('admin:forum_forumthread_changelist'))
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).parent_forum_id, self.other_forum.pk)
+        self.assertEqual(Forum.objects.get(pk=self.other_forum.pk).nb_threads, 1)
+
+    def test_move_threads_invalid_form(self):
+        """
+        Test that the intermediate page is displayed again when no valid forum is selected.
+        """
+        response = self._post_action('move_threads', [self.thread.pk], apply='yes', parent_forum='')
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/forum/forumthread/move_threads.html')
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).parent_forum_id, self.forum.pk)
+
+    def test_merge_threads_intermediate_page(self):
+        """
+        Test that the "merge threads" action display the confirmation page without merging anything.
+        """
+        response = self._post_action('merge_threads', [self.thread.pk, self.other_thread.pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/forum/forumthread/merge_threads.html')
+        self.assertContains(response, 'Test thread')
+        self.assertContains(response, 'Other thread')
+        self.assertEqual(ForumThread.objects.count(), 2)
+
+    def test_merge_threads_apply(self):
+        """
+        Test that the "merge threads" action merge the threads into the selected target once confirmed.
+        """
+        response = self._post_action('merge_threads', [self.thread.pk, self.other_thread.pk],
+                                     apply='yes', target_thread=self.other_thread.pk)
+        self.assertRedirects(response, reverse('admin:forum_forumthread_changelist'))
+        self.assertFalse(ForumThread.objects.filter(pk=self.thread.pk).exists())
+        self.assertEqual(ForumThread.objects.get(pk=self.other_thread.pk).nb_posts, 2)
+
+    def test_merge_threads_target_not_selected(self):
+        """
+        Test that the target thread must be one of the selected threads.
+        """
+        third_thread = ForumThread.objects.create_thread(self.forum, 'Third thread', self.user, timezone.now(),
+                                                         'Hello!', '127.0.0.1')
+        response = self._post_action('merge_threads', [self.thread.pk, self.other_thread.pk],
+                                     apply='yes', target_thread=third_thread.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/forum/forumthread/merge_threads.html')
+        self.assertEqual(ForumThread.objects.count(), 3)
+
+    def test_merge_single_thread(self):
+        """
+        Test that at least two threads must be selected for merging.
+        """
+        response = self._post_action('merge_threads', [self.thread.pk])
+        self.assertRedirects(response, reverse('admin:forum_forumthread_changelist'))
+        self.assertEqual(ForumThread.objects.count(), 2)
+
+    def test_soft_delete_and_restore_threads(self):
+        """
+        Test the "delete" and "restore" threads actions.
+        """
+        response = self._post_action('soft_delete_threads', [self.thread.pk])
+        self.assertRedirects(response, reverse('admin:forum_forumthread_changelist'))
+        self.assertIsNotNone(ForumThread.objects.get(pk=self.thread.pk).deleted_at)
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).nb_threads, 1)
+
+        response = self._post_action('restore_threads', [self.thread.pk])
+        self.assertRedirects(response, reverse('admin:forum_forumthread_changelist'))
+        self.assertIsNone(ForumThread.objects.get(pk=self.thread.pk).deleted_at)
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).nb_threads, 2)
+
+
+class ForumThreadPostAdminTestCase(TestCase):
+    """
+    Tests suite for the ``ForumThreadPost`` admin views and actions.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.user = get_user_model().objects.create_superuser(username='johndoe',
+                                                              password='illpassword',
+                                                              email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.user, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.user,
+                                                    content='Reply', author_ip_address='127.0.0.1')
+        self.client = Client()
+        self.client.login(username='johndoe', password='illpassword')
+
+    def test_soft_delete_and_restore_posts(self):
+        """
+        Test the "delete" and "restore" posts actions, the first post of the thread being excluded.
+        """
+        post_ids = [self.thread.first_post_id, self.reply.pk]
+        response = self.client.post(reverse('admin:forum_forumthreadpost_changelist'),
+                                    {'action': 'soft_delete_posts', helpers.ACTION_CHECKBOX_NAME: post_ids})
+        self.assertRedirects(response, reverse('admin:forum_forumthreadpost_changelist'))
+        self.assertIsNone(ForumThreadPost.objects.get(pk=self.thread.first_post_id).deleted_at)
+        self.assertIsNotNone(ForumThreadPost.objects.get(pk=self.reply.pk).deleted_at)
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).nb_posts, 1)
+
+        response = self.client.post(reverse('admin:forum_forumthreadpost_changelist'),
+                                    {'action': 'restore_posts', helpers.ACTION_CHECKBOX_NAME: post_ids})
+        self.assertRedirects(response, reverse('admin:forum_forumthreadpost_changelist'))
+        self.assertIsNone(ForumThreadPost.objects.get(pk=self.reply.pk).deleted_at)
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).nb_posts, 2)
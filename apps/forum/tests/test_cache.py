@@ -0,0 +1,122 @@
+"""
+Tests suite for the threads pages cache of the forum app.
+"""
+
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from apps.fileattachments.models import FileAttachment
+
+from ..cache import get_thread_cache_version
+from ..models import (Forum,
+                      ForumThread,
+                      ForumThreadPost)
+from ..settings import FORUM_THREAD_PAGES_CACHE_ALIAS
+
+
+class ThreadCacheVersionTestCase(TestCase):
+    """
+    Tests suite for the cache version of threads, bumped on each change of the cached posts.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests, with a fresh cache.
+        """
+        caches[FORUM_THREAD_PAGES_CACHE_ALIAS].clear()
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.other_thread = ForumThread.objects.create_thread(self.forum, 'Other thread', self.author,
+                                                              timezone.now(), 'Hello again!', '127.0.0.1')
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                    content='Reply', author_ip_address='127.0.0.1')
+        self.version = get_thread_cache_version(self.thread.pk)
+        self.other_version = get_thread_cache_version(self.other_thread.pk)
+
+    def assertVersionBumped(self):
+        """
+        Assert that the version of the test thread (only) has been bumped since the last call.
+        """
+        version = get_thread_cache_version(self.thread.pk)
+        self.assertNotEqual(version, self.version)
+        self.assertEqual(get_thread_cache_version(self.other_thread.pk), self.other_version)
+        self.version = version
+
+    def test_version_stable(self):
+        """
+        Test that the version does not change without any change of the thread.
+        """
+        self.assertEqual(get_thread_cache_version(self.thread.pk), self.version)
+
+    def test_bump_on_post_create(self):
+        """
+        Test that the version is bumped when a post is created.
+        """
+        ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                       content='Another reply', author_ip_address='127.0.0.1')
+        self.assertVersionBumped()
+
+    def test_bump_on_post_edit(self):
+        """
+        Test that the version is bumped when a post is edited or soft-deleted.
+        """
+        self.reply.content = 'Edited reply'
+        self.reply.save()
+        self.assertVersionBumped()
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.assertVersionBumped()
+
+    def test_bump_on_post_delete(self):
+        """
+        Test that the version is bumped when a post is physically deleted.
+        """
+        self.reply.delete()
+        self.assertVersionBumped()
+
+    def test_bump_on_bulk_post_delete(self):
+        """
+        Test that the version is bumped when posts are deleted or restored using the manager.
+        """
+        ForumThreadPost.objects.soft_delete_posts(ForumThreadPost.objects.filter(pk=self.reply.pk))
+        self.assertVersionBumped()
+        ForumThreadPost.objects.restore_posts(ForumThreadPost.objects.filter(pk=self.reply.pk))
+        self.assertVersionBumped()
+
+    @override_settings(MEDIA_ROOT=settings.DEBUG_MEDIA_ROOT)
+    def test_bump_on_attachment_change(self):
+        """
+        Test that the version is bumped when an attachment of a post is added or deleted.
+        """
+        attachment = FileAttachment.objects.create(content_object=self.reply,
+                                                   file=SimpleUploadedFile('test.txt', b'Hello world!'))
+        self.assertVersionBumped()
+        attachment.file.delete(save=False)
+        attachment.delete()
+        self.assertVersionBumped()
+
+    def test_bump_on_profile_update(self):
+        """
+        Test that the version of all threads where the user has posted is bumped when the user's profile is updated.
+        """
+        other_user = get_user_model().objects.create_user(username='johnsmith',
+                                                          password='illpassword',
+                                                          email='john.smith@example.com')
+        other_user.user_profile.save()
+        self.assertEqual(get_thread_cache_version(self.thread.pk), self.version)
+
+        ForumThreadPost.objects.create(parent_thread=self.other_thread, author=other_user,
+                                       content='Reply', author_ip_address='127.0.0.1')
+        self.other_version = get_thread_cache_version(self.other_thread.pk)
+        self.author.user_profile.save()
+        self.assertNotEqual(get_thread_cache_version(self.thread.pk), self.version)
+        self.assertNotEqual(get_thread_cache_version(self.other_thread.pk), self.other_version)
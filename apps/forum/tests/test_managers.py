@@ -0,0 +1,297 @@
+"""
+Tests suite for the data models managers of the forum app.
+"""
+
+from django.test import TestCase
+from django.core.cache import caches
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from ..models import (Forum,
+                      ForumThread,
+                      ForumThreadPost,
+                      ForumThreadSubscription,
+                      ReadForumTracker,
+                      ReadForumThreadTracker)
+from ..settings import FORUM_READ_MARKERS_CACHE_ALIAS
+
+
+class ForumThreadManagerTestCase(TestCase):
+    """
+    Tests suite for the bulk operations of the ``ForumThread`` manager class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.other_forum = Forum.objects.create(title='Other forum', slug='other-forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                    content='Reply', author_ip_address='127.0.0.1')
+        self.other_thread = ForumThread.objects.create_thread(self.forum, 'Other thread', self.author,
+                                                              timezone.now(), 'Hello again!', '127.0.0.1')
+        self.other_reply = ForumThreadPost.objects.create(parent_thread=self.other_thread, author=self.author,
+                                                          content='Other reply', author_ip_address='127.0.0.1')
+
+    def assertForumStats(self, forum, nb_threads, nb_posts, last_post):
+        """
+        Assert the statistics of the given forum, as stored in database.
+        :param forum: The forum to be checked.
+        :param nb_threads: The expected number of threads.
+        :param nb_posts: The expected number of posts.
+        :param last_post: The expected last post (or None).
+        """
+        forum = Forum.objects.get(pk=forum.pk)
+        self.assertEqual(forum.nb_threads, nb_threads)
+        self.assertEqual(forum.nb_posts, nb_posts)
+        self.assertEqual(forum.last_post_id, last_post.pk if last_post is not None else None)
+
+    def test_move_threads(self):
+        """
+        Test that moving threads update the statistics of the old and new parent forums.
+        """
+        nb_threads = ForumThread.objects.move_threads(ForumThread.objects.filter(pk=self.other_thread.pk),
+                                                      self.other_forum)
+        self.assertEqual(nb_threads, 1)
+        self.assertEqual(ForumThread.objects.get(pk=self.other_thread.pk).parent_forum_id, self.other_forum.pk)
+        self.assertForumStats(self.forum, 1, 2, self.reply)
+        self.assertForumStats(self.other_forum, 1, 2, self.other_reply)
+
+    def test_move_threads_to_same_forum(self):
+        """
+        Test that threads already in the target forum are not counted as moved.
+        """
+        nb_threads = ForumThread.objects.move_threads(ForumThread.objects.all(), self.forum)
+        self.assertEqual(nb_threads, 0)
+        self.assertForumStats(self.forum, 2, 4, self.other_reply)
+
+    def test_soft_delete_threads(self):
+        """
+        Test that deleting threads update the statistics of the parent forum.
+        """
+        nb_threads = ForumThread.objects.soft_delete_threads(ForumThread.objects.filter(pk=self.other_thread.pk))
+        self.assertEqual(nb_threads, 1)
+        self.assertIsNotNone(ForumThread.objects.get(pk=self.other_thread.pk).deleted_at)
+        self.assertForumStats(self.forum, 1, 2, self.reply)
+
+        # Already deleted threads are skipped
+        nb_threads = ForumThread.objects.soft_delete_threads(ForumThread.objects.all())
+        self.assertEqual(nb_threads, 1)
+        self.assertForumStats(self.forum, 0, 0, None)
+
+    def test_restore_threads(self):
+        """
+        Test that restoring threads update the statistics of the parent forum.
+        """
+        ForumThread.objects.soft_delete_threads(ForumThread.objects.all())
+        nb_threads = ForumThread.objects.restore_threads(ForumThread.objects.filter(pk=self.thread.pk))
+        self.assertEqual(nb_threads, 1)
+        self.assertIsNone(ForumThread.objects.get(pk=self.thread.pk).deleted_at)
+        self.assertForumStats(self.forum, 1, 2, self.reply)
+
+        # Published threads are skipped
+        nb_threads = ForumThread.objects.restore_threads(ForumThread.objects.all())
+        self.assertEqual(nb_threads, 1)
+        self.assertForumStats(self.forum, 2, 4, self.other_reply)
+
+    def test_restore_threads_without_first_post(self):
+        """
+        Test that deleted threads which lost their first post are not restored.
+        """
+        ForumThread.objects.soft_delete_threads(ForumThread.objects.filter(pk=self.other_thread.pk))
+        ForumThreadPost.objects.filter(parent_thread=self.other_thread).update(parent_thread=self.thread)
+        nb_threads = ForumThread.objects.restore_threads(ForumThread.objects.filter(pk=self.other_thread.pk))
+        self.assertEqual(nb_threads, 0)
+        self.assertIsNotNone(ForumThread.objects.get(pk=self.other_thread.pk).deleted_at)
+
+    def test_merge_threads(self):
+        """
+        Test that merging threads move all posts to the target thread and delete the other threads.
+        """
+        ForumThread.objects.move_threads(ForumThread.objects.filter(pk=self.other_thread.pk), self.other_forum)
+        ForumThreadSubscription.objects.subscribe_to_thread(self.author, self.other_thread)
+        target_thread = ForumThread.objects.merge_threads(ForumThread.objects.all())
+        self.assertEqual(target_thread, self.thread)
+        self.assertFalse(ForumThread.objects.filter(pk=self.other_thread.pk).exists())
+        self.assertFalse(ForumThreadSubscription.objects.filter(thread=self.other_thread.pk).exists())
+
+        # Posts are ordered by creation
+        posts = ForumThreadPost.objects.filter(parent_thread=self.thread).order_by('ordinal')
+        self.assertQuerysetEqual(posts, [self.thread.first_post_id, self.reply.pk,
+                                         self.other_thread.first_post_id, self.other_reply.pk],
+                                 transform=lambda post: post.pk)
+        self.assertEqual([post.ordinal for post in posts], [1, 2, 3, 4])
+        thread = ForumThread.objects.get(pk=self.thread.pk)
+        self.assertEqual(thread.nb_posts, 4)
+        self.assertEqual(thread.first_post_id, self.thread.first_post_id)
+        self.assertEqual(thread.last_post_id, self.other_reply.pk)
+        self.assertForumStats(self.forum, 1, 4, self.other_reply)
+        self.assertForumStats(self.other_forum, 0, 0, None)
+
+    def test_merge_threads_into_given_target(self):
+        """
+        Test that the posts are merged into the given target thread.
+        """
+        target_thread = ForumThread.objects.merge_threads(ForumThread.objects.all(), self.other_thread)
+        self.assertEqual(target_thread, self.other_thread)
+        self.assertFalse(ForumThread.objects.filter(pk=self.thread.pk).exists())
+        thread = ForumThread.objects.get(pk=self.other_thread.pk)
+        self.assertEqual(thread.nb_posts, 4)
+        self.assertEqual(thread.first_post_id, self.other_thread.first_post_id)
+        self.assertForumStats(self.forum, 1, 4, self.other_reply)
+
+    def test_merge_single_thread(self):
+        """
+        Test that merging a single thread (or no thread) does nothing.
+        """
+        target_thread = ForumThread.objects.merge_threads(ForumThread.objects.filter(pk=self.thread.pk))
+        self.assertEqual(target_thread, self.thread)
+        self.assertIsNone(ForumThread.objects.merge_threads(ForumThread.objects.none()))
+        self.assertEqual(ForumThread.objects.count(), 2)
+
+
+class ForumThreadPostManagerTestCase(TestCase):
+    """
+    Tests suite for the bulk operations of the ``ForumThreadPost`` manager class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.first_post = self.thread.first_post
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                    content='Reply', author_ip_address='127.0.0.1')
+        self.last_reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                         content='Last reply', author_ip_address='127.0.0.1')
+
+    def test_soft_delete_posts(self):
+        """
+        Test that deleting posts update the counters of the parent thread and forum.
+        """
+        nb_posts = ForumThreadPost.objects.soft_delete_posts(ForumThreadPost.objects.filter(pk=self.reply.pk))
+        self.assertEqual(nb_posts, 1)
+        reply = ForumThreadPost.objects.get(pk=self.reply.pk)
+        self.assertIsNotNone(reply.deleted_at)
+        self.assertEqual(reply.ordinal, 0)
+        self.assertEqual(ForumThreadPost.objects.get(pk=self.last_reply.pk).ordinal, 2)
+        thread = ForumThread.objects.get(pk=self.thread.pk)
+        self.assertEqual(thread.nb_posts, 2)
+        self.assertEqual(thread.last_post_id, self.last_reply.pk)
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).nb_posts, 2)
+
+    def test_soft_delete_last_post(self):
+        """
+        Test that deleting the last post of a thread update the last post of the thread and forum.
+        """
+        ForumThreadPost.objects.soft_delete_posts(ForumThreadPost.objects.filter(pk=self.last_reply.pk))
+        self.assertEqual(ForumThread.objects.get(pk=self.thread.pk).last_post_id, self.reply.pk)
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).last_post_id, self.reply.pk)
+
+    def test_soft_delete_posts_exclude_first_posts(self):
+        """
+        Test that the first post of a thread cannot be deleted (the thread itself must be deleted instead).
+        """
+        nb_posts = ForumThreadPost.objects.soft_delete_posts(ForumThreadPost.objects.all())
+        self.assertEqual(nb_posts, 2)
+        first_post = ForumThreadPost.objects.get(pk=self.first_post.pk)
+        self.assertIsNone(first_post.deleted_at)
+        self.assertEqual(first_post.ordinal, 1)
+        thread = ForumThread.objects.get(pk=self.thread.pk)
+        self.assertEqual(thread.nb_posts, 1)
+        self.assertEqual(thread.last_post_id, self.first_post.pk)
+        forum = Forum.objects.get(pk=self.forum.pk)
+        self.assertEqual(forum.nb_posts, 1)
+        self.assertEqual(forum.last_post_id, self.first_post.pk)
+
+    def test_restore_posts(self):
+        """
+        Test that restoring posts update the counters of the parent thread and forum.
+        """
+        ForumThreadPost.objects.soft_delete_posts(ForumThreadPost.objects.all())
+        nb_posts = ForumThreadPost.objects.restore_posts(ForumThreadPost.objects.all())
+        self.assertEqual(nb_posts, 2)
+        posts = ForumThreadPost.objects.filter(parent_thread=self.thread).order_by('id')
+        self.assertEqual([post.ordinal for post in posts], [1, 2, 3])
+        self.assertFalse(posts.filter(deleted_at__isnull=False).exists())
+        thread = ForumThread.objects.get(pk=self.thread.pk)
+        self.assertEqual(thread.nb_posts, 3)
+        self.assertEqual(thread.last_post_id, self.last_reply.pk)
+        forum = Forum.objects.get(pk=self.forum.pk)
+        self.assertEqual(forum.nb_posts, 3)
+        self.assertEqual(forum.last_post_id, self.last_reply.pk)
+
+
+class ReadForumThreadTrackerManagerTestCase(TestCase):
+    """
+    Tests suite for the ``ReadForumThreadTracker`` manager class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests, with a fresh cache.
+        """
+        caches[FORUM_READ_MARKERS_CACHE_ALIAS].clear()
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.user = get_user_model().objects.create_user(username='johnsmith',
+                                                         password='illpassword',
+                                                         email='john.smith@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.other_forum = Forum.objects.create(title='Other forum', slug='other-forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+
+    def _get_thread(self):
+        """
+        Return a fresh instance of the test thread, with the last post pre-fetched.
+        """
+        return ForumThread.objects.select_related('last_post').get(pk=self.thread.pk)
+
+    def test_mark_thread_as_read(self):
+        """
+        Test that the thread marker is created, and that the last read date is then cached.
+        """
+        ReadForumThreadTracker.objects.mark_thread_as_read(self.user, self._get_thread())
+        self.assertIsNotNone(ReadForumThreadTracker.objects.get_marker_for_thread(self.user, self.thread.pk))
+        thread = self._get_thread()
+        with self.assertNumQueries(0):
+            ReadForumThreadTracker.objects.mark_thread_as_read(self.user, thread)
+
+    def test_mark_thread_as_read_covered_by_forum_marker(self):
+        """
+        Test that the last read date is not cached when the thread is covered by the forum marker, so the thread
+        marker is written once the forum marker does not cover the thread anymore.
+        """
+        ReadForumTracker.objects.mark_forum_as_read(self.user, self.forum)
+        ReadForumThreadTracker.objects.mark_thread_as_read(self.user, self._get_thread())
+        self.assertIsNone(ReadForumThreadTracker.objects.get_marker_for_thread(self.user, self.thread.pk))
+
+        ForumThread.objects.move_threads(ForumThread.objects.filter(pk=self.thread.pk), self.other_forum)
+        ReadForumThreadTracker.objects.mark_thread_as_read(self.user, self._get_thread())
+        self.assertIsNotNone(ReadForumThreadTracker.objects.get_marker_for_thread(self.user, self.thread.pk))
+
+    def test_mark_forum_as_read_invalidate_cached_read_dates(self):
+        """
+        Test that the cached last read dates are invalidated when the thread markers are deleted by the forum marker.
+        """
+        ReadForumThreadTracker.objects.mark_thread_as_read(self.user, self._get_thread())
+        ReadForumTracker.objects.mark_forum_as_read(self.user, self.forum)
+        self.assertIsNone(ReadForumThreadTracker.objects.get_marker_for_thread(self.user, self.thread.pk))
+
+        ReadForumTracker.objects.mark_forum_as_unread(self.user, self.forum)
+        ReadForumThreadTracker.objects.mark_thread_as_read(self.user, self._get_thread())
+        self.assertIsNotNone(ReadForumThreadTracker.objects.get_marker_for_thread(self.user, self.thread.pk))
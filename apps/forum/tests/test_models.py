@@ -0,0 +1,400 @@
+"""
+Tests suite for the data models of the forum app.
+"""
+
+import io
+from datetime import timedelta
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from ..models import (Forum,
+                      ForumThread,
+                      ForumThreadPost)
+from ..settings import NB_FORUM_POST_PER_PAGE
+
+
+class ForumThreadPostCountersTestCase(TestCase):
+    """
+    Tests suite for the posts counter of threads and the position of posts in their thread.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.other_thread = ForumThread.objects.create_thread(self.forum, 'Other thread', self.author,
+                                                              timezone.now(), 'Hello again!', '127.0.0.1')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.first_post = self.thread.first_post
+        self.reply = self._create_post(self.thread, 'Reply')
+        self.last_reply = self._create_post(self.thread, 'Last reply')
+
+    def _create_post(self, thread, content):
+        """
+        Create a new post in the given thread.
+        :param thread: The parent thread.
+        :param content: The post content.
+        """
+        return ForumThreadPost.objects.create(parent_thread=thread, author=self.author,
+                                              content=content, author_ip_address='127.0.0.1')
+
+    def assertPositions(self, thread, positions):
+        """
+        Assert the number of posts of the given thread and the position of all its posts, as stored in database.
+        :param thread: The thread to be checked.
+        :param positions: The expected (post, ordinal) tuples, ordered by ID.
+        """
+        posts = ForumThreadPost.objects.filter(parent_thread=thread).order_by('id')
+        self.assertEqual([(post.pk, post.ordinal) for post in posts],
+                         [(post.pk, ordinal) for post, ordinal in positions])
+        nb_posts = len([ordinal for _, ordinal in positions if ordinal])
+        self.assertEqual(ForumThread.objects.get(pk=thread.pk).nb_posts, nb_posts)
+
+    def test_create_posts(self):
+        """
+        Test that new posts are numbered from 1, in order of creation.
+        """
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.reply, 2), (self.last_reply, 3)])
+        self.assertPositions(self.other_thread, [(self.other_thread.first_post, 1)])
+        self.assertEqual(self.last_reply.ordinal, 3)
+        self.assertEqual(self.thread.nb_posts, 3)
+
+    def test_soft_delete_post(self):
+        """
+        Test that deleted posts have no position and are not counted.
+        """
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.assertEqual(self.reply.ordinal, 0)
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.reply, 0), (self.last_reply, 2)])
+
+        # Saving the deleted post again does not change anything
+        self.reply.save()
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.reply, 0), (self.last_reply, 2)])
+
+    def test_undelete_post(self):
+        """
+        Test that restored posts get back their position.
+        """
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.reply.deleted_at = None
+        self.reply.save()
+        self.assertEqual(self.reply.ordinal, 2)
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.reply, 2), (self.last_reply, 3)])
+
+    def test_move_post(self):
+        """
+        Test that moved posts update the counters and positions of both threads.
+        """
+        self.reply.parent_thread = self.other_thread
+        self.reply.save()
+        self.assertEqual(self.reply.ordinal, 2)
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.last_reply, 2)])
+        self.assertPositions(self.other_thread, [(self.other_thread.first_post, 1), (self.reply, 2)])
+
+    def test_delete_post(self):
+        """
+        Test that physically deleted posts update the counters and positions of their thread.
+        """
+        self.reply.delete()
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.last_reply, 2)])
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).nb_posts, 3)
+
+    def test_fix_post_counters_command(self):
+        """
+        Test that the ``fixforumpostcounters`` command repair out-of-date counters and positions.
+        """
+        ForumThread.objects.filter(pk=self.thread.pk).update(nb_posts=42)
+        ForumThreadPost.objects.filter(pk=self.reply.pk).update(ordinal=5)
+        ForumThreadPost.objects.filter(pk=self.last_reply.pk).update(deleted_at=timezone.now())
+        stdout = io.StringIO()
+        call_command('fixforumpostcounters', stdout=stdout)
+        self.assertPositions(self.thread, [(self.first_post, 1), (self.reply, 2), (self.last_reply, 0)])
+        self.assertIn('1 thread(s) fixed', stdout.getvalue())
+
+        # Up-to-date threads are not fixed again
+        stdout = io.StringIO()
+        call_command('fixforumpostcounters', stdout=stdout)
+        self.assertIn('0 thread(s) fixed', stdout.getvalue())
+
+    def test_get_page_number(self):
+        """
+        Test that the page number is computed from the position of the post, without any query.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(ForumThreadPost(ordinal=1).get_page_number(), 1)
+            self.assertEqual(ForumThreadPost(ordinal=NB_FORUM_POST_PER_PAGE).get_page_number(), 1)
+            self.assertEqual(ForumThreadPost(ordinal=NB_FORUM_POST_PER_PAGE + 1).get_page_number(), 2)
+            self.assertEqual(ForumThreadPost(ordinal=NB_FORUM_POST_PER_PAGE * 2 + 1).get_page_number(), 3)
+
+            # Deleted posts are displayed on the first page
+            self.assertEqual(ForumThreadPost(ordinal=0).get_page_number(), 1)
+
+
+class ForumStatisticsTestCase(TestCase):
+    """
+    Tests suite for the statistics of forums, updated incrementally on each change. The incremental updates must
+    always agree with the statistics recomputed from scratch by ``Forum.objects.reset_forum_stats()``.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.root_forum = Forum.objects.create(title='Root forum', slug='root-forum', description='Test forum')
+        self.child_forum = Forum.objects.create(title='Child forum', slug='child-forum', description='Test forum',
+                                                parent=self.root_forum)
+        self.private_forum = Forum.objects.create(title='Private forum', slug='private-forum',
+                                                  description='Test forum', parent=self.root_forum, private=True)
+        self.other_forum = Forum.objects.create(title='Other forum', slug='other-forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.child_forum, 'Test thread', self.author,
+                                                        timezone.now(), 'Hello world!', '127.0.0.1')
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                    content='Reply', author_ip_address='127.0.0.1')
+        self.private_thread = ForumThread.objects.create_thread(self.private_forum, 'Private thread', self.author,
+                                                                timezone.now(), 'Hello!', '127.0.0.1')
+
+    def assertForumStats(self, forum, nb_threads, nb_posts, last_post):
+        """
+        Assert the statistics of the given forum, as stored in database.
+        :param forum: The forum to be checked.
+        :param nb_threads: The expected number of threads.
+        :param nb_posts: The expected number of posts.
+        :param last_post: The expected last post (or None).
+        """
+        forum = Forum.objects.get(pk=forum.pk)
+        self.assertEqual((forum.nb_threads, forum.nb_posts, forum.last_post_id),
+                         (nb_threads, nb_posts, last_post.pk if last_post is not None else None))
+
+    def assertStatsUpToDate(self):
+        """
+        Assert that the statistics of all forums are the same as the statistics recomputed from scratch.
+        """
+        stats = list(Forum.objects.order_by('pk').values_list('pk', 'nb_threads', 'nb_posts', 'last_post'))
+        self.assertEqual(Forum.objects.reset_forum_stats(), 0)
+        self.assertEqual(list(Forum.objects.order_by('pk').values_list('pk', 'nb_threads', 'nb_posts', 'last_post')),
+                         stats)
+
+    def test_create_thread_and_posts(self):
+        """
+        Test the statistics after creating threads and posts. Private forums are not rolled up into their parents.
+        """
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.child_forum, 1, 2, self.reply)
+        self.assertForumStats(self.root_forum, 1, 2, self.reply)
+        self.assertForumStats(self.private_forum, 1, 1, self.private_thread.first_post)
+        self.assertForumStats(self.other_forum, 0, 0, None)
+
+    def test_delete_thread(self):
+        """
+        Test the statistics after soft-deleting, restoring and physically deleting a thread.
+        """
+        self.thread.deleted_at = timezone.now()
+        self.thread.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 0, 0, None)
+
+        self.thread.deleted_at = None
+        self.thread.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 2, self.reply)
+
+        self.thread.delete()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 0, 0, None)
+
+    def test_delete_post(self):
+        """
+        Test the statistics after soft-deleting, restoring and physically deleting a post.
+        """
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 1, self.thread.first_post)
+
+        self.reply.deleted_at = None
+        self.reply.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 2, self.reply)
+
+        self.reply.delete()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 1, self.thread.first_post)
+
+    def test_move_thread(self):
+        """
+        Test the statistics after moving a thread to another forum.
+        """
+        self.thread.parent_forum = self.other_forum
+        self.thread.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 0, 0, None)
+        self.assertForumStats(self.other_forum, 1, 2, self.reply)
+
+    def test_move_post(self):
+        """
+        Test the statistics after moving a post to a thread of another forum.
+        """
+        other_thread = ForumThread.objects.create_thread(self.other_forum, 'Other thread', self.author,
+                                                         timezone.now(), 'Hello again!', '127.0.0.1')
+        self.reply.parent_thread = other_thread
+        self.reply.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 1, self.thread.first_post)
+        self.assertForumStats(self.other_forum, 1, 2, other_thread.first_post)
+
+    def test_move_forum(self):
+        """
+        Test the statistics after moving a forum to another parent forum.
+        """
+        self.child_forum.parent = self.other_forum
+        self.child_forum.save()
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 0, 0, None)
+        self.assertForumStats(self.other_forum, 1, 2, self.reply)
+
+    def test_set_private(self):
+        """
+        Test the statistics after flipping the "private" flag of a forum.
+        """
+        self.child_forum.set_private(True, save=True)
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 0, 0, None)
+        self.assertForumStats(self.child_forum, 1, 2, self.reply)
+
+        self.private_forum.set_private(False, save=True)
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 1, 1, self.private_thread.first_post)
+
+    def test_set_private_bulk(self):
+        """
+        Test the statistics after flipping the "private" flag of forums using the manager.
+        """
+        Forum.objects.set_private(Forum.objects.filter(pk=self.root_forum.pk), True, recursive=True)
+        self.assertStatsUpToDate()
+        Forum.objects.set_private(Forum.objects.filter(pk=self.root_forum.pk), False, recursive=True)
+        self.assertStatsUpToDate()
+        self.assertForumStats(self.root_forum, 2, 3, self.private_thread.first_post)
+
+
+class ForumThreadLastPostTestCase(TestCase):
+    """
+    Tests suite for the last post of threads, updated incrementally on each post change. The incremental updates
+    must always agree with the last posts recomputed by ``ForumThread.objects.reset_last_posts()``.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author,
+                                                        timezone.now() - timedelta(hours=3), 'Hello world!',
+                                                        '127.0.0.1')
+        self.first_post = self.thread.first_post
+        self.reply = self._create_post(self.thread, timezone.now() - timedelta(hours=2))
+        self.last_reply = self._create_post(self.thread, timezone.now() - timedelta(hours=1))
+
+    def _create_post(self, thread, pub_date):
+        """
+        Create a new post in the given thread.
+        :param thread: The parent thread.
+        :param pub_date: The post publication date.
+        """
+        return ForumThreadPost.objects.create(parent_thread=thread, author=self.author, pub_date=pub_date,
+                                              content='Reply', author_ip_address='127.0.0.1')
+
+    def assertLastPost(self, thread, last_post):
+        """
+        Assert the last post of the given thread, as stored in database and as recomputed from scratch.
+        :param thread: The thread to be checked.
+        :param last_post: The expected last post.
+        """
+        self.assertEqual(ForumThread.objects.get(pk=thread.pk).last_post_id, last_post.pk)
+        self.assertEqual(ForumThread.objects.reset_last_posts(ForumThread.objects.filter(pk=thread.pk)), 0)
+
+    def test_create_posts(self):
+        """
+        Test that the most recently published post is the last post.
+        """
+        self.assertLastPost(self.thread, self.last_reply)
+
+    def test_create_older_post(self):
+        """
+        Test that a new post published before the last post does not become the last post.
+        """
+        self._create_post(self.thread, timezone.now() - timedelta(hours=2))
+        self.assertLastPost(self.thread, self.last_reply)
+
+    def test_soft_delete_last_post(self):
+        """
+        Test that the previous post become the last post when the last post is deleted, and back on restore.
+        """
+        self.last_reply.deleted_at = timezone.now()
+        self.last_reply.save()
+        self.assertLastPost(self.thread, self.reply)
+
+        self.last_reply.deleted_at = None
+        self.last_reply.save()
+        self.assertLastPost(self.thread, self.last_reply)
+
+    def test_soft_delete_other_post(self):
+        """
+        Test that deleting a post which is not the last post does not change the last post.
+        """
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.assertLastPost(self.thread, self.last_reply)
+
+    def test_delete_last_post(self):
+        """
+        Test that physically deleting the last post of a thread does not delete the thread (regression test, the
+        thread was deleted in cascade) and that the previous post become the last post.
+        """
+        self.last_reply.delete()
+        self.assertTrue(ForumThread.objects.filter(pk=self.thread.pk).exists())
+        self.assertTrue(ForumThreadPost.objects.filter(pk=self.first_post.pk).exists())
+        self.assertLastPost(self.thread, self.reply)
+
+        self.reply.delete()
+        self.assertTrue(ForumThread.objects.filter(pk=self.thread.pk).exists())
+        self.assertLastPost(self.thread, self.first_post)
+
+    def test_delete_last_post_while_previous_deleted(self):
+        """
+        Test that the first post become the last post when all other posts are deleted.
+        """
+        self.reply.deleted_at = timezone.now()
+        self.reply.save()
+        self.last_reply.delete()
+        self.assertTrue(ForumThread.objects.filter(pk=self.thread.pk).exists())
+        self.assertLastPost(self.thread, self.first_post)
+
+    def test_move_last_post(self):
+        """
+        Test that the last posts of both threads are updated when the last post is moved to another thread.
+        """
+        other_thread = ForumThread.objects.create_thread(self.forum, 'Other thread', self.author,
+                                                         timezone.now() - timedelta(hours=4), 'Hello again!',
+                                                         '127.0.0.1')
+        self.last_reply.parent_thread = other_thread
+        self.last_reply.save()
+        self.assertLastPost(self.thread, self.reply)
+        self.assertLastPost(other_thread, self.last_reply)
+        self.assertEqual(Forum.objects.get(pk=self.forum.pk).last_post_id, other_thread.first_post_id)
+        self.assertEqual(Forum.objects.reset_forum_stats(), 0)
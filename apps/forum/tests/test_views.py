@@ -0,0 +1,108 @@
+"""
+Tests suite for the views of the forum app.
+"""
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import caches
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from ..models import (Forum,
+                      ForumThread,
+                      ForumThreadPost)
+from ..settings import FORUM_THREAD_PAGES_CACHE_ALIAS
+
+
+class ForumThreadShowViewTestCase(TestCase):
+    """
+    Tests suite for the "thread detail" view and its posts cache.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests, with a fresh cache.
+        """
+        caches[FORUM_THREAD_PAGES_CACHE_ALIAS].clear()
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.forum = Forum.objects.create(title='Forum', slug='forum', description='Test forum')
+        self.thread = ForumThread.objects.create_thread(self.forum, 'Test thread', self.author, timezone.now(),
+                                                        'Hello world!', '127.0.0.1')
+        self.reply = ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                                    content='Test reply', author_ip_address='127.0.0.1')
+
+    def _get_posts_queries(self, client):
+        """
+        Get the thread page with the given client and return the SQL queries selecting posts (the thread query,
+        which only joins the first and last posts, excepted).
+        :param client: The test client.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.thread.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Test reply')
+        return [query['sql'] for query in context.captured_queries
+                if 'FROM "forum_forumthreadpost"' in query['sql']]
+
+    def test_anonymous_cached_page(self):
+        """
+        Test that anonymous users get the cached posts without any posts query.
+        """
+        client = Client()
+        self.assertTrue(self._get_posts_queries(client))
+        self.assertEqual(self._get_posts_queries(client), [])
+
+    def test_anonymous_cache_invalidated(self):
+        """
+        Test that new posts are displayed right away.
+        """
+        client = Client()
+        self._get_posts_queries(client)
+        ForumThreadPost.objects.create(parent_thread=self.thread, author=self.author,
+                                       content='Another reply', author_ip_address='127.0.0.1')
+        self.assertTrue(self._get_posts_queries(client))
+        response = client.get(self.thread.get_absolute_url())
+        self.assertContains(response, 'Another reply')
+
+    def test_anonymous_no_controls(self):
+        """
+        Test that anonymous users do not get the posts controls.
+        """
+        client = Client()
+        for _ in range(2):
+            response = client.get(self.thread.get_absolute_url())
+            self.assertNotContains(response, self.reply.get_edit_url())
+            self.assertNotContains(response, self.reply.get_reply_url())
+
+    def test_authenticated_controls_on_cached_page(self):
+        """
+        Test that authenticated users get their own controls on top of the cached posts.
+        """
+        Client().get(self.thread.get_absolute_url())
+        client = Client()
+        client.login(username='johndoe', password='illpassword')
+        response = client.get(self.thread.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Test reply')
+        self.assertContains(response, self.reply.get_edit_url())
+        self.assertContains(response, self.reply.get_delete_url())
+        self.assertContains(response, self.reply.get_reply_url())
+        self.assertContains(response, self.thread.get_edit_url())
+
+    def test_authenticated_controls_of_other_users(self):
+        """
+        Test that authenticated users do not get the edit controls of posts of other users.
+        """
+        get_user_model().objects.create_user(username='johnsmith',
+                                             password='illpassword',
+                                             email='john.smith@example.com')
+        Client().get(self.thread.get_absolute_url())
+        client = Client()
+        client.login(username='johnsmith', password='illpassword')
+        response = client.get(self.thread.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, self.reply.get_edit_url())
+        self.assertContains(response, self.reply.get_reply_url())
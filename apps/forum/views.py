@@ -10,6 +10,7 @@ from django.shortcuts import get_object_or_404, resolve_url
 from django.utils.translation import ugettext_lazy as _
 from django.http import (HttpResponseRedirect,
                          HttpResponsePermanentRedirect)
+from django.template.loader import get_template
 from django.template.response import TemplateResponse
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_protect
@@ -17,14 +18,20 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Prefetch
 from django.contrib import messages
 
+from apps.accounts.models import UserProfile
 from apps.paginator.shortcut import (update_context_for_pagination,
                                      paginate)
+from apps.paginator.keyset import PositionPaginator
 from apps.txtrender.utils import render_quote
 
 from .settings import (NB_FORUM_THREAD_PER_PAGE,
                        NB_FORUM_POST_PER_PAGE,
                        NB_FORUM_POST_ON_REPLY_PAGE,
                        NB_SECONDS_BETWEEN_POSTS)
+from .cache import (CachedThreadPost,
+                    get_thread_page_cache_key,
+                    get_cached_thread_page,
+                    set_cached_thread_page)
 from .models import (Forum,
                      ForumSubscription,
                      ForumThread,
@@ -52,8 +59,13 @@ def forum_index(request,
     :return: TemplateResponse
     """
 
-    # Retrieve all root forums
-    root_forums = Forum.objects.root_forums().select_related('category').prefetch_related('children')
+    # Retrieve all root forums, with statistics and children
+    prefetch_children = Prefetch('children',
+                                 queryset=Forum.objects.select_related('last_post__author',
+                                                                       'last_post__parent_thread'))
+    root_forums = Forum.objects.root_forums() \
+        .select_related('category', 'last_post__author', 'last_post__parent_thread') \
+        .prefetch_related(prefetch_children)
 
     # Group by category
     root_forums_by_cat = defaultdict(list)
@@ -67,6 +79,14 @@ def forum_index(request,
         'root_forums': root_forums,
         'root_forums_by_cat': root_forums_by_cat,
     }
+
+    # Prefetch read markers
+    current_user = request.user
+    if current_user.is_authenticated():
+        all_forums = list(root_forums)
+        for forum in root_forums:
+            all_forums.extend(forum.children.all())
+        context['unread_forums'] = ReadForumTracker.objects.get_unread_forums(current_user, all_forums)
     if extra_context is not None:
         context.update(extra_context)
 
@@ -94,22 +114,17 @@ def forum_show(request, hierarchy,
         raise PermissionDenied()
 
     # Get all threads in this forum
-    queryset = ForumThread.objects.display_ordered(forum_obj) \
-        .select_related('first_post__author', 'last_post__author')
+    thread_list = ForumThread.objects.display_ordered(forum_obj)
+    queryset = thread_list.select_related('first_post__author', 'last_post__author')
 
-    # Prefetch posts and subscriptions
+    # Annotate posted, subscribed and read flags
     current_user = request.user
     if current_user.is_authenticated():
-        prefetch_posts = Prefetch('posts',
-                                  queryset=ForumThreadPost.objects.filter(author=current_user),
-                                  to_attr='user_posts')
-        prefetch_subscriptions = Prefetch('subscribers',
-                                          queryset=ForumThreadSubscription.objects.filter(user=current_user),
-                                          to_attr='user_subscriptions')
-        queryset = queryset.prefetch_related(prefetch_posts, prefetch_subscriptions)
+        queryset = ForumThread.objects.with_user_flags(current_user, queryset)
 
     # Related thread list pagination
-    paginator, page = paginate(queryset, request, NB_FORUM_THREAD_PER_PAGE)
+    # The threads are counted without the per-user flags, so the (cached) count is shared by all users
+    paginator, page = paginate(queryset, request, NB_FORUM_THREAD_PER_PAGE, count_queryset=thread_list)
 
     # Prefetch child forums
     if not page.has_previous():
@@ -138,7 +153,8 @@ def forum_show(request, hierarchy,
     # Prefetch read markers
     if current_user.is_authenticated():
         parent_forum_last_read_date = ReadForumTracker.objects.get_marker_for_forum(current_user, forum_obj)
-        thread_markers = ReadForumThreadTracker.objects.get_marker_for_threads(current_user, page.object_list)
+        thread_markers = {thread.id: thread.user_last_read_date for thread in page.object_list
+                          if thread.user_last_read_date is not None}
         context['read_markers'] = {
             'parent_forum_last_read_date': parent_forum_last_read_date,
             'thread_markers': thread_markers
@@ -363,7 +379,7 @@ def forum_thread_show(request, pk, slug,
     assert slug is not None
 
     # Get the thread object by pk
-    manager = ForumThread.objects.published().select_related('parent_forum', 'first_post__author')
+    manager = ForumThread.objects.published().select_related('parent_forum', 'first_post__author', 'last_post')
     thread_obj = get_object_or_404(manager, pk=pk, slug=slug)
 
     # Handle private thread
@@ -381,10 +397,35 @@ def forum_thread_show(request, pk, slug,
             # Redirect to the parent forum
             return HttpResponseRedirect(thread_obj.parent_forum.get_absolute_url())
 
-    # Paginate thread's posts
-    paginator, page = paginate(thread_obj.posts.published().order_by('pub_date')
-                               .select_related('author__user_profile', 'last_modification_by')
-                               .prefetch_related('attachments'), request, NB_FORUM_POST_PER_PAGE)
+    # Paginate thread's posts (using the stored posts positions and counter, without COUNT or OFFSET queries)
+    paginator, page = paginate(thread_obj.posts.published(), request, NB_FORUM_POST_PER_PAGE,
+                               paginator_class=PositionPaginator, position_field='ordinal',
+                               count=thread_obj.nb_posts)
+
+    # Get the posts from the fragment cache if available, only the per-user controls are rendered on cache hit
+    cache_key = get_thread_page_cache_key(thread_obj.pk, page.number)
+    cached_posts = get_cached_thread_page(cache_key)
+    if cached_posts is None:
+        posts = list(page.object_list.select_related('author__user_profile', 'last_modification_by')
+                     .prefetch_related('attachments'))
+        post_template = get_template('forum/post_body.html')
+        for post in posts:
+            post.cached_html = post_template.render({'post': post})
+        set_cached_thread_page(cache_key, [(post.pk, post.author_id, post.cached_html) for post in posts])
+    elif current_user.is_authenticated():
+        cached_posts = {pk: cached_html for pk, author_id, cached_html in cached_posts}
+        posts = list(page.object_list.select_related('author'))
+        for post in posts:
+            post.cached_html = cached_posts.get(post.pk, '')
+    else:
+        posts = [CachedThreadPost(pk, author_id, cached_html) for pk, author_id, cached_html in cached_posts]
+
+    # The authors online status change with their activity, so it is not part of the cached posts
+    online_author_ids = set(UserProfile.objects.get_online_users_accounts()
+                            .filter(user_id__in=set(post.author_id for post in posts))
+                            .values_list('user_id', flat=True))
+    for post in posts:
+        post.author_is_online = post.author_id in online_author_ids
 
     # Check if the current user has subscribed to the thread
     if current_user.is_authenticated():
@@ -403,6 +444,7 @@ def forum_thread_show(request, pk, slug,
         'has_subscribe_to_thread': has_subscribe_to_thread,
     }
     update_context_for_pagination(context, 'posts', request, paginator, page)
+    context['posts'] = posts
     if extra_context is not None:
         context.update(extra_context)
 
@@ -11,8 +11,9 @@ from apps.licenses.models import License
 from apps.tools.utils import unique_slug
 from apps.tools.fields import ThumbnailImageField
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .managers import ImageAttachmentManager
 from .settings import (IMG_ATTACHMENT_UPLOAD_DIR_NAME,
@@ -68,6 +69,15 @@ class ImageAttachment(models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     license = models.ForeignKey(License,
                                 related_name='img_attachments',
                                 verbose_name=_('License'),
@@ -174,39 +184,37 @@ class ImageAttachment(models.Model):
         """
 
         # Render the description text
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(ImageAttachment, self).save(update_fields=('description_html', 'description_text'))
+            super(ImageAttachment, self).save(update_fields=('description_html', 'description_text',
+                                                             'render_fingerprint', 'render_tags'))
 
 
-def _redo_image_attachments_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all image attachments.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for image in ImageAttachment.objects.all():
-        image.render_description(save=True)
-
-render_engine_changed.connect(_redo_image_attachments_text_rendering)
+register_rendered_model(ImageAttachment,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
@@ -8,8 +8,9 @@ from django.utils.translation import ugettext_lazy as _
 
 from apps.tools.utils import unique_slug
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .settings import LICENSE_LOGO_UPLOAD_DIR_NAME
 
@@ -47,6 +48,15 @@ class License(models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     usage = models.TextField(_('Usage'),
                              default='',
                              blank=True)
@@ -95,46 +105,43 @@ class License(models.Model):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_titles=True,
-                                                        allow_alerts_box=True,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_titles=True,
+                                                                 allow_alerts_box=True,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True,
+                                                                 merge_footnotes_html=True,
+                                                                 merge_footnotes_text=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(License, self).save(update_fields=('description_html', 'description_text'))
-
-
-def _redo_licenses_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all licenses.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for license in License.objects.all():
-        license.render_description(save=True)
+            super(License, self).save(update_fields=('description_html', 'description_text',
+                                                     'render_fingerprint', 'render_tags'))
 
 
-render_engine_changed.connect(_redo_licenses_text_rendering)
+register_rendered_model(License,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
@@ -0,0 +1,10 @@
+"""
+Mail queue app.
+
+This reusable Django application provide an email backend storing outgoing mails in the database (in the same
+transaction as the code sending them) and a ``sendqueuedmail`` management command sending queued mails as batch,
+over a single connection, with priorities, retries with exponential backoff and a dead-letter state for mails
+which cannot be sent.
+"""
+
+default_app_config = 'apps.mailqueue.apps.MailQueueConfig'
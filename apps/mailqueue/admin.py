@@ -0,0 +1,55 @@
+"""
+Admin views for the mail queue app.
+"""
+
+from django.contrib import admin
+from django.utils.translation import ugettext_lazy as _
+
+from .models import QueuedMail
+
+
+class QueuedMailAdmin(admin.ModelAdmin):
+    """
+    Admin form for the ``QueuedMail`` data model.
+    """
+
+    list_display = ('subject',
+                    'recipients',
+                    'priority',
+                    'status',
+                    'creation_date',
+                    'nb_attempts',
+                    'next_attempt_date')
+
+    search_fields = ('subject',
+                     'recipients')
+
+    list_filter = ('status',
+                   'priority',
+                   'creation_date')
+
+    readonly_fields = ('status',
+                       'subject',
+                       'recipients',
+                       'creation_date',
+                       'next_attempt_date',
+                       'last_attempt_date',
+                       'nb_attempts',
+                       'last_error')
+
+    exclude = ('message_data', )
+
+    actions = ['requeue_failed_mails']
+
+    def requeue_failed_mails(self, request, queryset):
+        """
+        Put back the selected failed mails in the queue.
+        :param request: The current request.
+        :param queryset: The selected mails.
+        """
+        nb_mails = QueuedMail.objects.requeue_failed(queryset)
+        self.message_user(request, _('%d failed mail(s) put back in the queue.') % nb_mails)
+    requeue_failed_mails.short_description = _('Put back selected failed mails in the queue')
+
+
+admin.site.register(QueuedMail, QueuedMailAdmin)
@@ -0,0 +1,15 @@
+"""
+Application file for the mail queue app.
+"""
+
+from django.apps import AppConfig
+from django.utils.translation import ugettext_lazy as _
+
+
+class MailQueueConfig(AppConfig):
+    """
+    Application configuration class for the mail queue app.
+    """
+
+    name = 'apps.mailqueue'
+    verbose_name = _('Mail queue')
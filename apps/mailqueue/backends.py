@@ -0,0 +1,31 @@
+"""
+Email backend for the mail queue app.
+"""
+
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import QueuedMail
+
+
+class DbQueueEmailBackend(BaseEmailBackend):
+    """
+    Email backend storing all messages in the database queue instead of sending them.
+    Messages are stored using the current database transaction, so mails are only queued if the transaction commit.
+    Queued mails are sent later by the ``sendqueuedmail`` management command.
+    The priority of a message can be set using the ``X-Mail-Queue-Priority`` header.
+    """
+
+    def send_messages(self, email_messages):
+        """
+        Queue the given messages.
+        :param email_messages: The list of ``EmailMessage`` instances to be queued.
+        :return: The number of messages queued.
+        """
+        if not email_messages:
+            return 0
+        try:
+            return QueuedMail.objects.enqueue(email_messages)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
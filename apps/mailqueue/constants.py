@@ -0,0 +1,27 @@
+"""
+Constants for the mail queue app.
+"""
+
+from django.utils.translation import ugettext_lazy as _
+
+
+MAIL_PRIORITY_HIGH = 0
+MAIL_PRIORITY_NORMAL = 1
+MAIL_PRIORITY_LOW = 2
+MAIL_PRIORITY_CHOICES = (
+    (MAIL_PRIORITY_HIGH, _('High')),
+    (MAIL_PRIORITY_NORMAL, _('Normal')),
+    (MAIL_PRIORITY_LOW, _('Low')),
+)
+
+MAIL_STATUS_QUEUED = 0
+MAIL_STATUS_SENT = 1
+MAIL_STATUS_FAILED = 2
+MAIL_STATUS_CHOICES = (
+    (MAIL_STATUS_QUEUED, _('Queued')),
+    (MAIL_STATUS_SENT, _('Sent')),
+    (MAIL_STATUS_FAILED, _('Failed')),
+)
+
+# Name of the message header used to set the priority of a mail (removed before sending)
+MAIL_PRIORITY_HEADER = 'X-Mail-Queue-Priority'
@@ -0,0 +1,125 @@
+"""
+Sending engine for the mail queue app.
+"""
+
+import time
+import smtplib
+
+from django.core.mail import get_connection
+
+from .models import QueuedMail
+from .constants import MAIL_STATUS_FAILED
+from .settings import (MAILQUEUE_EMAIL_BACKEND,
+                       MAILQUEUE_BATCH_SIZE,
+                       MAILQUEUE_MAX_RUN_TIME_SEC)
+
+
+class QueuedMailSender(object):
+    """
+    Send queued mails as batch, over a single connection reused for all mails.
+    """
+
+    def __init__(self, batch_size=MAILQUEUE_BATCH_SIZE,
+                 max_batches=None,
+                 max_time=MAILQUEUE_MAX_RUN_TIME_SEC,
+                 backend=MAILQUEUE_EMAIL_BACKEND):
+        """
+        Create a new queued mails sender.
+        :param batch_size: The number of mails fetched from the queue per batch.
+        :param max_batches: The maximum number of batches to be sent, None for no limit.
+        :param max_time: The maximum duration of a run in seconds, None for no limit. Queued mails are not claimed
+        while being sent, so the run must end before the expiration of the mutex lock of the sending command.
+        :param backend: The email backend used for sending mails.
+        """
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.max_time = max_time
+        self.backend = backend
+        self.connection = None
+        self.nb_sent = 0
+        self.nb_deferred = 0
+        self.nb_failed = 0
+        self.elapsed_time = 0
+
+    def open_connection(self):
+        """
+        Open the connection of the email backend, if not already open.
+        """
+        if self.connection is None:
+            self.connection = get_connection(self.backend, fail_silently=False)
+            self.connection.open()
+
+    def close_connection(self):
+        """
+        Close the connection of the email backend, if open.
+        """
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            finally:
+                self.connection = None
+
+    def send_mail(self, queued_mail):
+        """
+        Send a single queued mail and update its status.
+        :param queued_mail: The ``QueuedMail`` instance.
+        :return: True if the mail was sent, False otherwise.
+        """
+        try:
+            email_message = queued_mail.get_email_message()
+            self.open_connection()
+            self.connection.send_messages([email_message])
+        except Exception as e:
+            # Drop the connection on transport errors, a new one will be opened for the next mail
+            if isinstance(e, (smtplib.SMTPServerDisconnected, OSError)):
+                self.close_connection()
+            queued_mail.mark_as_deferred('%s: %s' % (type(e).__name__, e))
+            if queued_mail.status == MAIL_STATUS_FAILED:
+                self.nb_failed += 1
+            else:
+                self.nb_deferred += 1
+            return False
+        queued_mail.mark_as_sent()
+        self.nb_sent += 1
+        return True
+
+    def run(self):
+        """
+        Send all queued mails ready to be sent, by priority, batch after batch, until the maximum number of batches or
+        the maximum duration of the run is reached.
+        Mails deferred during the run are not retried before their next attempt date.
+        :return: The sending statistics, see ``get_stats()``.
+        """
+        start_time = time.time()
+        deadline = start_time + self.max_time if self.max_time is not None else None
+        nb_batches = 0
+        try:
+            while self.max_batches is None or nb_batches < self.max_batches:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                batch = list(QueuedMail.objects.ready_to_send()[:self.batch_size])
+                if not batch:
+                    break
+                for queued_mail in batch:
+                    # Remaining mails are left in the queue for the next run
+                    if deadline is not None and time.time() >= deadline:
+                        break
+                    self.send_mail(queued_mail)
+                nb_batches += 1
+        finally:
+            self.close_connection()
+            self.elapsed_time = time.time() - start_time
+        return self.get_stats()
+
+    def get_stats(self):
+        """
+        Return the sending statistics of this sender.
+        :return: A dictionary ``{'sent', 'deferred', 'failed', 'elapsed_time', 'rate'}``.
+        """
+        return {
+            'sent': self.nb_sent,
+            'deferred': self.nb_deferred,
+            'failed': self.nb_failed,
+            'elapsed_time': self.elapsed_time,
+            'rate': self.nb_sent / self.elapsed_time if self.elapsed_time else 0.0,
+        }
@@ -0,0 +1,25 @@
+"""
+Custom ``manage.py`` command to cleanup old sent and failed mails from the queue.
+"""
+
+from django.core.management.base import NoArgsCommand
+
+from ...models import QueuedMail
+
+
+class Command(NoArgsCommand):
+    """
+    A management command which deletes old sent and failed mails from the database.
+    Calls ``QueuedMail.objects.delete_old_mails()``, which
+    contains the actual logic for determining which mails are deleted.
+    """
+
+    help = "Delete old sent and failed mails from the database"
+
+    def handle_noargs(self, **options):
+        """
+        Command handler.
+        :param options: Not used.
+        :return: None.
+        """
+        QueuedMail.objects.delete_old_mails()
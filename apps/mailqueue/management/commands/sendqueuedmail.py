@@ -0,0 +1,82 @@
+"""
+Management command to send queued mails.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.dbmutex import (MutexLock,
+                          AlreadyLockedError,
+                          LockTimeoutError)
+
+from ...engine import QueuedMailSender
+from ...models import QueuedMail
+from ...settings import (MAILQUEUE_BATCH_SIZE,
+                         MAILQUEUE_MAX_RUN_TIME_SEC,
+                         MAILQUEUE_MUTEX_NAME)
+
+
+class Command(BaseCommand):
+    """
+    A management command which send all queued mails ready to be sent, as batch over a single connection.
+    Only one instance of this command can run at the same time (using a database mutex lock), so it can be safely
+    started by a CRON job every minute.
+    """
+
+    help = "Send queued mails"
+
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--batch-size',
+                            type=int,
+                            dest='batch_size',
+                            default=MAILQUEUE_BATCH_SIZE,
+                            help='Number of mails fetched from the queue per batch.')
+        parser.add_argument('--max-batches',
+                            type=int,
+                            dest='max_batches',
+                            default=None,
+                            help='Maximum number of batches to be sent.')
+        parser.add_argument('--max-time',
+                            type=int,
+                            dest='max_time',
+                            default=MAILQUEUE_MAX_RUN_TIME_SEC,
+                            help='Maximum duration of the run in seconds, must be below the mutex lock '
+                                 'expiration delay.')
+        parser.add_argument('--requeue-failed',
+                            action='store_true',
+                            dest='requeue_failed',
+                            default=False,
+                            help='Put back all failed mails in the queue before sending.')
+
+    def handle(self, *args, **options):
+        """
+        Command handler.
+        :param args: Not used.
+        :param options: Command options.
+        :return: None.
+        """
+        if options['requeue_failed']:
+            QueuedMail.objects.requeue_failed()
+
+        sender = QueuedMailSender(batch_size=options['batch_size'],
+                                  max_batches=options['max_batches'],
+                                  max_time=options['max_time'])
+        try:
+            with MutexLock(MAILQUEUE_MUTEX_NAME):
+                stats = sender.run()
+        except AlreadyLockedError:
+            if options['verbosity']:
+                self.stdout.write('Another instance is already sending queued mails')
+            return
+        except LockTimeoutError:
+            stats = sender.get_stats()
+
+        if options['verbosity']:
+            self.stdout.write('%(sent)d mail(s) sent, %(deferred)d deferred, %(failed)d failed '
+                              'in %(elapsed_time).1fs (%(rate).1f mails/s)' % stats)
+            if options['verbosity'] > 1:
+                self.stdout.write('Queue: %(queued)d queued (%(ready)d ready), %(sent)d sent, '
+                                  '%(failed)d failed' % QueuedMail.objects.get_stats())
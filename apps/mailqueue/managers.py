@@ -0,0 +1,99 @@
+"""
+Data models managers for the mail queue app.
+"""
+
+import datetime
+
+from django.db import models
+from django.utils import timezone
+
+from .constants import (MAIL_STATUS_QUEUED,
+                        MAIL_STATUS_SENT,
+                        MAIL_STATUS_FAILED,
+                        MAIL_PRIORITY_HEADER)
+from .settings import (MAILQUEUE_DEFAULT_PRIORITY,
+                       MAILQUEUE_SENT_TTL_TIMEOUT_DAYS,
+                       MAILQUEUE_FAILED_TTL_TIMEOUT_DAYS)
+
+
+class QueuedMailManager(models.Manager):
+    """
+    Manager class for the ``QueuedMail`` data model.
+    """
+
+    use_for_related_fields = True
+
+    def make_queued_mail(self, email_message, priority=None):
+        """
+        Create (without saving) a new queued mail for the given message.
+        The priority can also be set using the ``X-Mail-Queue-Priority`` message header.
+        :param email_message: The ``EmailMessage`` instance to be queued.
+        :param priority: The mail priority, default to the priority header or ``MAILQUEUE_DEFAULT_PRIORITY``.
+        :return: The ``QueuedMail`` instance (not saved).
+        """
+        header_priority = email_message.extra_headers.pop(MAIL_PRIORITY_HEADER, None)
+        if priority is None:
+            priority = int(header_priority) if header_priority is not None else MAILQUEUE_DEFAULT_PRIORITY
+        queued_mail = self.model(priority=priority,
+                                 subject=email_message.subject[:255],
+                                 recipients=', '.join(email_message.recipients()))
+        queued_mail.set_email_message(email_message)
+        return queued_mail
+
+    def enqueue(self, email_messages, priority=None):
+        """
+        Queue the given messages, using a single query.
+        :param email_messages: The list of ``EmailMessage`` instances to be queued.
+        :param priority: The mail priority, see ``make_queued_mail()``.
+        :return: The number of messages queued.
+        """
+        queued_mails = [self.make_queued_mail(email_message, priority)
+                        for email_message in email_messages if email_message.recipients()]
+        self.bulk_create(queued_mails)
+        return len(queued_mails)
+
+    def ready_to_send(self):
+        """
+        Return all queued mails ready to be sent, by priority and queue order.
+        """
+        return self.filter(status=MAIL_STATUS_QUEUED,
+                           next_attempt_date__lte=timezone.now()).order_by('priority', 'next_attempt_date', 'pk')
+
+    def requeue_failed(self, queryset=None):
+        """
+        Put back all failed (dead-letter) mails in the queue, with a fresh attempts counter.
+        :param queryset: The queryset to be processed, if None all failed mails are processed.
+        :return: The number of mails put back in the queue.
+        """
+        if queryset is None:
+            queryset = self.all()
+        return queryset.filter(status=MAIL_STATUS_FAILED).update(status=MAIL_STATUS_QUEUED,
+                                                                 nb_attempts=0,
+                                                                 next_attempt_date=timezone.now())
+
+    def get_stats(self):
+        """
+        Return the number of mails by status, plus the number of queued mails ready to be sent.
+        :return: A dictionary ``{'queued', 'ready', 'sent', 'failed'}``.
+        """
+        counts = dict(self.values_list('status').annotate(count=models.Count('pk')).order_by())
+        return {
+            'queued': counts.get(MAIL_STATUS_QUEUED, 0),
+            'ready': self.ready_to_send().count(),
+            'sent': counts.get(MAIL_STATUS_SENT, 0),
+            'failed': counts.get(MAIL_STATUS_FAILED, 0),
+        }
+
+    def delete_old_mails(self, queryset=None):
+        """
+        Delete old sent and failed mails.
+        :param queryset: The queryset to be processed, if None all mails are processed.
+        :return: None
+        """
+        if queryset is None:
+            queryset = self.all()
+        now = timezone.now()
+        sent_threshold = now - datetime.timedelta(days=MAILQUEUE_SENT_TTL_TIMEOUT_DAYS)
+        failed_threshold = now - datetime.timedelta(days=MAILQUEUE_FAILED_TTL_TIMEOUT_DAYS)
+        queryset.filter(status=MAIL_STATUS_SENT, last_attempt_date__lte=sent_threshold).delete()
+        queryset.filter(status=MAIL_STATUS_FAILED, last_attempt_date__lte=failed_threshold).delete()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedMail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(0, 'High'), (1, 'Normal'), (2, 'Low')], default=1, verbose_name='Priority')),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'Queued'), (1, 'Sent'), (2, 'Failed')], default=0, editable=False, verbose_name='Status')),
+                ('subject', models.CharField(editable=False, max_length=255, verbose_name='Subject')),
+                ('recipients', models.TextField(editable=False, verbose_name='Recipients')),
+                ('message_data', models.TextField(editable=False, verbose_name='Message data')),
+                ('creation_date', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Creation date')),
+                ('next_attempt_date', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Next attempt date')),
+                ('last_attempt_date', models.DateTimeField(blank=True, default=None, editable=False, null=True, verbose_name='Last attempt date')),
+                ('nb_attempts', models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Number of attempts')),
+                ('last_error', models.TextField(blank=True, default='', editable=False, verbose_name='Last error')),
+            ],
+            options={
+                'verbose_name': 'Queued mail',
+                'verbose_name_plural': 'Queued mails',
+                'ordering': ('-creation_date',),
+                'get_latest_by': 'creation_date',
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='queuedmail',
+            index_together=set([('status', 'priority', 'next_attempt_date')]),
+        ),
+    ]
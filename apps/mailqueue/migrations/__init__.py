@@ -0,0 +1,3 @@
+"""
+Migrations for the mail queue app.
+"""
@@ -0,0 +1,135 @@
+"""
+Data models for the mail queue app.
+"""
+
+import base64
+import pickle
+import datetime
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from .managers import QueuedMailManager
+from .constants import (MAIL_PRIORITY_CHOICES,
+                        MAIL_PRIORITY_NORMAL,
+                        MAIL_STATUS_CHOICES,
+                        MAIL_STATUS_QUEUED,
+                        MAIL_STATUS_SENT,
+                        MAIL_STATUS_FAILED)
+from .settings import (MAILQUEUE_MAX_ATTEMPTS,
+                       MAILQUEUE_RETRY_BASE_DELAY_SEC,
+                       MAILQUEUE_RETRY_MAX_DELAY_SEC)
+
+
+class QueuedMail(models.Model):
+    """
+    A queued mail data model.
+    A queued mail is made of:
+    - a priority (HIGH, NORMAL, LOW),
+    - a status (QUEUED, SENT, FAILED),
+    - the subject and recipients of the mail (for display purpose only),
+    - the serialized ``EmailMessage`` instance,
+    - some sending attempts information (number of attempts, date of the next and last attempt, last error).
+    """
+
+    priority = models.PositiveSmallIntegerField(_('Priority'),
+                                                choices=MAIL_PRIORITY_CHOICES,
+                                                default=MAIL_PRIORITY_NORMAL)
+
+    status = models.PositiveSmallIntegerField(_('Status'),
+                                              choices=MAIL_STATUS_CHOICES,
+                                              default=MAIL_STATUS_QUEUED,
+                                              editable=False)
+
+    subject = models.CharField(_('Subject'),
+                               max_length=255,
+                               editable=False)
+
+    recipients = models.TextField(_('Recipients'),
+                                  editable=False)
+
+    message_data = models.TextField(_('Message data'),
+                                    editable=False)
+
+    creation_date = models.DateTimeField(_('Creation date'),
+                                         default=timezone.now,
+                                         editable=False)
+
+    next_attempt_date = models.DateTimeField(_('Next attempt date'),
+                                             default=timezone.now,
+                                             editable=False)
+
+    last_attempt_date = models.DateTimeField(_('Last attempt date'),
+                                             default=None,
+                                             null=True,
+                                             blank=True,
+                                             editable=False)
+
+    nb_attempts = models.PositiveSmallIntegerField(_('Number of attempts'),
+                                                   default=0,
+                                                   editable=False)
+
+    last_error = models.TextField(_('Last error'),
+                                  default='',
+                                  blank=True,
+                                  editable=False)
+
+    objects = QueuedMailManager()
+
+    class Meta:
+        verbose_name = _('Queued mail')
+        verbose_name_plural = _('Queued mails')
+        get_latest_by = 'creation_date'
+        ordering = ('-creation_date', )
+        index_together = (
+            ('status', 'priority', 'next_attempt_date'),
+        )
+
+    def __str__(self):
+        return '%s (%s)' % (self.subject, self.recipients)
+
+    def set_email_message(self, email_message):
+        """
+        Serialize and store the given message.
+        :param email_message: The ``EmailMessage`` instance.
+        """
+        connection = email_message.connection
+        email_message.connection = None
+        try:
+            self.message_data = base64.b64encode(pickle.dumps(email_message, pickle.HIGHEST_PROTOCOL)).decode('ascii')
+        finally:
+            email_message.connection = connection
+
+    def get_email_message(self):
+        """
+        Return the stored ``EmailMessage`` instance.
+        """
+        return pickle.loads(base64.b64decode(self.message_data.encode('ascii')))
+
+    def mark_as_sent(self):
+        """
+        Mark this mail as sent.
+        """
+        self.status = MAIL_STATUS_SENT
+        self.nb_attempts += 1
+        self.last_attempt_date = timezone.now()
+        self.last_error = ''
+        self.save(update_fields=('status', 'nb_attempts', 'last_attempt_date', 'last_error'))
+
+    def mark_as_deferred(self, error):
+        """
+        Record a failed sending attempt. The next attempt is delayed using an exponential backoff, or the mail is
+        marked as failed (dead-letter) after ``MAILQUEUE_MAX_ATTEMPTS`` attempts.
+        :param error: The error message.
+        """
+        now = timezone.now()
+        self.nb_attempts += 1
+        self.last_attempt_date = now
+        self.last_error = error
+        if self.nb_attempts >= MAILQUEUE_MAX_ATTEMPTS:
+            self.status = MAIL_STATUS_FAILED
+        else:
+            delay = min(MAILQUEUE_RETRY_BASE_DELAY_SEC * 2 ** (self.nb_attempts - 1), MAILQUEUE_RETRY_MAX_DELAY_SEC)
+            self.next_attempt_date = now + datetime.timedelta(seconds=delay)
+        self.save(update_fields=('status', 'nb_attempts', 'last_attempt_date', 'next_attempt_date', 'last_error'))
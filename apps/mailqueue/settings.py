@@ -0,0 +1,38 @@
+"""
+Custom settings for the mail queue app.
+"""
+
+from django.conf import settings
+
+
+# Email backend used for actually sending queued mails
+MAILQUEUE_EMAIL_BACKEND = getattr(settings, 'MAILQUEUE_EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+
+# Default priority of queued mails (0 high, 1 normal, 2 low)
+MAILQUEUE_DEFAULT_PRIORITY = getattr(settings, 'MAILQUEUE_DEFAULT_PRIORITY', 1)
+
+# Number of mails sent per batch by the ``sendqueuedmail`` command
+MAILQUEUE_BATCH_SIZE = getattr(settings, 'MAILQUEUE_BATCH_SIZE', 100)
+
+# Maximum duration in seconds of a single run of the ``sendqueuedmail`` command (default 10min). Must be below the
+# expiration delay of the database mutex lock (``MUTEX_LOCK_EXPIRATION_DELAY_SEC``), otherwise another instance can
+# start sending the same mails once the lock has expired.
+MAILQUEUE_MAX_RUN_TIME_SEC = getattr(settings, 'MAILQUEUE_MAX_RUN_TIME_SEC', 10 * 60)
+
+# Maximum number of sending attempts before a mail is marked as failed (dead-letter)
+MAILQUEUE_MAX_ATTEMPTS = getattr(settings, 'MAILQUEUE_MAX_ATTEMPTS', 5)
+
+# Delay in seconds before the first retry, doubled after each failed attempt (default 1min)
+MAILQUEUE_RETRY_BASE_DELAY_SEC = getattr(settings, 'MAILQUEUE_RETRY_BASE_DELAY_SEC', 60)
+
+# Maximum delay in seconds between two attempts (default 6 hours)
+MAILQUEUE_RETRY_MAX_DELAY_SEC = getattr(settings, 'MAILQUEUE_RETRY_MAX_DELAY_SEC', 6 * 60 * 60)
+
+# Number of days before a sent mail is deleted
+MAILQUEUE_SENT_TTL_TIMEOUT_DAYS = getattr(settings, 'MAILQUEUE_SENT_TTL_TIMEOUT_DAYS', 7)
+
+# Number of days before a failed mail is deleted
+MAILQUEUE_FAILED_TTL_TIMEOUT_DAYS = getattr(settings, 'MAILQUEUE_FAILED_TTL_TIMEOUT_DAYS', 31)
+
+# Name of the database mutex lock used by the ``sendqueuedmail`` command
+MAILQUEUE_MUTEX_NAME = getattr(settings, 'MAILQUEUE_MUTEX_NAME', 'mailqueue')
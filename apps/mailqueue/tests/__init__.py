@@ -0,0 +1,3 @@
+"""
+Tests suite for the mail queue app.
+"""
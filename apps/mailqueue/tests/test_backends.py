@@ -0,0 +1,32 @@
+"""
+Tests suite for the email backend of the mail queue app.
+"""
+
+from django.test import TestCase, override_settings
+from django.core.mail import send_mail
+
+from ..models import QueuedMail
+
+
+@override_settings(EMAIL_BACKEND='apps.mailqueue.backends.DbQueueEmailBackend')
+class DbQueueEmailBackendTestCase(TestCase):
+    """
+    Tests suite for the ``DbQueueEmailBackend`` email backend.
+    """
+
+    def test_send_mail(self):
+        """
+        Test sending a mail using the backend.
+        """
+        self.assertEqual(send_mail('Hello', 'Hello World!', 'noreply@example.com', ['john.doe@example.com']), 1)
+        queued_mail = QueuedMail.objects.get()
+        self.assertEqual(queued_mail.subject, 'Hello')
+        self.assertEqual(queued_mail.recipients, 'john.doe@example.com')
+        self.assertEqual(queued_mail.get_email_message().body, 'Hello World!')
+
+    def test_send_mail_no_recipients(self):
+        """
+        Test sending a mail without recipients using the backend.
+        """
+        self.assertEqual(send_mail('Hello', 'Hello World!', 'noreply@example.com', []), 0)
+        self.assertFalse(QueuedMail.objects.exists())
@@ -0,0 +1,96 @@
+"""
+Tests suite for the sending engine of the mail queue app.
+"""
+
+import smtplib
+from unittest import mock
+
+from django.test import TestCase
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+
+from ..engine import QueuedMailSender
+from ..models import QueuedMail
+from ..constants import (MAIL_PRIORITY_HIGH,
+                         MAIL_PRIORITY_LOW,
+                         MAIL_STATUS_QUEUED,
+                         MAIL_STATUS_SENT)
+
+
+class QueuedMailSenderTestCase(TestCase):
+    """
+    Tests suite for the ``QueuedMailSender`` class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        QueuedMail.objects.enqueue([EmailMessage('Low %d' % i, 'Body', 'noreply@example.com', ['john@example.com'])
+                                    for i in range(3)], priority=MAIL_PRIORITY_LOW)
+        QueuedMail.objects.enqueue([EmailMessage('High', 'Body', 'noreply@example.com', ['jane@example.com'])],
+                                   priority=MAIL_PRIORITY_HIGH)
+
+    def _get_sender(self, **kwargs):
+        """
+        Create a new sender using the local memory backend.
+        """
+        return QueuedMailSender(backend='django.core.mail.backends.locmem.EmailBackend', **kwargs)
+
+    def test_run(self):
+        """
+        Test sending all queued mails.
+        """
+        stats = self._get_sender(batch_size=2).run()
+        self.assertEqual(stats['sent'], 4)
+        self.assertEqual(stats['deferred'], 0)
+        self.assertEqual([m.subject for m in mail.outbox], ['High', 'Low 0', 'Low 1', 'Low 2'])
+        self.assertEqual(QueuedMail.objects.filter(status=MAIL_STATUS_SENT).count(), 4)
+
+    def test_max_batches(self):
+        """
+        Test sending a limited number of batches.
+        """
+        stats = self._get_sender(batch_size=2, max_batches=1).run()
+        self.assertEqual(stats['sent'], 2)
+        self.assertEqual(QueuedMail.objects.filter(status=MAIL_STATUS_QUEUED).count(), 2)
+
+    def test_max_time(self):
+        """
+        Test that the run stops once the maximum duration is reached, leaving the remaining mails in the queue.
+        """
+        with mock.patch('apps.mailqueue.engine.time') as mock_time:
+            mock_time.time.side_effect = [0, 0, 0, 5, 10, 10, 10]
+            stats = self._get_sender(batch_size=10, max_time=10).run()
+        self.assertEqual(stats['sent'], 2)
+        self.assertEqual([m.subject for m in mail.outbox], ['High', 'Low 0'])
+        self.assertEqual(QueuedMail.objects.filter(status=MAIL_STATUS_QUEUED).count(), 2)
+
+    def test_single_connection(self):
+        """
+        Test that a single connection is opened for all mails.
+        """
+        with mock.patch.object(EmailBackend, 'open') as open_method:
+            self._get_sender().run()
+        self.assertEqual(open_method.call_count, 1)
+
+    def test_failure(self):
+        """
+        Test that failed mails are deferred and do not block the queue.
+        """
+        original_send_messages = EmailBackend.send_messages
+
+        def send_messages(backend, email_messages):
+            if email_messages[0].subject == 'High':
+                raise smtplib.SMTPRecipientsRefused({})
+            return original_send_messages(backend, email_messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', send_messages):
+            stats = self._get_sender().run()
+        self.assertEqual(stats['sent'], 3)
+        self.assertEqual(stats['deferred'], 1)
+        failed_mail = QueuedMail.objects.get(subject='High')
+        self.assertEqual(failed_mail.status, MAIL_STATUS_QUEUED)
+        self.assertEqual(failed_mail.nb_attempts, 1)
+        self.assertIn('SMTPRecipientsRefused', failed_mail.last_error)
@@ -0,0 +1,147 @@
+"""
+Tests suite for the data models of the mail queue app.
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+from ..models import QueuedMail
+from ..constants import (MAIL_PRIORITY_HIGH,
+                         MAIL_PRIORITY_LOW,
+                         MAIL_PRIORITY_HEADER,
+                         MAIL_STATUS_QUEUED,
+                         MAIL_STATUS_SENT,
+                         MAIL_STATUS_FAILED)
+from ..settings import (MAILQUEUE_DEFAULT_PRIORITY,
+                        MAILQUEUE_MAX_ATTEMPTS,
+                        MAILQUEUE_RETRY_BASE_DELAY_SEC,
+                        MAILQUEUE_SENT_TTL_TIMEOUT_DAYS)
+
+
+class QueuedMailModelTestCase(TestCase):
+    """
+    Tests suite for the ``QueuedMail`` data model class.
+    """
+
+    def _get_message(self, subject='Hello', **kwargs):
+        """
+        Create a new message for testing.
+        :return: The newly created message.
+        """
+        email_message = EmailMultiAlternatives(subject, 'Hello World!', 'noreply@example.com',
+                                               ['john.doe@example.com'], **kwargs)
+        email_message.attach_alternative('<p>Hello World!</p>', 'text/html')
+        return email_message
+
+    def test_str_method(self):
+        """
+        Test the ``__str__`` method.
+        """
+        queued_mail = QueuedMail.objects.make_queued_mail(self._get_message())
+        self.assertEqual(str(queued_mail), 'Hello (john.doe@example.com)')
+
+    def test_email_message_serialization(self):
+        """
+        Test the ``set_email_message`` and ``get_email_message`` methods.
+        """
+        queued_mail = QueuedMail.objects.make_queued_mail(self._get_message())
+        queued_mail.save()
+        queued_mail.refresh_from_db()
+        email_message = queued_mail.get_email_message()
+        self.assertEqual(email_message.subject, 'Hello')
+        self.assertEqual(email_message.body, 'Hello World!')
+        self.assertEqual(email_message.to, ['john.doe@example.com'])
+        self.assertEqual(email_message.alternatives, [('<p>Hello World!</p>', 'text/html')])
+
+    def test_enqueue(self):
+        """
+        Test the ``enqueue`` manager method.
+        """
+        self.assertEqual(QueuedMail.objects.enqueue([self._get_message(), self._get_message()]), 2)
+        self.assertEqual(QueuedMail.objects.filter(status=MAIL_STATUS_QUEUED,
+                                                   priority=MAILQUEUE_DEFAULT_PRIORITY).count(), 2)
+
+    def test_enqueue_priority_header(self):
+        """
+        Test the priority message header.
+        """
+        email_message = self._get_message(headers={MAIL_PRIORITY_HEADER: str(MAIL_PRIORITY_HIGH)})
+        QueuedMail.objects.enqueue([email_message])
+        queued_mail = QueuedMail.objects.get()
+        self.assertEqual(queued_mail.priority, MAIL_PRIORITY_HIGH)
+        self.assertNotIn(MAIL_PRIORITY_HEADER, queued_mail.get_email_message().extra_headers)
+
+    def test_ready_to_send(self):
+        """
+        Test the ``ready_to_send`` manager method.
+        """
+        QueuedMail.objects.enqueue([self._get_message('Low')], priority=MAIL_PRIORITY_LOW)
+        QueuedMail.objects.enqueue([self._get_message('High')], priority=MAIL_PRIORITY_HIGH)
+        QueuedMail.objects.enqueue([self._get_message('Later')], priority=MAIL_PRIORITY_HIGH)
+        QueuedMail.objects.filter(subject='Later').update(next_attempt_date=timezone.now() + timedelta(hours=1))
+        self.assertEqual([m.subject for m in QueuedMail.objects.ready_to_send()], ['High', 'Low'])
+
+    def test_mark_as_sent(self):
+        """
+        Test the ``mark_as_sent`` method.
+        """
+        QueuedMail.objects.enqueue([self._get_message()])
+        queued_mail = QueuedMail.objects.get()
+        queued_mail.mark_as_sent()
+        queued_mail.refresh_from_db()
+        self.assertEqual(queued_mail.status, MAIL_STATUS_SENT)
+        self.assertEqual(queued_mail.nb_attempts, 1)
+        self.assertIsNotNone(queued_mail.last_attempt_date)
+
+    def test_mark_as_deferred(self):
+        """
+        Test the ``mark_as_deferred`` method (exponential backoff).
+        """
+        QueuedMail.objects.enqueue([self._get_message()])
+        queued_mail = QueuedMail.objects.get()
+        queued_mail.mark_as_deferred('Error 1')
+        self.assertEqual(queued_mail.status, MAIL_STATUS_QUEUED)
+        self.assertEqual(queued_mail.last_error, 'Error 1')
+        first_delay = queued_mail.next_attempt_date - queued_mail.last_attempt_date
+        self.assertEqual(first_delay, timedelta(seconds=MAILQUEUE_RETRY_BASE_DELAY_SEC))
+        queued_mail.mark_as_deferred('Error 2')
+        second_delay = queued_mail.next_attempt_date - queued_mail.last_attempt_date
+        self.assertEqual(second_delay, first_delay * 2)
+
+    def test_mark_as_deferred_dead_letter(self):
+        """
+        Test the ``mark_as_deferred`` method after too many attempts.
+        """
+        QueuedMail.objects.enqueue([self._get_message()])
+        queued_mail = QueuedMail.objects.get()
+        for _ in range(MAILQUEUE_MAX_ATTEMPTS):
+            queued_mail.mark_as_deferred('Error')
+        queued_mail.refresh_from_db()
+        self.assertEqual(queued_mail.status, MAIL_STATUS_FAILED)
+        self.assertEqual(QueuedMail.objects.get_stats()['failed'], 1)
+        self.assertEqual(QueuedMail.objects.requeue_failed(), 1)
+        self.assertEqual(QueuedMail.objects.ready_to_send().count(), 1)
+
+    def test_get_stats(self):
+        """
+        Test the ``get_stats`` manager method.
+        """
+        QueuedMail.objects.enqueue([self._get_message(), self._get_message()])
+        QueuedMail.objects.all()[0].mark_as_sent()
+        self.assertEqual(QueuedMail.objects.get_stats(), {'queued': 1, 'ready': 1, 'sent': 1, 'failed': 0})
+
+    def test_delete_old_mails(self):
+        """
+        Test the ``delete_old_mails`` manager method.
+        """
+        QueuedMail.objects.enqueue([self._get_message(), self._get_message()])
+        QueuedMail.objects.update(status=MAIL_STATUS_SENT, last_attempt_date=timezone.now())
+        old_mail = QueuedMail.objects.all()[0]
+        threshold = timezone.now() - timedelta(days=MAILQUEUE_SENT_TTL_TIMEOUT_DAYS, seconds=1)
+        QueuedMail.objects.filter(pk=old_mail.pk).update(last_attempt_date=threshold)
+        QueuedMail.objects.delete_old_mails()
+        self.assertEqual(QueuedMail.objects.count(), 1)
+        self.assertFalse(QueuedMail.objects.filter(pk=old_mail.pk).exists())
@@ -7,7 +7,8 @@ from django.core.urlresolvers import reverse
 from django.utils.translation import ugettext_lazy as _
 
 from .models import (Notification,
-                     NotificationsUserProfile)
+                     NotificationsUserProfile,
+                     NotificationEvent)
 
 
 class NotificationAdmin(admin.ModelAdmin):
@@ -103,5 +104,46 @@ class NotificationsUserProfileAdmin(admin.ModelAdmin):
     user_username.admin_order_field = 'user__username'
 
 
+class NotificationEventAdmin(admin.ModelAdmin):
+    """
+    Custom admin model for the ``NotificationEvent`` model.
+    """
+
+    list_select_related = ('content_type', )
+
+    list_display = ('event_type',
+                    'content_type',
+                    'object_id',
+                    'creation_date',
+                    'nb_attempts',
+                    'failed')
+
+    list_filter = ('failed',
+                   'event_type',
+                   'creation_date')
+
+    search_fields = ('event_type',
+                     'last_error')
+
+    raw_id_fields = ('excluded_user', )
+
+    readonly_fields = ('creation_date',
+                       'nb_attempts',
+                       'last_error')
+
+    actions = ['requeue_failed_events']
+
+    def requeue_failed_events(self, request, queryset):
+        """
+        Put back the selected failed events in the queue.
+        :param request: The current request.
+        :param queryset: The selected events.
+        """
+        nb_events = NotificationEvent.objects.requeue_failed(queryset)
+        self.message_user(request, _('%d failed event(s) put back in the queue.') % nb_events)
+    requeue_failed_events.short_description = _('Put back selected failed events in the queue')
+
+
 admin.site.register(Notification, NotificationAdmin)
 admin.site.register(NotificationsUserProfile, NotificationsUserProfileAdmin)
+admin.site.register(NotificationEvent, NotificationEventAdmin)
@@ -0,0 +1,138 @@
+"""
+Notification events processing for the notifications app.
+
+Apps register a handler for each of their event types, usually in their ``notifications`` module::
+
+    register_event_handler('forum.new_thread', send_new_forum_thread_notifications)
+
+A handler is called with the event's target object, the current request (None when called by the
+``processnotificationevents`` command) and the user to be excluded from the notification list.
+"""
+
+import time
+
+from django.db import transaction
+from django.utils.module_loading import autodiscover_modules
+
+from .models import NotificationEvent
+from .settings import (NOTIFICATIONS_EVENTS_BATCH_SIZE,
+                       NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC)
+
+
+# Registered event handlers, by event type
+_event_handlers = {}
+
+
+def register_event_handler(event_type, handler):
+    """
+    Register the handler of the given event type.
+    :param event_type: The event type name, prefixed by the app name by convention (ex. "forum.new_thread").
+    :param handler: The handler callable, ``handler(target, request, excluded_user)``.
+    """
+    _event_handlers[event_type] = handler
+
+
+def get_event_handler(event_type):
+    """
+    Return the handler of the given event type.
+    :param event_type: The event type name.
+    :raise LookupError: If no handler is registered for the given event type.
+    """
+    try:
+        return _event_handlers[event_type]
+    except KeyError:
+        raise LookupError('No handler registered for notification event "%s"' % event_type)
+
+
+def autodiscover_event_handlers():
+    """
+    Import the ``notifications`` module of all installed apps, to register their event handlers.
+    """
+    autodiscover_modules('notifications')
+
+
+class NotificationEventProcessor(object):
+    """
+    Expand pending notification events into notifications, batch after batch.
+    """
+
+    def __init__(self, batch_size=NOTIFICATIONS_EVENTS_BATCH_SIZE,
+                 max_batches=None,
+                 max_time=NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC):
+        """
+        Create a new notification events processor.
+        :param batch_size: The number of events fetched per batch.
+        :param max_batches: The maximum number of batches to be processed, None for no limit.
+        :param max_time: The maximum duration of a run in seconds, None for no limit. Pending events are not claimed
+        while being processed, so the run must end before the expiration of the mutex lock of the processing command.
+        """
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.max_time = max_time
+        self.nb_processed = 0
+        self.nb_skipped = 0
+        self.nb_errors = 0
+        self.elapsed_time = 0
+
+    def process_event(self, event):
+        """
+        Process a single event. Notifications are created and the event deleted in the same transaction.
+        Events whose target object does not exist anymore are deleted without further processing.
+        :param event: The ``NotificationEvent`` instance.
+        :return: True if the event was processed, False otherwise.
+        """
+        try:
+            with transaction.atomic():
+                target = event.content_object
+                if target is None:
+                    self.nb_skipped += 1
+                else:
+                    get_event_handler(event.event_type)(target, None, event.excluded_user)
+                    self.nb_processed += 1
+                event.delete()
+        except Exception as e:
+            event.mark_as_failed('%s: %s' % (type(e).__name__, e))
+            self.nb_errors += 1
+            return False
+        return True
+
+    def run(self):
+        """
+        Process all pending events, oldest first, until the maximum number of batches or the maximum duration of the
+        run is reached. Events failing during the run are not retried before the next run.
+        :return: The processing statistics, see ``get_stats()``.
+        """
+        start_time = time.time()
+        deadline = start_time + self.max_time if self.max_time is not None else None
+        nb_batches = 0
+        last_pk = 0
+        try:
+            while self.max_batches is None or nb_batches < self.max_batches:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                batch = list(NotificationEvent.objects.pending().filter(pk__gt=last_pk)
+                             .select_related('excluded_user')[:self.batch_size])
+                if not batch:
+                    break
+                for event in batch:
+                    # Remaining events are left pending for the next run
+                    if deadline is not None and time.time() >= deadline:
+                        break
+                    self.process_event(event)
+                    last_pk = event.pk
+                nb_batches += 1
+        finally:
+            self.elapsed_time = time.time() - start_time
+        return self.get_stats()
+
+    def get_stats(self):
+        """
+        Return the processing statistics of this processor.
+        :return: A dictionary ``{'processed', 'skipped', 'errors', 'elapsed_time'}``.
+        """
+        return {
+            'processed': self.nb_processed,
+            'skipped': self.nb_skipped,
+            'errors': self.nb_errors,
+            'elapsed_time': self.elapsed_time,
+        }
@@ -0,0 +1,110 @@
+"""
+Management command to process pending notification events.
+"""
+
+import time
+
+from django.core.management.base import (BaseCommand,
+                                         CommandError)
+
+from apps.dbmutex import (MutexLock,
+                          AlreadyLockedError,
+                          LockTimeoutError)
+
+from ...events import (NotificationEventProcessor,
+                       autodiscover_event_handlers)
+from ...models import NotificationEvent
+from ...settings import (NOTIFICATIONS_EVENTS_BATCH_SIZE,
+                         NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC,
+                         NOTIFICATIONS_EVENTS_MUTEX_NAME)
+
+
+class Command(BaseCommand):
+    """
+    A management command which expand all pending notification events into notifications and mails.
+    Only one instance of this command can process events at the same time (using a database mutex lock), so it can
+    be safely started by a CRON job every minute, or run as a long-lived worker with ``--loop``.
+    """
+
+    help = "Process pending notification events"
+
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--batch-size',
+                            type=int,
+                            dest='batch_size',
+                            default=NOTIFICATIONS_EVENTS_BATCH_SIZE,
+                            help='Number of events fetched per batch.')
+        parser.add_argument('--max-time',
+                            type=int,
+                            dest='max_time',
+                            default=NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC,
+                            help='Maximum duration of a run in seconds, must be below the mutex lock '
+                                 'expiration delay.')
+        parser.add_argument('--loop',
+                            action='store_true',
+                            dest='loop',
+                            default=False,
+                            help='Keep running and poll for new events.')
+        parser.add_argument('--interval',
+                            type=float,
+                            dest='interval',
+                            default=5,
+                            help='Delay in seconds between two polls in loop mode.')
+        parser.add_argument('--requeue-failed',
+                            action='store_true',
+                            dest='requeue_failed',
+                            default=False,
+                            help='Put back all failed events in the queue before processing.')
+
+    def write_stats(self, stats, verbosity):
+        """
+        Write the given processing statistics.
+        :param stats: The processing statistics.
+        :param verbosity: The verbosity level.
+        """
+        if verbosity:
+            self.stdout.write('%(processed)d event(s) processed, %(skipped)d skipped, %(errors)d error(s) '
+                              'in %(elapsed_time).1fs' % stats)
+
+    def handle(self, *args, **options):
+        """
+        Command handler.
+        :param args: Not used.
+        :param options: Command options.
+        :return: None.
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be at least 1')
+        if options['requeue_failed']:
+            NotificationEvent.objects.requeue_failed()
+        autodiscover_event_handlers()
+
+        # The lock is taken for each run (not for the whole loop) and each run is bounded by ``--max-time``, so the
+        # lock is released before its expiration delay (events are not claimed while being processed)
+        try:
+            while True:
+                processor = NotificationEventProcessor(batch_size=options['batch_size'],
+                                                       max_time=options['max_time'])
+                try:
+                    with MutexLock(NOTIFICATIONS_EVENTS_MUTEX_NAME):
+                        processor.run()
+                except AlreadyLockedError:
+                    if not options['loop']:
+                        if options['verbosity']:
+                            self.stdout.write('Another instance is already processing notification events')
+                        return
+                except LockTimeoutError:
+                    pass
+                stats = processor.get_stats()
+                if not options['loop']:
+                    self.write_stats(stats, options['verbosity'])
+                    return
+                if stats['processed'] or stats['skipped'] or stats['errors']:
+                    self.write_stats(stats, options['verbosity'])
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
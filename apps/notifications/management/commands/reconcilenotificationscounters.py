@@ -0,0 +1,26 @@
+"""
+Management command to repair the unread notifications counters.
+"""
+
+from django.core.management.base import NoArgsCommand
+
+from ...models import NotificationsUserProfile
+
+
+class Command(NoArgsCommand):
+    """
+    A management command which recompute the unread notifications counter of all users and fix the drifted ones.
+    Calls ``NotificationsUserProfile.objects.reconcile_unread_notifications_count()``.
+    """
+
+    help = "Recompute the unread notifications counters and fix the drifted ones"
+
+    def handle_noargs(self, **options):
+        """
+        Command handler.
+        :param options: Command options.
+        :return: None.
+        """
+        nb_fixed = NotificationsUserProfile.objects.reconcile_unread_notifications_count()
+        if options['verbosity']:
+            self.stdout.write('%d counter(s) fixed' % nb_fixed)
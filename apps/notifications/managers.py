@@ -4,14 +4,22 @@ Data models managers for the notifications app.
 
 import datetime
 
-from django.db import models
+from django.db import (models,
+                       connections)
+from django.db.models import (F,
+                              Count)
+from django.core.mail import get_connection
 from django.utils import timezone
 from django.utils.translation import override
 from django.template import loader
+from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 
-from .settings import READ_NOTIFICATION_DELETION_TIMEOUT_DAYS
+from .settings import (READ_NOTIFICATION_DELETION_TIMEOUT_DAYS,
+                       NOTIFICATIONS_BULK_BATCH_SIZE,
+                       NOTIFICATIONS_DEFERRED_EVENTS)
 from .signals import (new_notification,
+                      new_notifications,
                       dismiss_notification)
 
 
@@ -83,21 +91,117 @@ class NotificationManager(models.Manager):
         # Return the newly created object
         return new_obj
 
+    def send_notification_to_users(self, request, users,
+                                   title_template_name,
+                                   message_template_name,
+                                   message_template_name_html,
+                                   extra_context=None,
+                                   dismiss_code='',
+                                   use_https=False,
+                                   kwargs_send_mail=None,
+                                   batch_size=NOTIFICATIONS_BULK_BATCH_SIZE):
+        """
+        Send the same notification to all the given users, using a handful of queries.
+        Users profiles are fetched with a single query, the notification text is rendered once per language,
+        notifications are inserted using ``bulk_create`` and mails are sent over a single connection.
+        The ``new_notifications`` signal is sent once per batch (``new_notification`` is also sent for each
+        notification if it has any listener).
+        Unlike ``send_notification_to_user``, the template context cannot depend on the recipient.
+        :param request: The current request.
+        :param users: The notification's recipients, as a queryset or a list of users.
+        :param title_template_name: The notification's title template name to be used.
+        :param message_template_name: The notification's message template name to be used (text version). Only used
+        for the notification email body.
+        :param message_template_name_html: The notification's message template name to be used (HTML version).
+        :param dismiss_code: Dismiss code for this notification.
+        :param extra_context: Extra context arguments to be used when rendering the notification.
+        :param use_https: Set to ``True`` to use HTTPS for urls.
+        :param kwargs_send_mail: Custom kwargs for the make_notification_mail() function.
+        :param batch_size: Number of notifications inserted per query.
+        :return: The list of newly created notifications (inactive users are skipped).
+        """
+
+        # Fetch all active recipients with their profiles using a single query
+        if not isinstance(users, models.QuerySet):
+            users = get_user_model().objects.filter(pk__in=[user.pk for user in users])
+        users = users.filter(is_active=True).select_related('user_profile', 'notifications_profile')
+
+        # Prepare context for the text rendering
+        current_site = get_current_site(request)
+        context = {
+            'domain': current_site.domain,
+            'site_name': current_site.name,
+            'protocol': 'https' if use_https else 'http',
+            }
+        if extra_context:
+            context.update(extra_context)
+
+        # Render the notification text once per language
+        rendered_by_language = {}
+        new_objs = []
+        for user in users:
+            language = user.user_profile.preferred_language
+            if language not in rendered_by_language:
+                with override(language):
+                    rendered_by_language[language] = (loader.render_to_string(title_template_name, context),
+                                                      loader.render_to_string(message_template_name, context),
+                                                      loader.render_to_string(message_template_name_html, context))
+            title, message, message_html = rendered_by_language[language]
+            new_objs.append(self.model(recipient=user, title=title,
+                                       message=message, message_html=message_html,
+                                       dismiss_code=dismiss_code))
+
+        # Create the notifications (one by one if the database cannot return the primary keys of bulk inserts)
+        if getattr(connections[self.db].features, 'can_return_ids_from_bulk_insert', False):
+            for index in range(0, len(new_objs), batch_size):
+                self.bulk_create(new_objs[index:index + batch_size])
+
+            # Update the unread counters (``bulk_create`` bypass ``Notification.save()``)
+            from .models import NotificationsUserProfile
+            NotificationsUserProfile.objects.increment_unread_notifications_count(
+                [new_obj.recipient_id for new_obj in new_objs])
+        else:
+            for new_obj in new_objs:
+                new_obj.save(force_insert=True)
+
+        # Send signals
+        if new_objs:
+            new_notifications.send(sender=NotificationManager, notifications=new_objs)
+            if new_notification.has_listeners(NotificationManager):
+                for new_obj in new_objs:
+                    new_notification.send(sender=NotificationManager, notification=new_obj)
+
+        # Send the notifications by mail (with or without custom args), over a single connection
+        mails = [new_obj.make_notification_mail(request, **(kwargs_send_mail or {}))
+                 for new_obj in new_objs if new_obj.recipient.notifications_profile.send_mail_on_new_notification]
+        if mails:
+            get_connection(fail_silently=True).send_messages(mails)
+
+        # Return the newly created objects
+        return new_objs
+
     def has_unread_notification(self, user):
         """
         Check if the given user has unread notifications.
         :param user: The user to be checked.
         :return: ``True`` if the user has unread notifications, ``False`` otherwise.
         """
-        return self.filter(recipient=user, unread=True).exists()
+        return self.unread_notifications_count(user) > 0
 
     def unread_notifications_count(self, user):
         """
         Return the number of unread notifications for the given user.
+        The number is read from the denormalized counter of the user's profile (primary key lookup), not counted.
         :param user: The user to be checked.
         :return: The number of unread notifications.
         """
-        return self.filter(recipient=user, unread=True).count()
+        from .models import NotificationsUserProfile
+        count = NotificationsUserProfile.objects.filter(user=user) \
+            .values_list('unread_notifications_count', flat=True).first()
+        if count is None:
+            # Profile creation compute the initial value of the counter
+            count = user.notifications_profile.unread_notifications_count
+        return count
 
     def mark_all_notifications_has_read(self, user):
         """
@@ -105,7 +209,10 @@ class NotificationManager(models.Manager):
         :param user: The user to be processed.
         :return: The number of notifications updated.
         """
-        return self.filter(recipient=user).update(unread=False)
+        from .models import NotificationsUserProfile
+        nb_updated = self.filter(recipient=user).update(unread=False)
+        NotificationsUserProfile.objects.filter(user=user).update(unread_notifications_count=0)
+        return nb_updated
 
     def delete_old_notifications(self, queryset=None):
         """
@@ -125,7 +232,116 @@ class NotificationManager(models.Manager):
         :param dismiss_code: The target dismiss code.
         :return: None
         """
-        queryset = self.filter(recipient=user, dismiss_code=dismiss_code)
-        for notification in queryset:
+        notifications = list(self.filter(recipient=user, dismiss_code=dismiss_code, unread=True))
+        self.filter(pk__in=[notification.pk for notification in notifications]).update(unread=False)
+        for notification in notifications:
+            notification.unread = False
             dismiss_notification.send(sender=NotificationManager, notification=notification)
-        queryset.update(unread=False)
+
+
+class NotificationEventManager(models.Manager):
+    """
+    Manager class for the ``NotificationEvent`` data model.
+    """
+
+    use_for_related_fields = True
+
+    def record_event(self, event_type, target, request, excluded_user=None):
+        """
+        Record a new notification event, to be expanded into notifications by the ``processnotificationevents``
+        command. In local mode (``NOTIFICATIONS_DEFERRED_EVENTS`` set to False) the event handler is called right
+        away with the current request and nothing is recorded.
+        :param event_type: The event type, see ``apps.notifications.events.register_event_handler()``.
+        :param target: The event's target object (new post, new thread, new comment, ...).
+        :param request: The current request.
+        :param excluded_user: The user to be excluded from the notification list (usually the event's author).
+        :return: The newly created event, or None in local mode.
+        """
+        if not NOTIFICATIONS_DEFERRED_EVENTS:
+            from .events import get_event_handler
+            get_event_handler(event_type)(target, request, excluded_user)
+            return None
+        return self.create(event_type=event_type,
+                           content_object=target,
+                           excluded_user=excluded_user)
+
+    def pending(self):
+        """
+        Return all events waiting to be processed, oldest first.
+        """
+        return self.filter(failed=False).order_by('pk')
+
+    def requeue_failed(self, queryset=None):
+        """
+        Put back all failed events in the queue, with a fresh attempts counter.
+        :param queryset: The queryset to be processed, if None all failed events are processed.
+        :return: The number of events put back in the queue.
+        """
+        if queryset is None:
+            queryset = self.all()
+        return queryset.filter(failed=True).update(failed=False, nb_attempts=0)
+
+
+class NotificationsUserProfileManager(models.Manager):
+    """
+    Manager class for the ``NotificationsUserProfile`` data model.
+    """
+
+    use_for_related_fields = True
+
+    def increment_unread_notifications_count(self, user_ids, delta=1):
+        """
+        Add ``delta`` to the unread notifications counter of the given users. Missing profiles are created (with
+        an up-to-date counter) and counters never go below zero.
+        :param user_ids: The PK of the users to be updated, can contain duplicates.
+        :param delta: The value to be added to each counter (once per occurrence of the user in ``user_ids``).
+        :return: None
+        """
+        deltas = {}
+        for user_id in user_ids:
+            deltas[user_id] = deltas.get(user_id, 0) + delta
+
+        # Group users by delta value for updating counters with a handful of queries
+        user_ids_by_delta = {}
+        for user_id, user_delta in deltas.items():
+            user_ids_by_delta.setdefault(user_delta, []).append(user_id)
+        for user_delta, delta_user_ids in user_ids_by_delta.items():
+            queryset = self.filter(user_id__in=delta_user_ids)
+            if user_delta < 0:
+                queryset = queryset.filter(unread_notifications_count__gte=-user_delta)
+            nb_updated = queryset.update(unread_notifications_count=F('unread_notifications_count') + user_delta)
+            if nb_updated != len(delta_user_ids):
+                self.reconcile_unread_notifications_count(delta_user_ids)
+
+    def reconcile_unread_notifications_count(self, user_ids=None):
+        """
+        Recompute the unread notifications counter of the given users and fix the drifted ones. Missing profiles of
+        the given users are created.
+        :param user_ids: The PK of the users to be processed, if None all existing profiles are processed.
+        :return: The number of counters fixed.
+        """
+        from .models import Notification
+
+        # Count unread notifications per user, with a single query
+        unread_notifications = Notification.objects.filter(unread=True)
+        profiles = self.all()
+        if user_ids is not None:
+            unread_notifications = unread_notifications.filter(recipient_id__in=user_ids)
+            profiles = profiles.filter(user_id__in=user_ids)
+        actual_counts = dict(unread_notifications.order_by().values_list('recipient_id')
+                             .annotate(count=Count('id')))
+
+        # Fix the drifted counters
+        nb_fixed = 0
+        missing_user_ids = set(user_ids or ())
+        for user_id, count in profiles.values_list('user_id', 'unread_notifications_count'):
+            missing_user_ids.discard(user_id)
+            actual_count = actual_counts.get(user_id, 0)
+            if count != actual_count:
+                self.filter(user_id=user_id).update(unread_notifications_count=actual_count)
+                nb_fixed += 1
+
+        # Create the missing profiles
+        for user_id in missing_user_ids:
+            self.get_or_create(user_id=user_id)
+        return nb_fixed
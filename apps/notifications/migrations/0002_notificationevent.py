@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationEvent',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('event_type', models.CharField(verbose_name='Event type', max_length=100)),
+                ('object_id', models.PositiveIntegerField()),
+                ('creation_date', models.DateTimeField(verbose_name='Creation date', auto_now_add=True)),
+                ('nb_attempts', models.PositiveSmallIntegerField(verbose_name='Number of attempts', default=0)),
+                ('failed', models.BooleanField(verbose_name='Failed', default=False)),
+                ('last_error', models.TextField(verbose_name='Last error', blank=True, default='')),
+                ('content_type', models.ForeignKey(to='contenttypes.ContentType')),
+                ('excluded_user', models.ForeignKey(verbose_name='Excluded user', blank=True, null=True, default=None, related_name='+', on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notification event',
+                'verbose_name_plural': 'Notification events',
+                'ordering': ('-creation_date',),
+                'get_latest_by': 'creation_date',
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='notificationevent',
+            index_together=set([('failed', 'id')]),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import Count
+
+
+def init_unread_notifications_count(apps, schema_editor):
+    """
+    Initialize the unread notifications counter of all existing profiles.
+    """
+    Notification = apps.get_model('notifications', 'Notification')
+    NotificationsUserProfile = apps.get_model('notifications', 'NotificationsUserProfile')
+    unread_counts = Notification.objects.filter(unread=True).order_by().values_list('recipient_id') \
+        .annotate(count=Count('id'))
+    for user_id, count in unread_counts:
+        NotificationsUserProfile.objects.filter(user_id=user_id).update(unread_notifications_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notificationevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationsuserprofile',
+            name='unread_notifications_count',
+            field=models.PositiveIntegerField(verbose_name='Unread notifications count', default=0, editable=False),
+        ),
+        migrations.RunPython(init_unread_notifications_count, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,9 @@ from django.core.mail import EmailMultiAlternatives
 from django.core.urlresolvers import reverse
 from django.contrib import messages
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils.safestring import mark_safe
 from django.utils.translation import override
@@ -16,7 +19,10 @@ from django.template import loader
 
 from apps.tools.fields import AutoOneToOneField
 
-from .managers import NotificationManager
+from .managers import (NotificationManager,
+                       NotificationsUserProfileManager,
+                       NotificationEventManager)
+from .settings import NOTIFICATIONS_EVENTS_MAX_ATTEMPTS
 from .signals import (dismiss_notification,
                       unread_notification)
 
@@ -94,35 +100,33 @@ class Notification(models.Model):
         """
 
         # Save the model
+        adding = self._state.adding
         res = super(Notification, self).save(*args, **kwargs)
 
-        # Detect unread changes
-        if self._old_unread and not self.unread:
+        # Update the recipient's unread counter on creation, detect unread changes otherwise
+        if adding:
+            if self.unread:
+                NotificationsUserProfile.objects.increment_unread_notifications_count([self.recipient_id])
+        elif self._old_unread and not self.unread:
             dismiss_notification.send(sender=Notification, notification=self)
         elif self.unread and not self._old_unread:
             unread_notification.send(sender=Notification, notification=self)
+        self._old_unread = self.unread
 
         # Return super()
         return res
 
-    def send_notification_by_mail(self, request,
-                                  mail_subject_template_name='notifications/email_notification_subject.txt',
-                                  mail_body_template_name='notifications/email_notification_body.txt',
-                                  mail_body_template_name_html='notifications/email_notification_body.html',
-                                  extra_context=None,
-                                  use_https=False,
-                                  from_email=None,
-                                  reply_to=None):
+    def make_notification_mail(self, request,
+                               mail_subject_template_name='notifications/email_notification_subject.txt',
+                               mail_body_template_name='notifications/email_notification_body.txt',
+                               mail_body_template_name_html='notifications/email_notification_body.html',
+                               extra_context=None,
+                               use_https=False,
+                               from_email=None,
+                               reply_to=None):
         """
-        Send the notification to the user by mail.
-        :param request: The current request (used to determine the site domain).
-        :param mail_subject_template_name: The template name to be used for the mail's subject.
-        :param mail_body_template_name: The template name to be used for the mail's body.
-        :param mail_body_template_name_html: The template name to be used for the mail's body (HTML version).
-        :param extra_context: Any extra context for the template.
-        :param use_https: Set to ``True`` if HTTPS must be used for urls.
-        :param from_email: Set to something not None to overwrite the default ``from`` address.
-        :param reply_to: "Reply-to" email address.
+        Craft the mail of this notification, see ``send_notification_by_mail()`` for parameters.
+        :return: The ``EmailMultiAlternatives`` instance (not sent).
         """
 
         # Prepare context for the text rendering
@@ -149,12 +153,41 @@ class Notification(models.Model):
             mail_body = loader.render_to_string(mail_body_template_name, context)
             mail_body_html = loader.render_to_string(mail_body_template_name_html, context)
 
-        # craft the email and send it
+        # craft the email
         email_message = EmailMultiAlternatives(mail_subject,
                                                mail_body, from_email,
                                                [self.recipient.email],
                                                reply_to=reply_to)
         email_message.attach_alternative(mail_body_html, 'text/html')
+        return email_message
+
+    def send_notification_by_mail(self, request,
+                                  mail_subject_template_name='notifications/email_notification_subject.txt',
+                                  mail_body_template_name='notifications/email_notification_body.txt',
+                                  mail_body_template_name_html='notifications/email_notification_body.html',
+                                  extra_context=None,
+                                  use_https=False,
+                                  from_email=None,
+                                  reply_to=None):
+        """
+        Send the notification to the user by mail.
+        :param request: The current request (used to determine the site domain).
+        :param mail_subject_template_name: The template name to be used for the mail's subject.
+        :param mail_body_template_name: The template name to be used for the mail's body.
+        :param mail_body_template_name_html: The template name to be used for the mail's body (HTML version).
+        :param extra_context: Any extra context for the template.
+        :param use_https: Set to ``True`` if HTTPS must be used for urls.
+        :param from_email: Set to something not None to overwrite the default ``from`` address.
+        :param reply_to: "Reply-to" email address.
+        """
+        email_message = self.make_notification_mail(request,
+                                                    mail_subject_template_name=mail_subject_template_name,
+                                                    mail_body_template_name=mail_body_template_name,
+                                                    mail_body_template_name_html=mail_body_template_name_html,
+                                                    extra_context=extra_context,
+                                                    use_https=use_https,
+                                                    from_email=from_email,
+                                                    reply_to=reply_to)
         email_message.send(fail_silently=True)
 
 
@@ -180,6 +213,46 @@ def notice_unread_notifications_upon_login(sender, user, request, **kwargs):
 user_logged_in.connect(notice_unread_notifications_upon_login)
 
 
+def decrement_unread_counter_on_dismiss(sender, notification, **kwargs):
+    """
+    Decrement the unread notifications counter of the recipient when a notification is read or dismissed.
+    :param sender: Not used.
+    :param notification: The dismissed notification.
+    :param kwargs: Not used.
+    :return: None
+    """
+    NotificationsUserProfile.objects.increment_unread_notifications_count([notification.recipient_id], -1)
+
+dismiss_notification.connect(decrement_unread_counter_on_dismiss)
+
+
+def increment_unread_counter_on_unread(sender, notification, **kwargs):
+    """
+    Increment the unread notifications counter of the recipient when a notification is marked as unread.
+    :param sender: Not used.
+    :param notification: The notification marked as unread.
+    :param kwargs: Not used.
+    :return: None
+    """
+    NotificationsUserProfile.objects.increment_unread_notifications_count([notification.recipient_id])
+
+unread_notification.connect(increment_unread_counter_on_unread)
+
+
+def decrement_unread_counter_on_delete(sender, instance, **kwargs):
+    """
+    Decrement the unread notifications counter of the recipient when an unread notification is deleted.
+    :param sender: Not used.
+    :param instance: The deleted notification.
+    :param kwargs: Not used.
+    :return: None
+    """
+    if instance.unread:
+        NotificationsUserProfile.objects.increment_unread_notifications_count([instance.recipient_id], -1)
+
+post_delete.connect(decrement_unread_counter_on_delete, sender=Notification)
+
+
 class NotificationsUserProfile(models.Model):
     """
     Notifications user's profile data model.
@@ -194,6 +267,94 @@ class NotificationsUserProfile(models.Model):
     send_mail_on_new_notification = models.BooleanField(_('Send mail on new notification'),
                                                         default=True)
 
+    unread_notifications_count = models.PositiveIntegerField(_('Unread notifications count'),
+                                                             default=0,
+                                                             editable=False)
+
+    objects = NotificationsUserProfileManager()
+
     class Meta:
         verbose_name = _('Notification user profile')
         verbose_name_plural = _('Notification user profiles')
+
+    def save(self, *args, **kwargs):
+        """
+        Save the model. Compute the initial value of the unread notifications counter on creation.
+        :param args: For super()
+        :param kwargs: For super()
+        :return: super()
+        """
+        if self._state.adding:
+            self.unread_notifications_count = Notification.objects.filter(recipient_id=self.user_id,
+                                                                          unread=True).count()
+        elif not args and 'update_fields' not in kwargs:
+            # The counter is only updated using atomic queries, never overwrite it with a (maybe stale) value
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name != 'unread_notifications_count']
+        return super(NotificationsUserProfile, self).save(*args, **kwargs)
+
+
+class NotificationEvent(models.Model):
+    """
+    Notification event data model.
+    Events are recorded by views in place of sending notifications (see ``NotificationEventManager.record_event()``)
+    and expanded into notifications and mails later by the ``processnotificationevents`` command.
+    A notification event is made of:
+    - an event type (used to find the event handler),
+    - a target object (generic relation),
+    - an user to be excluded from the notification list (usually the event's author),
+    - a creation date,
+    - some processing attempts information (number of attempts, failed flag, last error).
+    """
+
+    event_type = models.CharField(_('Event type'),
+                                  max_length=100)
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    excluded_user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                                      related_name='+',
+                                      default=None,
+                                      blank=True,
+                                      null=True,
+                                      on_delete=models.SET_NULL,
+                                      verbose_name=_('Excluded user'))
+
+    creation_date = models.DateTimeField(_('Creation date'),
+                                         auto_now_add=True)
+
+    nb_attempts = models.PositiveSmallIntegerField(_('Number of attempts'),
+                                                   default=0)
+
+    failed = models.BooleanField(_('Failed'),
+                                 default=False)
+
+    last_error = models.TextField(_('Last error'),
+                                  default='',
+                                  blank=True)
+
+    objects = NotificationEventManager()
+
+    class Meta:
+        verbose_name = _('Notification event')
+        verbose_name_plural = _('Notification events')
+        get_latest_by = 'creation_date'
+        ordering = ('-creation_date',)
+        index_together = (('failed', 'id'),)
+
+    def __str__(self):
+        return '%s #%d' % (self.event_type, self.object_id)
+
+    def mark_as_failed(self, error):
+        """
+        Record a failed processing attempt. The event is marked as failed (and not retried anymore) after
+        ``NOTIFICATIONS_EVENTS_MAX_ATTEMPTS`` attempts.
+        :param error: The error message.
+        """
+        self.nb_attempts += 1
+        self.last_error = error
+        if self.nb_attempts >= NOTIFICATIONS_EVENTS_MAX_ATTEMPTS:
+            self.failed = True
+        self.save(update_fields=('nb_attempts', 'failed', 'last_error'))
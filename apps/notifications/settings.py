@@ -10,3 +10,24 @@ NB_NOTIFICATIONS_PER_PAGE = getattr(settings, 'NB_NOTIFICATIONS_PER_PAGE', 25)
 
 # Number of days before a notification (read or not) is deleted.
 READ_NOTIFICATION_DELETION_TIMEOUT_DAYS = getattr(settings, 'READ_NOTIFICATION_DELETION_TIMEOUT_DAYS', 30)
+
+# Number of notifications inserted per query when sending a notification to many users
+NOTIFICATIONS_BULK_BATCH_SIZE = getattr(settings, 'NOTIFICATIONS_BULK_BATCH_SIZE', 500)
+
+# Set to True to only record notification events and let the ``processnotificationevents`` command expand them
+# (set to False, the default, for the local mode: events are expanded right away, in the current process)
+NOTIFICATIONS_DEFERRED_EVENTS = getattr(settings, 'NOTIFICATIONS_DEFERRED_EVENTS', False)
+
+# Number of notification events fetched per batch by the ``processnotificationevents`` command
+NOTIFICATIONS_EVENTS_BATCH_SIZE = getattr(settings, 'NOTIFICATIONS_EVENTS_BATCH_SIZE', 50)
+
+# Maximum duration in seconds of a single run of the ``processnotificationevents`` command (default 10min). Must be
+# below the expiration delay of the database mutex lock (``MUTEX_LOCK_EXPIRATION_DELAY_SEC``), otherwise another
+# instance can start expanding the same events once the lock has expired.
+NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC = getattr(settings, 'NOTIFICATIONS_EVENTS_MAX_RUN_TIME_SEC', 10 * 60)
+
+# Maximum number of processing attempts before a notification event is marked as failed
+NOTIFICATIONS_EVENTS_MAX_ATTEMPTS = getattr(settings, 'NOTIFICATIONS_EVENTS_MAX_ATTEMPTS', 3)
+
+# Name of the database mutex lock used by the ``processnotificationevents`` command
+NOTIFICATIONS_EVENTS_MUTEX_NAME = getattr(settings, 'NOTIFICATIONS_EVENTS_MUTEX_NAME', 'notificationevents')
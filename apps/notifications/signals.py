@@ -8,6 +8,9 @@ from django.dispatch import Signal
 # A new notification has been created.
 new_notification = Signal(providing_args=["notification"])
 
+# A batch of new notifications has been created (see ``send_notification_to_users``).
+new_notifications = Signal(providing_args=["notifications"])
+
 # Notification get read/dismiss
 dismiss_notification = Signal(providing_args=["notification"])
 
@@ -0,0 +1,142 @@
+"""
+Tests suite for the notification events of the notifications app.
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+
+from ..models import NotificationEvent
+from ..events import (NotificationEventProcessor,
+                      register_event_handler,
+                      get_event_handler)
+from ..settings import NOTIFICATIONS_EVENTS_MAX_ATTEMPTS
+
+
+class NotificationEventTestCase(TestCase):
+    """
+    Tests suite for the ``NotificationEvent`` data model and the ``NotificationEventProcessor`` class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.handler = mock.MagicMock()
+        register_event_handler('tests.new_user', self.handler)
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.target = get_user_model().objects.create_user(username='janedoe',
+                                                           password='illpassword',
+                                                           email='jane.doe@example.com')
+
+    def test_get_event_handler(self):
+        """
+        Test the ``get_event_handler`` function.
+        """
+        self.assertEqual(get_event_handler('tests.new_user'), self.handler)
+        with self.assertRaises(LookupError):
+            get_event_handler('tests.unknown')
+
+    def test_record_event_local_mode(self):
+        """
+        Test that events are processed right away, without being recorded, in local mode.
+        """
+        request = mock.MagicMock()
+        with mock.patch('apps.notifications.managers.NOTIFICATIONS_DEFERRED_EVENTS', False):
+            self.assertIsNone(NotificationEvent.objects.record_event('tests.new_user', self.target,
+                                                                     request, self.author))
+        self.handler.assert_called_once_with(self.target, request, self.author)
+        self.assertFalse(NotificationEvent.objects.exists())
+
+    def _record_event(self):
+        """
+        Record a new event in deferred mode.
+        """
+        with mock.patch('apps.notifications.managers.NOTIFICATIONS_DEFERRED_EVENTS', True):
+            return NotificationEvent.objects.record_event('tests.new_user', self.target, None, self.author)
+
+    def test_record_event_deferred_mode(self):
+        """
+        Test that events are only recorded in deferred mode.
+        """
+        event = self._record_event()
+        self.assertIsNotNone(event.pk)
+        self.assertEqual(event.content_object, self.target)
+        self.assertEqual(event.excluded_user, self.author)
+        self.assertFalse(self.handler.called)
+        self.assertQuerysetEqual(NotificationEvent.objects.pending(), [repr(event)])
+
+    def test_process_events(self):
+        """
+        Test the processing of pending events.
+        """
+        self._record_event()
+        self._record_event()
+        stats = NotificationEventProcessor(batch_size=1).run()
+        self.assertEqual(stats['processed'], 2)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(self.handler.call_count, 2)
+        self.handler.assert_called_with(self.target, None, self.author)
+        self.assertFalse(NotificationEvent.objects.exists())
+
+    def test_process_events_max_batches(self):
+        """
+        Test the processing of pending events with a maximum number of batches.
+        """
+        self._record_event()
+        self._record_event()
+        stats = NotificationEventProcessor(batch_size=1, max_batches=1).run()
+        self.assertEqual(stats['processed'], 1)
+        self.assertEqual(NotificationEvent.objects.count(), 1)
+
+    def test_process_events_max_time(self):
+        """
+        Test that the processing stops once the maximum duration is reached, leaving the remaining events pending.
+        """
+        self._record_event()
+        self._record_event()
+        with mock.patch('apps.notifications.events.time') as mock_time:
+            mock_time.time.side_effect = [0, 0, 0, 10, 10, 10]
+            stats = NotificationEventProcessor(max_time=10).run()
+        self.assertEqual(stats['processed'], 1)
+        self.assertEqual(NotificationEvent.objects.pending().count(), 1)
+
+    def test_process_events_deleted_target(self):
+        """
+        Test that events whose target does not exist anymore are skipped and deleted.
+        """
+        self._record_event()
+        self.target.delete()
+        stats = NotificationEventProcessor().run()
+        self.assertEqual(stats['skipped'], 1)
+        self.assertFalse(self.handler.called)
+        self.assertFalse(NotificationEvent.objects.exists())
+
+    def test_process_events_error(self):
+        """
+        Test that failing events are retried up to ``NOTIFICATIONS_EVENTS_MAX_ATTEMPTS`` times.
+        """
+        self.handler.side_effect = ValueError('Oops')
+        event = self._record_event()
+        for _ in range(NOTIFICATIONS_EVENTS_MAX_ATTEMPTS):
+            self.assertEqual(NotificationEventProcessor().run()['errors'], 1)
+        event.refresh_from_db()
+        self.assertEqual(event.nb_attempts, NOTIFICATIONS_EVENTS_MAX_ATTEMPTS)
+        self.assertEqual(event.last_error, 'ValueError: Oops')
+        self.assertTrue(event.failed)
+        self.assertFalse(NotificationEvent.objects.pending().exists())
+        self.assertEqual(NotificationEvent.objects.requeue_failed(), 1)
+        self.assertTrue(NotificationEvent.objects.pending().exists())
+
+    def test_command(self):
+        """
+        Test the ``processnotificationevents`` command.
+        """
+        self._record_event()
+        call_command('processnotificationevents', verbosity=0)
+        self.handler.assert_called_once_with(self.target, None, self.author)
+        self.assertFalse(NotificationEvent.objects.exists())
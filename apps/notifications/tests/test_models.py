@@ -5,14 +5,16 @@ Tests suite for the models of the notifications app.
 from unittest.mock import patch
 from datetime import timedelta
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory
+from django.core import mail
 from django.core.urlresolvers import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from ..models import (Notification,
                       NotificationsUserProfile)
-from ..signals import (dismiss_notification,
+from ..signals import (new_notifications,
+                       dismiss_notification,
                        unread_notification)
 from ..settings import READ_NOTIFICATION_DELETION_TIMEOUT_DAYS
 
@@ -278,6 +280,157 @@ class NotificationTestCase(TestCase):
         notification.refresh_from_db()
         self.assertFalse(notification.unread)
 
+    def test_unread_notifications_counter(self):
+        """
+        Test that the unread notifications counter used by ``unread_notifications_count`` is maintained.
+        """
+        recipient = get_user_model().objects.create_user(username='jonhdoe',
+                                                         password='illpassword',
+                                                         email='jonh.doe@example.com')
+        notification1 = Notification.objects.create(title='Test 1',
+                                                    message='Test 1',
+                                                    message_html='Test 1',
+                                                    recipient=recipient,
+                                                    dismiss_code='123456')
+        notification2 = Notification.objects.create(title='Test 2',
+                                                    message='Test 2',
+                                                    message_html='Test 2',
+                                                    recipient=recipient)
+        Notification.objects.create(title='Test 3',
+                                    message='Test 3',
+                                    message_html='Test 3',
+                                    recipient=recipient,
+                                    unread=False)
+        self.assertEqual(2, recipient.notifications_profile.unread_notifications_count)
+
+        notification2.unread = False
+        notification2.save()
+        self.assertEqual(1, Notification.objects.unread_notifications_count(recipient))
+        notification2.unread = True
+        notification2.save()
+        self.assertEqual(2, Notification.objects.unread_notifications_count(recipient))
+
+        Notification.objects.dismiss_notifications(recipient, '123456')
+        Notification.objects.dismiss_notifications(recipient, '123456')
+        self.assertEqual(1, Notification.objects.unread_notifications_count(recipient))
+
+        notification1.delete()
+        notification2.delete()
+        self.assertEqual(0, Notification.objects.unread_notifications_count(recipient))
+
+    def test_unread_notifications_counter_not_overwritten(self):
+        """
+        Test that saving a (stale) profile instance does not overwrite the unread notifications counter.
+        """
+        recipient = get_user_model().objects.create_user(username='jonhdoe',
+                                                         password='illpassword',
+                                                         email='jonh.doe@example.com')
+        profile = recipient.notifications_profile
+        Notification.objects.create(title='Test 1',
+                                    message='Test 1',
+                                    message_html='Test 1',
+                                    recipient=recipient)
+        profile.send_mail_on_new_notification = False
+        profile.save()
+        self.assertEqual(1, Notification.objects.unread_notifications_count(recipient))
+
+    def test_reconcile_unread_notifications_count(self):
+        """
+        Test the ``reconcile_unread_notifications_count`` method of the profile manager class.
+        """
+        recipient = get_user_model().objects.create_user(username='jonhdoe',
+                                                         password='illpassword',
+                                                         email='jonh.doe@example.com')
+        Notification.objects.create(title='Test 1',
+                                    message='Test 1',
+                                    message_html='Test 1',
+                                    recipient=recipient)
+        NotificationsUserProfile.objects.filter(user=recipient).update(unread_notifications_count=5)
+        self.assertEqual(5, Notification.objects.unread_notifications_count(recipient))
+        self.assertEqual(1, NotificationsUserProfile.objects.reconcile_unread_notifications_count())
+        self.assertEqual(1, Notification.objects.unread_notifications_count(recipient))
+        self.assertEqual(0, NotificationsUserProfile.objects.reconcile_unread_notifications_count())
+
+
+class SendNotificationToUsersTestCase(TestCase):
+    """
+    Tests suite for the ``send_notification_to_users`` manager method.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.user1 = get_user_model().objects.create_user(username='johndoe1',
+                                                          password='illpassword',
+                                                          email='john.doe1@example.com')
+        self.user2 = get_user_model().objects.create_user(username='johndoe2',
+                                                          password='illpassword',
+                                                          email='john.doe2@example.com')
+        self.user2.notifications_profile.send_mail_on_new_notification = False
+        self.user2.notifications_profile.save()
+        self.user3 = get_user_model().objects.create_user(username='johndoe3',
+                                                          password='illpassword',
+                                                          email='john.doe3@example.com')
+        self.user3.is_active = False
+        self.user3.save()
+        self.request = RequestFactory().get('/')
+
+    def _send_notification(self, users):
+        """
+        Send a test notification to the given users.
+        """
+        return Notification.objects.send_notification_to_users(self.request, users,
+                                                                'forum/notif_new_thread_title.txt',
+                                                                'forum/notif_new_thread_msg.txt',
+                                                                'forum/notif_new_thread_msg.html',
+                                                                dismiss_code='test')
+
+    def test_send_notification_to_users(self):
+        """
+        Test sending a notification to many users.
+        """
+        notifications = self._send_notification(get_user_model().objects.all())
+        self.assertEqual(len(notifications), 2)
+        self.assertEqual(Notification.objects.filter(dismiss_code='test').count(), 2)
+        self.assertFalse(Notification.objects.filter(recipient=self.user3).exists())
+        for notification in notifications:
+            self.assertIsNotNone(notification.pk)
+            self.assertEqual(notification.title, notifications[0].title)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['john.doe1@example.com'])
+        self.assertEqual(Notification.objects.unread_notifications_count(self.user1), 1)
+        self.assertEqual(Notification.objects.unread_notifications_count(self.user2), 1)
+
+    def test_send_notification_to_users_list(self):
+        """
+        Test sending a notification to a list of users.
+        """
+        notifications = self._send_notification([self.user1, self.user3])
+        self.assertEqual([notification.recipient for notification in notifications], [self.user1])
+
+    def test_new_notifications_signal(self):
+        """
+        Test the ``new_notifications`` signal emission.
+        """
+        received = []
+
+        def _signal_listener(sender, notifications, **kwargs):
+            received.append(notifications)
+        new_notifications.connect(_signal_listener)
+        try:
+            notifications = self._send_notification(get_user_model().objects.all())
+        finally:
+            new_notifications.disconnect(_signal_listener)
+        self.assertEqual(received, [notifications])
+
+    def test_no_recipients(self):
+        """
+        Test sending a notification to nobody.
+        """
+        self.assertEqual(self._send_notification(get_user_model().objects.none()), [])
+        self.assertEqual(len(mail.outbox), 0)
+
 
 class NotificationsUserProfileTestCase(TestCase):
     """
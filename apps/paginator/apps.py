@@ -13,3 +13,13 @@ class PaginatorConfig(AppConfig):
 
     name = 'apps.paginator'
     verbose_name = _('Paginator')
+
+    def ready(self):
+        """
+        Connect the cached counts invalidation signals receivers of the ``PAGINATOR_CACHED_COUNT_MODELS`` models, in
+        every process (including workers and management commands not using any paginator).
+        """
+        from .counts import register_count_invalidation
+        from .settings import PAGINATOR_CACHED_COUNT_MODELS
+        for model_label in PAGINATOR_CACHED_COUNT_MODELS:
+            register_count_invalidation(self.apps.get_model(model_label))
@@ -0,0 +1,197 @@
+"""
+Cached and estimated objects counts for paginated lists.
+
+Three counting modes are available:
+
+- "exact": a ``COUNT(*)`` query for each request, like Django's ``Paginator``.
+- "cached": the exact count is cached for a short time (see ``PAGINATOR_COUNT_CACHE_TIMEOUT``), by queryset signature
+  (the SQL query and its parameters). All cached counts of a model are invalidated when any instance of this model is
+  saved or deleted, for the models listed in ``PAGINATOR_CACHED_COUNT_MODELS`` (signals receivers are connected at
+  startup, see ``PaginatorConfig.ready()``). Date and time parameters (like "now" in ``published()`` querysets) are
+  rounded to the cache timeout, so the signature of such querysets does not change for each request.
+- "estimated": the PostgreSQL planner estimate is used for large lists (see ``PAGINATOR_ESTIMATED_COUNT_THRESHOLD``),
+  the cached exact count otherwise. Estimates can be off by a few percents, so the last pages of a large list may be
+  empty or missing.
+"""
+
+import calendar
+import datetime
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.signals import (post_save,
+                                      post_delete)
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.utils.encoding import force_bytes
+from django.utils.functional import cached_property
+
+from apps.tools.cache import (get_cache_version,
+                              bump_cache_version)
+
+from .settings import (PAGINATOR_COUNT_CACHE_ALIAS,
+                       PAGINATOR_COUNT_CACHE_KEY_PREFIX,
+                       PAGINATOR_COUNT_CACHE_TIMEOUT,
+                       PAGINATOR_ESTIMATED_COUNT_THRESHOLD)
+
+
+# Counting modes
+COUNT_MODE_EXACT = 'exact'
+COUNT_MODE_CACHED = 'cached'
+COUNT_MODE_ESTIMATED = 'estimated'
+COUNT_MODES = (COUNT_MODE_EXACT, COUNT_MODE_CACHED, COUNT_MODE_ESTIMATED)
+
+
+def _get_model_label(model):
+    """
+    Return the label of the given model, like "app_label.model_name".
+    :param model: The model class.
+    """
+    return '%s.%s' % (model._meta.app_label, model._meta.model_name)
+
+
+def _get_generation_key(model):
+    """
+    Return the cache key of the cached counts generation number of the given model.
+    :param model: The model class.
+    """
+    return '%s:count-gen:%s' % (PAGINATOR_COUNT_CACHE_KEY_PREFIX, _get_model_label(model))
+
+
+def get_counts_generation(model):
+    """
+    Return the current cached counts generation number of the given model.
+    :param model: The model class.
+    """
+    return get_cache_version(PAGINATOR_COUNT_CACHE_ALIAS, _get_generation_key(model))
+
+
+def invalidate_cached_counts(sender, **kwargs):
+    """
+    Invalidate all cached counts of the given model.
+    :param sender: The model class.
+    :param kwargs: Not used.
+    """
+    bump_cache_version(PAGINATOR_COUNT_CACHE_ALIAS, _get_generation_key(sender))
+
+
+def register_count_invalidation(model):
+    """
+    Invalidate the cached counts of the given model on save and delete of any instance of the model.
+    Can be called several times for the same model.
+    :param model: The model class.
+    """
+    dispatch_uid = 'paginator-counts-%s' % _get_model_label(model)
+    post_save.connect(invalidate_cached_counts, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(invalidate_cached_counts, sender=model, dispatch_uid=dispatch_uid)
+
+
+def get_queryset_signature(queryset):
+    """
+    Return the signature of the given queryset, computed from the SQL query and its parameters.
+    :param queryset: The queryset.
+    :raise EmptyResultSet: If the queryset cannot match any object.
+    """
+    sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    rounded_params = []
+    for param in params:
+        if isinstance(param, datetime.datetime):
+            param = calendar.timegm(param.utctimetuple()) // PAGINATOR_COUNT_CACHE_TIMEOUT
+        rounded_params.append(param)
+    digest = hashlib.sha1()
+    digest.update(force_bytes(queryset.db))
+    digest.update(b'\0')
+    digest.update(force_bytes(sql))
+    digest.update(b'\0')
+    digest.update(force_bytes(repr(rounded_params)))
+    return digest.hexdigest()
+
+
+def get_cached_count(queryset):
+    """
+    Return the exact number of objects of the given queryset, from the cache if available.
+    :param queryset: The queryset.
+    """
+    try:
+        signature = get_queryset_signature(queryset)
+    except EmptyResultSet:
+        return 0
+    cache = caches[PAGINATOR_COUNT_CACHE_ALIAS]
+    cache_key = '%s:count:%s:%s:%s' % (PAGINATOR_COUNT_CACHE_KEY_PREFIX, _get_model_label(queryset.model),
+                                       get_counts_generation(queryset.model), signature)
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, PAGINATOR_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def estimate_count(queryset):
+    """
+    Return the PostgreSQL planner estimate of the number of objects of the given queryset.
+    :param queryset: The queryset.
+    :return: The estimated number of objects, or None if not available (other database engines).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) %s' % sql, params)
+        plan = cursor.fetchone()[0]
+    if not isinstance(plan, list):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_count(queryset, count_mode=COUNT_MODE_EXACT):
+    """
+    Return the number of objects of the given queryset, using the given counting mode.
+    :param queryset: The queryset.
+    :param count_mode: The counting mode ("exact", "cached" or "estimated").
+    """
+    if count_mode == COUNT_MODE_ESTIMATED:
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate >= PAGINATOR_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+    if count_mode in (COUNT_MODE_CACHED, COUNT_MODE_ESTIMATED):
+        return get_cached_count(queryset)
+    return queryset.count()
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator with cached or estimated objects count.
+    """
+
+    def __init__(self, object_list, per_page, count_mode=COUNT_MODE_CACHED, count_queryset=None, **kwargs):
+        """
+        Create a new paginator.
+        :param object_list: The queryset to be paginated.
+        :param per_page: The number of objects per page.
+        :param count_mode: The counting mode ("exact", "cached" or "estimated").
+        :param count_queryset: The queryset to be counted, default to ``object_list``. Use it to count the objects
+        without the (costly or per-user) annotations of the paginated queryset.
+        :param kwargs: For super()
+        """
+        if count_mode not in COUNT_MODES:
+            raise ValueError('Unknown count mode "%s"' % count_mode)
+        super(CachedCountPaginator, self).__init__(object_list, per_page, **kwargs)
+        self.count_mode = count_mode
+        self.count_queryset = count_queryset
+
+    @cached_property
+    def count(self):
+        """
+        Return the total number of objects, across all pages.
+        """
+        if self.count_queryset is not None:
+            return get_count(self.count_queryset, self.count_mode)
+        if hasattr(self.object_list, 'query'):
+            return get_count(self.object_list, self.count_mode)
+        return len(self.object_list)
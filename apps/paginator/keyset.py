@@ -0,0 +1,276 @@
+"""
+Offset-free paginators.
+
+Django's ``Paginator`` issue a ``COUNT(*)`` query and fetch each page using ``OFFSET n``, so deep pages get slower
+as tables grow. The paginators of this module seek directly to the requested page using an ordered, indexed key:
+
+- ``KeysetPaginator`` seek after (or before) the ordering key of the last (or first) object of the previous page.
+  Pages are identified by an opaque token instead of a page number, and the count is only computed on demand.
+- ``PositionPaginator`` filter on a stored, gap-less, 1-based position field (like the position of a post in a
+  forum's thread). Pages are identified by their number, like with Django's ``Paginator``.
+"""
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import (Paginator,
+                                   InvalidPage)
+from django.db.models import Q
+from django.utils.encoding import (force_bytes,
+                                   force_text)
+from django.utils.functional import cached_property
+
+from .counts import (COUNT_MODE_EXACT,
+                     get_count)
+
+
+# Page tokens directions
+NEXT_PAGE = 'n'
+PREVIOUS_PAGE = 'p'
+
+
+class InvalidPageToken(InvalidPage):
+    """
+    Exception raised when a page token cannot be decoded.
+    """
+    pass
+
+
+class KeysetPaginator(object):
+    """
+    Keyset (a.k.a. seek) paginator.
+    The ordering fields must be non nullable and should be covered by a database index. The primary key is appended
+    to the ordering (if not already present) to make the key unique.
+    """
+
+    # Allow templates to tell keyset and numbered paginations apart
+    is_keyset = True
+
+    def __init__(self, queryset, per_page, ordering=None, count_mode=COUNT_MODE_EXACT):
+        """
+        Create a new keyset paginator.
+        :param queryset: The queryset to be paginated.
+        :param per_page: The number of objects per page.
+        :param ordering: The ordering of the pages, default to the queryset (or model) ordering.
+        :param count_mode: The counting mode ("exact", "cached" or "estimated"), see the ``counts`` module.
+        """
+        if ordering is None:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+        ordering = list(ordering)
+        pk_name = queryset.model._meta.pk.name
+        if not any(lookup.lstrip('-') in ('pk', pk_name) for lookup in ordering):
+            ordering.append('pk')
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.key_fields = [self._get_field(lookup.lstrip('-')) for lookup in self.ordering]
+        self.count_mode = count_mode
+
+    def _get_field(self, lookup):
+        """
+        Return the model field instance of the given ordering lookup (relations can be followed using ``__``).
+        :param lookup: The ordering lookup, without direction prefix.
+        """
+        model = self.queryset.model
+        parts = lookup.split('__')
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.pk if parts[-1] == 'pk' else model._meta.get_field(parts[-1])
+
+    @cached_property
+    def count(self):
+        """
+        Return the total number of objects. Only computed when used.
+        """
+        return get_count(self.queryset, self.count_mode)
+
+    def get_key(self, obj):
+        """
+        Return the ordering key of the given object.
+        :param obj: The object instance.
+        """
+        key = []
+        for lookup, field in zip(self.ordering, self.key_fields):
+            value = obj
+            for part in lookup.lstrip('-').split('__')[:-1]:
+                value = getattr(value, part)
+            key.append(getattr(value, field.attname))
+        return key
+
+    def encode_token(self, key, direction):
+        """
+        Encode the given ordering key and direction into an opaque, URL safe, page token.
+        :param key: The ordering key of the first (previous page) or last (next page) object of the current page.
+        :param direction: The seek direction, ``NEXT_PAGE`` or ``PREVIOUS_PAGE``.
+        """
+        values = [direction]
+        for value in key:
+            if isinstance(value, (datetime.date, datetime.time)):
+                value = value.isoformat()
+            elif isinstance(value, decimal.Decimal):
+                value = str(value)
+            values.append(value)
+        data = json.dumps(values, separators=(',', ':'))
+        return force_text(base64.urlsafe_b64encode(force_bytes(data))).rstrip('=')
+
+    def decode_token(self, token):
+        """
+        Decode the given page token.
+        :param token: The page token.
+        :return: A tuple ``(direction, key)``.
+        :raise InvalidPageToken: If the token is invalid.
+        """
+        try:
+            data = base64.urlsafe_b64decode(force_bytes(token + '=' * (-len(token) % 4)))
+            values = json.loads(force_text(data))
+            direction, values = values[0], values[1:]
+            if direction not in (NEXT_PAGE, PREVIOUS_PAGE) or len(values) != len(self.key_fields):
+                raise ValueError()
+            key = [field.to_python(value) for field, value in zip(self.key_fields, values)]
+        except (TypeError, ValueError, IndexError, KeyError, ValidationError, binascii.Error):
+            raise InvalidPageToken('Invalid page token')
+        return direction, key
+
+    def get_seek_filter(self, key, backward):
+        """
+        Return the filter selecting the objects after (or before) the given ordering key.
+        :param key: The ordering key.
+        :param backward: Select the objects before the key if True, after otherwise.
+        """
+        seek_filter = Q()
+        for i, lookup in enumerate(self.ordering):
+            descending = lookup.startswith('-') != backward
+            condition = Q(**{'%s__%s' % (lookup.lstrip('-'), 'lt' if descending else 'gt'): key[i]})
+            for previous_lookup, value in zip(self.ordering[:i], key[:i]):
+                condition &= Q(**{previous_lookup.lstrip('-'): value})
+            seek_filter |= condition
+        return seek_filter
+
+    def page(self, token=None):
+        """
+        Return the page of the given token.
+        Stale tokens (no more objects after or before the key, like when the objects of the page have been deleted)
+        fall back to the first page.
+        :param token: The page token, None for the first page.
+        :raise InvalidPageToken: If the token is invalid.
+        """
+        direction, key = self.decode_token(token) if token else (NEXT_PAGE, None)
+        backward = direction == PREVIOUS_PAGE
+        queryset = self.queryset.order_by(*self.ordering)
+        if backward:
+            queryset = queryset.reverse()
+        if key is not None:
+            queryset = queryset.filter(self.get_seek_filter(key, backward))
+
+        # Fetch one more object to know if there is more objects in this direction
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if not object_list and key is not None:
+            return self.page()
+        if backward:
+            object_list.reverse()
+            return KeysetPage(object_list, self, has_next=True, has_previous=has_more)
+        return KeysetPage(object_list, self, has_next=has_more, has_previous=key is not None)
+
+
+class KeysetPage(object):
+    """
+    A single page of a ``KeysetPaginator``.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        """
+        Create a new page.
+        :param object_list: The objects of this page.
+        :param paginator: The parent paginator.
+        :param has_next: True if there is a next page.
+        :param has_previous: True if there is a previous page.
+        """
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+        # Page numbers are unknown, except for the first page
+        self.number = None if has_previous else 1
+
+    def __repr__(self):
+        return '<Page %s (keyset)>' % (self.number or '?')
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_page_token(self):
+        """
+        Return the token of the next page, or None if this page is empty.
+        """
+        if not self.object_list:
+            return None
+        return self.paginator.encode_token(self.paginator.get_key(self.object_list[-1]), NEXT_PAGE)
+
+    def previous_page_token(self):
+        """
+        Return the token of the previous page, or None if this page is empty.
+        """
+        if not self.object_list:
+            return None
+        return self.paginator.encode_token(self.paginator.get_key(self.object_list[0]), PREVIOUS_PAGE)
+
+
+class PositionPaginator(Paginator):
+    """
+    Numbered paginator for querysets with a stored, gap-less, 1-based position field.
+    Pages are fetched by filtering on the positions range instead of using ``OFFSET`` and the total number of objects
+    must be given (usually a denormalized counter), so no ``COUNT(*)`` query is issued.
+    """
+
+    def __init__(self, object_list, per_page, position_field, count, **kwargs):
+        """
+        Create a new position paginator.
+        :param object_list: The queryset to be paginated.
+        :param per_page: The number of objects per page.
+        :param position_field: The name of the position field.
+        :param count: The total number of objects.
+        :param kwargs: For super()
+        """
+        super(PositionPaginator, self).__init__(object_list, per_page, **kwargs)
+        self.position_field = position_field
+        self._given_count = count
+
+    @cached_property
+    def count(self):
+        """
+        Return the total number of objects, as given to the constructor (no ``COUNT(*)`` query).
+        """
+        return self._given_count
+
+    def page(self, number):
+        """
+        Return the page of the given number.
+        :param number: The page number.
+        """
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        object_list = self.object_list.filter(**{
+            '%s__gt' % self.position_field: bottom,
+            '%s__lte' % self.position_field: top,
+        }).order_by(self.position_field)
+        return self._get_page(object_list, number, self)
@@ -0,0 +1,28 @@
+"""
+Custom settings for the pagination app.
+"""
+
+from django.conf import settings
+
+
+# Default objects counting mode of paginated views ("exact", "cached" or "estimated")
+PAGINATOR_DEFAULT_COUNT_MODE = getattr(settings, 'PAGINATOR_DEFAULT_COUNT_MODE', 'exact')
+
+# Objects counting mode of paginated views, by view name (ex. {'forum:forum_detail': 'cached'})
+PAGINATOR_COUNT_MODES = getattr(settings, 'PAGINATOR_COUNT_MODES', {})
+
+# Models of the paginated lists using cached or estimated counts, as "app_label.ModelName" labels. The cached counts of
+# these models are invalidated when any instance is saved or deleted.
+PAGINATOR_CACHED_COUNT_MODELS = getattr(settings, 'PAGINATOR_CACHED_COUNT_MODELS', ())
+
+# Django cache alias used for the cached counts
+PAGINATOR_COUNT_CACHE_ALIAS = getattr(settings, 'PAGINATOR_COUNT_CACHE_ALIAS', 'default')
+
+# Key prefix for all cached counts entries
+PAGINATOR_COUNT_CACHE_KEY_PREFIX = getattr(settings, 'PAGINATOR_COUNT_CACHE_KEY_PREFIX', 'paginator')
+
+# Lifetime of a cached count in seconds (default 1 minute)
+PAGINATOR_COUNT_CACHE_TIMEOUT = getattr(settings, 'PAGINATOR_COUNT_CACHE_TIMEOUT', 60)
+
+# Minimum planner estimate for using the estimated count instead of the (cached) exact count, in "estimated" mode
+PAGINATOR_ESTIMATED_COUNT_THRESHOLD = getattr(settings, 'PAGINATOR_ESTIMATED_COUNT_THRESHOLD', 10000)
@@ -6,6 +6,12 @@ from django.http import Http404
 from django.utils.translation import ugettext_lazy as _
 from django.core.paginator import Paginator, InvalidPage
 
+from .counts import (COUNT_MODE_EXACT,
+                     CachedCountPaginator)
+from .keyset import KeysetPaginator
+from .settings import (PAGINATOR_DEFAULT_COUNT_MODE,
+                       PAGINATOR_COUNT_MODES)
+
 
 def get_page_number(request):
     """
@@ -16,16 +22,52 @@ def get_page_number(request):
     return request.GET.get('page', None) or 1
 
 
-def paginate(queryset, request, nb_objects_per_page=25):
+def get_page_token(request):
+    """
+    Return the keyset pagination page token from the given request using the ``cursor`` GET parameter.
+    :param request: The current request.
+    :return: The page token, or None if not specified.
+    """
+    return request.GET.get('cursor', None) or None
+
+
+def get_count_mode(request):
+    """
+    Return the objects counting mode of the current view, from the ``PAGINATOR_COUNT_MODES`` setting.
+    :param request: The current request.
+    :return: The counting mode ("exact", "cached" or "estimated").
+    """
+    view_name = getattr(getattr(request, 'resolver_match', None), 'view_name', None)
+    if not isinstance(view_name, str):
+        return PAGINATOR_DEFAULT_COUNT_MODE
+    return PAGINATOR_COUNT_MODES.get(view_name, PAGINATOR_DEFAULT_COUNT_MODE)
+
+
+def paginate(queryset, request, nb_objects_per_page=25, paginator_class=None, count_queryset=None,
+             **paginator_kwargs):
     """
     Paginate the given queryset. Raise Http404 on invalid page number.
     :param queryset: The queryset to be paginated.
-    :param request: The current request (for retrieving the page number).
+    :param request: The current request (for retrieving the page number and the counting mode).
     :param nb_objects_per_page: The number of objects per page.
+    :param paginator_class: The paginator class to be used (must support page numbers), default to a paginator
+    using the counting mode of the current view (see ``get_count_mode()``).
+    :param count_queryset: The queryset to be counted, default to the paginated queryset. Use it to count the objects
+    without the annotations of the paginated queryset, see ``CachedCountPaginator``.
+    :param paginator_kwargs: Any extra arguments for the paginator class.
     :return: A tuple of (paginator, page) objects.
     """
     page_number = get_page_number(request)
-    paginator = Paginator(queryset, nb_objects_per_page)
+    if paginator_class is None:
+        count_mode = get_count_mode(request)
+        if count_mode == COUNT_MODE_EXACT and count_queryset is None:
+            paginator_class = Paginator
+        else:
+            paginator_class = CachedCountPaginator
+            paginator_kwargs['count_mode'] = count_mode
+    if count_queryset is not None:
+        paginator_kwargs['count_queryset'] = count_queryset
+    paginator = paginator_class(queryset, nb_objects_per_page, **paginator_kwargs)
     try:
         page = paginator.page(page_number)
     except InvalidPage as e:
@@ -36,6 +78,27 @@ def paginate(queryset, request, nb_objects_per_page=25):
     return paginator, page
 
 
+def paginate_by_keyset(queryset, request, nb_objects_per_page=25, ordering=None):
+    """
+    Paginate the given queryset using a ``KeysetPaginator``. Raise Http404 on invalid page token.
+    :param queryset: The queryset to be paginated.
+    :param request: The current request (for retrieving the page token).
+    :param nb_objects_per_page: The number of objects per page.
+    :param ordering: The ordering of the pages, default to the queryset ordering.
+    :return: A tuple of (paginator, page) objects.
+    """
+    page_token = get_page_token(request)
+    paginator = KeysetPaginator(queryset, nb_objects_per_page, ordering, count_mode=get_count_mode(request))
+    try:
+        page = paginator.page(page_token)
+    except InvalidPage as e:
+        raise Http404(_('Invalid page token (%(page_token)s): %(message)s') % {
+            'page_token': page_token,
+            'message': str(e)
+        })
+    return paginator, page
+
+
 def update_context_for_pagination(context, object_list_name, request, paginator, page):
     """
     Update the given context for pagination using the given paginator and page objects.
@@ -49,6 +112,8 @@ def update_context_for_pagination(context, object_list_name, request, paginator,
     get_params = request.GET.copy()
     if 'page' in get_params:
         get_params.pop('page')
+    if 'cursor' in get_params:
+        get_params.pop('cursor')
     if get_params:
         get_params = get_params.urlencode()
     else:
@@ -2,13 +2,26 @@
 Tests suite for the pagination app.
 """
 
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 from django.http import Http404, QueryDict
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth import get_user_model
 
+from .counts import (CachedCountPaginator,
+                     get_count,
+                     estimate_count,
+                     register_count_invalidation)
+from .keyset import (KeysetPaginator,
+                     PositionPaginator,
+                     InvalidPageToken,
+                     NEXT_PAGE,
+                     PREVIOUS_PAGE)
 from .shortcut import (get_page_number,
+                       get_page_token,
+                       get_count_mode,
                        paginate,
+                       paginate_by_keyset,
                        update_context_for_pagination)
 
 
@@ -169,3 +182,232 @@ class PaginatorTestCase(SimpleTestCase):
             'get_params': 'foo=%2Fbar%2F',
             'get_params_union': '&foo=%2Fbar%2F',
         })
+
+    def test_update_context_for_pagination_cursor_arg_removed(self):
+        context = {}
+        request = MagicMock(GET=QueryDict('cursor=abc&foo=bar'))
+        paginator = MagicMock()
+        page = MagicMock(number=None, object_list=[1, 2, 3])
+        page.has_other_pages = Mock(return_value=True)
+        update_context_for_pagination(context, 'test', request, paginator, page)
+        self.assertEqual(context['get_params'], 'foo=bar')
+        self.assertFalse(context['is_first_page'])
+
+    def test_get_page_token(self):
+        """
+        Test the ``get_page_token`` method.
+        """
+        self.assertEqual(get_page_token(MagicMock(GET={'cursor': 'abc'})), 'abc')
+        self.assertIsNone(get_page_token(MagicMock(GET={'cursor': ''})))
+        self.assertIsNone(get_page_token(MagicMock(GET={})))
+
+    def test_position_paginator(self):
+        """
+        Test that the ``PositionPaginator`` filter on the positions range.
+        """
+        queryset = MagicMock()
+        paginator = PositionPaginator(queryset, 10, 'ordinal', 25)
+        self.assertEqual(paginator.num_pages, 3)
+        paginator.page(2)
+        queryset.filter.assert_called_once_with(ordinal__gt=10, ordinal__lte=20)
+        queryset.filter.return_value.order_by.assert_called_once_with('ordinal')
+        self.assertFalse(queryset.count.called)
+
+
+class KeysetPaginatorTestCase(TestCase):
+    """
+    Tests suite for the ``KeysetPaginator`` class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        user_model = get_user_model()
+        for i in range(7):
+            user_model.objects.create(username='user%d' % i,
+                                      email='user%d@example.com' % i,
+                                      is_staff=i % 3 == 0)
+        self.queryset = user_model.objects.all()
+        self.ordering = ('-is_staff', 'username')
+        self.expected = list(self.queryset.order_by(*(self.ordering + ('pk', ))).values_list('username', flat=True))
+
+    def test_ordering_pk_added(self):
+        """
+        Test that the primary key is appended to the ordering.
+        """
+        paginator = KeysetPaginator(self.queryset, 3, self.ordering)
+        self.assertEqual(paginator.ordering, ('-is_staff', 'username', 'pk'))
+
+    def test_forward_and_backward(self):
+        """
+        Test the pagination forward (using next page tokens) and backward (using previous page tokens).
+        """
+        paginator = KeysetPaginator(self.queryset, 3, self.ordering)
+        pages = [paginator.page()]
+        self.assertEqual(pages[0].number, 1)
+        self.assertFalse(pages[0].has_previous())
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_page_token()))
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[-1].number)
+        self.assertEqual([user.username for page in pages for user in page], self.expected)
+
+        page = paginator.page(pages[-1].previous_page_token())
+        self.assertEqual(list(page), list(pages[1]))
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+        page = paginator.page(page.previous_page_token())
+        self.assertEqual(list(page), list(pages[0]))
+        self.assertFalse(page.has_previous())
+
+    def test_stale_next_token(self):
+        """
+        Test that a next page token past the last object fall back to the first page.
+        """
+        paginator = KeysetPaginator(self.queryset, 3, self.ordering)
+        last = self.queryset.order_by(*paginator.ordering).last()
+        page = paginator.page(paginator.encode_token(paginator.get_key(last), NEXT_PAGE))
+        self.assertEqual(page.number, 1)
+        self.assertFalse(page.has_previous())
+        self.assertEqual([user.username for user in page], self.expected[:3])
+
+    def test_stale_previous_token(self):
+        """
+        Test that a previous page token before the first object fall back to the first page.
+        """
+        paginator = KeysetPaginator(self.queryset, 3, self.ordering)
+        first = self.queryset.order_by(*paginator.ordering).first()
+        page = paginator.page(paginator.encode_token(paginator.get_key(first), PREVIOUS_PAGE))
+        self.assertEqual(page.number, 1)
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+        self.assertEqual([user.username for user in page], self.expected[:3])
+
+    def test_empty_page_tokens(self):
+        """
+        Test that the tokens of an empty page are None.
+        """
+        paginator = KeysetPaginator(self.queryset.none(), 3, self.ordering)
+        page = paginator.page()
+        self.assertEqual(len(page), 0)
+        self.assertIsNone(page.next_page_token())
+        self.assertIsNone(page.previous_page_token())
+
+    def test_count(self):
+        """
+        Test the ``count`` property.
+        """
+        self.assertEqual(KeysetPaginator(self.queryset, 3).count, 7)
+
+    def test_invalid_token(self):
+        """
+        Test that invalid tokens raise ``InvalidPageToken``.
+        """
+        paginator = KeysetPaginator(self.queryset, 3, self.ordering)
+        for token in ('foobar', 'WyJ4IiwxXQ', paginator.encode_token(['foo', 'bar', 'baz'], 'n')):
+            with self.assertRaises(InvalidPageToken):
+                paginator.page(token)
+
+    def test_paginate_by_keyset(self):
+        """
+        Test the ``paginate_by_keyset`` shortcut with an invalid page token.
+        """
+        with self.assertRaises(Http404):
+            paginate_by_keyset(self.queryset, MagicMock(GET={'cursor': 'foobar'}))
+
+
+class CachedCountPaginatorTestCase(TestCase):
+    """
+    Tests suite for the cached and estimated counts.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.user_model = get_user_model()
+        register_count_invalidation(self.user_model)
+        for i in range(3):
+            self.user_model.objects.create(username='user%d' % i, email='user%d@example.com' % i)
+
+    def test_cached_count(self):
+        """
+        Test that counts are cached and invalidated on save.
+        """
+        queryset = self.user_model.objects.filter(is_active=True)
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        # Bulk updates do not send signals, so the cached count is still used
+        self.user_model.objects.filter(username='user0').update(is_active=False)
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 3)
+
+        # Saving an instance invalidate all counts of the model
+        self.user_model.objects.get(username='user1').save()
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 2)
+        self.user_model.objects.get(username='user2').delete()
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 1)
+
+    def test_count_queryset(self):
+        """
+        Test that the count queryset is counted instead of the paginated queryset.
+        """
+        queryset = self.user_model.objects.all()
+        paginator = CachedCountPaginator(queryset, 2, count_queryset=queryset.filter(username='user0'))
+        self.assertEqual(paginator.count, 1)
+
+        request = MagicMock(GET={}, resolver_match=MagicMock(view_name='tests:list'))
+        with patch.dict('apps.paginator.shortcut.PAGINATOR_COUNT_MODES', {}, clear=True):
+            paginator, page = paginate(queryset, request, 2, count_queryset=queryset.filter(username='user0'))
+        self.assertIsInstance(paginator, CachedCountPaginator)
+        self.assertEqual(paginator.count_mode, 'exact')
+        self.assertEqual(paginator.count, 1)
+
+    def test_cached_count_empty_queryset(self):
+        """
+        Test the cached count of an empty queryset.
+        """
+        self.assertEqual(get_count(self.user_model.objects.filter(pk__in=[]), 'cached'), 0)
+
+    def test_estimated_count_fallback(self):
+        """
+        Test that the exact count is used when no estimate is available.
+        """
+        queryset = self.user_model.objects.all()
+        with patch('apps.paginator.counts.estimate_count', return_value=None):
+            self.assertEqual(get_count(queryset, 'estimated'), 3)
+        with patch('apps.paginator.counts.estimate_count', return_value=50000):
+            self.assertEqual(get_count(queryset, 'estimated'), 50000)
+        with patch('apps.paginator.counts.estimate_count', return_value=10):
+            self.assertEqual(get_count(queryset, 'estimated'), 3)
+        if estimate_count(queryset) is not None:
+            self.assertGreaterEqual(estimate_count(queryset), 0)
+
+    def test_unknown_count_mode(self):
+        """
+        Test that unknown counting modes are rejected.
+        """
+        with self.assertRaises(ValueError):
+            CachedCountPaginator([], 2, count_mode='foobar')
+
+    def test_get_count_mode(self):
+        """
+        Test the ``get_count_mode`` shortcut.
+        """
+        request = MagicMock(resolver_match=MagicMock(view_name='forum:forum_detail'))
+        with patch.dict('apps.paginator.shortcut.PAGINATOR_COUNT_MODES', {'forum:forum_detail': 'estimated'}):
+            self.assertEqual(get_count_mode(request), 'estimated')
+        with patch.dict('apps.paginator.shortcut.PAGINATOR_COUNT_MODES', {}, clear=True):
+            self.assertEqual(get_count_mode(request), 'exact')
+        self.assertEqual(get_count_mode(MagicMock(resolver_match=None)), 'exact')
+
+    def test_paginate_with_count_mode(self):
+        """
+        Test that the ``paginate`` shortcut use the counting mode of the current view.
+        """
+        request = MagicMock(GET={}, resolver_match=MagicMock(view_name='tests:list'))
+        with patch.dict('apps.paginator.shortcut.PAGINATOR_COUNT_MODES', {'tests:list': 'cached'}):
+            paginator, page = paginate(self.user_model.objects.all(), request, 2)
+        self.assertIsInstance(paginator, CachedCountPaginator)
+        self.assertEqual(paginator.count_mode, 'cached')
+        self.assertEqual(paginator.num_pages, 2)
@@ -0,0 +1,10 @@
+"""
+Performance statistics app.
+
+This reusable Django application provide a lightweight, always-on, instrumentation middleware recording the latency,
+database queries and rendering time of a sample of the requests, by view. Statistics are aggregated in memory and
+periodically written to a local store, the ``perfreport`` management command print the top offenders.
+Other applications can record their own timings and counters using the ``collector`` module API.
+"""
+
+default_app_config = 'apps.perfstats.apps.PerfStatsConfig'
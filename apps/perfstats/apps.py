@@ -0,0 +1,15 @@
+"""
+Application file for the performance statistics app.
+"""
+
+from django.apps import AppConfig
+from django.utils.translation import ugettext_lazy as _
+
+
+class PerfStatsConfig(AppConfig):
+    """
+    Application configuration class for the performance statistics app.
+    """
+
+    name = 'apps.perfstats'
+    verbose_name = _('Performance statistics')
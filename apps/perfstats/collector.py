@@ -0,0 +1,76 @@
+"""
+Per-request metrics collector.
+
+The metrics of the current (instrumented) request are stored in a thread-local dictionary. Other applications can
+record their own timings and counters, like the rendering cache hits and misses, using ``record_timing()``,
+``record_count()`` or the ``timed()`` context manager. These functions do nothing when the current request is not
+instrumented, so they can be called from hot paths.
+
+By convention, timings names end with ``_time`` and cache counters names end with ``_cache_hits`` and
+``_cache_misses``, so the ``perfreport`` command can summarize them.
+"""
+
+import time
+from contextlib import contextmanager
+import threading
+
+
+_local = threading.local()
+
+
+def start_collecting():
+    """
+    Start collecting metrics for the current thread.
+    :return: None
+    """
+    _local.metrics = {}
+
+
+def stop_collecting():
+    """
+    Stop collecting metrics for the current thread.
+    :return: The collected metrics, as a dictionary ``{name: value}``.
+    """
+    metrics = getattr(_local, 'metrics', None)
+    _local.metrics = None
+    return metrics or {}
+
+
+def record_timing(name, seconds):
+    """
+    Add the given duration to the given timing of the current request, if instrumented.
+    :param name: The timing name, should end with ``_time``.
+    :param seconds: The duration in seconds.
+    :return: None
+    """
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is not None:
+        metrics[name] = metrics.get(name, 0.0) + seconds
+
+
+def record_count(name, count=1):
+    """
+    Add the given count to the given counter of the current request, if instrumented.
+    :param name: The counter name.
+    :param count: The count to be added.
+    :return: None
+    """
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is not None:
+        metrics[name] = metrics.get(name, 0) + count
+
+
+@contextmanager
+def timed(name):
+    """
+    Context manager recording the duration of the enclosed block in the given timing of the current request.
+    :param name: The timing name, should end with ``_time``.
+    """
+    if getattr(_local, 'metrics', None) is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start_time)
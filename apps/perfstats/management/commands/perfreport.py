@@ -0,0 +1,149 @@
+"""
+Management command to print the performance statistics report.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...settings import PERFSTATS_LATENCY_BUCKETS_MS
+from ...store import (read_stats,
+                      purge_stats)
+
+
+# Available sort keys
+SORT_KEYS = ('total_time', 'avg_time', 'p95_time', 'max_time', 'count', 'avg_queries', 'avg_db_time',
+             'avg_render_time')
+
+
+def _get_percentile(latency_histogram, count, percentile):
+    """
+    Return the approximate latency percentile in milliseconds (the upper bound of the matching histogram bucket),
+    or None if in the last (unbounded) bucket.
+    :param latency_histogram: The latency histogram, as a dictionary ``{upper_bound: count}``.
+    :param count: The total number of requests.
+    :param percentile: The percentile (between 0 and 100).
+    """
+    threshold = count * percentile / 100
+    cumulated = 0
+    for bound in [str(bound) for bound in PERFSTATS_LATENCY_BUCKETS_MS] + ['inf']:
+        cumulated += latency_histogram.get(bound, 0)
+        if cumulated >= threshold:
+            return float(bound) if bound != 'inf' else None
+    return None
+
+
+def aggregate_stats(records):
+    """
+    Aggregate the given statistics records by view.
+    :param records: An iterable of records, see ``store.read_stats()``.
+    :return: A list of dictionaries, one per view.
+    """
+    views = {}
+    for record in records:
+        view = views.get(record['view'])
+        if view is None:
+            view = views[record['view']] = {
+                'view': record['view'],
+                'count': 0,
+                'estimated_count': 0.0,
+                'total_time': 0.0,
+                'max_time': 0.0,
+                'latency_histogram': {},
+                'metrics': {},
+            }
+        view['count'] += record['count']
+        view['estimated_count'] += record['count'] / record['sample_rate'] if record['sample_rate'] else 0
+        view['total_time'] += record['total_time']
+        view['max_time'] = max(view['max_time'], record['max_time'])
+        for bound, count in record['latency_histogram'].items():
+            view['latency_histogram'][bound] = view['latency_histogram'].get(bound, 0) + count
+        for name, value in record['metrics'].items():
+            view['metrics'][name] = view['metrics'].get(name, 0) + value
+
+    results = []
+    for view in views.values():
+        count = view['count']
+        metrics = view['metrics']
+        cache_hits = sum(value for name, value in metrics.items() if name.endswith('_cache_hits'))
+        cache_misses = sum(value for name, value in metrics.items() if name.endswith('_cache_misses'))
+        view.update({
+            'avg_time': view['total_time'] / count,
+            'p95_time': _get_percentile(view['latency_histogram'], count, 95),
+            'avg_queries': metrics.get('db_queries', 0) / count,
+            'avg_db_time': metrics.get('db_time', 0.0) / count,
+            'avg_render_time': metrics.get('render_time', 0.0) / count,
+            'cache_hit_ratio': cache_hits / (cache_hits + cache_misses) if cache_hits + cache_misses else None,
+        })
+        results.append(view)
+    return results
+
+
+class Command(BaseCommand):
+    """
+    A management command which print the top offenders views, from the statistics recorded by the
+    ``PerfStatsMiddleware`` in the local store of this host.
+    Counts are the number of sampled requests, the estimated number of requests take the sample rate into account.
+    """
+
+    help = "Print the views performance statistics report"
+
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--hours',
+                            type=float,
+                            dest='hours',
+                            default=24,
+                            help='Report the statistics of the last N hours (default 24).')
+        parser.add_argument('--sort',
+                            dest='sort',
+                            choices=SORT_KEYS,
+                            default='total_time',
+                            help='Sort key of the report (default total_time).')
+        parser.add_argument('--limit',
+                            type=int,
+                            dest='limit',
+                            default=20,
+                            help='Number of views to be printed (default 20).')
+        parser.add_argument('--purge-days',
+                            type=float,
+                            dest='purge_days',
+                            default=None,
+                            help='Delete the statistics older than N days before printing the report.')
+
+    def handle(self, *args, **options):
+        """
+        Command handler.
+        :param args: Not used.
+        :param options: Command options.
+        :return: None.
+        """
+        now = time.time()
+        if options['purge_days'] is not None:
+            nb_deleted = purge_stats(now - options['purge_days'] * 24 * 3600)
+            if options['verbosity']:
+                self.stdout.write('%d record(s) deleted' % nb_deleted)
+
+        results = aggregate_stats(read_stats(since=now - options['hours'] * 3600))
+        if not results:
+            self.stdout.write('No statistics recorded')
+            return
+
+        sort_key = options['sort']
+        results.sort(key=lambda view: view[sort_key] if view[sort_key] is not None else float('inf'), reverse=True)
+
+        self.stdout.write('%-50s %8s %9s %9s %9s %9s %8s %9s %9s %7s' % (
+            'View', 'Sampled', 'Est. reqs', 'Avg ms', 'P95 ms', 'Max ms',
+            'Queries', 'DB ms', 'Render ms', 'Cache'))
+        for view in results[:options['limit']]:
+            p95_time = '%.0f' % view['p95_time'] \
+                if view['p95_time'] is not None else '>%d' % PERFSTATS_LATENCY_BUCKETS_MS[-1]
+            cache_hit_ratio = '%.0f%%' % (view['cache_hit_ratio'] * 100) if view['cache_hit_ratio'] is not None else '-'
+            self.stdout.write('%-50s %8d %9.0f %9.1f %9s %9.1f %8.1f %9.1f %9.1f %7s' % (
+                view['view'][:50], view['count'], view['estimated_count'],
+                view['avg_time'] * 1000, p95_time, view['max_time'] * 1000,
+                view['avg_queries'], view['avg_db_time'] * 1000, view['avg_render_time'] * 1000,
+                cache_hit_ratio))
@@ -0,0 +1,98 @@
+"""
+Middleware for the performance statistics app.
+"""
+
+import atexit
+import itertools
+import random
+import time
+
+from django.db import connections
+
+from .collector import (start_collecting,
+                        stop_collecting)
+from .settings import (PERFSTATS_ENABLED,
+                       PERFSTATS_SAMPLE_RATE,
+                       PERFSTATS_FLUSH_INTERVAL_SECONDS)
+from .stats import aggregator
+from .store import write_stats
+
+
+def flush_stats():
+    """
+    Write the statistics aggregated by this process to the local store.
+    :return: None
+    """
+    period_start, period_end, views = aggregator.pop()
+    write_stats(period_start, period_end, views, PERFSTATS_SAMPLE_RATE)
+
+# Do not lose the statistics of the last period on (graceful) shutdown
+atexit.register(flush_stats)
+
+
+class PerfStatsMiddleware(object):
+    """
+    Middleware recording the latency, the database queries count and time, and the metrics recorded using the
+    ``collector`` module API (rendering time, cache hits and misses, etc) of a sample of the requests, by view.
+    Must be the first middleware, to also measure the time spent in all other middleware.
+    """
+
+    def process_request(self, request):
+        """
+        Process the request, start the instrumentation if the request is sampled.
+        :param request: The current request instance.
+        """
+        if not PERFSTATS_ENABLED or random.random() >= PERFSTATS_SAMPLE_RATE:
+            return
+
+        # Log the database queries of this request (already logged with DEBUG=True)
+        queries_logs = []
+        for connection in connections.all():
+            queries_logs.append((connection, connection.force_debug_cursor, len(connection.queries_log)))
+            connection.force_debug_cursor = True
+
+        start_collecting()
+        request._perfstats = (time.perf_counter(), queries_logs)
+
+    def process_response(self, request, response):
+        """
+        Process the response, record the request statistics if the request is sampled.
+        :param request: The current request instance.
+        :param response: The current response instance.
+        """
+        instrumentation = getattr(request, '_perfstats', None)
+        if instrumentation is None:
+            return response
+        del request._perfstats
+        start_time, queries_logs = instrumentation
+        elapsed_time = time.perf_counter() - start_time
+        metrics = stop_collecting()
+
+        # Sum up the database queries of this request
+        nb_queries = 0
+        queries_time = 0.0
+        for connection, force_debug_cursor, start_index in queries_logs:
+            connection.force_debug_cursor = force_debug_cursor
+            for query in itertools.islice(connection.queries_log, start_index, None):
+                nb_queries += 1
+                queries_time += float(query['time'])
+        metrics['db_queries'] = nb_queries
+        metrics['db_time'] = queries_time
+
+        aggregator.add(self.get_view_name(request, response), elapsed_time, metrics)
+        if time.time() - aggregator.get_period_start() >= PERFSTATS_FLUSH_INTERVAL_SECONDS:
+            flush_stats()
+        return response
+
+    @staticmethod
+    def get_view_name(request, response):
+        """
+        Return the name of the view of the given request: the URL name (with namespaces) if any, the view function
+        path otherwise, or the response status code for unresolved URLs (404, redirections by middleware, etc).
+        :param request: The current request instance.
+        :param response: The current response instance.
+        """
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is None:
+            return '<unresolved %d>' % response.status_code
+        return resolver_match.view_name
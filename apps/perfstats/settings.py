@@ -0,0 +1,26 @@
+"""
+Custom settings for the performance statistics app.
+"""
+
+import os
+import tempfile
+
+from django.conf import settings
+
+
+# Set to False to disable the performance statistics middleware
+PERFSTATS_ENABLED = getattr(settings, 'PERFSTATS_ENABLED', True)
+
+# Fraction of the requests to be instrumented (default 5%).
+# Instrumented requests log all their database queries, keep this rate low to keep the overhead low.
+PERFSTATS_SAMPLE_RATE = getattr(settings, 'PERFSTATS_SAMPLE_RATE', 0.05)
+
+# Minimum number of seconds between two writes of the in-memory statistics to the local store (default 1 minute)
+PERFSTATS_FLUSH_INTERVAL_SECONDS = getattr(settings, 'PERFSTATS_FLUSH_INTERVAL_SECONDS', 60)
+
+# Directory of the local store, one file per process (default "perfstats" in the system temporary directory)
+PERFSTATS_DIR = getattr(settings, 'PERFSTATS_DIR', os.path.join(tempfile.gettempdir(), 'perfstats'))
+
+# Upper bounds of the latency histogram buckets in milliseconds
+PERFSTATS_LATENCY_BUCKETS_MS = getattr(settings, 'PERFSTATS_LATENCY_BUCKETS_MS',
+                                       (10, 25, 50, 100, 250, 500, 1000, 2500, 5000))
@@ -0,0 +1,101 @@
+"""
+In-process statistics aggregation, by view.
+"""
+
+import bisect
+import threading
+import time
+
+from .settings import PERFSTATS_LATENCY_BUCKETS_MS
+
+
+class ViewStats(object):
+    """
+    Aggregated statistics of a single view: requests count, latency (total, maximum and histogram) and sums of all
+    the other metrics (database queries, rendering time, cache hits and misses, etc).
+    """
+
+    def __init__(self):
+        """
+        Create new empty statistics.
+        """
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.latency_histogram = [0] * (len(PERFSTATS_LATENCY_BUCKETS_MS) + 1)
+        self.metrics = {}
+
+    def add(self, elapsed_time, metrics):
+        """
+        Add a request to the statistics.
+        :param elapsed_time: The request latency in seconds.
+        :param metrics: The other metrics of the request, as a dictionary ``{name: value}``.
+        """
+        self.count += 1
+        self.total_time += elapsed_time
+        self.max_time = max(self.max_time, elapsed_time)
+        self.latency_histogram[bisect.bisect_left(PERFSTATS_LATENCY_BUCKETS_MS, elapsed_time * 1000)] += 1
+        for name, value in metrics.items():
+            self.metrics[name] = self.metrics.get(name, 0) + value
+
+    def as_dict(self):
+        """
+        Return the statistics as a JSON serializable dictionary. The latency histogram is keyed by bucket upper bound
+        in milliseconds ("inf" for the last bucket).
+        """
+        bounds = [str(bound) for bound in PERFSTATS_LATENCY_BUCKETS_MS] + ['inf']
+        return {
+            'count': self.count,
+            'total_time': self.total_time,
+            'max_time': self.max_time,
+            'latency_histogram': {bound: count for bound, count in zip(bounds, self.latency_histogram) if count},
+            'metrics': self.metrics,
+        }
+
+
+class StatsAggregator(object):
+    """
+    Thread-safe aggregator of the views statistics of the current process, since the last flush.
+    """
+
+    def __init__(self):
+        """
+        Create a new empty aggregator.
+        """
+        self._lock = threading.Lock()
+        self._views = {}
+        self._period_start = time.time()
+
+    def add(self, view_name, elapsed_time, metrics):
+        """
+        Add a request to the statistics of the given view.
+        :param view_name: The view name.
+        :param elapsed_time: The request latency in seconds.
+        :param metrics: The other metrics of the request, as a dictionary ``{name: value}``.
+        """
+        with self._lock:
+            view_stats = self._views.get(view_name)
+            if view_stats is None:
+                view_stats = self._views[view_name] = ViewStats()
+            view_stats.add(elapsed_time, metrics)
+
+    def get_period_start(self):
+        """
+        Return the timestamp of the last flush (or of the aggregator creation).
+        """
+        return self._period_start
+
+    def pop(self):
+        """
+        Return and reset the aggregated statistics.
+        :return: A tuple ``(period_start, period_end, views)`` with ``views`` a dictionary ``{view_name: ViewStats}``.
+        """
+        with self._lock:
+            now = time.time()
+            period_start, views = self._period_start, self._views
+            self._period_start, self._views = now, {}
+        return period_start, now, views
+
+
+# Statistics aggregator of this process
+aggregator = StatsAggregator()
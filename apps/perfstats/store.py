@@ -0,0 +1,91 @@
+"""
+Local store of the performance statistics.
+
+Each process append its statistics to its own file (one JSON record per view and per flush), so writes never contend.
+The ``perfreport`` management command read all the files of the store directory.
+"""
+
+import glob
+import json
+import os
+import socket
+
+from .settings import PERFSTATS_DIR
+
+
+def _get_process_filename():
+    """
+    Return the store file name of the current process.
+    """
+    return os.path.join(PERFSTATS_DIR, '%s-%d.jsonl' % (socket.gethostname(), os.getpid()))
+
+
+def write_stats(period_start, period_end, views, sample_rate):
+    """
+    Append the given views statistics to the store file of the current process.
+    :param period_start: The statistics period start timestamp.
+    :param period_end: The statistics period end timestamp.
+    :param views: The views statistics, as a dictionary ``{view_name: ViewStats}``.
+    :param sample_rate: The sample rate used to collect the statistics.
+    :return: None
+    """
+    if not views:
+        return
+    lines = []
+    for view_name, view_stats in views.items():
+        record = view_stats.as_dict()
+        record.update({
+            'view': view_name,
+            'start': period_start,
+            'end': period_end,
+            'sample_rate': sample_rate,
+        })
+        lines.append(json.dumps(record, sort_keys=True))
+    os.makedirs(PERFSTATS_DIR, exist_ok=True)
+    with open(_get_process_filename(), 'a') as fi_handle:
+        fi_handle.write('\n'.join(lines) + '\n')
+
+
+def read_stats(since=None):
+    """
+    Read all the statistics records of the store.
+    :param since: Only return the records of the periods ending after this timestamp, if set.
+    :return: A generator of records (dictionaries).
+    """
+    for filename in sorted(glob.glob(os.path.join(PERFSTATS_DIR, '*.jsonl'))):
+        with open(filename) as fi_handle:
+            for line in fi_handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Truncated line (process killed while writing)
+                    continue
+                if since is None or record['end'] >= since:
+                    yield record
+
+
+def purge_stats(before):
+    """
+    Delete the statistics records of the periods ending before the given timestamp. Files of running processes are
+    rewritten in place, records appended while purging may be lost.
+    :param before: The purge limit timestamp.
+    :return: The number of deleted records.
+    """
+    nb_deleted = 0
+    for filename in glob.glob(os.path.join(PERFSTATS_DIR, '*.jsonl')):
+        with open(filename) as fi_handle:
+            lines = fi_handle.readlines()
+        kept_lines = []
+        for line in lines:
+            try:
+                if json.loads(line)['end'] >= before:
+                    kept_lines.append(line)
+            except ValueError:
+                pass
+        nb_deleted += len(lines) - len(kept_lines)
+        if not kept_lines:
+            os.remove(filename)
+        elif len(kept_lines) != len(lines):
+            with open(filename, 'w') as fi_handle:
+                fi_handle.writelines(kept_lines)
+    return nb_deleted
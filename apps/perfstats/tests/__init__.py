@@ -0,0 +1,3 @@
+"""
+Tests suites for the performance statistics app.
+"""
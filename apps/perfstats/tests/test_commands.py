@@ -0,0 +1,116 @@
+"""
+Test suite for the performance statistics management commands.
+"""
+
+import io
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..management.commands.perfreport import aggregate_stats
+from ..stats import ViewStats
+from ..store import (write_stats,
+                     read_stats)
+
+
+class PerfReportCommandTestCase(SimpleTestCase):
+    """
+    Test suite for the ``perfreport`` management command.
+    """
+
+    def setUp(self):
+        """
+        Start each test with a temporary store.
+        """
+        self.store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store_dir)
+        patcher = mock.patch('apps.perfstats.store.PERFSTATS_DIR', self.store_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_stats(self, period_end, view_name, latencies, metrics, sample_rate=0.5):
+        """
+        Write the statistics of the given requests to the store.
+        :param period_end: The period end timestamp.
+        :param view_name: The view name.
+        :param latencies: The requests latencies, in seconds.
+        :param metrics: The metrics of each request.
+        :param sample_rate: The sample rate.
+        """
+        view_stats = ViewStats()
+        for latency in latencies:
+            view_stats.add(latency, metrics)
+        write_stats(period_end - 60, period_end, {view_name: view_stats}, sample_rate)
+
+    def test_aggregate_stats(self):
+        """
+        Test if the statistics records are aggregated by view.
+        """
+        now = time.time()
+        self._write_stats(now, 'slow', [0.2, 0.4], {'db_queries': 10, 'forum_page_cache_hits': 1})
+        self._write_stats(now, 'slow', [3], {'db_queries': 4, 'forum_page_cache_misses': 1})
+        self._write_stats(now, 'fast', [0.001], {'render_time': 0.0005})
+        results = {view['view']: view for view in aggregate_stats(read_stats())}
+        self.assertEqual({'slow', 'fast'}, set(results.keys()))
+
+        slow = results['slow']
+        self.assertEqual(3, slow['count'])
+        self.assertEqual(6, slow['estimated_count'])
+        self.assertAlmostEqual(1.2, slow['avg_time'])
+        self.assertEqual(3, slow['max_time'])
+        self.assertEqual(5000, slow['p95_time'])
+        self.assertEqual(8, slow['avg_queries'])
+        self.assertAlmostEqual(2 / 3, slow['cache_hit_ratio'])
+
+        fast = results['fast']
+        self.assertEqual(10, fast['p95_time'])
+        self.assertEqual(0.0005, fast['avg_render_time'])
+        self.assertIsNone(fast['cache_hit_ratio'])
+
+    def test_report(self):
+        """
+        Test if the report print the views of the requested period, sorted as requested.
+        """
+        now = time.time()
+        self._write_stats(now, 'many', [0.01] * 100, {})
+        self._write_stats(now, 'slow', [2], {})
+        self._write_stats(now - 48 * 3600, 'old', [10], {})
+
+        output = io.StringIO()
+        call_command('perfreport', stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].startswith('slow '))
+        self.assertTrue(lines[2].startswith('many '))
+
+        output = io.StringIO()
+        call_command('perfreport', sort='count', limit=1, stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[1].startswith('many '))
+
+        output = io.StringIO()
+        call_command('perfreport', hours=72, stdout=output)
+        self.assertTrue(output.getvalue().splitlines()[1].startswith('old '))
+
+    def test_purge(self):
+        """
+        Test if old statistics are deleted.
+        """
+        now = time.time()
+        self._write_stats(now, 'recent', [0.1], {})
+        self._write_stats(now - 10 * 24 * 3600, 'old', [0.1], {})
+        call_command('perfreport', purge_days=7, verbosity=0, stdout=io.StringIO())
+        self.assertEqual(['recent'], [record['view'] for record in read_stats()])
+
+    def test_empty_store(self):
+        """
+        Test the report without any statistics.
+        """
+        output = io.StringIO()
+        call_command('perfreport', stdout=output)
+        self.assertEqual('No statistics recorded', output.getvalue().strip())
@@ -0,0 +1,149 @@
+"""
+Test suite for the performance statistics middleware.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.urlresolvers import ResolverMatch
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (TestCase,
+                         RequestFactory)
+
+from ..collector import (record_count,
+                         record_timing)
+from ..middleware import PerfStatsMiddleware
+from ..stats import aggregator
+from ..store import read_stats
+
+
+def dummy_view(request):
+    """
+    Dummy view for the ``ResolverMatch`` of the requests.
+    """
+    return HttpResponse()
+
+
+class PerfStatsMiddlewareTestCase(TestCase):
+    """
+    Test suite for the ``PerfStatsMiddleware``.
+    """
+
+    def setUp(self):
+        """
+        Start each test with empty statistics and a temporary store, with all requests sampled.
+        """
+        aggregator.pop()
+        self.store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store_dir)
+        for patcher in (mock.patch('apps.perfstats.store.PERFSTATS_DIR', self.store_dir),
+                        mock.patch('apps.perfstats.middleware.PERFSTATS_SAMPLE_RATE', 1)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.middleware = PerfStatsMiddleware()
+
+    def _get_request(self, url_name='dummy'):
+        """
+        Return a new request, resolved to the given URL name (unresolved if None).
+        :param url_name: The URL name of the request.
+        """
+        request = RequestFactory().get('/')
+        if url_name is not None:
+            request.resolver_match = ResolverMatch(dummy_view, (), {}, url_name=url_name)
+        return request
+
+    def test_middleware_installed(self):
+        """
+        Test if the ``PerfStatsMiddleware`` is installed, as the first middleware.
+        """
+        from django.conf import settings
+        self.assertEqual('apps.perfstats.middleware.PerfStatsMiddleware', settings.MIDDLEWARE_CLASSES[0])
+
+    def test_sampled_request(self):
+        """
+        Test if the statistics of sampled requests are recorded, with the database queries and collected metrics.
+        """
+        request = self._get_request()
+        self.assertIsNone(self.middleware.process_request(request))
+        self.assertTrue(connection.force_debug_cursor)
+        get_user_model().objects.count()
+        get_user_model().objects.count()
+        record_count('render_cache_hits')
+        record_count('render_cache_misses', 2)
+        record_timing('render_time', 0.5)
+        response = HttpResponse()
+        self.assertIs(response, self.middleware.process_response(request, response))
+        self.assertFalse(connection.force_debug_cursor)
+        self.assertFalse(hasattr(request, '_perfstats'))
+
+        period_start, period_end, views = aggregator.pop()
+        self.assertEqual(['dummy'], list(views.keys()))
+        view_stats = views['dummy']
+        self.assertEqual(1, view_stats.count)
+        self.assertEqual(view_stats.total_time, view_stats.max_time)
+        self.assertEqual(1, sum(view_stats.latency_histogram))
+        self.assertEqual(2, view_stats.metrics['db_queries'])
+        self.assertEqual(1, view_stats.metrics['render_cache_hits'])
+        self.assertEqual(2, view_stats.metrics['render_cache_misses'])
+        self.assertEqual(0.5, view_stats.metrics['render_time'])
+
+    def test_not_sampled_request(self):
+        """
+        Test if the statistics of not sampled requests are not recorded.
+        """
+        request = self._get_request()
+        with mock.patch('apps.perfstats.middleware.PERFSTATS_SAMPLE_RATE', 0):
+            self.middleware.process_request(request)
+        self.assertFalse(connection.force_debug_cursor)
+        record_count('render_cache_hits')
+        self.middleware.process_response(request, HttpResponse())
+        period_start, period_end, views = aggregator.pop()
+        self.assertEqual({}, views)
+
+    def test_disabled(self):
+        """
+        Test if no statistics are recorded when disabled.
+        """
+        request = self._get_request()
+        with mock.patch('apps.perfstats.middleware.PERFSTATS_ENABLED', False):
+            self.middleware.process_request(request)
+        self.middleware.process_response(request, HttpResponse())
+        period_start, period_end, views = aggregator.pop()
+        self.assertEqual({}, views)
+
+    def test_unresolved_request(self):
+        """
+        Test if the statistics of unresolved requests are recorded by status code.
+        """
+        request = self._get_request(url_name=None)
+        self.middleware.process_request(request)
+        self.middleware.process_response(request, HttpResponse(status=404))
+        period_start, period_end, views = aggregator.pop()
+        self.assertEqual(['<unresolved 404>'], list(views.keys()))
+
+    def test_flush(self):
+        """
+        Test if the statistics are written to the store once the flush interval is elapsed.
+        """
+        for _ in range(3):
+            request = self._get_request()
+            self.middleware.process_request(request)
+            self.middleware.process_response(request, HttpResponse())
+        self.assertEqual([], list(read_stats()))
+
+        with mock.patch('apps.perfstats.middleware.PERFSTATS_FLUSH_INTERVAL_SECONDS', 0):
+            request = self._get_request()
+            self.middleware.process_request(request)
+            self.middleware.process_response(request, HttpResponse())
+        self.assertEqual(1, len(os.listdir(self.store_dir)))
+        records = list(read_stats())
+        self.assertEqual(1, len(records))
+        self.assertEqual('dummy', records[0]['view'])
+        self.assertEqual(4, records[0]['count'])
+        self.assertEqual(1, records[0]['sample_rate'])
+        period_start, period_end, views = aggregator.pop()
+        self.assertEqual({}, views)
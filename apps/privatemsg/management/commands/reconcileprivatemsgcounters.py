@@ -0,0 +1,26 @@
+"""
+Management command to repair the unread private messages counters.
+"""
+
+from django.core.management.base import NoArgsCommand
+
+from ...models import PrivateMessageUserProfile
+
+
+class Command(NoArgsCommand):
+    """
+    A management command which recompute the unread private messages counter of all users and fix the drifted ones.
+    Calls ``PrivateMessageUserProfile.objects.reconcile_unread_messages_count()``.
+    """
+
+    help = "Recompute the unread private messages counters and fix the drifted ones"
+
+    def handle_noargs(self, **options):
+        """
+        Command handler.
+        :param options: Command options.
+        :return: None.
+        """
+        nb_fixed = PrivateMessageUserProfile.objects.reconcile_unread_messages_count()
+        if options['verbosity']:
+            self.stdout.write('%d counter(s) fixed' % nb_fixed)
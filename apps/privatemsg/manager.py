@@ -5,7 +5,9 @@ Data model objects manager for the private messages app.
 import datetime
 
 from django.db import models
-from django.db.models import Q
+from django.db.models import (Q,
+                              F,
+                              Count)
 from django.utils import timezone
 
 from .settings import (DELETED_MSG_DELETION_TIMEOUT_DAYS,
@@ -20,13 +22,25 @@ class PrivateMessageManager(models.Manager):
     def inbox_count_for(self, user):
         """
         Returns the number of unread messages for the given user.
+        The number is read from the denormalized counter of the user's profile (primary key lookup), not counted.
         :param user: The target user.
         :return: The number of unread messages.
         """
-        return self.filter(recipient=user,
-                           read_at__isnull=True,
+        from .models import PrivateMessageUserProfile
+        count = PrivateMessageUserProfile.objects.filter(user=user) \
+            .values_list('unread_messages_count', flat=True).first()
+        if count is None:
+            # Profile creation compute the initial value of the counter
+            count = user.privatemsg_profile.unread_messages_count
+        return count
+
+    def unread_inbox_messages(self):
+        """
+        Returns all unread messages not deleted by their recipient (the messages counted by ``inbox_count_for``).
+        """
+        return self.filter(read_at__isnull=True,
                            recipient_deleted_at__isnull=True,
-                           recipient_permanently_deleted=False).count()
+                           recipient_permanently_deleted=False)
 
     def inbox_for(self, user):
         """
@@ -46,11 +60,11 @@ class PrivateMessageManager(models.Manager):
         :param user: The target user.
         :return: The number of messages marked as read.
         """
+        from .models import PrivateMessageUserProfile
         now = timezone.now()
-        return self.filter(recipient=user,
-                           read_at__isnull=True,
-                           recipient_deleted_at__isnull=True,
-                           recipient_permanently_deleted=False).update(read_at=now)
+        nb_updated = self.unread_inbox_messages().filter(recipient=user).update(read_at=now)
+        PrivateMessageUserProfile.objects.filter(user=user).update(unread_messages_count=0)
+        return nb_updated
 
     def outbox_for(self, user):
         """
@@ -131,6 +145,60 @@ class PrivateMessageManager(models.Manager):
                         sender_deleted_at__lte=logical_deletion_date).update(sender_permanently_deleted=True)
 
 
+class PrivateMessageUserProfileManager(models.Manager):
+    """
+    Manager class for the ``PrivateMessageUserProfile`` data model.
+    """
+
+    use_for_related_fields = True
+
+    def increment_unread_messages_count(self, user_id, delta=1):
+        """
+        Add ``delta`` to the unread messages counter of the given user. A missing profile is created (with an
+        up-to-date counter) and the counter never go below zero.
+        :param user_id: The PK of the user to be updated.
+        :param delta: The value to be added to the counter.
+        :return: None
+        """
+        queryset = self.filter(user_id=user_id)
+        if delta < 0:
+            queryset = queryset.filter(unread_messages_count__gte=-delta)
+        if not queryset.update(unread_messages_count=F('unread_messages_count') + delta):
+            self.reconcile_unread_messages_count([user_id])
+
+    def reconcile_unread_messages_count(self, user_ids=None):
+        """
+        Recompute the unread messages counter of the given users and fix the drifted ones. Missing profiles of the
+        given users are created.
+        :param user_ids: The PK of the users to be processed, if None all existing profiles are processed.
+        :return: The number of counters fixed.
+        """
+        from .models import PrivateMessage
+
+        # Count unread messages per user, with a single query
+        unread_messages = PrivateMessage.objects.unread_inbox_messages()
+        profiles = self.all()
+        if user_ids is not None:
+            unread_messages = unread_messages.filter(recipient_id__in=user_ids)
+            profiles = profiles.filter(user_id__in=user_ids)
+        actual_counts = dict(unread_messages.order_by().values_list('recipient_id').annotate(count=Count('id')))
+
+        # Fix the drifted counters
+        nb_fixed = 0
+        missing_user_ids = set(user_ids or ())
+        for user_id, count in profiles.values_list('user_id', 'unread_messages_count'):
+            missing_user_ids.discard(user_id)
+            actual_count = actual_counts.get(user_id, 0)
+            if count != actual_count:
+                self.filter(user_id=user_id).update(unread_messages_count=actual_count)
+                nb_fixed += 1
+
+        # Create the missing profiles
+        for user_id in missing_user_ids:
+            self.get_or_create(user_id=user_id)
+        return nb_fixed
+
+
 class BlockedUserManager(models.Manager):
     """
     Manager class for the ``BlockedUser`` data model.
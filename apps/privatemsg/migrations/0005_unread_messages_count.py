@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import Count
+
+
+def init_unread_messages_count(apps, schema_editor):
+    """
+    Initialize the unread messages counter of all existing profiles.
+    """
+    PrivateMessage = apps.get_model('privatemsg', 'PrivateMessage')
+    PrivateMessageUserProfile = apps.get_model('privatemsg', 'PrivateMessageUserProfile')
+    unread_counts = PrivateMessage.objects.filter(read_at__isnull=True,
+                                                  recipient_deleted_at__isnull=True,
+                                                  recipient_permanently_deleted=False) \
+        .order_by().values_list('recipient_id').annotate(count=Count('id'))
+    for user_id, count in unread_counts:
+        PrivateMessageUserProfile.objects.filter(user_id=user_id).update(unread_messages_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('privatemsg', '0004_render_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privatemessageuserprofile',
+            name='unread_messages_count',
+            field=models.PositiveIntegerField(verbose_name='Unread messages count', default=0, editable=False),
+        ),
+        migrations.RunPython(init_unread_messages_count, migrations.RunPython.noop),
+    ]
@@ -11,13 +11,16 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 from django.contrib import messages
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete
 
 from apps.tools.fields import AutoOneToOneField
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from .manager import (PrivateMessageManager,
+                      PrivateMessageUserProfileManager,
                       BlockedUserManager)
 from .settings import NB_SECONDS_BETWEEN_PRIVATE_MSG
 
@@ -46,6 +49,15 @@ class PrivateMessage(models.Model):
 
     body_text = models.TextField(_('Message (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     sender = models.ForeignKey(settings.AUTH_USER_MODEL,
                                db_index=True,  # Database optimization
                                related_name='privatemsg_sent',
@@ -107,6 +119,16 @@ class PrivateMessage(models.Model):
     def __str__(self):
         return self.get_subject_display()
 
+    def __init__(self, *args, **kwargs):
+        """
+        Backup the recipient and the unread state for updating the recipient's unread counter.
+        :param args: For super()
+        :param kwargs: For super()
+        """
+        super(PrivateMessage, self).__init__(*args, **kwargs)
+        self._old_recipient_id = self.recipient_id
+        self._old_unread_in_inbox = self.unread_in_inbox()
+
     def save(self, *args, **kwargs):
         """
         All the saving logic happen here.
@@ -121,8 +143,28 @@ class PrivateMessage(models.Model):
         self.render_body()
 
         # Save the message
+        adding = self._state.adding
         super(PrivateMessage, self).save(*args, **kwargs)
 
+        # Update the unread counter of the recipient
+        if adding:
+            self._old_unread_in_inbox = False
+        self.update_unread_counters()
+
+    def update_unread_counters(self):
+        """
+        Update the unread messages counter of the recipient if the message has been created, read, unread, deleted
+        or un-deleted since the last call.
+        """
+        unread_in_inbox = self.unread_in_inbox()
+        if self.recipient_id != self._old_recipient_id or unread_in_inbox != self._old_unread_in_inbox:
+            if self._old_unread_in_inbox:
+                PrivateMessageUserProfile.objects.increment_unread_messages_count(self._old_recipient_id, -1)
+            if unread_in_inbox:
+                PrivateMessageUserProfile.objects.increment_unread_messages_count(self.recipient_id)
+        self._old_recipient_id = self.recipient_id
+        self._old_unread_in_inbox = unread_in_inbox
+
     def fix_deletion_states(self):
         """
         Fix ``recipient_deleted_at`` and ``sender_deleted_at`` fields.
@@ -179,6 +221,12 @@ class PrivateMessage(models.Model):
     unread.short_description = _('Unread')
     unread.boolean = True
 
+    def unread_in_inbox(self):
+        """
+        Returns ``True`` if the message is unread and not deleted by the recipient (counted in the inbox count).
+        """
+        return self.read_at is None and self.recipient_deleted_at is None and not self.recipient_permanently_deleted
+
     def deleted_at_recipient_side(self):
         """
         Returns ``True`` if the recipient has deleted the message.
@@ -270,50 +318,49 @@ class PrivateMessage(models.Model):
 
         # Render HTML
         allow_cdm_extra = self.sender.has_perm('accounts.allow_cdm_extra')
-        content_html, content_text, _ = render_document(self.body,
-                                                        allow_titles=True,
-                                                        allow_code_blocks=True,
-                                                        allow_alerts_box=True,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_figures=True,
-                                                        allow_lists=True,
-                                                        allow_todo_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_footnotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=allow_cdm_extra,
-                                                        render_text_version=True,
-                                                        merge_footnotes_html=True,
-                                                        merge_footnotes_text=True)
+        content_html, content_text, extra_dict = render_document(self.body,
+                                                                 allow_titles=True,
+                                                                 allow_code_blocks=True,
+                                                                 allow_alerts_box=True,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_figures=True,
+                                                                 allow_lists=True,
+                                                                 allow_todo_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_footnotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=allow_cdm_extra,
+                                                                 render_text_version=True,
+                                                                 merge_footnotes_html=True,
+                                                                 merge_footnotes_text=True)
         self.body_html = content_html
         self.body_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
             # Avoid infinite loop by calling directly super.save
-            super(PrivateMessage, self).save(update_fields=('body_html', 'body_text'))
+            super(PrivateMessage, self).save(update_fields=('body_html', 'body_text',
+                                                            'render_fingerprint', 'render_tags'))
 
 
-def _redo_private_messages_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all private messages.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for message in PrivateMessage.objects.all():
-        message.render_body(save=True)
-
-render_engine_changed.connect(_redo_private_messages_text_rendering)
+register_rendered_model(PrivateMessage,
+                        'render_body',
+                        ('body_html', 'body_text'),
+                        select_related=('sender',),
+                        date_field='sent_at')
 
 
 def notice_unread_messages_upon_login(sender, user, request, **kwargs):
@@ -337,6 +384,20 @@ def notice_unread_messages_upon_login(sender, user, request, **kwargs):
 user_logged_in.connect(notice_unread_messages_upon_login)
 
 
+def decrement_unread_counter_on_delete(sender, instance, **kwargs):
+    """
+    Decrement the unread messages counter of the recipient when an unread message is deleted.
+    :param sender: Not used.
+    :param instance: The deleted message.
+    :param kwargs: Not used.
+    :return: None
+    """
+    if instance.unread_in_inbox():
+        PrivateMessageUserProfile.objects.increment_unread_messages_count(instance.recipient_id, -1)
+
+post_delete.connect(decrement_unread_counter_on_delete, sender=PrivateMessage)
+
+
 class PrivateMessageUserProfile(models.Model):
     """
     Private messages user's profile data model.
@@ -359,6 +420,12 @@ class PrivateMessageUserProfile(models.Model):
                                                       blank=True,
                                                       null=True)
 
+    unread_messages_count = models.PositiveIntegerField(_('Unread messages count'),
+                                                        default=0,
+                                                        editable=False)
+
+    objects = PrivateMessageUserProfileManager()
+
     class Meta:
         verbose_name = _('Private messages user profile')
         verbose_name_plural = _('Private messages user profiles')
@@ -366,6 +433,22 @@ class PrivateMessageUserProfile(models.Model):
     def __str__(self):
         return 'Private messages user profile of "%s"' % self.user.username
 
+    def save(self, *args, **kwargs):
+        """
+        Save the model. Compute the initial value of the unread messages counter on creation.
+        :param args: For super()
+        :param kwargs: For super()
+        :return: super()
+        """
+        if self._state.adding:
+            self.unread_messages_count = PrivateMessage.objects.unread_inbox_messages() \
+                .filter(recipient_id=self.user_id).count()
+        elif not args and 'update_fields' not in kwargs:
+            # The counter is only updated using atomic queries, never overwrite it with a (maybe stale) value
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name != 'unread_messages_count']
+        return super(PrivateMessageUserProfile, self).save(*args, **kwargs)
+
     def is_flooding(self):
         """
         Returns ``True`` if the user has post something less than ``NB_SECONDS_BETWEEN_PRIVATE_MSG`` seconds from now.
@@ -335,6 +335,54 @@ class PrivateMessageTestCase(TestCase):
         inbox_count = PrivateMessage.objects.inbox_count_for(user2)
         self.assertEqual(1, inbox_count)
 
+    def test_inbox_count_for_counter(self):
+        """
+        Test that the unread messages counter used by ``inbox_count_for`` is maintained.
+        """
+        msg = PrivateMessage.objects.create(sender=self.sender,
+                                            recipient=self.recipient,
+                                            subject='Test message',
+                                            body='Test message')
+        self.assertEqual(2, PrivateMessage.objects.inbox_count_for(self.recipient))
+        self.assertEqual(0, PrivateMessage.objects.inbox_count_for(self.sender))
+
+        msg.read_at = timezone.now()
+        msg.save()
+        self.assertEqual(1, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        msg.read_at = None
+        msg.save()
+        self.assertEqual(2, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        msg.delete_from_user_side(self.recipient)
+        msg.save()
+        self.assertEqual(1, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        msg.undelete_from_user_side(self.recipient)
+        msg.save()
+        self.assertEqual(2, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        msg.delete_from_user_side(self.sender)
+        msg.save()
+        self.assertEqual(2, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        msg.delete()
+        self.assertEqual(1, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+        PrivateMessage.objects.mark_all_messages_has_read_for(self.recipient)
+        self.assertEqual(0, PrivateMessage.objects.inbox_count_for(self.recipient))
+
+    def test_reconcile_unread_messages_count(self):
+        """
+        Test the ``reconcile_unread_messages_count`` method of the profile manager class.
+        """
+        self.assertEqual(1, PrivateMessage.objects.inbox_count_for(self.recipient))
+        PrivateMessageUserProfile.objects.filter(user=self.recipient).update(unread_messages_count=5)
+        self.assertEqual(5, PrivateMessage.objects.inbox_count_for(self.recipient))
+        self.assertEqual(1, PrivateMessageUserProfile.objects.reconcile_unread_messages_count())
+        self.assertEqual(1, PrivateMessage.objects.inbox_count_for(self.recipient))
+        self.assertEqual(0, PrivateMessageUserProfile.objects.reconcile_unread_messages_count())
+
     def test_inbox_for_method(self):
         """
         Test the ``inbox_for`` method of the manager class.
@@ -16,7 +16,8 @@ from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from apps.paginator.shortcut import (update_context_for_pagination,
-                                     paginate)
+                                     paginate,
+                                     paginate_by_keyset)
 
 from .models import PrivateMessage, BlockedUser
 from .forms import (PrivateMessageCreationForm,
@@ -54,7 +55,7 @@ def msg_inbox(request, filterby='all',
         messages = messages.filter(read_at__isnull=True)
 
     # Messages list pagination
-    paginator, page = paginate(messages, request, NB_PRIVATE_MSG_PER_PAGE)
+    paginator, page = paginate_by_keyset(messages, request, NB_PRIVATE_MSG_PER_PAGE)
 
     # Render the template
     context = {
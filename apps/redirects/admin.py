@@ -18,10 +18,12 @@ class RedirectionAdmin(admin.ModelAdmin):
     list_display = ('site',
                     'old_path',
                     'new_path',
+                    'match_type',
                     'permanent_redirect',
                     'active')
 
     list_filter = ('site',
+                   'match_type',
                    'permanent_redirect',
                    'active')
 
@@ -36,7 +38,8 @@ class RedirectionAdmin(admin.ModelAdmin):
         }),
         (_('URLs'), {
             'fields': ('old_path',
-                       'new_path')
+                       'new_path',
+                       'match_type')
         }),
         (_('Metadata'), {
             'fields': ('permanent_redirect',
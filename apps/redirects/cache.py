@@ -0,0 +1,31 @@
+"""
+Version number of the redirections, shared by all processes using the cache.
+
+The version is bumped each time a redirection is created, updated or deleted. Each process keeps its own in-memory
+redirection table for each site (see the ``table`` module) and rebuilds it when the version change, so redirections
+are never searched in the database on request.
+"""
+
+from apps.tools.cache import (get_cache_version,
+                              bump_cache_version)
+
+from .settings import REDIRECTS_CACHE_ALIAS
+
+
+# Cache key of the version number of the redirections
+VERSION_KEY = 'redirects:version'
+
+
+def get_redirections_cache_version():
+    """
+    Return the current cache version number of the redirections.
+    """
+    return get_cache_version(REDIRECTS_CACHE_ALIAS, VERSION_KEY)
+
+
+def invalidate_redirections_cache():
+    """
+    Invalidate all redirection tables by bumping the version number.
+    :return: None
+    """
+    bump_cache_version(REDIRECTS_CACHE_ALIAS, VERSION_KEY)
@@ -0,0 +1,15 @@
+"""
+Match types for the redirect app.
+"""
+
+from django.utils.translation import ugettext_lazy as _
+
+
+MATCH_EXACT = 'exact'
+MATCH_PREFIX = 'prefix'
+MATCH_REGEX = 'regex'
+MATCH_TYPES = (
+    (MATCH_EXACT, _('Exact path')),
+    (MATCH_PREFIX, _('Path prefix')),
+    (MATCH_REGEX, _('Regular expression')),
+)
@@ -5,6 +5,11 @@ Data models managers for the redirect app.
 from django.db import models
 from django.conf import settings
 
+from .cache import get_redirections_cache_version
+from .table import (RedirectionTable,
+                    get_process_redirection_table,
+                    set_process_redirection_table)
+
 
 class RedirectionManager(models.Manager):
     """
@@ -31,3 +36,27 @@ class RedirectionManager(models.Manager):
 
         # No redirection found
         return None
+
+    def get_redirection_table(self, current_site):
+        """
+        Return the in-memory table of all active redirections of the given site, built once per process and rebuilt
+        when redirections change.
+        :param current_site: The current site object.
+        """
+        version = get_redirections_cache_version()
+        table = get_process_redirection_table(current_site.pk, version)
+        if table is None:
+            table = RedirectionTable(self.filter(site=current_site, active=True).order_by('old_path'))
+            set_process_redirection_table(current_site.pk, version, table)
+        return table
+
+    def find_redirection(self, current_site, path):
+        """
+        Search the redirection for the given path, exact, prefix or regular expression, using the in-memory
+        redirection table of the given site.
+        :param current_site: The current site object.
+        :param path: The path to be redirected.
+        :return: A tuple ``(redirection, new_path)``, or ``(None, None)`` if no redirection found. The new path is
+        empty for "gone" redirections.
+        """
+        return self.get_redirection_table(current_site).lookup(path)
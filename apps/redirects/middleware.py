@@ -48,17 +48,17 @@ class RedirectFallbackMiddleware(object):
         # Get the current request site object
         current_site = get_current_site(request)
 
-        # Query the database
-        r = Redirection.objects.get_redirection(current_site, request)
+        # Search the redirection table
+        r, new_path = Redirection.objects.find_redirection(current_site, request.get_full_path())
 
         # Handle the redirection
         if r is not None:
-            if not r.new_path:
+            if not new_path:
                 return render(request, self.response_gone_template_name, {}, status=410)
             elif r.permanent_redirect:
-                return self.response_permanent_redirect_class(r.new_path)
+                return self.response_permanent_redirect_class(new_path)
             else:
-                return self.response_redirect_class(r.new_path)
+                return self.response_redirect_class(new_path)
 
         # No redirect was found. Return the response.
         return response
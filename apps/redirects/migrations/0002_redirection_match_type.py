@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('redirects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redirection',
+            name='match_type',
+            field=models.CharField(verbose_name='Match type', max_length=10, default='exact', choices=[('exact', 'Exact path'), ('prefix', 'Path prefix'), ('regex', 'Regular expression')], help_text="For prefix matches, the remaining of the path is appended to the new path. For regular expressions matches, the expression is matched from the start of the path and the new path can use groups, like '\\1' or '\\g<name>'."),
+        ),
+    ]
@@ -2,11 +2,20 @@
 Data models for the redirect app.
 """
 
+import re
+
 from django.db import models
+from django.db.models.signals import (post_save,
+                                      post_delete)
+from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.sites.models import Site
 
 from .managers import RedirectionManager
+from .cache import invalidate_redirections_cache
+from .constants import (MATCH_TYPES,
+                        MATCH_EXACT,
+                        MATCH_REGEX)
 
 
 class Redirection(models.Model):
@@ -14,7 +23,7 @@ class Redirection(models.Model):
     A redirection data model used to store runtime redirection for old/obsolete URLS..
     A redirection is made of:
     - a site,
-    - an old path (without the domain name),
+    - an old path (without the domain name), matched exactly, as a prefix or as a regular expression,
     - a new path (can be blank to generate a "Gone" response),
     - a "permanent" flag,
     - an "active" flag.
@@ -38,6 +47,15 @@ class Redirection(models.Model):
                                             "or a full URL starting with 'http://'. "
                                             "Can be blank if the redirection should raise a '410 Gone' response."))
 
+    match_type = models.CharField(_('Match type'),
+                                  max_length=10,
+                                  default=MATCH_EXACT,
+                                  choices=MATCH_TYPES,
+                                  help_text=_("For prefix matches, the remaining of the path is appended to the "
+                                              "new path. For regular expressions matches, the expression is "
+                                              "matched from the start of the path and the new path can use "
+                                              "groups, like '\\1' or '\\g<name>'."))
+
     permanent_redirect = models.BooleanField(_('Permanent redirection'),
                                              default=True)
 
@@ -54,3 +72,34 @@ class Redirection(models.Model):
 
     def __str__(self):
         return "[%s] %s -> %s" % (self.site.domain, self.old_path, self.new_path)
+
+    def clean(self):
+        """
+        Validate the regular expression of regular expressions redirections, and the groups references of the new path.
+        """
+        if self.match_type == MATCH_REGEX:
+            try:
+                regex = re.compile(self.old_path)
+            except re.error as e:
+                raise ValidationError({'old_path': ValidationError(_('Invalid regular expression: %s.') % e,
+                                                                   code='invalid_regex')})
+            if self.new_path:
+                try:
+                    # The replacement template is parsed (and checked against the groups of the regular expression)
+                    # even when nothing match
+                    regex.sub(self.new_path, '')
+                except (re.error, IndexError) as e:
+                    raise ValidationError({'new_path': ValidationError(_('Invalid groups reference: %s.') % e,
+                                                                       code='invalid_template')})
+
+
+def invalidate_redirections_cache_on_change(sender, **kwargs):
+    """
+    Invalidate the redirection tables when a redirection is created, updated or deleted.
+    :param sender: Not used.
+    :param kwargs: Not used.
+    """
+    invalidate_redirections_cache()
+
+post_save.connect(invalidate_redirections_cache_on_change, sender=Redirection)
+post_delete.connect(invalidate_redirections_cache_on_change, sender=Redirection)
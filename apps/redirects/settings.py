@@ -0,0 +1,13 @@
+"""
+Custom settings for the redirect app.
+"""
+
+from django.conf import settings
+
+
+# Django cache alias used for storing the version number of the redirections
+REDIRECTS_CACHE_ALIAS = getattr(settings, 'REDIRECTS_CACHE_ALIAS', 'default')
+
+# Maximum number of paths without redirection remembered by each redirection table (default 1000).
+# Only used when regular expression redirections exist, to avoid matching the same path again and again.
+REDIRECTS_MAX_CACHED_MISSES = getattr(settings, 'REDIRECTS_MAX_CACHED_MISSES', 1000)
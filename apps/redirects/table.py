@@ -0,0 +1,150 @@
+"""
+In-memory redirection table, used by the ``RedirectFallbackMiddleware`` to search for redirections without any
+database query.
+
+The table of a site is made of:
+
+- a dictionary of the exact paths redirections;
+- a single compiled regular expression matching all the prefixes of the prefix redirections (longest prefix first);
+- a single compiled regular expression matching all the regular expressions redirections, used to reject unmatched
+  paths at once, then each regular expression in turn to find the matching redirection;
+- a bounded set of the paths without redirection, when regular expressions redirections exist.
+
+The table is built once per process and per site, and rebuilt each time the redirections cache version change
+(see the ``cache`` module).
+"""
+
+import re
+
+from .constants import (MATCH_PREFIX,
+                        MATCH_REGEX)
+from .settings import REDIRECTS_MAX_CACHED_MISSES
+
+
+# Back-references in regular expressions, like "\1" or "(?P=name)"
+BACK_REFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class RedirectionTable(object):
+    """
+    In-memory table of the active redirections of a site.
+    """
+
+    def __init__(self, redirections):
+        """
+        Build the table of the given redirections.
+        :param redirections: An iterable of ``Redirection`` instances, in order of precedence for regular expressions.
+        """
+        self.exact_redirections = {}
+        self.prefix_redirections = {}
+        self.regex_redirections = []
+        for redirection in redirections:
+            if redirection.match_type == MATCH_PREFIX:
+                self.prefix_redirections[redirection.old_path] = redirection
+            elif redirection.match_type == MATCH_REGEX:
+                try:
+                    self.regex_redirections.append((re.compile(redirection.old_path), redirection))
+                except re.error:
+                    # Invalid regular expression, ignored (model validation should prevent this)
+                    pass
+            else:
+                self.exact_redirections[redirection.old_path] = redirection
+
+        # Longest prefix first
+        self.prefix_matcher = None
+        if self.prefix_redirections:
+            prefixes = sorted(self.prefix_redirections.keys(), key=len, reverse=True)
+            self.prefix_matcher = re.compile('|'.join(re.escape(prefix) for prefix in prefixes))
+
+        # Combining regular expressions can fail (duplicate group names, too many groups) or change the meaning of
+        # back-references, so regular expressions with back-references are never combined
+        self.regex_matcher = None
+        if self.regex_redirections and not any(BACK_REFERENCE_RE.search(regex.pattern)
+                                               for regex, redirection in self.regex_redirections):
+            try:
+                self.regex_matcher = re.compile('|'.join('(?:%s)' % regex.pattern
+                                                         for regex, redirection in self.regex_redirections))
+            except (re.error, AssertionError, OverflowError):
+                pass
+
+        self.misses = set()
+
+    def lookup(self, path):
+        """
+        Search the redirection of the given path. Exact paths redirections first, then the longest prefix
+        redirection, then the first matching regular expression redirection.
+        :param path: The path to be redirected.
+        :return: A tuple ``(redirection, new_path)``, or ``(None, None)`` if no redirection found. The new path is
+        empty for "gone" redirections.
+        """
+        redirection = self.exact_redirections.get(path)
+        if redirection is not None:
+            return redirection, redirection.new_path
+
+        if self.prefix_matcher is not None:
+            match = self.prefix_matcher.match(path)
+            if match is not None:
+                redirection = self.prefix_redirections[match.group(0)]
+                if not redirection.new_path:
+                    return redirection, ''
+                return redirection, redirection.new_path + path[match.end():]
+
+        if self.regex_redirections and path not in self.misses:
+            if self.regex_matcher is None or self.regex_matcher.match(path) is not None:
+                for regex, redirection in self.regex_redirections:
+                    match = regex.match(path)
+                    if match is None:
+                        continue
+                    if not redirection.new_path:
+                        return redirection, ''
+                    try:
+                        return redirection, match.expand(redirection.new_path)
+                    except (re.error, IndexError):
+                        # Invalid new path template, ignored (model validation should prevent this)
+                        continue
+            self._add_miss(path)
+
+        return None, None
+
+    def _add_miss(self, path):
+        """
+        Remember the given path as a path without redirection.
+        :param path: The path without redirection.
+        """
+        if len(self.misses) >= REDIRECTS_MAX_CACHED_MISSES:
+            self.misses.clear()
+        self.misses.add(path)
+
+
+# Per-process redirection tables, as a dictionary ``{site_id: (version, table)}``
+_process_tables = {}
+
+
+def get_process_redirection_table(site_id, version):
+    """
+    Return the redirection table of the given site in the current process, if built for the given cache version.
+    :param site_id: The site's ID.
+    :param version: The current redirections cache version.
+    :return: The ``RedirectionTable`` instance, or None if not built yet or outdated.
+    """
+    table_version, table = _process_tables.get(site_id, (None, None))
+    return table if table_version == version else None
+
+
+def set_process_redirection_table(site_id, version, table):
+    """
+    Set the redirection table of the given site in the current process.
+    :param site_id: The site's ID.
+    :param version: The redirections cache version used to build the table.
+    :param table: The ``RedirectionTable`` instance.
+    :return: None
+    """
+    _process_tables[site_id] = (version, table)
+
+
+def reset_process_redirection_tables():
+    """
+    Drop all the redirection tables of the current process, forcing a rebuild on next use.
+    :return: None
+    """
+    _process_tables.clear()
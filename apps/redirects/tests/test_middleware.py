@@ -4,10 +4,15 @@ Tests suite for the redirect app.
 
 from django.conf import settings
 from django.http import HttpResponse
+from django.core.cache import caches
 from django.test import TestCase, Client
 
 from ..models import Redirection
 from ..middleware import RedirectFallbackMiddleware
+from ..constants import (MATCH_PREFIX,
+                         MATCH_REGEX)
+from ..settings import REDIRECTS_CACHE_ALIAS
+from ..table import reset_process_redirection_tables
 
 
 class RedirectFallbackMiddlewareTestCase(TestCase):
@@ -15,6 +20,13 @@ class RedirectFallbackMiddlewareTestCase(TestCase):
     Tests suite for the ``RedirectFallbackMiddleware``.
     """
 
+    def setUp(self):
+        """
+        Start each test with a fresh cache and redirection tables.
+        """
+        caches[REDIRECTS_CACHE_ALIAS].clear()
+        reset_process_redirection_tables()
+
     def test_middleware_installed(self):
         """
         Test if the ``RedirectFallbackMiddleware`` is installed.
@@ -77,3 +89,50 @@ class RedirectFallbackMiddlewareTestCase(TestCase):
         client = Client()
         response = client.get('/test-RedirectFallbackMiddleware/')
         self.assertEqual(404, response.status_code)
+
+    def test_prefix_redirection(self):
+        """
+        Test the middleware with a prefix redirection.
+        """
+        Redirection.objects.create(site_id=settings.SITE_ID,
+                                   old_path='/test-RedirectFallbackMiddleware/',
+                                   new_path='/test-RedirectFallbackMiddleware-2/',
+                                   match_type=MATCH_PREFIX)
+        client = Client()
+        response = client.get('/test-RedirectFallbackMiddleware/foo/bar/')
+        self.assertRedirects(response, '/test-RedirectFallbackMiddleware-2/foo/bar/',
+                             status_code=301, fetch_redirect_response=False)
+
+    def test_regex_redirection(self):
+        """
+        Test the middleware with a regular expression redirection.
+        """
+        Redirection.objects.create(site_id=settings.SITE_ID,
+                                   old_path=r'^/test-RedirectFallbackMiddleware/(?P<pk>\d+)/$',
+                                   new_path=r'/test-RedirectFallbackMiddleware-2/\g<pk>/',
+                                   match_type=MATCH_REGEX)
+        client = Client()
+        response = client.get('/test-RedirectFallbackMiddleware/42/')
+        self.assertRedirects(response, '/test-RedirectFallbackMiddleware-2/42/',
+                             status_code=301, fetch_redirect_response=False)
+        response = client.get('/test-RedirectFallbackMiddleware/foo/')
+        self.assertEqual(404, response.status_code)
+
+    def test_redirection_change(self):
+        """
+        Test the middleware when a redirection is created or updated after the redirection table was built.
+        """
+        client = Client()
+        response = client.get('/test-RedirectFallbackMiddleware/')
+        self.assertEqual(404, response.status_code)
+
+        redirection = Redirection.objects.create(site_id=settings.SITE_ID,
+                                                 old_path='/test-RedirectFallbackMiddleware/',
+                                                 new_path='/test-RedirectFallbackMiddleware-2/')
+        response = client.get('/test-RedirectFallbackMiddleware/')
+        self.assertEqual(301, response.status_code)
+
+        redirection.active = False
+        redirection.save()
+        response = client.get('/test-RedirectFallbackMiddleware/')
+        self.assertEqual(404, response.status_code)
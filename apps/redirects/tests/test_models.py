@@ -3,8 +3,16 @@ Tests suite for the data models of the redirect app.
 """
 from django.test import TestCase
 from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.contrib.sites.models import Site
 
 from ..models import Redirection
+from ..constants import (MATCH_EXACT,
+                         MATCH_PREFIX,
+                         MATCH_REGEX)
+from ..settings import REDIRECTS_CACHE_ALIAS
+from ..table import reset_process_redirection_tables
 
 
 class RedirectionModelTestCase(TestCase):
@@ -29,6 +37,7 @@ class RedirectionModelTestCase(TestCase):
         self.assertEqual(settings.SITE_ID, redirection.site_id)
         self.assertEqual('/404/', redirection.old_path)
         self.assertEqual('', redirection.new_path)
+        self.assertEqual(MATCH_EXACT, redirection.match_type)
         self.assertTrue(redirection.permanent_redirect)
         self.assertTrue(redirection.active)
 
@@ -39,3 +48,103 @@ class RedirectionModelTestCase(TestCase):
         redirection = self._get_redirection()
         self.assertEqual("[%s] %s -> %s" % (redirection.site.domain,
                                             redirection.old_path, redirection.new_path), str(redirection))
+
+    def test_clean_regex(self):
+        """
+        Test if the model validation assert the regular expression is valid.
+        """
+        redirection = self._get_redirection()
+        redirection.match_type = MATCH_REGEX
+        redirection.old_path = '^/foo/(bar/$'
+        with self.assertRaises(ValidationError) as e:
+            redirection.full_clean()
+        self.assertEqual(e.exception.error_dict['old_path'][0].code, 'invalid_regex')
+
+    def test_clean_regex_new_path(self):
+        """
+        Test if the model validation assert the groups references of the new path are valid.
+        """
+        redirection = self._get_redirection()
+        redirection.match_type = MATCH_REGEX
+        redirection.old_path = r'^/foo/(\d+)/'
+        for new_path in (r'/bar/\2/', r'/bar/\g<slug>/', r'/bar/\x/'):
+            redirection.new_path = new_path
+            with self.assertRaises(ValidationError) as e:
+                redirection.full_clean()
+            self.assertEqual(e.exception.error_dict['new_path'][0].code, 'invalid_template')
+        redirection.new_path = r'/bar/\1/'
+        redirection.full_clean()
+
+
+class RedirectionTableTestCase(TestCase):
+    """
+    Tests suite for the ``find_redirection`` method of the ``Redirection`` manager class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests, with a fresh cache and redirection tables.
+        """
+        caches[REDIRECTS_CACHE_ALIAS].clear()
+        reset_process_redirection_tables()
+        self.site = Site.objects.get_current()
+        Redirection.objects.create(site=self.site, old_path='/foo/exact/', new_path='/exact/')
+        Redirection.objects.create(site=self.site, old_path='/foo/', new_path='/short/', match_type=MATCH_PREFIX)
+        Redirection.objects.create(site=self.site, old_path='/foo/bar/', new_path='/long/', match_type=MATCH_PREFIX)
+        Redirection.objects.create(site=self.site, old_path='/gone/', new_path='', match_type=MATCH_PREFIX)
+        Redirection.objects.create(site=self.site, old_path=r'^/(\d+)/', new_path=r'/number/\1/',
+                                   match_type=MATCH_REGEX)
+        Redirection.objects.create(site=self.site, old_path=r'^/invalid/(\w+)/', new_path=r'/\2/',
+                                   match_type=MATCH_REGEX)
+        Redirection.objects.create(site=self.site, old_path=r'^/invalid/\w+/', new_path='/valid/',
+                                   match_type=MATCH_REGEX)
+        Redirection.objects.create(site=self.site, old_path='/inactive/', new_path='/exact/', active=False)
+
+    def _find_new_path(self, path):
+        """
+        Return the new path of the given path, or None if no redirection found.
+        :param path: The path to be redirected.
+        """
+        return Redirection.objects.find_redirection(self.site, path)[1]
+
+    def test_exact_first(self):
+        """
+        Test that exact redirections take precedence over prefix redirections.
+        """
+        self.assertEqual(self._find_new_path('/foo/exact/'), '/exact/')
+
+    def test_longest_prefix(self):
+        """
+        Test that the longest prefix redirection is used.
+        """
+        self.assertEqual(self._find_new_path('/foo/baz/'), '/short/baz/')
+        self.assertEqual(self._find_new_path('/foo/bar/baz/'), '/long/baz/')
+        self.assertEqual(self._find_new_path('/gone/baz/'), '')
+
+    def test_regex(self):
+        """
+        Test the regular expression redirections.
+        """
+        self.assertEqual(self._find_new_path('/42/foo/'), '/number/42/')
+        self.assertIsNone(self._find_new_path('/foo42/'))
+
+    def test_regex_invalid_new_path(self):
+        """
+        Test that regular expression redirections with an invalid new path (saved without validation) are ignored.
+        """
+        self.assertEqual(self._find_new_path('/invalid/foo/'), '/valid/')
+
+    def test_inactive(self):
+        """
+        Test that inactive redirections are ignored.
+        """
+        self.assertIsNone(self._find_new_path('/inactive/'))
+
+    def test_no_query(self):
+        """
+        Test that no database query is made once the redirection table is built, even for missing paths.
+        """
+        self.assertIsNone(self._find_new_path('/missing/'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self._find_new_path('/missing/'))
+            self.assertEqual(self._find_new_path('/foo/exact/'), '/exact/')
@@ -15,8 +15,9 @@ from pygments.styles import get_style_by_name
 
 from apps.tools.models import ModelDiffMixin
 from apps.txtrender.fields import RenderTextField
-from apps.txtrender.utils import render_document
-from apps.txtrender.signals import render_engine_changed
+from apps.txtrender.utils import (render_document,
+                                  format_used_tags)
+from apps.txtrender.rerender import register_rendered_model
 
 from apps.licenses.models import License
 
@@ -81,6 +82,15 @@ class CodeSnippet(ModelDiffMixin, models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     source_code = models.TextField(_('Source code'))
 
     html_for_display = models.TextField(_('HTML for display'),
@@ -206,42 +216,40 @@ class CodeSnippet(ModelDiffMixin, models.Model):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
-            super(CodeSnippet, self).save(update_fields=('description_html', 'description_text'))
+            super(CodeSnippet, self).save(update_fields=('description_html', 'description_text',
+                                                         'render_fingerprint', 'render_tags'))
 
 
-def _redo_code_snippets_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all code snippets.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for snippet in CodeSnippet.objects.all():
-        snippet.render_description(save=True)
-
-render_engine_changed.connect(_redo_code_snippets_text_rendering)
+register_rendered_model(CodeSnippet,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
 
 
 class CodeSnippetBundle(models.Model):
@@ -278,6 +286,15 @@ class CodeSnippetBundle(models.Model):
 
     description_text = models.TextField(_('Description (raw text)'))
 
+    render_fingerprint = models.CharField(_('Rendering engine fingerprint'),
+                                          max_length=40,
+                                          default='',
+                                          editable=False)
+
+    render_tags = models.TextField(_('Rendering used tags'),
+                                   default='',
+                                   editable=False)
+
     snippets = models.ManyToManyField(CodeSnippet,
                                       verbose_name=_('Snippets in this bundle'))
 
@@ -339,39 +356,37 @@ class CodeSnippetBundle(models.Model):
         """
 
         # Render HTML
-        content_html, content_text, _ = render_document(self.description,
-                                                        allow_text_formating=True,
-                                                        allow_text_extra=True,
-                                                        allow_text_alignments=True,
-                                                        allow_text_directions=True,
-                                                        allow_text_modifiers=True,
-                                                        allow_text_colors=True,
-                                                        allow_spoilers=True,
-                                                        allow_lists=True,
-                                                        allow_definition_lists=True,
-                                                        allow_tables=True,
-                                                        allow_quotes=True,
-                                                        allow_acronyms=True,
-                                                        allow_links=True,
-                                                        allow_medias=True,
-                                                        allow_cdm_extra=True,
-                                                        force_nofollow=False,
-                                                        render_text_version=True)
+        content_html, content_text, extra_dict = render_document(self.description,
+                                                                 allow_text_formating=True,
+                                                                 allow_text_extra=True,
+                                                                 allow_text_alignments=True,
+                                                                 allow_text_directions=True,
+                                                                 allow_text_modifiers=True,
+                                                                 allow_text_colors=True,
+                                                                 allow_spoilers=True,
+                                                                 allow_lists=True,
+                                                                 allow_definition_lists=True,
+                                                                 allow_tables=True,
+                                                                 allow_quotes=True,
+                                                                 allow_acronyms=True,
+                                                                 allow_links=True,
+                                                                 allow_medias=True,
+                                                                 allow_cdm_extra=True,
+                                                                 force_nofollow=False,
+                                                                 render_text_version=True)
         self.description_html = content_html
         self.description_text = content_text
 
+        self.render_fingerprint = extra_dict['fingerprint']
+        self.render_tags = format_used_tags(extra_dict)
+
         # Save if required
         if save:
-            super(CodeSnippetBundle, self).save(update_fields=('description_html', 'description_text'))
+            super(CodeSnippetBundle, self).save(update_fields=('description_html', 'description_text',
+                                                               'render_fingerprint', 'render_tags'))
 
 
-def _redo_snippet_bundles_text_rendering(sender, **kwargs):
-    """
-    Redo text rendering of all code snippets bundle.
-    :param sender: Not used.
-    :param kwargs: Not used.
-    """
-    for bundle in CodeSnippetBundle.objects.all():
-        bundle.render_description(save=True)
-
-render_engine_changed.connect(_redo_snippet_bundles_text_rendering)
+register_rendered_model(CodeSnippetBundle,
+                        'render_description',
+                        ('description_html', 'description_text'),
+                        date_field='last_modification_date')
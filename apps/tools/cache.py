@@ -0,0 +1,39 @@
+"""
+Cache versioning helpers.
+
+A version number stored in the cache namespaces a set of cached entries (or in-process structures): bumping the
+version invalidates all of them at once, so they never need to be deleted explicitly.
+"""
+
+import time
+
+from django.core.cache import caches
+
+
+def get_cache_version(cache_alias, version_key):
+    """
+    Return the current version number stored under the given key, creating it if missing.
+    The version starts from the current timestamp, so the version number of an evicted key is never reused.
+    :param cache_alias: The Django cache alias.
+    :param version_key: The cache key of the version number.
+    """
+    cache = caches[cache_alias]
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, int(time.time()), None)
+        version = cache.get(version_key, int(time.time()))
+    return version
+
+
+def bump_cache_version(cache_alias, version_key):
+    """
+    Increment the version number stored under the given key. Nothing is done if the version number does not exist
+    yet (there is nothing cached under it to invalidate).
+    :param cache_alias: The Django cache alias.
+    :param version_key: The cache key of the version number.
+    :return: None
+    """
+    try:
+        caches[cache_alias].incr(version_key)
+    except ValueError:
+        pass
@@ -0,0 +1,49 @@
+"""
+Query expressions helpers, used to annotate querysets with per-row subqueries on related models.
+
+The subqueries are built from real querysets using ``OuterRef``, so the outer table alias, the quoting and the
+database alias are all resolved by the compiler of the outer query.
+"""
+
+from django.db.models import (Exists,
+                              Max,
+                              OuterRef,
+                              Subquery)
+
+
+def _get_related_queryset(model, fk_field_name, filters):
+    """
+    Return the queryset selecting the rows of the given model related to the current row of the outer query and
+    matching the given filters.
+    :param model: The related model class.
+    :param fk_field_name: The name of the foreign key field to the outer model.
+    :param filters: Exact lookups on the related model fields, model instances are replaced by their PK.
+    """
+    lookups = {field_name: getattr(value, 'pk', value) for field_name, value in filters.items()}
+    return model._base_manager.filter(**{fk_field_name: OuterRef('pk')}).filter(**lookups).order_by()
+
+
+def related_exists(model, fk_field_name, **filters):
+    """
+    Return an expression, True if at least one related row match the given filters.
+    Usage: ``Thread.objects.annotate(user_has_posted=related_exists(Post, 'thread', author=user))``.
+    :param model: The related model class.
+    :param fk_field_name: The name of the foreign key field to the outer model.
+    :param filters: Exact lookups on the related model fields, model instances are replaced by their PK.
+    """
+    return Exists(_get_related_queryset(model, fk_field_name, filters))
+
+
+def related_max(model, fk_field_name, field_name, **filters):
+    """
+    Return an expression, the maximum value of the given field of the related rows matching the given filters
+    (None if no row match).
+    :param model: The related model class.
+    :param fk_field_name: The name of the foreign key field to the outer model.
+    :param field_name: The name of the field to be selected.
+    :param filters: Exact lookups on the related model fields, model instances are replaced by their PK.
+    """
+    field = model._meta.get_field(field_name)
+    queryset = _get_related_queryset(model, fk_field_name, filters) \
+        .values(fk_field_name).annotate(max_value=Max(field_name)).values('max_value')
+    return Subquery(queryset, output_field=field.__class__())
@@ -25,10 +25,12 @@ class AutoSingleRelatedObjectDescriptor(SingleRelatedObjectDescriptor):
             obj = self.related.related_model(**{self.related.field.name: instance})
             # Previously: "self.related.model" (this variable now target the other end class type)
             obj.save()
-            # Don't return obj directly, otherwise it won't be added
-            # to Django's cache, and the first 2 calls to obj.relobj
-            # will return 2 different in-memory objects
-            return super(AutoSingleRelatedObjectDescriptor, self).__get__(instance, instance_type)
+            # Add the new object to Django's cache, otherwise the first 2 calls
+            # to obj.relobj will return 2 different in-memory objects (and a
+            # ``None`` cached by ``select_related`` would still raise)
+            setattr(instance, self.cache_name, obj)
+            setattr(obj, self.related.field.get_cache_name(), instance)
+            return obj
 
 
 class AutoOneToOneField(models.OneToOneField):
@@ -0,0 +1,328 @@
+"""
+Benchmark tools for the text rendering app.
+
+This module can generate realistic corpora of documents (see ``CORPUS_GENERATORS``) and measure the time and peak
+memory usage of each stage of the rendering pipeline (see ``PIPELINE_STAGES``), mirroring ``render_document``
+with all permissions, text version and extra information enabled. Reports are plain dictionaries, suitable for
+JSON serialization and diffing between releases.
+"""
+
+import sys
+import time
+import random
+import platform
+import tracemalloc
+from collections import OrderedDict
+
+import skcode
+from skcode import (parse_skcode,
+                    render_to_html,
+                    render_to_text)
+from skcode.utility import (make_paragraphs,
+                            extract_footnotes,
+                            render_footnotes_html,
+                            render_footnotes_text,
+                            extract_titles,
+                            make_titles_hierarchy,
+                            make_auto_title_ids,
+                            render_titles_hierarchy_html,
+                            render_titles_hierarchy_text,
+                            setup_smileys_replacement,
+                            setup_cosmetics_replacement,
+                            setup_relative_urls_conversion)
+
+from django.contrib.staticfiles.templatetags.staticfiles import static
+
+from .engine import get_engine_fingerprint
+from .settings import (EMOTICONS_IMG_DIR,
+                       RELATIVE_URL_BASE)
+from .utils import (TEXT_OPTS,
+                    NEWLINE_OPTS)
+
+
+# Words used to generate random sentences
+WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'arduino', 'raspberry', 'capteur', 'moteur', 'tension',
+         'courant', 'programme', 'fonction', 'variable', 'registre', 'horloge', 'broche', 'signal', 'code',
+         'question', 'merci', 'bonjour', 'probleme', 'solution', 'schema', 'montage', 'resistance', 'led')
+
+
+def make_sentence(rng, min_words=4, max_words=16):
+    """
+    Generate a random sentence.
+    :param rng: The random generator to be used.
+    :param min_words: Minimum number of words.
+    :param max_words: Maximum number of words.
+    """
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    words[0] = words[0].capitalize()
+    return ' '.join(words) + rng.choice('.!?')
+
+
+def make_paragraph(rng, min_sentences=1, max_sentences=6):
+    """
+    Generate a random paragraph with some inline formatting.
+    :param rng: The random generator to be used.
+    :param min_sentences: Minimum number of sentences.
+    :param max_sentences: Maximum number of sentences.
+    """
+    sentences = []
+    for _ in range(rng.randint(min_sentences, max_sentences)):
+        sentence = make_sentence(rng)
+        choice = rng.random()
+        if choice < 0.2:
+            sentence = '[b]%s[/b]' % sentence
+        elif choice < 0.3:
+            sentence = '[i]%s[/i]' % sentence
+        elif choice < 0.4:
+            sentence = '%s [url=https://example.com/%d]lien[/url]' % (sentence, rng.randint(1, 1000))
+        elif choice < 0.45:
+            sentence = '%s :)' % sentence
+        sentences.append(sentence)
+    return ' '.join(sentences)
+
+
+def generate_forum_reply(rng):
+    """
+    Generate a short forum reply.
+    :param rng: The random generator to be used.
+    """
+    return '\n\n'.join(make_paragraph(rng, 1, 3) for _ in range(rng.randint(1, 3)))
+
+
+def generate_article(rng):
+    """
+    Generate a long article with titles, footnotes, tables and code blocks.
+    :param rng: The random generator to be used.
+    """
+    parts = []
+    for section in range(rng.randint(4, 8)):
+        parts.append('[h2]%s[/h2]' % make_sentence(rng, 2, 5))
+        for _ in range(rng.randint(2, 5)):
+            parts.append(make_paragraph(rng, 3, 8))
+            if rng.random() < 0.3:
+                parts.append('%s[footnote]%s[/footnote]' % (make_sentence(rng), make_sentence(rng)))
+        if rng.random() < 0.5:
+            parts.append('[h3]%s[/h3]' % make_sentence(rng, 2, 5))
+            parts.append(make_paragraph(rng, 2, 5))
+        if rng.random() < 0.5:
+            rows = ['[tr]%s[/tr]' % ''.join('[td]%s[/td]' % rng.choice(WORDS) for _ in range(4))
+                    for _ in range(rng.randint(3, 10))]
+            parts.append('[table]\n%s\n[/table]' % '\n'.join(rows))
+        if rng.random() < 0.6:
+            lines = ['def function_%d(value):' % section]
+            lines.extend('    value = value * %d + %d' % (rng.randint(1, 9), i) for i in range(rng.randint(3, 15)))
+            lines.append('    return value')
+            parts.append('[code=python]\n%s\n[/code]' % '\n'.join(lines))
+        if rng.random() < 0.4:
+            items = '\n'.join('[*] %s' % make_sentence(rng, 2, 8) for _ in range(rng.randint(2, 6)))
+            parts.append('[list]\n%s\n[/list]' % items)
+    return '\n\n'.join(parts)
+
+
+def generate_quote_reply(rng):
+    """
+    Generate a quote-heavy forum reply (nested quotes of previous replies).
+    :param rng: The random generator to be used.
+    """
+    document = generate_forum_reply(rng)
+    for _ in range(rng.randint(1, 5)):
+        document = '[quote=%s]%s[/quote]\n\n%s' % (rng.choice(WORDS), document, generate_forum_reply(rng))
+    return document
+
+
+def generate_nested_tags(rng):
+    """
+    Generate a pathological document with deeply nested and unclosed tags.
+    :param rng: The random generator to be used.
+    """
+    tag_names = ('b', 'i', 'u', 's', 'quote', 'spoiler', 'center', 'color=red')
+    depth = rng.randint(50, 200)
+    opening = [rng.choice(tag_names) for _ in range(depth)]
+    closing = ['[/%s]' % tag_name.split('=')[0] for tag_name in reversed(opening) if rng.random() < 0.8]
+    return '%s%s%s' % (''.join('[%s]' % tag_name for tag_name in opening),
+                       make_sentence(rng),
+                       ''.join(closing))
+
+
+# All corpus generators, by corpus name
+CORPUS_GENERATORS = OrderedDict((
+    ('forum_replies', generate_forum_reply),
+    ('articles', generate_article),
+    ('quotes', generate_quote_reply),
+    ('nested_tags', generate_nested_tags),
+))
+
+
+def generate_corpus(name, nb_documents, seed=0):
+    """
+    Generate a corpus of documents. The same seed always generates the same corpus.
+    :param name: The corpus name, see ``CORPUS_GENERATORS``.
+    :param nb_documents: The number of documents to be generated.
+    :param seed: The random generator seed.
+    :return: A list of documents.
+    """
+    generator = CORPUS_GENERATORS[name]
+    rng = random.Random('%s:%s' % (name, seed))
+    return [generator(rng) for _ in range(nb_documents)]
+
+
+def _stage_parse(state):
+    """
+    Parse the document (same options as ``render_document``).
+    """
+    state['document'] = parse_skcode(state['input_text'],
+                                     allow_tagvalue_attr=True,
+                                     allow_self_closing_tags=True,
+                                     erroneous_text_node_opts=TEXT_OPTS,
+                                     newline_node_opts=NEWLINE_OPTS,
+                                     drop_unrecognized=False,
+                                     texturize_unclosed_tags=False)
+
+
+def _stage_setup(state):
+    """
+    Setup smileys, cosmetics and URLs replacement, make paragraphs and titles IDs.
+    """
+    document = state['document']
+    setup_cosmetics_replacement(document)
+    setup_smileys_replacement(document, lambda filename: static(EMOTICONS_IMG_DIR + filename))
+    if RELATIVE_URL_BASE:
+        setup_relative_urls_conversion(document, RELATIVE_URL_BASE)
+    make_paragraphs(document)
+    make_auto_title_ids(document)
+
+
+def _stage_footnotes(state):
+    """
+    Extract and render footnotes.
+    """
+    footnotes = extract_footnotes(state['document'])
+    render_footnotes_html(footnotes)
+    render_footnotes_text(footnotes)
+
+
+def _stage_summary(state):
+    """
+    Extract and render the titles summary.
+    """
+    titles_hierarchy = make_titles_hierarchy(extract_titles(state['document']))
+    render_titles_hierarchy_html(titles_hierarchy)
+    render_titles_hierarchy_text(titles_hierarchy)
+
+
+def _stage_render_html(state):
+    """
+    Render the document as HTML.
+    """
+    render_to_html(state['document'], force_rel_nofollow=True)
+
+
+def _stage_render_text(state):
+    """
+    Render the document as text.
+    """
+    render_to_text(state['document'])
+
+
+# All stages of the rendering pipeline, in order
+PIPELINE_STAGES = OrderedDict((
+    ('parse', _stage_parse),
+    ('setup', _stage_setup),
+    ('footnotes', _stage_footnotes),
+    ('summary', _stage_summary),
+    ('render_html', _stage_render_html),
+    ('render_text', _stage_render_text),
+))
+
+
+def _format_stage_results(durations, peak_memory):
+    """
+    Summarize the durations and peak memory usage of a single stage.
+    :param durations: List of durations in seconds (one per document).
+    :param peak_memory: Peak memory usage in bytes, or None if not measured.
+    """
+    total = sum(durations)
+    return OrderedDict((
+        ('total', total),
+        ('mean', total / len(durations) if durations else 0.0),
+        ('max', max(durations) if durations else 0.0),
+        ('peak_memory', peak_memory),
+    ))
+
+
+def benchmark_documents(documents, measure_memory=True):
+    """
+    Measure the time and peak memory usage of each stage of the rendering pipeline for the given documents.
+    Timings are measured in a first pass without memory tracing, peak memory usage (in bytes, the maximum over
+    all documents) in a second pass using ``tracemalloc``.
+    :param documents: The list of documents.
+    :param measure_memory: Set to False to skip the memory pass.
+    :return: An ordered dictionary ``{stage_name: {'total', 'mean', 'max', 'peak_memory'}}``, plus a ``'total'``
+    entry for the whole pipeline.
+    """
+    durations = OrderedDict((stage_name, []) for stage_name in PIPELINE_STAGES)
+    durations['total'] = []
+    peak_memory = OrderedDict((stage_name, 0 if measure_memory else None) for stage_name in durations)
+
+    # Timings pass
+    for input_text in documents:
+        state = {'input_text': input_text.strip()}
+        document_start_time = time.perf_counter()
+        for stage_name, stage in PIPELINE_STAGES.items():
+            start_time = time.perf_counter()
+            stage(state)
+            durations[stage_name].append(time.perf_counter() - start_time)
+        durations['total'].append(time.perf_counter() - document_start_time)
+
+    # Memory pass
+    if measure_memory:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            for input_text in documents:
+                state = {'input_text': input_text.strip()}
+                for stage_name, stage in PIPELINE_STAGES.items():
+                    tracemalloc.clear_traces()
+                    stage(state)
+                    peak_memory[stage_name] = max(peak_memory[stage_name], tracemalloc.get_traced_memory()[1])
+                    peak_memory['total'] = max(peak_memory['total'], peak_memory[stage_name])
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+    return OrderedDict((stage_name, _format_stage_results(stage_durations, peak_memory[stage_name]))
+                       for stage_name, stage_durations in durations.items())
+
+
+def run_benchmark(corpora=None, nb_documents=100, seed=0, measure_memory=True):
+    """
+    Run the complete benchmark suite.
+    :param corpora: The list of corpus names to be benchmarked, all corpora by default.
+    :param nb_documents: The number of documents per corpus.
+    :param seed: The random generator seed of the corpora.
+    :param measure_memory: Set to False to skip peak memory measures.
+    :return: The benchmark report, as an ordered dictionary (JSON serializable).
+    """
+    if corpora is None:
+        corpora = list(CORPUS_GENERATORS.keys())
+    report = OrderedDict()
+    report['environment'] = OrderedDict((
+        ('python', sys.version.split()[0]),
+        ('implementation', platform.python_implementation()),
+        ('skcode', getattr(skcode, '__version__', 'unknown')),
+        ('engine_fingerprint', get_engine_fingerprint()),
+    ))
+    report['parameters'] = OrderedDict((
+        ('nb_documents', nb_documents),
+        ('seed', seed),
+    ))
+    report['corpora'] = OrderedDict()
+    for name in corpora:
+        documents = generate_corpus(name, nb_documents, seed)
+        report['corpora'][name] = OrderedDict((
+            ('nb_documents', len(documents)),
+            ('total_size', sum(len(document) for document in documents)),
+            ('stages', benchmark_documents(documents, measure_memory)),
+        ))
+    return report
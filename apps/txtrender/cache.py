@@ -0,0 +1,256 @@
+"""
+Rendering cache for the text rendering app.
+
+Rendered documents are content-addressed: the cache key is a hash of the input text, of all the rendering options
+and of the rendering engine version. A bounded per-process LRU cache sit in front of the Django cache backend, so
+identical inputs never hit the parser twice.
+"""
+
+import time
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.utils.encoding import force_bytes
+
+from apps.perfstats.collector import (record_count,
+                                      timed)
+
+from .engine import get_engine_fingerprint
+from .settings import (RENDER_CACHE_ENABLED,
+                       RENDER_CACHE_ALIAS,
+                       RENDER_CACHE_KEY_PREFIX,
+                       RENDER_CACHE_TIMEOUT,
+                       RENDER_CACHE_LOCAL_MAX_ENTRIES,
+                       RENDER_CACHE_GENERATION_CHECK_INTERVAL)
+
+
+class RenderCache(object):
+    """
+    Two levels rendering cache: a bounded in-process LRU cache backed by a Django cache.
+    All entries are namespaced by a generation number stored in the Django cache, allowing global invalidation
+    of the cache (see ``invalidate()``). Other processes see the new generation number after at most
+    ``generation_check_interval`` seconds.
+    """
+
+    def __init__(self, cache_alias=RENDER_CACHE_ALIAS,
+                 key_prefix=RENDER_CACHE_KEY_PREFIX,
+                 timeout=RENDER_CACHE_TIMEOUT,
+                 max_local_entries=RENDER_CACHE_LOCAL_MAX_ENTRIES,
+                 generation_check_interval=RENDER_CACHE_GENERATION_CHECK_INTERVAL,
+                 engine_version=None):
+        """
+        Create a new rendering cache.
+        :param cache_alias: The Django cache alias to be used as shared backend.
+        :param key_prefix: The key prefix for all cache entries.
+        :param timeout: Lifetime of the entries in the shared backend in seconds.
+        :param max_local_entries: Maximum number of entries in the local LRU cache.
+        :param generation_check_interval: Delay between two checks of the shared generation number.
+        :param engine_version: The rendering engine version string, see ``get_engine_fingerprint()`` for default.
+        """
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+        self.max_local_entries = max_local_entries
+        self.generation_check_interval = generation_check_interval
+        self.engine_version = engine_version if engine_version is not None else get_engine_fingerprint()
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._generation = None
+        self._generation_checked_at = 0
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        """
+        Return the Django cache backend instance.
+        """
+        return caches[self.cache_alias]
+
+    def _get_generation_key(self):
+        """
+        Return the cache key of the generation number.
+        """
+        return '%s:generation' % self.key_prefix
+
+    def get_generation(self):
+        """
+        Return the current generation number, checked against the shared backend at most
+        every ``generation_check_interval`` seconds.
+        """
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at >= self.generation_check_interval:
+            generation_key = self._get_generation_key()
+            self.backend.add(generation_key, 1, None)
+            generation = self.backend.get(generation_key, 1)
+            with self._lock:
+                if generation != self._generation:
+                    self._local.clear()
+                self._generation = generation
+                self._generation_checked_at = now
+        return self._generation
+
+    def make_key(self, input_text, options):
+        """
+        Compute the cache key for the given input text and rendering options.
+        :param input_text: The input document text.
+        :param options: A sequence of ``(name, value)`` couples of all rendering options, in a stable order.
+        :return: The cache key (without generation number).
+        """
+        digest = hashlib.sha1()
+        digest.update(force_bytes(self.engine_version))
+        digest.update(b'\0')
+        digest.update(force_bytes(repr(tuple(options))))
+        digest.update(b'\0')
+        digest.update(force_bytes(input_text))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Return the rendered document for the given key, or ``None`` if not in cache.
+        :param key: The cache key, see ``make_key()``.
+        """
+        generation = self.get_generation()
+
+        # Local cache first
+        with self._lock:
+            value = self._local.get(key)
+            if value is not None:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return value
+
+        # Then shared cache
+        value = self.backend.get('%s:%d:%s' % (self.key_prefix, generation, key))
+        if value is not None:
+            self._store_local(key, value)
+            with self._lock:
+                self.shared_hits += 1
+            return value
+
+        # Cache miss
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        """
+        Store the rendered document for the given key in both local and shared caches.
+        :param key: The cache key, see ``make_key()``.
+        :param value: The rendered document.
+        """
+        generation = self.get_generation()
+        self._store_local(key, value)
+        self.backend.set('%s:%d:%s' % (self.key_prefix, generation, key), value, self.timeout)
+
+    def _store_local(self, key, value):
+        """
+        Store the given value in the local LRU cache, evicting the least recently used entries if necessary.
+        :param key: The cache key.
+        :param value: The value to be stored.
+        """
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def clear_local(self):
+        """
+        Clear the local LRU cache.
+        """
+        with self._lock:
+            self._local.clear()
+
+    def invalidate(self):
+        """
+        Invalidate all cached documents of all processes by incrementing the shared generation number.
+        """
+        generation_key = self._get_generation_key()
+        if not self.backend.add(generation_key, 2, None):
+            try:
+                self.backend.incr(generation_key)
+            except ValueError:
+                # Key expired between add() and incr()
+                self.backend.set(generation_key, 2, None)
+        with self._lock:
+            self._local.clear()
+            self._generation = None
+
+    def get_stats(self):
+        """
+        Return the hit/miss counters of this process as a dictionary.
+        """
+        with self._lock:
+            hits = self.local_hits + self.shared_hits
+            total = hits + self.misses
+            return {
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'hits': hits,
+                'misses': self.misses,
+                'hit_ratio': hits / total if total else 0.0,
+                'local_entries': len(self._local),
+            }
+
+    def reset_stats(self):
+        """
+        Reset the hit/miss counters of this process.
+        """
+        with self._lock:
+            self.local_hits = 0
+            self.shared_hits = 0
+            self.misses = 0
+
+
+# Rendering cache instance of this process
+render_cache = RenderCache()
+
+
+def cached_rendering(func):
+    """
+    Decorator for caching the result of a rendering function using ``render_cache``.
+    The first positional argument of the function must be the input text, all others arguments are rendering options
+    and are part of the cache key. The decorated function accept an extra ``use_cache`` keyword argument (default
+    True) to bypass the cache.
+    The rendering function must return a tuple ``(html, text, extra_dict)``.
+    """
+    signature = inspect.signature(func)
+    default_options = OrderedDict((name, param.default)
+                                  for name, param in signature.parameters.items()
+                                  if param.default is not inspect.Parameter.empty)
+
+    @functools.wraps(func)
+    def wrapper(input_text, *args, use_cache=True, **kwargs):
+
+        # Bypass the cache if requested
+        if not use_cache or not RENDER_CACHE_ENABLED:
+            with timed('render_time'):
+                return func(input_text, *args, **kwargs)
+
+        # Compute the cache key
+        options = default_options.copy()
+        options.update(signature.bind_partial(input_text, *args, **kwargs).arguments)
+        input_text = options.pop('input_text')
+        key = render_cache.make_key(input_text.strip(), options.items())
+
+        # Cache lookup
+        cached = render_cache.get(key)
+        if cached is not None:
+            record_count('render_cache_hits')
+            content_html, content_text, extra_dict = cached
+            return content_html, content_text, dict(extra_dict)
+
+        # Render the document and update the cache
+        record_count('render_cache_misses')
+        with timed('render_time'):
+            content_html, content_text, extra_dict = func(input_text, *args, **kwargs)
+        render_cache.set(key, (content_html, content_text, dict(extra_dict)))
+        return content_html, content_text, extra_dict
+
+    return wrapper
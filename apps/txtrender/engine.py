@@ -0,0 +1,50 @@
+"""
+Rendering engine version and fingerprint for the text rendering app.
+"""
+
+import hashlib
+
+import skcode
+from skcode.tags import DEFAULT_RECOGNIZED_TAGS
+
+from django.conf import settings
+from django.utils.encoding import force_bytes
+
+from .settings import (EMOTICONS_IMG_DIR,
+                       RELATIVE_URL_BASE,
+                       RENDER_ENGINE_REVISION)
+
+
+def get_recognized_tags_signature():
+    """
+    Return a string describing all recognized tags and the class of their renderer.
+    """
+    return ','.join('%s=%s.%s' % (tag_name, type(tag_opts).__module__, type(tag_opts).__name__)
+                    for tag_name, tag_opts in sorted(DEFAULT_RECOGNIZED_TAGS.items()))
+
+
+def get_engine_version():
+    """
+    Return the version string of the rendering engine. Any change in the SkCode library version, the local engine
+    revision number, the recognized tags set or the settings used at rendering time produce a different version string.
+    """
+    return '%s:%d:%s:%s:%s:%s' % (getattr(skcode, '__version__', 'unknown'),
+                                  RENDER_ENGINE_REVISION,
+                                  EMOTICONS_IMG_DIR,
+                                  RELATIVE_URL_BASE,
+                                  settings.STATIC_URL,
+                                  get_recognized_tags_signature())
+
+
+# Engine fingerprint, computed once per process
+_engine_fingerprint = None
+
+
+def get_engine_fingerprint():
+    """
+    Return the fingerprint (SHA1 hex digest) of the rendering engine version, see ``get_engine_version()``.
+    """
+    global _engine_fingerprint
+    if _engine_fingerprint is None:
+        _engine_fingerprint = hashlib.sha1(force_bytes(get_engine_version())).hexdigest()
+    return _engine_fingerprint
@@ -0,0 +1,102 @@
+"""
+Management command to benchmark the text rendering pipeline.
+"""
+
+import json
+
+from django.core.management.base import (BaseCommand,
+                                         CommandError)
+
+from ...benchmarks import (CORPUS_GENERATORS,
+                           run_benchmark)
+
+
+class Command(BaseCommand):
+    """
+    A management command which benchmark each stage of the text rendering pipeline (parsing, setup, footnotes and
+    summary extraction, HTML and text rendering) over generated corpora of documents.
+    Corpora are generated from a seed, so two runs with the same parameters process the same documents. Use
+    ``--json`` to get a machine readable report, suitable for diffing between releases.
+    """
+
+    help = "Benchmark the text rendering pipeline"
+
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--corpora',
+                            nargs='+',
+                            dest='corpora',
+                            choices=list(CORPUS_GENERATORS.keys()),
+                            default=None,
+                            help='Only benchmark the given corpora.')
+        parser.add_argument('--documents',
+                            type=int,
+                            dest='nb_documents',
+                            default=100,
+                            help='Number of documents per corpus.')
+        parser.add_argument('--seed',
+                            type=int,
+                            dest='seed',
+                            default=0,
+                            help='Seed of the corpora random generator.')
+        parser.add_argument('--no-memory',
+                            action='store_false',
+                            dest='measure_memory',
+                            default=True,
+                            help='Do not measure peak memory usage (faster).')
+        parser.add_argument('--json',
+                            action='store_true',
+                            dest='json',
+                            default=False,
+                            help='Output the report as JSON.')
+        parser.add_argument('--output',
+                            dest='output',
+                            default=None,
+                            help='Write the JSON report to the given file.')
+
+    def write_report(self, report):
+        """
+        Write the given report in a human readable form.
+        :param report: The benchmark report.
+        """
+        self.stdout.write('Python %(python)s (%(implementation)s), SkCode %(skcode)s, '
+                          'engine %(engine_fingerprint)s' % report['environment'])
+        for name, corpus in report['corpora'].items():
+            self.stdout.write('')
+            self.stdout.write('%s: %d documents, %d characters' % (name, corpus['nb_documents'],
+                                                                   corpus['total_size']))
+            self.stdout.write('  %-12s %12s %12s %12s %12s' % ('stage', 'total (ms)', 'mean (ms)',
+                                                              'max (ms)', 'peak (KiB)'))
+            for stage_name, stage in corpus['stages'].items():
+                peak_memory = '%.1f' % (stage['peak_memory'] / 1024) if stage['peak_memory'] is not None else '-'
+                self.stdout.write('  %-12s %12.3f %12.3f %12.3f %12s' % (stage_name,
+                                                                         stage['total'] * 1000,
+                                                                         stage['mean'] * 1000,
+                                                                         stage['max'] * 1000,
+                                                                         peak_memory))
+
+    def handle(self, *args, **options):
+        """
+        Command handler.
+        :param args: Not used.
+        :param options: Command options.
+        :return: None.
+        """
+        if options['nb_documents'] < 1:
+            raise CommandError('The number of documents must be at least 1')
+
+        report = run_benchmark(corpora=options['corpora'],
+                               nb_documents=options['nb_documents'],
+                               seed=options['seed'],
+                               measure_memory=options['measure_memory'])
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        elif not options['output'] or options['verbosity'] > 1:
+            self.write_report(report)
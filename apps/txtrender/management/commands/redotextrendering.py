@@ -2,25 +2,130 @@
 Management command to redo text rendering of all rich text fields in the database.
 """
 
-from django.core.management.base import NoArgsCommand
+import datetime
 
+from django.core.management.base import (BaseCommand,
+                                         CommandError)
+from django.utils import timezone
+from django.utils.dateparse import (parse_datetime,
+                                    parse_date)
+
+from ...cache import render_cache
+from ...rerender import get_rendered_models
 from ...signals import render_engine_changed
+from ...settings import (RERENDER_CHUNK_SIZE,
+                         RERENDER_NB_WORKERS)
 
 
-class Command(NoArgsCommand):
+class Command(BaseCommand):
     """
     A management command which force all rich text fields in the database to be
     regenerated from the source text.
-    Send the signal ``render_engine_changed`` and let all listening applications
+    Invalidate the rendering cache, then send the signal ``render_engine_changed`` and let all listening applications
     to handle the signal and redo rendering.
+    Rows are processed in chunks, in parallel if ``--workers`` is greater than one. An interrupted run is resumed
+    from the last checkpoint unless ``--restart`` is given.
+    Only rows rendered with another engine fingerprint are processed, unless ``--all`` is given. Remember to
+    increment the ``RENDER_ENGINE_REVISION`` setting after any change in the rendering code of the project.
+    Use ``--tags`` to only process documents using some specific tags (for example after a change in a tag
+    renderer).
     """
 
     help = "Redo text rendering of all rich text fields in the database"
 
-    def handle_noargs(self, **options):
+    def add_arguments(self, parser):
+        """
+        Add custom arguments to the command.
+        :param parser: The arguments parser.
+        """
+        parser.add_argument('--models',
+                            nargs='+',
+                            dest='models',
+                            default=None,
+                            help='Only process the given models (in the form "app_label.model_name").')
+        parser.add_argument('--workers',
+                            type=int,
+                            dest='nb_workers',
+                            default=RERENDER_NB_WORKERS,
+                            help='Number of worker processes.')
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            dest='chunk_size',
+                            default=RERENDER_CHUNK_SIZE,
+                            help='Number of rows per chunk.')
+        parser.add_argument('--since',
+                            dest='since',
+                            default=None,
+                            help='Only process rows modified since the given date (YYYY-MM-DD[ HH:MM:SS]).')
+        parser.add_argument('--all',
+                            action='store_false',
+                            dest='stale_only',
+                            default=True,
+                            help='Process all rows, not only rows rendered with another engine fingerprint.')
+        parser.add_argument('--tags',
+                            nargs='+',
+                            dest='tags',
+                            default=None,
+                            help='Only process rows using at least one of the given tag names.')
+        parser.add_argument('--restart',
+                            action='store_false',
+                            dest='resume',
+                            default=True,
+                            help='Ignore any checkpoint of a previous interrupted run.')
+
+    @staticmethod
+    def parse_since(value):
+        """
+        Parse the "since" argument value.
+        :param value: The argument value.
+        :return: An aware datetime or None.
+        """
+        if value is None:
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            since_date = parse_date(value)
+            if since_date is None:
+                raise CommandError('Invalid date "%s"' % value)
+            since = datetime.datetime.combine(since_date, datetime.time.min)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def report_progress(self, model_label, nb_rendered, elapsed_time):
+        """
+        Progress callback of the re-rendering engine.
+        :param model_label: The model being processed.
+        :param nb_rendered: Number of rows rendered so far.
+        :param elapsed_time: Elapsed time in seconds.
+        """
+        rate = nb_rendered / elapsed_time if elapsed_time else 0
+        self.stdout.write('%s: %d rows rendered (%.1f rows/s)' % (model_label, nb_rendered, rate))
+
+    def handle(self, *args, **options):
         """
         Command handler.
-        :param options: Not used.
+        :param args: Not used.
+        :param options: Command options.
         :return: None.
         """
-        render_engine_changed.send(sender=self.__class__)
+        try:
+            get_rendered_models(options['models'])
+        except LookupError as e:
+            raise CommandError(str(e))
+        if options['nb_workers'] < 1:
+            raise CommandError('The number of workers must be at least 1')
+        if options['chunk_size'] < 1:
+            raise CommandError('The chunk size must be at least 1')
+        since = self.parse_since(options['since'])
+
+        render_cache.invalidate()
+        render_engine_changed.send(sender=self.__class__,
+                                   models=options['models'],
+                                   nb_workers=options['nb_workers'],
+                                   chunk_size=options['chunk_size'],
+                                   since=since,
+                                   stale_only=options['stale_only'],
+                                   tags=options['tags'],
+                                   resume=options['resume'],
+                                   progress_callback=self.report_progress if options['verbosity'] else None)
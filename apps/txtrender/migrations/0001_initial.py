@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderingCheckpoint',
+            fields=[
+                ('id', models.AutoField(serialize=False, auto_created=True, primary_key=True, verbose_name='ID')),
+                ('model_label', models.CharField(unique=True, max_length=255, verbose_name='Model label')),
+                ('last_pk', models.BigIntegerField(verbose_name='Last rendered primary key')),
+                ('since', models.DateTimeField(default=None, null=True, blank=True, verbose_name='Since date filter')),
+                ('nb_rendered', models.PositiveIntegerField(default=0, verbose_name='Number of rows rendered')),
+                ('last_modification_date', models.DateTimeField(auto_now=True, verbose_name='Last modification date')),
+            ],
+            options={
+                'ordering': ('model_label',),
+                'verbose_name_plural': 'Rendering checkpoints',
+                'verbose_name': 'Rendering checkpoint',
+            },
+        ),
+    ]
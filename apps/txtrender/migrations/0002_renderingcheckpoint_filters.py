@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('txtrender', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renderingcheckpoint',
+            name='tags',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Tag names filter', default=''),
+        ),
+        migrations.AddField(
+            model_name='renderingcheckpoint',
+            name='stale_only',
+            field=models.BooleanField(default=False, verbose_name='Stale only filter'),
+        ),
+    ]
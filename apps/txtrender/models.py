@@ -0,0 +1,52 @@
+"""
+Data models for the text rendering app.
+"""
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class RenderingCheckpoint(models.Model):
+    """
+    Checkpoint of an interrupted re-rendering run for one rendered model.
+    A checkpoint is made of:
+    - the label of the rendered model,
+    - the primary key of the last row rendered,
+    - the "since" date filter of the run (if any),
+    - the tag names filter of the run (if any),
+    - the "stale only" filter of the run,
+    - the number of rows rendered so far.
+    """
+
+    model_label = models.CharField(_('Model label'),
+                                   max_length=255,
+                                   unique=True)
+
+    last_pk = models.BigIntegerField(_('Last rendered primary key'))
+
+    since = models.DateTimeField(_('Since date filter'),
+                                 default=None,
+                                 blank=True,
+                                 null=True)
+
+    tags = models.CharField(_('Tag names filter'),
+                            max_length=255,
+                            default='',
+                            blank=True)
+
+    stale_only = models.BooleanField(_('Stale only filter'),
+                                     default=False)
+
+    nb_rendered = models.PositiveIntegerField(_('Number of rows rendered'),
+                                              default=0)
+
+    last_modification_date = models.DateTimeField(_('Last modification date'),
+                                                  auto_now=True)
+
+    class Meta:
+        verbose_name = _('Rendering checkpoint')
+        verbose_name_plural = _('Rendering checkpoints')
+        ordering = ('model_label', )
+
+    def __str__(self):
+        return '%s #%d' % (self.model_label, self.last_pk)
@@ -0,0 +1,312 @@
+"""
+Re-rendering engine for the text rendering app.
+
+Applications register their rendered models using ``register_rendered_model()``. On ``render_engine_changed``, the
+engine walks each registered model in primary key chunks, renders the chunks (in a pool of worker processes if
+requested), writes back the results with one bulk UPDATE per chunk and records a checkpoint after each chunk so an
+interrupted run can be resumed.
+Rendered models store the fingerprint of the engine used to render them and the tag names used by their documents,
+allowing the engine to only process stale rows, or rows using some specific tags.
+"""
+
+import time
+import multiprocessing
+from collections import (OrderedDict,
+                         namedtuple,
+                         deque)
+
+from django.db import (connections,
+                       transaction)
+from django.db.models import (Q,
+                              Case,
+                              When,
+                              Value)
+
+from .models import RenderingCheckpoint
+from .engine import get_engine_fingerprint
+from .utils import get_used_tag_lookup_value
+from .signals import render_engine_changed
+from .settings import (RERENDER_CHUNK_SIZE,
+                       RERENDER_NB_WORKERS)
+
+
+# Registered model description
+RenderedModel = namedtuple('RenderedModel', ('label', 'model', 'render_method', 'fields',
+                                             'select_related', 'date_field',
+                                             'fingerprint_field', 'tags_field'))
+
+# All registered models, by label
+_registry = OrderedDict()
+
+
+def get_model_label(model):
+    """
+    Return the label of the given model class, in the form "app_label.model_name".
+    :param model: The model class.
+    """
+    return '%s.%s' % (model._meta.app_label, model._meta.model_name)
+
+
+def register_rendered_model(model, render_method, fields, select_related=(), date_field=None,
+                            fingerprint_field='render_fingerprint', tags_field='render_tags'):
+    """
+    Register a rendered model for the re-rendering engine.
+    :param model: The model class.
+    :param render_method: The name of the model method doing the rendering (called without argument, must not save).
+    :param fields: The list of all fields names updated by the rendering method.
+    :param select_related: The list of related fields required by the rendering method (for ``select_related``).
+    :param date_field: The name of the last modification date field, used by the "since" filter (optional).
+    :param fingerprint_field: The name of the engine fingerprint field, None if the model does not store it.
+    :param tags_field: The name of the used tag names field, None if the model does not store it.
+    """
+    label = get_model_label(model)
+    fields = tuple(fields) + tuple(field_name for field_name in (fingerprint_field, tags_field)
+                                   if field_name and field_name not in fields)
+    _registry[label] = RenderedModel(label, model, render_method, fields, tuple(select_related), date_field,
+                                     fingerprint_field, tags_field)
+
+
+def get_rendered_models(labels=None):
+    """
+    Return the list of registered models with the given labels, or all registered models if ``labels`` is None.
+    :param labels: A list of models labels (case insensitive).
+    :raise LookupError: If any of the given labels is not registered.
+    """
+    if labels is None:
+        return list(_registry.values())
+    rendered_models = []
+    for label in labels:
+        try:
+            rendered_models.append(_registry[label.lower()])
+        except KeyError:
+            raise LookupError('Unknown rendered model "%s"' % label)
+    return rendered_models
+
+
+def render_chunk(model_label, pks):
+    """
+    Render the given rows of a registered model, without saving anything.
+    :param model_label: The label of the registered model.
+    :param pks: The list of primary keys of the rows to be rendered.
+    :return: A list of ``(pk, {field_name: value})`` couples.
+    """
+    rendered_model = _registry[model_label]
+    queryset = rendered_model.model._default_manager.filter(pk__in=pks)
+    if rendered_model.select_related:
+        queryset = queryset.select_related(*rendered_model.select_related)
+    results = []
+    for instance in queryset.iterator():
+        getattr(instance, rendered_model.render_method)()
+        results.append((instance.pk, {field_name: getattr(instance, field_name)
+                                      for field_name in rendered_model.fields}))
+    return results
+
+
+def bulk_update_rendering(rendered_model, results):
+    """
+    Write back the rendering results of a chunk using a single UPDATE query.
+    :param rendered_model: The registered model.
+    :param results: The rendering results, see ``render_chunk()``.
+    """
+    if not results:
+        return
+    model = rendered_model.model
+    updates = {}
+    for field_name in rendered_model.fields:
+        updates[field_name] = Case(*[When(pk=pk, then=Value(values[field_name])) for pk, values in results],
+                                   output_field=model._meta.get_field(field_name))
+    model._default_manager.filter(pk__in=[pk for pk, _ in results]).update(**updates)
+
+
+class RerenderEngine(object):
+    """
+    Chunked, resumable and (optionally) parallel re-rendering engine.
+    """
+
+    def __init__(self, nb_workers=RERENDER_NB_WORKERS,
+                 chunk_size=RERENDER_CHUNK_SIZE,
+                 since=None,
+                 stale_only=False,
+                 tags=None,
+                 resume=True,
+                 progress_callback=None):
+        """
+        Create a new re-rendering engine.
+        :param nb_workers: Number of worker processes, set to 1 to render in the current process.
+        :param chunk_size: Number of rows per chunk.
+        :param since: Only render rows modified since this date (for models with a date field).
+        :param stale_only: Only render rows rendered with another engine fingerprint (for models with a fingerprint
+        field).
+        :param tags: Only render rows using at least one of the given tag names (for models with a tags field).
+        :param resume: Set to False to ignore existing checkpoints and restart from scratch.
+        :param progress_callback: Callable called after each chunk with the model label, the number of rows
+        rendered so far and the elapsed time in seconds.
+        """
+        self.nb_workers = max(1, nb_workers)
+        self.chunk_size = chunk_size
+        self.since = since
+        self.stale_only = stale_only
+        self.tags = tags
+        self.resume = resume
+        self.progress_callback = progress_callback
+
+    def get_queryset(self, rendered_model):
+        """
+        Return the queryset of all rows of the given model to be rendered, ordered by primary key.
+        :param rendered_model: The registered model.
+        """
+        queryset = rendered_model.model._default_manager.order_by('pk')
+        if self.since is not None and rendered_model.date_field:
+            queryset = queryset.filter(**{'%s__gte' % rendered_model.date_field: self.since})
+        if self.stale_only and rendered_model.fingerprint_field:
+            queryset = queryset.exclude(**{rendered_model.fingerprint_field: get_engine_fingerprint()})
+        if self.tags and rendered_model.tags_field:
+            tags_filter = Q()
+            for tag_name in self.tags:
+                tags_filter |= Q(**{'%s__contains' % rendered_model.tags_field: get_used_tag_lookup_value(tag_name)})
+            queryset = queryset.filter(tags_filter)
+        return queryset
+
+    def iter_pk_chunks(self, rendered_model, last_pk=None):
+        """
+        Yield lists of primary keys to be rendered, in ascending order, using keyset pagination.
+        :param rendered_model: The registered model.
+        :param last_pk: Start after this primary key (if not None).
+        """
+        queryset = self.get_queryset(rendered_model)
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(chunk_queryset.values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                return
+            yield pks
+            last_pk = pks[-1]
+
+    def get_tags_signature(self):
+        """
+        Return the tag names filter of this run as a string (sorted, comma separated), for the checkpoints.
+        """
+        return ','.join(sorted(set(self.tags))) if self.tags else ''
+
+    def get_checkpoint(self, rendered_model):
+        """
+        Return the checkpoint of the given model to resume from, or None. Checkpoints of runs with other filters are
+        ignored, because the rows before the checkpoint may not have been selected by these filters.
+        :param rendered_model: The registered model.
+        """
+        if not self.resume:
+            return None
+        checkpoint = RenderingCheckpoint.objects.filter(model_label=rendered_model.label).first()
+        if checkpoint is None or (checkpoint.since, checkpoint.tags, checkpoint.stale_only) != \
+                (self.since, self.get_tags_signature(), self.stale_only):
+            return None
+        return checkpoint
+
+    def write_chunk(self, rendered_model, last_pk, results, nb_rendered):
+        """
+        Write back the results of a chunk and update the checkpoint, in a single transaction.
+        :param rendered_model: The registered model.
+        :param last_pk: The last primary key of the chunk.
+        :param results: The rendering results, see ``render_chunk()``.
+        :param nb_rendered: The number of rows rendered so far, including this chunk.
+        """
+        with transaction.atomic():
+            bulk_update_rendering(rendered_model, results)
+            RenderingCheckpoint.objects.update_or_create(model_label=rendered_model.label,
+                                                         defaults={
+                                                             'last_pk': last_pk,
+                                                             'since': self.since,
+                                                             'tags': self.get_tags_signature(),
+                                                             'stale_only': self.stale_only,
+                                                             'nb_rendered': nb_rendered,
+                                                         })
+
+    def run_model(self, rendered_model, pool=None):
+        """
+        Re-render all rows of the given model.
+        :param rendered_model: The registered model.
+        :param pool: The worker processes pool, or None to render in the current process.
+        :return: The number of rows rendered.
+        """
+        checkpoint = self.get_checkpoint(rendered_model)
+        last_pk = checkpoint.last_pk if checkpoint is not None else None
+        nb_rendered = checkpoint.nb_rendered if checkpoint is not None else 0
+        start_time = time.time()
+
+        # Keep at most two chunks per worker in flight, results are written in order
+        pending = deque()
+        max_pending = self.nb_workers * 2 if pool is not None else 1
+        for pks in self.iter_pk_chunks(rendered_model, last_pk):
+            if pool is not None:
+                pending.append((pks[-1], pool.apply_async(render_chunk, (rendered_model.label, pks))))
+            else:
+                pending.append((pks[-1], render_chunk(rendered_model.label, pks)))
+            if len(pending) >= max_pending:
+                nb_rendered = self._write_pending(rendered_model, pending, nb_rendered, start_time)
+        while pending:
+            nb_rendered = self._write_pending(rendered_model, pending, nb_rendered, start_time)
+
+        # Model done, drop the checkpoint
+        RenderingCheckpoint.objects.filter(model_label=rendered_model.label).delete()
+        return nb_rendered
+
+    def _write_pending(self, rendered_model, pending, nb_rendered, start_time):
+        """
+        Write back the oldest pending chunk.
+        :return: The updated number of rows rendered.
+        """
+        last_pk, results = pending.popleft()
+        if not isinstance(results, list):
+            results = results.get()
+        nb_rendered += len(results)
+        self.write_chunk(rendered_model, last_pk, results, nb_rendered)
+        if self.progress_callback is not None:
+            self.progress_callback(rendered_model.label, nb_rendered, time.time() - start_time)
+        return nb_rendered
+
+    def run(self, rendered_models):
+        """
+        Re-render all rows of the given models.
+        :param rendered_models: The list of registered models to be processed.
+        :return: A dictionary ``{model_label: nb_rows_rendered}``.
+        """
+        pool = None
+        if self.nb_workers > 1:
+            # Forked workers must not share the database connections of this process
+            connections.close_all()
+            pool = multiprocessing.Pool(self.nb_workers)
+        try:
+            return OrderedDict((rendered_model.label, self.run_model(rendered_model, pool))
+                               for rendered_model in rendered_models)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+
+def _redo_registered_models_rendering(sender, models=None, nb_workers=1, chunk_size=RERENDER_CHUNK_SIZE,
+                                      since=None, stale_only=False, tags=None, resume=True,
+                                      progress_callback=None, **kwargs):
+    """
+    Redo text rendering of all registered models.
+    :param sender: Not used.
+    :param models: List of models labels to be processed, all registered models by default.
+    :param nb_workers: Number of worker processes.
+    :param chunk_size: Number of rows per chunk.
+    :param since: Only render rows modified since this date.
+    :param stale_only: Only render rows rendered with another engine fingerprint.
+    :param tags: Only render rows using at least one of the given tag names.
+    :param resume: Set to False to ignore existing checkpoints.
+    :param progress_callback: Progress callback, see ``RerenderEngine``.
+    :param kwargs: Not used.
+    """
+    engine = RerenderEngine(nb_workers=nb_workers,
+                            chunk_size=chunk_size,
+                            since=since,
+                            stale_only=stale_only,
+                            tags=tags,
+                            resume=resume,
+                            progress_callback=progress_callback)
+    engine.run(get_rendered_models(models))
+
+render_engine_changed.connect(_redo_registered_models_rendering)
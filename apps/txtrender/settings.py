@@ -10,3 +10,42 @@ EMOTICONS_IMG_DIR = getattr(settings, 'EMOTICONS_IMG_DIR', 'images/smileys/')
 
 # Base URL for relative-to-absolute conversion
 RELATIVE_URL_BASE = getattr(settings, 'RELATIVE_URL_BASE', 'https://www.carnetdumaker.net/')
+
+# Set to False to disable the rendering cache of ``render_document``
+RENDER_CACHE_ENABLED = getattr(settings, 'RENDER_CACHE_ENABLED', True)
+
+# Django cache alias used as shared backend for the rendering cache
+RENDER_CACHE_ALIAS = getattr(settings, 'RENDER_CACHE_ALIAS', 'default')
+
+# Key prefix for all rendering cache entries
+RENDER_CACHE_KEY_PREFIX = getattr(settings, 'RENDER_CACHE_KEY_PREFIX', 'txtrender')
+
+# Lifetime of a rendered document in the shared cache in seconds (default 7 days)
+RENDER_CACHE_TIMEOUT = getattr(settings, 'RENDER_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+# Maximum number of rendered documents kept in the per-process LRU cache (default 512)
+RENDER_CACHE_LOCAL_MAX_ENTRIES = getattr(settings, 'RENDER_CACHE_LOCAL_MAX_ENTRIES', 512)
+
+# Delay in seconds between two checks of the shared cache generation number (default 60s)
+RENDER_CACHE_GENERATION_CHECK_INTERVAL = getattr(settings, 'RENDER_CACHE_GENERATION_CHECK_INTERVAL', 60)
+
+# Revision number of the rendering engine, increment it when the rendering code change
+RENDER_ENGINE_REVISION = getattr(settings, 'RENDER_ENGINE_REVISION', 1)
+
+# Number of rows rendered per chunk by the re-rendering engine (default 200)
+RERENDER_CHUNK_SIZE = getattr(settings, 'RERENDER_CHUNK_SIZE', 200)
+
+# Default number of worker processes used by the re-rendering engine (default 1, no process pool)
+RERENDER_NB_WORKERS = getattr(settings, 'RERENDER_NB_WORKERS', 1)
+
+# Maximum length of the preview input text in characters (default 64K)
+PREVIEW_MAX_INPUT_LENGTH = getattr(settings, 'PREVIEW_MAX_INPUT_LENGTH', 65536)
+
+# Lifetime of a rendered preview fragment in cache in seconds (default 10 minutes)
+PREVIEW_CACHE_TIMEOUT = getattr(settings, 'PREVIEW_CACHE_TIMEOUT', 60 * 10)
+
+# Maximum number of preview requests per user per rate limit period, set to 0 to disable (default 60)
+PREVIEW_RATE_LIMIT = getattr(settings, 'PREVIEW_RATE_LIMIT', 60)
+
+# Duration of the preview rate limit period in seconds (default 60s)
+PREVIEW_RATE_LIMIT_PERIOD = getattr(settings, 'PREVIEW_RATE_LIMIT_PERIOD', 60)
@@ -6,4 +6,6 @@ from django.dispatch import Signal
 
 
 # Emitted when the rendering engine is altered.
-render_engine_changed = Signal(providing_args=[])
+# All arguments are optional, see ``rerender._redo_registered_models_rendering`` for details.
+render_engine_changed = Signal(providing_args=['models', 'nb_workers', 'chunk_size', 'since', 'stale_only',
+                                               'tags', 'resume', 'progress_callback'])
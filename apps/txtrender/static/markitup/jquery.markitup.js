@@ -45,6 +45,8 @@
 					previewParser:			false,
 					previewParserPath:		'',
 					previewParserVar:		'data',
+					previewHashVar:			'', // send the hash of the last preview (from the X-Preview-Hash header)
+					previewRefreshDelay:	0, // debounce delay of preview refreshes in milliseconds
 					resizeHandle:			true,
 					beforeInsert:			'',
 					afterInsert:			'',
@@ -97,7 +99,8 @@
 
 		return this.each(function() {
 			var $$, textarea, levels, scrollPosition, caretPosition, caretOffset,
-				clicked, hash, header, footer, previewWindow, template, iFrame, abort;
+				clicked, hash, header, footer, previewWindow, template, iFrame, abort,
+				previewTimer, previewRequest, previewHash;
 			$$ = $(this);
 			textarea = this;
 			levels = [];
@@ -495,6 +498,7 @@
 
 			// open preview window
 			function preview() {
+				previewHash = null;
 				if (typeof options.previewHandler === 'function') {
 					previewWindow = true;
 				} else if (options.previewInElement) {
@@ -532,7 +536,12 @@
 
 			// refresh Preview window
 			function refreshPreview() {
- 				renderPreview();
+				if (options.previewRefreshDelay) {
+					clearTimeout(previewTimer);
+					previewTimer = setTimeout(renderPreview, options.previewRefreshDelay);
+				} else {
+					renderPreview();
+				}
 			}
 
 			function renderPreview() {
@@ -543,14 +552,30 @@
 					var data = options.previewParser( $$.val() );
 					writeInPreview(localize(data, 1) ); 
 				} else if (options.previewParserPath !== '') {
-					$.ajax({
+					var postData = options.previewParserVar+'='+encodeURIComponent($$.val());
+					if (options.previewHashVar && previewHash) {
+						postData += '&'+options.previewHashVar+'='+encodeURIComponent(previewHash);
+					}
+					if (previewRequest) {
+						previewRequest.abort();
+					}
+					previewRequest = $.ajax({
 						type: 'POST',
 						dataType: 'text',
 						global: false,
 						url: options.previewParserPath,
-						data: options.previewParserVar+'='+encodeURIComponent($$.val()),
-						success: function(data) {
+						data: postData,
+						success: function(data, textStatus, xhr) {
+							if (xhr.status === 304) {
+								return;
+							}
+							if (options.previewHashVar) {
+								previewHash = xhr.getResponseHeader('X-Preview-Hash');
+							}
 							writeInPreview( localize(data, 1) ); 
+						},
+						complete: function() {
+							previewRequest = null;
 						}
 					});
 				} else {
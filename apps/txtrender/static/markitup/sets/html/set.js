@@ -9,6 +9,8 @@ mySettings = {
     previewPosition:    'before',
     previewParserPath : '/api/texte/preview/',
     previewParserVar :  'content',
+    previewHashVar :    'last_hash',
+    previewRefreshDelay : 500,
 	markupSet: [
         {name:'Titre', dropMenu: [
             {name:'Titre de niveau 1', key:'1', openWith:'[h1]', closeWith:'[/h1]', placeHolder:'Votre titre ici', className:'bbheader' },
@@ -0,0 +1,53 @@
+"""
+Tests suite for the benchmark tools of the text rendering app.
+"""
+
+import json
+
+from django.test import SimpleTestCase
+
+from ..benchmarks import (CORPUS_GENERATORS,
+                          PIPELINE_STAGES,
+                          generate_corpus,
+                          benchmark_documents,
+                          run_benchmark)
+
+
+class BenchmarksTestCase(SimpleTestCase):
+    """
+    Tests suite for the benchmark tools.
+    """
+
+    def test_generate_corpus(self):
+        """
+        Test that the ``generate_corpus`` function is deterministic for a given seed.
+        """
+        for name in CORPUS_GENERATORS:
+            corpus = generate_corpus(name, 5, seed=42)
+            self.assertEqual(len(corpus), 5)
+            self.assertEqual(corpus, generate_corpus(name, 5, seed=42))
+            self.assertNotEqual(corpus, generate_corpus(name, 5, seed=43))
+
+    def test_benchmark_documents(self):
+        """
+        Test the ``benchmark_documents`` function.
+        """
+        results = benchmark_documents(generate_corpus('articles', 2))
+        self.assertEqual(list(results.keys()), list(PIPELINE_STAGES.keys()) + ['total'])
+        for stage in results.values():
+            self.assertGreaterEqual(stage['total'], stage['max'])
+            self.assertGreater(stage['peak_memory'], 0)
+
+    def test_benchmark_documents_no_memory(self):
+        """
+        Test the ``benchmark_documents`` function without memory measures.
+        """
+        results = benchmark_documents(generate_corpus('forum_replies', 2), measure_memory=False)
+        self.assertIsNone(results['total']['peak_memory'])
+
+    def test_run_benchmark_json(self):
+        """
+        Test that the benchmark report is JSON serializable.
+        """
+        report = run_benchmark(corpora=['quotes'], nb_documents=2, measure_memory=False)
+        self.assertEqual(json.loads(json.dumps(report))['corpora']['quotes']['nb_documents'], 2)
@@ -0,0 +1,161 @@
+"""
+Tests suite for the rendering cache of the text rendering app.
+"""
+
+from django.test import SimpleTestCase
+from django.core.cache import caches
+
+from ..cache import (RenderCache,
+                     cached_rendering,
+                     render_cache)
+
+
+class RenderCacheTestCase(SimpleTestCase):
+    """
+    Tests suite for the ``RenderCache`` class.
+    """
+
+    def setUp(self):
+        """
+        Create a fresh cache for each test.
+        """
+        caches['default'].clear()
+        self.cache = RenderCache(cache_alias='default',
+                                 key_prefix='test-txtrender',
+                                 max_local_entries=2,
+                                 engine_version='test')
+
+    def test_make_key(self):
+        """
+        Test the ``make_key`` method.
+        """
+        key = self.cache.make_key('foobar', (('allow_titles', True), ))
+        self.assertEqual(key, self.cache.make_key('foobar', (('allow_titles', True), )))
+        self.assertNotEqual(key, self.cache.make_key('foobar', (('allow_titles', False), )))
+        self.assertNotEqual(key, self.cache.make_key('foobaz', (('allow_titles', True), )))
+
+    def test_make_key_engine_version(self):
+        """
+        Test the ``make_key`` method with different engine versions.
+        """
+        other_cache = RenderCache(cache_alias='default', engine_version='other')
+        self.assertNotEqual(self.cache.make_key('foobar', ()), other_cache.make_key('foobar', ()))
+
+    def test_get_set(self):
+        """
+        Test the ``get`` and ``set`` methods.
+        """
+        self.assertIsNone(self.cache.get('foo'))
+        self.cache.set('foo', 'bar')
+        self.assertEqual(self.cache.get('foo'), 'bar')
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['local_hits'], 1)
+        self.assertEqual(stats['shared_hits'], 0)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_shared_hit(self):
+        """
+        Test the ``get`` method when the entry is only available in the shared cache.
+        """
+        self.cache.set('foo', 'bar')
+        self.cache.clear_local()
+        self.assertEqual(self.cache.get('foo'), 'bar')
+        self.assertEqual(self.cache.get('foo'), 'bar')
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['shared_hits'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_local_lru_eviction(self):
+        """
+        Test the LRU eviction of the local cache.
+        """
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(self.cache.get_stats()['local_entries'], 2)
+        self.assertIn('a', self.cache._local)
+        self.assertNotIn('b', self.cache._local)
+        self.assertIn('c', self.cache._local)
+
+    def test_invalidate(self):
+        """
+        Test the ``invalidate`` method.
+        """
+        self.cache.set('foo', 'bar')
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get('foo'))
+
+    def test_reset_stats(self):
+        """
+        Test the ``reset_stats`` method.
+        """
+        self.cache.get('foo')
+        self.cache.reset_stats()
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 0)
+        self.assertEqual(stats['misses'], 0)
+        self.assertEqual(stats['hit_ratio'], 0.0)
+
+
+class CachedRenderingTestCase(SimpleTestCase):
+    """
+    Tests suite for the ``cached_rendering`` decorator.
+    """
+
+    def setUp(self):
+        """
+        Create a fake rendering function for the tests.
+        """
+        render_cache.invalidate()
+        self.calls = []
+
+        @cached_rendering
+        def fake_render(input_text, allow_titles=False):
+            self.calls.append((input_text, allow_titles))
+            return input_text.upper(), input_text, {'allow_titles': allow_titles}
+
+        self.fake_render = fake_render
+
+    def test_cache_hit(self):
+        """
+        Test rendering the same document twice.
+        """
+        self.assertEqual(self.fake_render('foo'), ('FOO', 'foo', {'allow_titles': False}))
+        self.assertEqual(self.fake_render('foo'), ('FOO', 'foo', {'allow_titles': False}))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_default_options(self):
+        """
+        Test that explicit default options and implicit default options share the same cache entry.
+        """
+        self.fake_render('foo')
+        self.fake_render('foo', allow_titles=False)
+        self.fake_render('foo', False)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_options_in_key(self):
+        """
+        Test rendering the same document with different options.
+        """
+        self.fake_render('foo')
+        self.assertEqual(self.fake_render('foo', allow_titles=True), ('FOO', 'foo', {'allow_titles': True}))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_use_cache(self):
+        """
+        Test the ``use_cache`` keyword argument.
+        """
+        self.fake_render('foo', use_cache=False)
+        self.fake_render('foo', use_cache=False)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_extra_dict_copy(self):
+        """
+        Test that altering the returned extra dictionary does not alter the cache.
+        """
+        html, text, extra_dict = self.fake_render('foo')
+        extra_dict['allow_titles'] = 'altered'
+        html, text, extra_dict = self.fake_render('foo')
+        self.assertEqual(extra_dict, {'allow_titles': False})
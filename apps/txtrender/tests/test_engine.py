@@ -4,10 +4,53 @@ Tests suite for the text rendering engine of the text rendering app.
 
 from django.test import SimpleTestCase
 
+from ..engine import get_engine_fingerprint
+from ..utils import (render_document,
+                     format_used_tags,
+                     get_used_tag_lookup_value)
+
 
 class TextRenderingEngineTestCase(SimpleTestCase):
     """
     Tests suite for the text rendering engine.
     """
 
-    pass
+    def test_engine_fingerprint(self):
+        """
+        Test the ``get_engine_fingerprint`` function.
+        """
+        fingerprint = get_engine_fingerprint()
+        self.assertEqual(len(fingerprint), 40)
+        self.assertEqual(fingerprint, get_engine_fingerprint())
+
+    def test_render_document_extra_dict(self):
+        """
+        Test the fingerprint and used tags information of ``render_document``.
+        """
+        _, _, extra_dict = render_document('[i]Hello[/i] [b]World![/b] [u]Foobar[/u]',
+                                           allow_text_formating=True,
+                                           use_cache=False)
+        self.assertEqual(extra_dict['fingerprint'], get_engine_fingerprint())
+        self.assertEqual(extra_dict['used_tags'], ('b', 'i', 'u'))
+
+    def test_render_document_empty_extra_dict(self):
+        """
+        Test the fingerprint and used tags information of ``render_document`` with an empty document.
+        """
+        _, _, extra_dict = render_document('')
+        self.assertEqual(extra_dict['fingerprint'], get_engine_fingerprint())
+        self.assertEqual(extra_dict['used_tags'], ())
+
+    def test_format_used_tags(self):
+        """
+        Test the ``format_used_tags`` function.
+        """
+        self.assertEqual(format_used_tags({'used_tags': ('i', 'b')}, {'used_tags': ('b', 'url')}), ',b,i,url,')
+        self.assertEqual(format_used_tags({'used_tags': ()}), '')
+
+    def test_get_used_tag_lookup_value(self):
+        """
+        Test the ``get_used_tag_lookup_value`` function.
+        """
+        self.assertEqual(get_used_tag_lookup_value('YouTube'), ',youtube,')
+        self.assertIn(get_used_tag_lookup_value('b'), format_used_tags({'used_tags': ('b', 'i')}))
@@ -0,0 +1,154 @@
+"""
+Tests suite for the re-rendering engine of the text rendering app.
+"""
+
+from django.test import TestCase
+
+from apps.licenses.models import License
+
+from ..models import RenderingCheckpoint
+from ..engine import get_engine_fingerprint
+from ..rerender import (RerenderEngine,
+                        get_rendered_models,
+                        get_model_label,
+                        render_chunk)
+
+
+class RerenderEngineTestCase(TestCase):
+    """
+    Tests suite for the re-rendering engine.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests.
+        """
+        self.license1 = License.objects.create(name='Test 1', slug='test-1', description='[b]Hello World![/b]')
+        self.license2 = License.objects.create(name='Test 2', slug='test-2', description='[i]Hello World![/i]')
+        self.license3 = License.objects.create(name='Test 3', slug='test-3', description='[u]Hello World![/u]')
+        License.objects.update(description_html='', description_text='')
+        self.rendered_models = get_rendered_models(['licenses.license'])
+
+    def test_get_model_label(self):
+        """
+        Test the ``get_model_label`` function.
+        """
+        self.assertEqual(get_model_label(License), 'licenses.license')
+
+    def test_get_rendered_models(self):
+        """
+        Test the ``get_rendered_models`` function.
+        """
+        self.assertEqual(len(self.rendered_models), 1)
+        self.assertEqual(self.rendered_models[0].model, License)
+        self.assertEqual(get_rendered_models(['Licenses.License']), self.rendered_models)
+        self.assertIn(self.rendered_models[0], get_rendered_models())
+
+    def test_get_rendered_models_unknown(self):
+        """
+        Test the ``get_rendered_models`` function with an unknown model label.
+        """
+        with self.assertRaises(LookupError):
+            get_rendered_models(['licenses.unknown'])
+
+    def test_render_chunk(self):
+        """
+        Test the ``render_chunk`` function.
+        """
+        results = dict(render_chunk('licenses.license', [self.license1.pk]))
+        self.assertEqual(list(results.keys()), [self.license1.pk])
+        self.assertIn('<strong>Hello World!</strong>', results[self.license1.pk]['description_html'])
+        self.license1.refresh_from_db()
+        self.assertEqual(self.license1.description_html, '')
+
+    def test_run(self):
+        """
+        Test a complete re-rendering run.
+        """
+        engine = RerenderEngine(chunk_size=2)
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 3})
+        for license in License.objects.all():
+            self.assertIn('Hello World!', license.description_html)
+            self.assertIn('Hello World!', license.description_text)
+        self.assertFalse(RenderingCheckpoint.objects.exists())
+
+    def test_resume(self):
+        """
+        Test resuming an interrupted re-rendering run.
+        """
+        RenderingCheckpoint.objects.create(model_label='licenses.license',
+                                           last_pk=self.license1.pk,
+                                           nb_rendered=1)
+        engine = RerenderEngine(chunk_size=2)
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 3})
+        self.license1.refresh_from_db()
+        self.license3.refresh_from_db()
+        self.assertEqual(self.license1.description_html, '')
+        self.assertIn('Hello World!', self.license3.description_html)
+
+    def test_resume_other_filters(self):
+        """
+        Test ignoring the checkpoint of an interrupted re-rendering run with other filters.
+        """
+        RenderingCheckpoint.objects.create(model_label='licenses.license',
+                                           last_pk=self.license2.pk,
+                                           tags='youtube',
+                                           nb_rendered=1)
+        engine = RerenderEngine(chunk_size=2)
+        self.assertIsNone(engine.get_checkpoint(self.rendered_models[0]))
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 3})
+        self.license1.refresh_from_db()
+        self.assertIn('Hello World!', self.license1.description_html)
+
+        RenderingCheckpoint.objects.create(model_label='licenses.license',
+                                           last_pk=self.license2.pk,
+                                           tags='i,u',
+                                           nb_rendered=1)
+        self.assertIsNone(RerenderEngine(tags=['u', 'i'], stale_only=True).get_checkpoint(self.rendered_models[0]))
+        self.assertIsNotNone(RerenderEngine(tags=['u', 'i']).get_checkpoint(self.rendered_models[0]))
+
+    def test_restart(self):
+        """
+        Test ignoring the checkpoint of an interrupted re-rendering run.
+        """
+        RenderingCheckpoint.objects.create(model_label='licenses.license',
+                                           last_pk=self.license1.pk,
+                                           nb_rendered=1)
+        engine = RerenderEngine(chunk_size=2, resume=False)
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 3})
+        self.license1.refresh_from_db()
+        self.assertIn('Hello World!', self.license1.description_html)
+
+    def test_progress_callback(self):
+        """
+        Test the progress callback of the engine.
+        """
+        progress = []
+        engine = RerenderEngine(chunk_size=2,
+                                progress_callback=lambda label, nb, elapsed: progress.append((label, nb)))
+        engine.run(self.rendered_models)
+        self.assertEqual(progress, [('licenses.license', 2), ('licenses.license', 3)])
+
+    def test_stale_only(self):
+        """
+        Test re-rendering only rows rendered with another engine fingerprint.
+        """
+        License.objects.filter(pk=self.license2.pk).update(render_fingerprint='')
+        engine = RerenderEngine(stale_only=True)
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 1})
+        self.license1.refresh_from_db()
+        self.license2.refresh_from_db()
+        self.assertEqual(self.license1.description_html, '')
+        self.assertIn('Hello World!', self.license2.description_html)
+        self.assertEqual(self.license2.render_fingerprint, get_engine_fingerprint())
+
+    def test_tags(self):
+        """
+        Test re-rendering only rows using some specific tags.
+        """
+        engine = RerenderEngine(tags=['i', 'u'])
+        self.assertEqual(engine.run(self.rendered_models), {'licenses.license': 2})
+        self.license1.refresh_from_db()
+        self.license2.refresh_from_db()
+        self.assertEqual(self.license1.description_html, '')
+        self.assertIn('Hello World!', self.license2.description_html)
@@ -2,12 +2,19 @@
 Tests suite for the views of the text rendering app.
 """
 
+from unittest import mock
+
 from django.test import TestCase, Client
+from django.core.cache import caches
 from django.core.urlresolvers import reverse
 from django.contrib.auth import get_user_model
 from django.utils.encoding import force_bytes
 from django.utils.translation import ugettext_lazy as _
 
+from ..settings import RENDER_CACHE_ALIAS
+from ..views import (PREVIEW_HASH_HEADER,
+                     get_preview_hash)
+
 
 class TextRenderingViewsTestCase(TestCase):
     """
@@ -21,6 +28,7 @@ class TextRenderingViewsTestCase(TestCase):
         get_user_model().objects.create_user(username='johndoe',
                                              password='illpassword',
                                              email='john.doe@example.com')
+        caches[RENDER_CACHE_ALIAS].clear()
 
     def test_preview_rendering(self):
         """
@@ -60,3 +68,58 @@ class TextRenderingViewsTestCase(TestCase):
         response = client.post(reverse('txtrender:preview'), {'content': ''})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content, b'')
+
+    def test_preview_rendering_too_long(self):
+        """
+        Test the ``preview_rendering`` view with a too long input.
+        """
+        client = Client()
+        client.login(username='johndoe', password='illpassword')
+        with mock.patch('apps.txtrender.views.PREVIEW_MAX_INPUT_LENGTH', 10):
+            response = client.post(reverse('txtrender:preview'), {'content': '[b]Hello World![/b]'})
+        self.assertEqual(response.status_code, 413)
+
+    def test_preview_rendering_hash(self):
+        """
+        Test the ``preview_rendering`` view hash header and "unchanged" response.
+        """
+        client = Client()
+        client.login(username='johndoe', password='illpassword')
+        response = client.post(reverse('txtrender:preview'), {'content': '[b]Hello World![/b]'})
+        self.assertEqual(response.status_code, 200)
+        preview_hash = response[PREVIEW_HASH_HEADER]
+        self.assertEqual(preview_hash, get_preview_hash('[b]Hello World![/b]', 'user'))
+        response = client.post(reverse('txtrender:preview'), {'content': '[b]Hello World![/b]',
+                                                              'last_hash': preview_hash})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        response = client.post(reverse('txtrender:preview'), {'content': '[i]Hello World![/i]',
+                                                              'last_hash': preview_hash})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response[PREVIEW_HASH_HEADER], preview_hash)
+
+    def test_preview_rendering_cache(self):
+        """
+        Test the ``preview_rendering`` view fragment cache.
+        """
+        client = Client()
+        client.login(username='johndoe', password='illpassword')
+        response = client.post(reverse('txtrender:preview'), {'content': '[b]Hello World![/b]'})
+        with mock.patch('apps.txtrender.views.render_document') as render_document:
+            cached_response = client.post(reverse('txtrender:preview'), {'content': '[b]Hello World![/b]'})
+        self.assertFalse(render_document.called)
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_preview_rendering_rate_limit(self):
+        """
+        Test the ``preview_rendering`` view rate limit.
+        """
+        client = Client()
+        client.login(username='johndoe', password='illpassword')
+        with mock.patch('apps.txtrender.views.PREVIEW_RATE_LIMIT', 2):
+            for i in range(2):
+                response = client.post(reverse('txtrender:preview'), {'content': 'Hello %d' % i})
+                self.assertEqual(response.status_code, 200)
+            response = client.post(reverse('txtrender:preview'), {'content': 'Hello World!'})
+            self.assertEqual(response.status_code, 429)
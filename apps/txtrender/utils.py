@@ -31,6 +31,45 @@ from django.contrib.staticfiles.templatetags.staticfiles import static
 
 from .settings import (EMOTICONS_IMG_DIR,
                        RELATIVE_URL_BASE)
+from .cache import cached_rendering
+from .engine import get_engine_fingerprint
+
+
+def extract_used_tag_names(document):
+    """
+    Return the set of all recognized tag names used in the given document tree.
+    :param document: The document tree.
+    :return: A set of tag names.
+    """
+    used_tags = set()
+    nodes = list(document.children)
+    while nodes:
+        node = nodes.pop()
+        if node.name in DEFAULT_RECOGNIZED_TAGS:
+            used_tags.add(node.name)
+        nodes.extend(node.children)
+    return used_tags
+
+
+def format_used_tags(*extra_dicts):
+    """
+    Merge the used tag names of the given ``render_document`` extra dictionaries into a string like ``",b,i,url,"``,
+    suitable for ``contains`` lookups (see ``get_used_tag_lookup_value()``).
+    :param extra_dicts: The extra dictionaries returned by ``render_document``.
+    :return: The formatted tag names string, or an empty string if no tag is used.
+    """
+    used_tags = set()
+    for extra_dict in extra_dicts:
+        used_tags.update(extra_dict['used_tags'])
+    return ',%s,' % ','.join(sorted(used_tags)) if used_tags else ''
+
+
+def get_used_tag_lookup_value(tag_name):
+    """
+    Return the value to be used with a ``contains`` lookup for selecting documents using the given tag name.
+    :param tag_name: The tag name.
+    """
+    return ',%s,' % tag_name.lower()
 
 
 def copy_tags_if_allowed(tags, tags_array_in, tags_array_out, allowed):
@@ -46,6 +85,14 @@ def copy_tags_if_allowed(tags, tags_array_in, tags_array_out, allowed):
             tags_array_out[tag_name] = tags_array_in[tag_name]
 
 
+# Text and newline node options, shared by all documents
+TEXT_OPTS = TextTagOptions()
+ERRONEOUS_TEXT_OPTS = ErroneousTextTagOptions()
+NEWLINE_OPTS = NewlineTagOptions()
+HARD_NEWLINE_OPTS = HardNewlineTagOptions()
+
+
+@cached_rendering
 def render_document(input_text,
                     allow_titles=False,
                     allow_code_blocks=False,
@@ -82,6 +129,9 @@ def render_document(input_text,
                     make_auto_paragraphs=True):
     """
     Render the given document as HTML, text (if requested) and output extra runtime information.
+    Results are cached using the rendering cache, use ``use_cache=False`` to bypass the cache.
+    The extra information dictionary also contain the engine fingerprint (``fingerprint``) and the sorted tuple
+    of recognized tag names used in the document (``used_tags``).
     :param input_text: The input document text (not safe).
     """
 
@@ -93,48 +143,13 @@ def render_document(input_text,
             'footnotes_text': '',
             'summary_html': '',
             'summary_text': '',
+            'fingerprint': get_engine_fingerprint(),
+            'used_tags': (),
         }
 
-    # Filter tags according to permissions
-    allowed_tags = {}
-    copy_tags_if_allowed(('h1', 'h2', 'h3',
-                          'h4', 'h5', 'h6'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_titles)
-    copy_tags_if_allowed(('code', 'python', 'cpp',
-                          'java', 'html', 'php'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_code_blocks)
-    copy_tags_if_allowed(('alert', 'error', 'danger',
-                          'warning', 'info', 'success',
-                          'note', 'question'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_alerts_box)
-    copy_tags_if_allowed(('b', 'bold', 'strong',
-                          'i', 'italic', 'em',
-                          's', 'strike', 'del',
-                          'u', 'underline', 'ins',
-                          'sub', 'sup', 'pre',
-                          'icode', 'kbd', 'keyboard',
-                          'glow', 'highlight', 'mark',
-                          'cite', 'not'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_formating)
-    copy_tags_if_allowed(('nobbc', 'noparse', 'hr', 'br'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_extra)
-    copy_tags_if_allowed(('center', 'left', 'right'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_alignments)
-    copy_tags_if_allowed(('bdo', 'ltr', 'rtl'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_directions)
-    copy_tags_if_allowed(('lowercase', 'uppercase', 'capitalize'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_modifiers)
-    copy_tags_if_allowed(('color', 'black', 'blue',
-                          'gray', 'green', 'orange',
-                          'purple', 'red', 'white', 'yellow'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_text_colors)
-    copy_tags_if_allowed(('spoiler', 'hide', 'ispoiler'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_spoilers)
-    copy_tags_if_allowed(('figure', 'figcaption'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_figures)
-    copy_tags_if_allowed(('list', 'ul', 'ol', 'li'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_lists)
-    copy_tags_if_allowed(('todolist', 'task'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_todo_lists)
-    copy_tags_if_allowed(('dl', 'dt', 'dd'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_definition_lists)
-    copy_tags_if_allowed(('table', 'tr', 'th', 'td'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_tables)
-    copy_tags_if_allowed(('quote', 'blockquote'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_quotes)
-    copy_tags_if_allowed(('footnote', 'fn', 'fnref'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_footnotes)
-    copy_tags_if_allowed(('abbr', 'acronym'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_acronyms)
-    copy_tags_if_allowed(('anchor', 'goto', 'url', 'link', 'email'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_links)
-    copy_tags_if_allowed(('img', 'youtube'), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_medias)
-    # copy_tags_if_allowed(('', ''), DEFAULT_RECOGNIZED_TAGS, allowed_tags, allow_cdm_extra)
-
     # Handle preview_mode and hard_newline options
-    erroneous_text_opts = ErroneousTextTagOptions() if preview_mode else TextTagOptions()
-    newlines_opts = HardNewlineTagOptions() if hard_newline else NewlineTagOptions()
+    erroneous_text_opts = ERRONEOUS_TEXT_OPTS if preview_mode else TEXT_OPTS
+    newlines_opts = HARD_NEWLINE_OPTS if hard_newline else NEWLINE_OPTS
 
     # Parse the document
     document = parse_skcode(input_text,
@@ -145,6 +160,9 @@ def render_document(input_text,
                             drop_unrecognized=False,
                             texturize_unclosed_tags=False)
 
+    # Collect used tag names
+    used_tags = tuple(sorted(extract_used_tag_names(document)))
+
     # Setup smileys and cosmetics replacement
     def _base_url(filename):
         return static(EMOTICONS_IMG_DIR + filename)
@@ -204,6 +222,8 @@ def render_document(input_text,
         'footnotes_text': footnotes_output_text,
         'summary_html': titles_summary_output_html,
         'summary_text': titles_summary_output_text,
+        'fingerprint': get_engine_fingerprint(),
+        'used_tags': used_tags,
     }
 
 
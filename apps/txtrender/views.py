@@ -2,12 +2,64 @@
 Home pages views for the text rendering app.
 """
 
+import hashlib
+
+from django.core.cache import caches
 from django.http.response import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.template.response import TemplateResponse
+from django.utils.encoding import force_bytes
 from django.utils.translation import ugettext_lazy as _
 
 from .utils import render_document
+from .engine import get_engine_fingerprint
+from .settings import (RENDER_CACHE_ALIAS,
+                       RENDER_CACHE_KEY_PREFIX,
+                       PREVIEW_MAX_INPUT_LENGTH,
+                       PREVIEW_CACHE_TIMEOUT,
+                       PREVIEW_RATE_LIMIT,
+                       PREVIEW_RATE_LIMIT_PERIOD)
+
+
+# Name of the response header containing the hash of the preview
+PREVIEW_HASH_HEADER = 'X-Preview-Hash'
+
+# Name of the POST variable containing the hash of the last preview received by the client
+PREVIEW_LAST_HASH_VAR = 'last_hash'
+
+
+def get_preview_hash(user_input, permission_level):
+    """
+    Compute the hash of a preview, from the input text, the user permission level and the engine fingerprint.
+    :param user_input: The user input text.
+    :param permission_level: The user permission level ("staff" or "user").
+    """
+    digest = hashlib.sha1()
+    digest.update(force_bytes(get_engine_fingerprint()))
+    digest.update(b'\0')
+    digest.update(force_bytes(permission_level))
+    digest.update(b'\0')
+    digest.update(force_bytes(user_input))
+    return digest.hexdigest()
+
+
+def is_preview_rate_limited(user):
+    """
+    Count a preview request for the given user and return True if the user exceeded the rate limit.
+    :param user: The current user.
+    """
+    if not PREVIEW_RATE_LIMIT:
+        return False
+    cache = caches[RENDER_CACHE_ALIAS]
+    rate_key = '%s:preview-rate:%d' % (RENDER_CACHE_KEY_PREFIX, user.pk)
+    if cache.add(rate_key, 1, PREVIEW_RATE_LIMIT_PERIOD):
+        return False
+    try:
+        return cache.incr(rate_key) > PREVIEW_RATE_LIMIT
+    except ValueError:
+        # Key expired between add() and incr()
+        cache.set(rate_key, 1, PREVIEW_RATE_LIMIT_PERIOD)
+        return False
 
 
 @csrf_exempt
@@ -16,6 +68,10 @@ def preview_rendering(request,
                       extra_context=None):
     """
     Text rendering preview view.
+    Rendered previews are cached by hash (see ``get_preview_hash()``) and the hash is sent back in the
+    ``X-Preview-Hash`` response header. If the client send the hash of its last preview in the ``last_hash`` POST
+    variable and nothing changed, an empty 304 response is returned. Requests above the per-user rate limit get an
+    empty 429 response.
     :param request: The incoming request.
     :param template_name: The template name to be used.
     :param extra_context: Any extra template context information.
@@ -37,8 +93,32 @@ def preview_rendering(request,
     if not user_input:
         return HttpResponse('')
 
-    # Render the user input
+    # Check the input size
+    if len(user_input) > PREVIEW_MAX_INPUT_LENGTH:
+        return HttpResponse(_('The text is too long to be previewed.'), status=413)
+
+    # Do nothing if the client already have the up-to-date preview
     is_staff = request.user.is_staff
+    preview_hash = get_preview_hash(user_input, 'staff' if is_staff else 'user')
+    if request.POST.get(PREVIEW_LAST_HASH_VAR, '') == preview_hash:
+        response = HttpResponse(status=304)
+        response[PREVIEW_HASH_HEADER] = preview_hash
+        return response
+
+    # Check the rate limit
+    if is_preview_rate_limited(request.user):
+        return HttpResponse(status=429)
+
+    # Fragment cache lookup
+    cache = caches[RENDER_CACHE_ALIAS]
+    cache_key = '%s:preview:%s:%s' % (RENDER_CACHE_KEY_PREFIX, template_name, preview_hash)
+    cached_content = cache.get(cache_key)
+    if cached_content is not None:
+        response = HttpResponse(cached_content)
+        response[PREVIEW_HASH_HEADER] = preview_hash
+        return response
+
+    # Render the user input
     output_html, output_text, extra_dict = render_document(user_input,
                                                            allow_titles=True,
                                                            allow_code_blocks=True,
@@ -64,8 +144,11 @@ def preview_rendering(request,
                                                            preview_mode=True,
                                                            merge_footnotes_html=True)
 
-    # Return the result
+    # Return the result and update the fragment cache
     context = {
         'output_html': output_html,
     }
-    return TemplateResponse(request, template_name, context)
+    response = TemplateResponse(request, template_name, context)
+    response[PREVIEW_HASH_HEADER] = preview_hash
+    response.add_post_render_callback(lambda r: cache.set(cache_key, r.content, PREVIEW_CACHE_TIMEOUT))
+    return response
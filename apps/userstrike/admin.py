@@ -31,7 +31,7 @@ class UserStrikeAdmin(admin.ModelAdmin):
     list_display = ('internal_reason',
                     'author_username_link',
                     'target_username_link',
-                    'target_ip_address',
+                    'target_ip_display',
                     'creation_date',
                     'expiration_date',
                     'block_access')
@@ -55,7 +55,8 @@ class UserStrikeAdmin(admin.ModelAdmin):
     fieldsets = (
         (_('Target user'), {
             'fields': ('target_user',
-                       'target_ip_address')
+                       'target_ip_address',
+                       'target_ip_prefix_length')
         }),
         (_('Metadata'), {
             'fields': ('author',
@@ -89,5 +90,14 @@ class UserStrikeAdmin(admin.ModelAdmin):
     target_username_link.admin_order_field = 'target_user__username'
     target_username_link.allow_tags = True
 
+    def target_ip_display(self, obj):
+        """
+        Return the targeted IP address or network.
+        :param obj: Current model object.
+        """
+        return obj.get_target_ip_display()
+    target_ip_display.short_description = _('Related IP address')
+    target_ip_display.admin_order_field = 'target_ip_address'
+
 
 admin.site.register(UserStrike, UserStrikeAdmin)
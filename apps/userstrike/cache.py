@@ -0,0 +1,31 @@
+"""
+Version number of the strikes, shared by all processes using the cache.
+
+The version is bumped each time a strike is created, updated or deleted. Each process keeps its own in-memory strike
+index (see the ``index`` module) and rebuilds it when the version change, so the strikes are never searched in the
+database on request.
+"""
+
+from apps.tools.cache import (get_cache_version,
+                              bump_cache_version)
+
+from .settings import USER_STRIKE_CACHE_ALIAS
+
+
+# Cache key of the version number of the strikes
+VERSION_KEY = 'userstrike:version'
+
+
+def get_strikes_cache_version():
+    """
+    Return the current cache version number of the strikes.
+    """
+    return get_cache_version(USER_STRIKE_CACHE_ALIAS, VERSION_KEY)
+
+
+def invalidate_strikes_cache():
+    """
+    Invalidate all strike indexes by bumping the version number.
+    :return: None
+    """
+    bump_cache_version(USER_STRIKE_CACHE_ALIAS, VERSION_KEY)
@@ -0,0 +1,152 @@
+"""
+In-memory index of the active strikes, used by the ``UserStrikeMiddleware`` to search for strikes without any database
+query.
+
+The index is made of:
+
+- a dictionary of the strikes by target user ID;
+- for each IP version, a sorted list of disjoint addresses ranges with the strikes covering each range. Strikes can
+  target a single IP address or a whole network (CIDR notation), networks can overlap.
+
+Searching strikes for an IP address is a binary search in the sorted ranges (O(log n)). The index is built once per
+process and rebuilt each time the strikes cache version change (see the ``cache`` module).
+"""
+
+import bisect
+import ipaddress
+from itertools import groupby
+from operator import itemgetter
+
+
+class StrikeIndex(object):
+    """
+    In-memory index of strikes, by target user ID and by target IP address range.
+    """
+
+    def __init__(self, strikes):
+        """
+        Build the index of the given strikes.
+        :param strikes: An iterable of ``UserStrike`` instances.
+        """
+        self.user_strikes = {}
+        ip_ranges = {4: [], 6: []}
+        for strike in strikes:
+            if strike.target_user_id is not None:
+                self.user_strikes.setdefault(strike.target_user_id, []).append(strike)
+            try:
+                network = strike.get_target_ip_network()
+            except ValueError:
+                # Invalid IP address or prefix length, ignored (model validation should prevent this)
+                continue
+            if network is not None:
+                ip_ranges[network.version].append((int(network.network_address),
+                                                   int(network.broadcast_address),
+                                                   strike))
+        self.ip_ranges = {version: self._build_ranges(ranges) for version, ranges in ip_ranges.items()}
+
+    @staticmethod
+    def _build_ranges(ranges):
+        """
+        Split the given (maybe overlapping) addresses ranges into sorted, disjoint, addresses ranges.
+        :param ranges: A list of ``(first_address, last_address, strike)`` tuples, addresses as integers.
+        :return: A tuple ``(starts, strikes)`` with the first address of each range and the list of strikes covering
+        each range (maybe empty).
+        """
+        # Sweep line over the sorted ranges' bounds: each range add its strike at its first address and remove it
+        # after its last address. Active strikes are kept by range index to preserve the original strikes order.
+        events = []
+        for i, (first_address, last_address, strike) in enumerate(ranges):
+            events.append((first_address, i, strike))
+            events.append((last_address + 1, i, None))
+        events.sort(key=itemgetter(0, 1))
+        active_strikes = {}
+        starts = []
+        range_strikes = []
+        for bound, bound_events in groupby(events, key=itemgetter(0)):
+            for _, i, strike in bound_events:
+                if strike is None:
+                    del active_strikes[i]
+                else:
+                    active_strikes[i] = strike
+            strikes = [active_strikes[i] for i in sorted(active_strikes)]
+            # Merge adjacent ranges covered by the same strikes
+            if range_strikes and range_strikes[-1] == strikes:
+                continue
+            starts.append(bound)
+            range_strikes.append(strikes)
+        return starts, range_strikes
+
+    def get_user_strikes(self, user_id):
+        """
+        Return the strikes targeting the given user.
+        :param user_id: The user's ID.
+        """
+        return self.user_strikes.get(user_id, [])
+
+    def get_ip_address_strikes(self, ip_address):
+        """
+        Return the strikes targeting the given IP address, or a network including the given IP address.
+        :param ip_address: The IP address, as a string.
+        """
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return []
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        starts, range_strikes = self.ip_ranges[address.version]
+        position = bisect.bisect_right(starts, int(address)) - 1
+        return range_strikes[position] if position >= 0 else []
+
+    def search(self, user_id, ip_address, now):
+        """
+        Search the latest (non expired) strike for the given user or IP address, blocking strikes first.
+        :param user_id: The user's ID to search strike for, can be None.
+        :param ip_address: The IP address to search strike for, can be None.
+        :param now: The current date and time, for checking the strikes' expiration date.
+        :return: The strike found, or None.
+        """
+        strikes = []
+        if user_id is not None:
+            strikes.extend(self.get_user_strikes(user_id))
+        if ip_address:
+            strikes.extend(self.get_ip_address_strikes(ip_address))
+
+        # Indexed strikes may have expired since the index was built
+        strikes = [strike for strike in strikes if strike.expiration_date is None or strike.expiration_date >= now]
+        if not strikes:
+            return None
+        return max(strikes, key=lambda strike: (strike.block_access, strike.creation_date))
+
+
+# Per-process strike index, as a tuple ``(version, index)``
+_process_index = (None, None)
+
+
+def get_process_strike_index(version):
+    """
+    Return the strike index of the current process, if built for the given strikes cache version.
+    :param version: The current strikes cache version.
+    :return: The ``StrikeIndex`` instance, or None if not built yet or outdated.
+    """
+    index_version, index = _process_index
+    return index if index_version == version else None
+
+
+def set_process_strike_index(version, index):
+    """
+    Set the strike index of the current process.
+    :param version: The strikes cache version used to build the index.
+    :param index: The ``StrikeIndex`` instance.
+    :return: None
+    """
+    global _process_index
+    _process_index = (version, index)
+
+
+def reset_process_strike_index():
+    """
+    Drop the strike index of the current process, forcing a rebuild on next use.
+    :return: None
+    """
+    set_process_strike_index(None, None)
@@ -6,6 +6,11 @@ from django.db import models
 from django.db.models import Q
 from django.utils import timezone
 
+from .cache import get_strikes_cache_version
+from .index import (StrikeIndex,
+                    get_process_strike_index,
+                    set_process_strike_index)
+
 
 class UserStrikeManager(models.Manager):
     """
@@ -14,9 +19,17 @@ class UserStrikeManager(models.Manager):
 
     use_for_related_fields = True
 
+    def active(self):
+        """
+        Return a queryset of all non expired strikes.
+        """
+        return self.filter(Q(expiration_date__isnull=True) | Q(expiration_date__isnull=False,
+                                                               expiration_date__gte=timezone.now()))
+
     def search_for_strike(self, user, ip_address):
         """
         Search the latest (non expired) strike for the given user or IP address.
+        Strikes targeting a whole network are not matched, see ``search_for_strike_cached()``.
         :param user: The user instance to search strike for.
         :param ip_address: The IP address to search strike for.
         """
@@ -27,11 +40,31 @@ class UserStrikeManager(models.Manager):
         elif user and not ip_address:
             strike_lookup = Q(target_user=user)
         elif not user and ip_address:
-            strike_lookup = Q(target_ip_address=ip_address)
+            strike_lookup = Q(target_ip_address=ip_address, target_ip_prefix_length__isnull=True)
         else:
-            strike_lookup = Q(target_user=user) | Q(target_ip_address=ip_address)
+            strike_lookup = Q(target_user=user) | Q(target_ip_address=ip_address, target_ip_prefix_length__isnull=True)
 
         # Do the search
-        return self.filter(Q(expiration_date__isnull=True) | Q(expiration_date__isnull=False,
-                                                               expiration_date__gte=timezone.now()),
-                           strike_lookup).order_by('-block_access', '-creation_date').first()
+        return self.active().filter(strike_lookup).order_by('-block_access', '-creation_date').first()
+
+    def get_strike_index(self):
+        """
+        Return the in-memory index of all active strikes, built once per process and rebuilt when strikes change.
+        """
+        version = get_strikes_cache_version()
+        index = get_process_strike_index(version)
+        if index is None:
+            index = StrikeIndex(self.active())
+            set_process_strike_index(version, index)
+        return index
+
+    def search_for_strike_cached(self, user, ip_address):
+        """
+        Search the latest (non expired) strike for the given user or IP address, like ``search_for_strike()``, using
+        the in-memory strike index. Unlike ``search_for_strike()``, strikes targeting a whole network are also matched.
+        :param user: The user instance to search strike for.
+        :param ip_address: The IP address to search strike for.
+        """
+        if not user and not ip_address:
+            return None
+        return self.get_strike_index().search(user.pk if user else None, ip_address, timezone.now())
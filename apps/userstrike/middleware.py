@@ -32,7 +32,7 @@ class UserStrikeMiddleware(object):
         # Search for strike
         current_user = request.user if request.user.is_authenticated() else None
         ip_address = get_client_ip_address(request)
-        strike = UserStrike.objects.search_for_strike(user=current_user, ip_address=ip_address)
+        strike = UserStrike.objects.search_for_strike_cached(user=current_user, ip_address=ip_address)
 
         # Test if strike found
         if strike and strike.block_access:
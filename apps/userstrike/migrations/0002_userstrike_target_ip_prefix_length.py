@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userstrike', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstrike',
+            name='target_ip_prefix_length',
+            field=models.PositiveSmallIntegerField(verbose_name='Related IP network prefix length', blank=True, null=True, default=None, help_text='Leave empty to target the IP address only. Set to target the whole network, using the CIDR notation (for instance 24 for 10.0.0.0/24).'),
+        ),
+    ]
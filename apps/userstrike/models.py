@@ -2,12 +2,17 @@
 Data models for the user strike app.
 """
 
+import ipaddress
+
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models.signals import (post_save,
+                                      post_delete)
 from django.utils.translation import ugettext_lazy as _
 
 from .managers import UserStrikeManager
+from .cache import invalidate_strikes_cache
 
 
 class UserStrike(models.Model):
@@ -15,7 +20,7 @@ class UserStrike(models.Model):
     User strike model for administrators use only.
     An user strike contain:
     - an target user ID (can be null if IP address used),
-    - an IP address (can be null if user ID used),
+    - an IP address (can be null if user ID used), with an optional network prefix length to target a whole network,
     - an expiration date,
     - a "block access" flag for ban,
     - an internal and public reason for the strike.
@@ -35,6 +40,15 @@ class UserStrike(models.Model):
                                                      blank=True,
                                                      null=True)
 
+    target_ip_prefix_length = models.PositiveSmallIntegerField(_('Related IP network prefix length'),
+                                                               default=None,
+                                                               blank=True,
+                                                               null=True,
+                                                               help_text=_('Leave empty to target the IP address '
+                                                                           'only. Set to target the whole network, '
+                                                                           'using the CIDR notation (for instance '
+                                                                           '24 for 10.0.0.0/24).'))
+
     author = models.ForeignKey(settings.AUTH_USER_MODEL,
                                db_index=True,  # Database optimization
                                related_name='authored_admin_strikes',
@@ -66,14 +80,55 @@ class UserStrike(models.Model):
         ordering = ('-creation_date', )
 
     def __str__(self):
-        return 'Strike for "%s", reason: %s' % (self.target_user.username if self.target_user else self.target_ip_address,
+        return 'Strike for "%s", reason: %s' % (self.target_user.username if self.target_user else self.get_target_ip_display(),
                                                 self.internal_reason)
 
+    def get_target_ip_network(self):
+        """
+        Return the targeted IP network (a single address network if no prefix length is set), or None.
+        """
+        if not self.target_ip_address:
+            return None
+        if self.target_ip_prefix_length is None:
+            return ipaddress.ip_network(self.target_ip_address)
+        return ipaddress.ip_network('%s/%d' % (self.target_ip_address, self.target_ip_prefix_length), strict=False)
+
+    def get_target_ip_display(self):
+        """
+        Return the targeted IP address, or the targeted IP network in CIDR notation if a prefix length is set.
+        """
+        if self.target_ip_address and self.target_ip_prefix_length is not None:
+            return '%s/%d' % (self.target_ip_address, self.target_ip_prefix_length)
+        return self.target_ip_address
+
     def clean(self):
         """
         Validate that the target user or the target ip address is set. The two fields can be set at the same time to
-        provide an user ban with an IP ban.
+        provide an user ban with an IP ban. Also validate the network prefix length, if any.
         """
         if not self.target_user and not self.target_ip_address:
             raise ValidationError(_('You must select an user or enter an IP address.'),
                                   code='invalid_strike_target')
+        if self.target_ip_prefix_length is not None:
+            if not self.target_ip_address:
+                raise ValidationError({'target_ip_prefix_length': ValidationError(
+                    _('You must enter an IP address to target a network.'), code='prefix_without_ip_address')})
+            try:
+                network = self.get_target_ip_network()
+            except ValueError:
+                raise ValidationError({'target_ip_prefix_length': ValidationError(
+                    _('Invalid network prefix length for this IP address.'), code='invalid_prefix_length')})
+            # Store the network address, not the address used to define the network
+            self.target_ip_address = str(network.network_address)
+
+
+def invalidate_strikes_cache_on_change(sender, **kwargs):
+    """
+    Invalidate the cached strikes when a strike is created, updated or deleted.
+    :param sender: Not used.
+    :param kwargs: Not used.
+    """
+    invalidate_strikes_cache()
+
+post_save.connect(invalidate_strikes_cache_on_change, sender=UserStrike)
+post_delete.connect(invalidate_strikes_cache_on_change, sender=UserStrike)
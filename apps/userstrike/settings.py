@@ -0,0 +1,9 @@
+"""
+Custom settings for the user strike app.
+"""
+
+from django.conf import settings
+
+
+# Django cache alias used for storing the version number of the strikes
+USER_STRIKE_CACHE_ALIAS = getattr(settings, 'USER_STRIKE_CACHE_ALIAS', 'default')
@@ -0,0 +1,57 @@
+"""
+Tests suite for the strike index.
+"""
+
+import ipaddress
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase
+
+from ..index import StrikeIndex
+
+
+class StrikeIndexTestCase(SimpleTestCase):
+    """
+    Tests suite for the ``StrikeIndex`` class.
+    """
+
+    def make_strike(self, network, user_id=None):
+        """
+        Return a fake strike targeting the given network.
+        :param network: The target network, in CIDR notation.
+        :param user_id: The target user ID.
+        """
+        return Mock(target_user_id=user_id,
+                    get_target_ip_network=Mock(return_value=ipaddress.ip_network(network)))
+
+    def test_overlapping_and_nested_networks(self):
+        """
+        Test the addresses ranges built from overlapping and nested networks.
+        """
+        outer = self.make_strike('10.0.0.0/16')
+        nested = self.make_strike('10.0.1.0/24')
+        single = self.make_strike('10.0.1.42/32')
+        overlapping = self.make_strike('10.0.255.0/24')
+        adjacent = self.make_strike('10.1.0.0/24')
+        index = StrikeIndex([outer, nested, single, overlapping, adjacent])
+        starts, range_strikes = index.ip_ranges[4]
+        self.assertEqual([str(ipaddress.ip_address(start)) for start in starts],
+                         ['10.0.0.0', '10.0.1.0', '10.0.1.42', '10.0.1.43', '10.0.2.0',
+                          '10.0.255.0', '10.1.0.0', '10.1.1.0'])
+        self.assertEqual(range_strikes, [[outer], [outer, nested], [outer, nested, single], [outer, nested],
+                                         [outer], [outer, overlapping], [adjacent], []])
+        self.assertEqual(index.get_ip_address_strikes('10.0.1.42'), [outer, nested, single])
+        self.assertEqual(index.get_ip_address_strikes('10.0.2.1'), [outer])
+        self.assertEqual(index.get_ip_address_strikes('9.255.255.255'), [])
+        self.assertEqual(index.get_ip_address_strikes('10.1.1.0'), [])
+        self.assertEqual(index.ip_ranges[6], ([], []))
+
+    def test_duplicate_networks(self):
+        """
+        Test that strikes targeting the same network are all indexed.
+        """
+        first = self.make_strike('2001:db8::/32')
+        second = self.make_strike('2001:db8::/32')
+        index = StrikeIndex([first, second])
+        self.assertEqual(index.get_ip_address_strikes('2001:db8::1'), [first, second])
+        self.assertEqual(index.get_ip_address_strikes('2001:db9::1'), [])
@@ -4,10 +4,13 @@ Tests suite for the user strike app.
 
 from django.test import TestCase, Client
 from django.http import HttpRequest
+from django.core.cache import caches
 from django.contrib.auth import get_user_model
 
 from ..models import UserStrike
 from ..middleware import UserStrikeMiddleware
+from ..index import reset_process_strike_index
+from ..settings import USER_STRIKE_CACHE_ALIAS
 
 
 class UserStrikeMiddlewareTestCase(TestCase):
@@ -19,6 +22,8 @@ class UserStrikeMiddlewareTestCase(TestCase):
         """
         Create some fixtures for the tests.
         """
+        caches[USER_STRIKE_CACHE_ALIAS].clear()
+        reset_process_strike_index()
         self.admin = get_user_model().objects.create_superuser(username='johndoe',
                                                                password='illpassword',
                                                                email='john.doe@example.com')
@@ -3,13 +3,17 @@ Tests suite for the data models of the user strike app.
 """
 
 from datetime import timedelta
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
 from django.test import TestCase
 from django.utils import timezone
 
 from ..models import UserStrike
+from ..index import reset_process_strike_index
+from ..settings import USER_STRIKE_CACHE_ALIAS
 
 
 class UserStrikeModelTestCase(TestCase):
@@ -67,6 +71,34 @@ class UserStrikeModelTestCase(TestCase):
             strike.target_ip_address = None
             strike.full_clean()
 
+    def test_clean_ip_network(self):
+        """
+        Test if the model validation normalize the target IP network.
+        """
+        strike, author, user = self._get_strike()
+        strike.target_ip_address = '10.0.0.42'
+        strike.target_ip_prefix_length = 24
+        strike.full_clean()
+        self.assertEqual(strike.target_ip_address, '10.0.0.0')
+        self.assertEqual(strike.get_target_ip_display(), '10.0.0.0/24')
+
+    def test_clean_ip_network_invalid_prefix_length(self):
+        """
+        Test if the model validation assert the network prefix length is valid.
+        """
+        strike, author, user = self._get_strike()
+        strike.target_ip_address = '10.0.0.42'
+        strike.target_ip_prefix_length = 33
+        with self.assertRaises(ValidationError) as e:
+            strike.full_clean()
+        self.assertEqual(e.exception.error_dict['target_ip_prefix_length'][0].code, 'invalid_prefix_length')
+
+        strike.target_ip_address = None
+        strike.target_ip_prefix_length = 24
+        with self.assertRaises(ValidationError) as e:
+            strike.full_clean()
+        self.assertEqual(e.exception.error_dict['target_ip_prefix_length'][0].code, 'prefix_without_ip_address')
+
     def test_search_for_strike_with_multiple_strike(self):
         """
         Test the ``search_for_strike`` method of the manager class with multiple strike.
@@ -216,3 +248,153 @@ class UserStrikeModelTestCase(TestCase):
         Test the ``search_for_strike`` method of the manager class with no user nor ip address.
         """
         self.assertIsNone(UserStrike.objects.search_for_strike(None, None))
+
+
+class UserStrikeCacheTestCase(TestCase):
+    """
+    Tests suite for the ``search_for_strike_cached`` method of the ``UserStrike`` manager class.
+    """
+
+    def setUp(self):
+        """
+        Create some fixtures for the tests, with a fresh cache and strike index.
+        """
+        caches[USER_STRIKE_CACHE_ALIAS].clear()
+        reset_process_strike_index()
+        self.author = get_user_model().objects.create_user(username='johndoe',
+                                                           password='illpassword',
+                                                           email='john.doe@example.com')
+        self.user = get_user_model().objects.create_user(username='johnsmith',
+                                                         password='illpassword',
+                                                         email='john.smith@example.com')
+
+    def test_no_strike_cached(self):
+        """
+        Test that the absence of strike is cached.
+        """
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'))
+
+    def test_invalidation_on_create(self):
+        """
+        Test that cached strikes are invalidated when a strike is created.
+        """
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'))
+        strike = UserStrike.objects.create(author=self.author,
+                                           internal_reason='Test strike',
+                                           target_ip_address='10.0.0.42')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'), strike)
+        with self.assertNumQueries(0):
+            self.assertEqual(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'), strike)
+
+    def test_invalidation_on_update_and_delete(self):
+        """
+        Test that cached strikes are invalidated when a strike is updated or deleted.
+        """
+        strike = UserStrike.objects.create(author=self.author,
+                                           internal_reason='Test strike',
+                                           target_user=self.user)
+        self.assertFalse(UserStrike.objects.search_for_strike_cached(self.user, None).block_access)
+        strike.block_access = True
+        strike.save()
+        self.assertTrue(UserStrike.objects.search_for_strike_cached(self.user, None).block_access)
+        strike.delete()
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(self.user, None))
+
+    def test_blocking_first(self):
+        """
+        Test that blocking strikes are returned first, like with ``search_for_strike``.
+        """
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 1',
+                                  target_user=self.user,
+                                  block_access=True)
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 2',
+                                  target_ip_address='10.0.0.42')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42'),
+                         UserStrike.objects.search_for_strike(self.user, '10.0.0.42'))
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(self.user, '10.0.0.42').internal_reason,
+                         'Test strike 1')
+
+    def test_cached_strike_expiration(self):
+        """
+        Test that cached strikes are ignored once expired.
+        """
+        now = timezone.now()
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike',
+                                  target_user=self.user,
+                                  expiration_date=now + timedelta(seconds=10))
+        self.assertIsNotNone(UserStrike.objects.search_for_strike_cached(self.user, None))
+        with mock.patch('django.utils.timezone.now') as mock_now:
+            mock_now.return_value = now + timedelta(seconds=20)
+            self.assertIsNone(UserStrike.objects.search_for_strike_cached(self.user, None))
+
+    def test_network_strike(self):
+        """
+        Test that strikes targeting a whole network match all addresses of the network.
+        """
+        strike = UserStrike.objects.create(author=self.author,
+                                           internal_reason='Test strike',
+                                           target_ip_address='10.0.0.0',
+                                           target_ip_prefix_length=24)
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '10.0.0.0'), strike)
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '10.0.0.42'), strike)
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '10.0.0.255'), strike)
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '::ffff:10.0.0.42'), strike)
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, '10.0.1.0'))
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, '9.255.255.255'))
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, '::a00:2a'))
+
+        # Network strikes are not matched by the database search
+        self.assertIsNone(UserStrike.objects.search_for_strike(None, '10.0.0.0'))
+
+    def test_invalid_network_strike(self):
+        """
+        Test that strikes with an invalid target network (saved without validation) are ignored by the index.
+        """
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 1',
+                                  target_ip_address='10.0.0.0',
+                                  target_ip_prefix_length=40)
+        strike = UserStrike.objects.create(author=self.author,
+                                           internal_reason='Test strike 2',
+                                           target_ip_address='10.0.0.42')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '10.0.0.42'), strike)
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, '10.0.0.1'))
+
+    def test_overlapping_network_strikes(self):
+        """
+        Test that blocking strikes are returned first with overlapping networks.
+        """
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 1',
+                                  target_ip_address='2001:db8::',
+                                  target_ip_prefix_length=32)
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 2',
+                                  target_ip_address='2001:db8:42::',
+                                  target_ip_prefix_length=48,
+                                  block_access=True)
+        UserStrike.objects.create(author=self.author,
+                                  internal_reason='Test strike 3',
+                                  target_ip_address='2001:db8:42::1')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '2001:db8:1::1').internal_reason,
+                         'Test strike 1')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '2001:db8:42::1').internal_reason,
+                         'Test strike 2')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '2001:db8:42::2').internal_reason,
+                         'Test strike 2')
+        self.assertEqual(UserStrike.objects.search_for_strike_cached(None, '2001:db8:43::1').internal_reason,
+                         'Test strike 1')
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, '2001:db9::1'))
+        self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, 'not an ip'))
+
+    def test_nothing(self):
+        """
+        Test the ``search_for_strike_cached`` method with no user nor ip address.
+        """
+        with self.assertNumQueries(0):
+            self.assertIsNone(UserStrike.objects.search_for_strike_cached(None, None))
@@ -220,10 +220,11 @@ INSTALLED_APPS = [
     'apps.imageattachments',
     'apps.licenses',
     'apps.loginwatcher',
-    # 'apps.mailqueue',
+    'apps.mailqueue',
     'apps.multiupload',
     'apps.notifications',
     'apps.paginator',
+    'apps.perfstats',
     'apps.privatemsg',
     'apps.redirects',
     'apps.registration',
@@ -242,6 +243,8 @@ INSTALLED_APPS = [
 # List of all middleware that are enabled in this Django installation
 # See https://docs.djangoproject.com/en/1.7/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = [
+    'apps.perfstats.middleware.PerfStatsMiddleware',  # For per-view performance statistics
+    # PerfStatsMiddleware MUST BE FIRST
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # For language activation upon login
     'apps.timezones.middleware.TimezoneMiddleware',  # For timezone activation upon login
@@ -551,6 +554,27 @@ LOG_EVENT_TTL_TIMEOUT_DAYS = 3 * 31
 
 #endregion
 
+#region ----- Paginator app settings
+
+# Objects counting mode of paginated views, by view name ("exact", "cached" or "estimated")
+PAGINATOR_COUNT_MODES = {
+    'forum:forum_detail': 'cached',
+    'blog:index': 'cached',
+    'blog:archive_year': 'cached',
+    'blog:archive_month': 'cached',
+    'blog:tag_detail': 'cached',
+    'blog:category_detail': 'cached',
+    'bloglicense:license_articles_detail': 'cached',
+}
+
+# Models of the paginated views using cached or estimated counts, for invalidation on save and delete
+PAGINATOR_CACHED_COUNT_MODELS = (
+    'forum.ForumThread',
+    'blog.Article',
+)
+
+#endregion
+
 #region ----- Twitter app settings
 
 # Consumer key (from https://apps.twitter.com/)
@@ -54,7 +54,17 @@ CACHES = {
 
 # Email backend for sending email
 # See https://docs.djangoproject.com/en/1.7/ref/settings/#std:setting-EMAIL_BACKEND
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = 'apps.mailqueue.backends.DbQueueEmailBackend'
+
+# Email backend used by the mail queue for actually sending queued mails
+MAILQUEUE_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+#endregion
+
+#region ----- Notifications settings
+
+# Only record notification events in views, the ``processnotificationevents`` command expand them
+NOTIFICATIONS_DEFERRED_EVENTS = True
 
 #endregion
 